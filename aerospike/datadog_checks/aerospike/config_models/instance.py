@@ -90,9 +90,11 @@ class InstanceConfig(BaseModel):
     aws_region: Optional[str] = None
     aws_service: Optional[str] = None
     cache_metric_wildcards: Optional[bool] = None
+    cache_sample_tags: Optional[bool] = None
     cache_shared_labels: Optional[bool] = None
     collect_counters_with_distributions: Optional[bool] = None
     collect_histogram_buckets: Optional[bool] = None
+    concurrent_scrapes: Optional[int] = None
     connect_timeout: Optional[float] = None
     datacenter_metrics: Optional[tuple[str, ...]] = None
     datacenters: Optional[tuple[str, ...]] = None
@@ -138,6 +140,8 @@ class InstanceConfig(BaseModel):
     read_timeout: Optional[float] = None
     rename_labels: Optional[MappingProxyType[str, Any]] = None
     request_size: Optional[float] = None
+    sample_tags_cache_max_age: Optional[int] = None
+    sample_tags_cache_size: Optional[int] = None
     service: Optional[str] = None
     share_labels: Optional[MappingProxyType[str, Union[bool, ShareLabels]]] = None
     skip_proxy: Optional[bool] = None
@@ -154,6 +158,7 @@ class InstanceConfig(BaseModel):
     tls_protocols_allowed: Optional[tuple[str, ...]] = None
     tls_use_host_header: Optional[bool] = None
     tls_verify: Optional[bool] = None
+    use_fast_parser: Optional[bool] = None
     use_latest_spec: Optional[bool] = None
     use_legacy_auth_encoding: Optional[bool] = None
     use_process_start_time: Optional[bool] = None
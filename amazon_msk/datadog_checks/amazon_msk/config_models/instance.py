@@ -92,10 +92,12 @@ class InstanceConfig(BaseModel):
     aws_service: Optional[str] = None
     boto_config: Optional[MappingProxyType[str, Any]] = None
     cache_metric_wildcards: Optional[bool] = None
+    cache_sample_tags: Optional[bool] = None
     cache_shared_labels: Optional[bool] = None
     cluster_arn: str
     collect_counters_with_distributions: Optional[bool] = None
     collect_histogram_buckets: Optional[bool] = None
+    concurrent_scrapes: Optional[int] = None
     connect_timeout: Optional[float] = None
     disable_generic_tags: Optional[bool] = None
     empty_default_hostname: Optional[bool] = None
@@ -139,6 +141,8 @@ class InstanceConfig(BaseModel):
     region_name: Optional[str] = None
     rename_labels: Optional[MappingProxyType[str, Any]] = None
     request_size: Optional[float] = None
+    sample_tags_cache_max_age: Optional[int] = None
+    sample_tags_cache_size: Optional[int] = None
     service: Optional[str] = None
     share_labels: Optional[MappingProxyType[str, Union[bool, ShareLabels]]] = None
     skip_proxy: Optional[bool] = None
@@ -153,6 +157,7 @@ class InstanceConfig(BaseModel):
     tls_protocols_allowed: Optional[tuple[str, ...]] = None
     tls_use_host_header: Optional[bool] = None
     tls_verify: Optional[bool] = None
+    use_fast_parser: Optional[bool] = None
     use_latest_spec: Optional[bool] = None
     use_legacy_auth_encoding: Optional[bool] = None
     use_openmetrics: Optional[bool] = None
@@ -28,6 +28,10 @@ def instance_cache_metric_wildcards():
     return True
 
 
+def instance_cache_sample_tags():
+    return False
+
+
 def instance_cache_shared_labels():
     return True
 
@@ -40,6 +44,10 @@ def instance_collect_histogram_buckets():
     return True
 
 
+def instance_concurrent_scrapes():
+    return 1
+
+
 def instance_disable_generic_tags():
     return False
 
@@ -96,6 +104,14 @@ def instance_request_size():
     return 16
 
 
+def instance_sample_tags_cache_max_age():
+    return 5
+
+
+def instance_sample_tags_cache_size():
+    return 100000
+
+
 def instance_skip_proxy():
     return False
 
@@ -124,6 +140,10 @@ def instance_tls_verify():
     return True
 
 
+def instance_use_fast_parser():
+    return False
+
+
 def instance_use_latest_spec():
     return False
 
@@ -120,9 +120,11 @@ class InstanceConfig(BaseModel):
     bearer_token_path: Optional[str] = None
     bearer_token_refresh_interval: Optional[int] = None
     cache_metric_wildcards: Optional[bool] = None
+    cache_sample_tags: Optional[bool] = None
     cache_shared_labels: Optional[bool] = None
     collect_counters_with_distributions: Optional[bool] = None
     collect_histogram_buckets: Optional[bool] = None
+    concurrent_scrapes: Optional[int] = None
     connect_timeout: Optional[float] = None
     disable_generic_tags: Optional[bool] = None
     empty_default_hostname: Optional[bool] = None
@@ -171,6 +173,8 @@ class InstanceConfig(BaseModel):
     read_timeout: Optional[float] = None
     rename_labels: Optional[MappingProxyType[str, Any]] = None
     request_size: Optional[float] = None
+    sample_tags_cache_max_age: Optional[int] = None
+    sample_tags_cache_size: Optional[int] = None
     send_distribution_buckets: Optional[bool] = None
     send_distribution_counts_as_monotonic: Optional[bool] = None
     send_distribution_sums_as_monotonic: Optional[bool] = None
@@ -192,6 +196,7 @@ class InstanceConfig(BaseModel):
     tls_use_host_header: Optional[bool] = None
     tls_verify: Optional[bool] = None
     type_overrides: Optional[MappingProxyType[str, Any]] = None
+    use_fast_parser: Optional[bool] = None
     use_latest_spec: Optional[bool] = None
     use_legacy_auth_encoding: Optional[bool] = None
     use_openmetrics: Optional[bool] = None
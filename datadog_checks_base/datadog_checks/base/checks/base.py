@@ -10,6 +10,7 @@ import re
 import traceback
 import unicodedata
 from collections import deque
+from itertools import islice
 from os.path import basename
 from typing import (  # noqa: F401
     TYPE_CHECKING,
@@ -18,6 +19,7 @@ from typing import (  # noqa: F401
     Callable,
     Deque,
     Dict,
+    Iterable,
     List,
     Optional,
     Sequence,
@@ -48,6 +50,7 @@ from ..utils.common import ensure_bytes, to_native_string
 from ..utils.diagnose import Diagnosis
 from ..utils.http import RequestsWrapper
 from ..utils.limiter import Limiter
+from ..utils.lru import LRUCache
 from ..utils.metadata import MetadataManager
 from ..utils.secrets import SecretsSanitizer
 from ..utils.serialization import from_json, to_json
@@ -92,6 +95,8 @@ if TYPE_CHECKING:
 
 # Metric types for which it's only useful to submit once per set of tags
 ONE_PER_CONTEXT_METRIC_TYPES = [aggregator.GAUGE, aggregator.RATE, aggregator.MONOTONIC_COUNT]
+# Maximum number of metric names for which `submit_metrics` remembers the namespace and filtering result
+MAX_SUBMISSION_NAMES = 10000
 TYPO_SIMILARITY_THRESHOLD = 0.95
 
 
@@ -165,6 +170,15 @@ class AgentCheck(object):
     # See https://github.com/DataDog/integrations-core/pull/2093 for more information.
     DEFAULT_METRIC_LIMIT = 0
 
+    # The number of results memoized by each of the metric name normalization methods (`normalize`,
+    # `convert_to_underscore_separated` and namespace formatting) and by `normalize_tag`. These can be
+    # overridden with the `metric_name_cache_size` and `tag_cache_size` options of `init_config`, 0 disables them.
+    DEFAULT_METRIC_NAME_CACHE_SIZE = 10000
+    DEFAULT_TAG_CACHE_SIZE = 10000
+
+    # The maximum number of logs sent by `send_logs` between two writes of the log cursor to disk
+    DEFAULT_LOG_BATCH_SIZE = 1000
+
     # Allow tracing for classic integrations
     def __init_subclass__(cls, *args, **kwargs):
         try:
@@ -234,6 +248,16 @@ class AgentCheck(object):
         logger = logging.getLogger('{}.{}'.format(__name__, self.name))
         self.log = CheckLoggingAdapter(logger, self)
 
+        # Setup memoization of metric name and tag normalization
+        metric_name_cache_size = self._get_cache_size('metric_name_cache_size', self.DEFAULT_METRIC_NAME_CACHE_SIZE)
+        tag_cache_size = self._get_cache_size('tag_cache_size', self.DEFAULT_TAG_CACHE_SIZE)
+        self._normalize_cache = self._create_cache('normalize', metric_name_cache_size)
+        self._convert_to_underscore_separated_cache = self._create_cache(
+            'convert_to_underscore_separated', metric_name_cache_size
+        )
+        self._format_namespace_cache = self._create_cache('format_namespace', metric_name_cache_size)
+        self._normalize_tag_cache = self._create_cache('normalize_tag', tag_cache_size)
+
         metric_patterns = self.instance.get('metric_patterns', {}) if instance else {}
         if not isinstance(metric_patterns, dict):
             raise ConfigurationError('Setting `metric_patterns` must be a mapping')
@@ -241,6 +265,9 @@ class AgentCheck(object):
         self.exclude_metrics_pattern = self._create_metrics_pattern(metric_patterns, 'exclude')
         self.include_metrics_pattern = self._create_metrics_pattern(metric_patterns, 'include')
 
+        # Resolved metric names used by `submit_metrics`, excluded metrics are stored as `None`
+        self._submission_names = {}  # type: Dict[Tuple[str, bool, str], Optional[str]]
+
         # TODO: Remove with Agent 5
         # Set proxy settings
         self.proxies = self._get_requests_proxy()
@@ -336,6 +363,33 @@ class AgentCheck(object):
 
         return None
 
+    def _get_cache_size(self, option, default):
+        # type: (str, int) -> int
+        cache_size = self.init_config.get(option, default) if self.init_config else default
+
+        try:
+            cache_size = int(cache_size)
+        except (ValueError, TypeError):
+            cache_size = -1
+
+        if cache_size < 0:
+            self.warning(
+                "Configured '%s' must be a non-negative integer: %s. Reverting to the default size: %s",
+                option,
+                self.init_config[option],
+                default,
+            )
+            return default
+
+        return cache_size
+
+    def _create_cache(self, name, max_size):
+        # type: (str, int) -> Optional[LRUCache]
+        if max_size > 0:
+            return LRUCache(name, max_size)
+
+        return None
+
     def _get_metric_limiter(self, name, instance=None):
         # type: (str, InstanceType) -> Optional[Limiter]
         limit = self._get_metric_limit(instance=instance)
@@ -763,6 +817,100 @@ class AgentCheck(object):
 
         aggregator.submit_metric(self, self.check_id, mtype, name, value, tags, hostname, flush_first_value)
 
+    def submit_metrics(self, metrics, raw=False, flush_first_value=False):
+        # type: (Iterable[Tuple[int, str, float, Sequence[str], str]], bool, bool) -> None
+        """Sample many metrics at once.
+
+        This is equivalent to calling the submission method of each metric type for every entry, but
+        the namespace and filtering of each metric name is resolved only once, and every tag list is
+        normalized only once per batch. Tag lists must therefore not be modified while the batch is consumed.
+
+        Parameters:
+            metrics (Iterable[tuple]):
+                the `(type, name, value, tags, hostname)` entries to submit, where `type` is
+                one of the metric types of the `aggregator` module e.g. `aggregator.GAUGE`
+            raw (bool):
+                whether to ignore any defined namespace prefix
+            flush_first_value (bool):
+                whether to sample the first value of monotonic counts
+        """
+        names = self._submission_names
+        metric_limiter = self.metric_limiter
+        normalized_tags = {}  # type: Dict[int, Tuple[Sequence[str], List[str]]]
+        submissions = []
+
+        for mtype, name, value, tags, hostname in metrics:
+            if value is None:
+                # ignore metric sample
+                continue
+
+            key = (name, raw, self.__NAMESPACE__)
+            try:
+                name = names[key]
+            except KeyError:
+                resolved_name = self._format_namespace(name, raw)
+                if not self.should_send_metric(resolved_name):
+                    resolved_name = None
+
+                if len(names) >= MAX_SUBMISSION_NAMES:
+                    names.clear()
+
+                names[key] = name = resolved_name
+
+            if name is None:
+                continue
+
+            if tags:
+                # The original list is kept so that its identifier cannot be reused during the batch
+                tags_id = id(tags)
+                if tags_id in normalized_tags:
+                    tags = normalized_tags[tags_id][1]
+                else:
+                    normalized = self._normalize_tags_type(tags, metric_name=name)
+                    normalized_tags[tags_id] = (tags, normalized)
+                    tags = normalized
+            else:
+                tags = []
+
+            if hostname is None:
+                hostname = ''
+
+            if metric_limiter:
+                if mtype in ONE_PER_CONTEXT_METRIC_TYPES:
+                    if metric_limiter.is_reached():
+                        continue
+                else:
+                    context = self._context_uid(mtype, name, tags, hostname)
+                    if metric_limiter.is_reached(context):
+                        continue
+
+            try:
+                value = float(value)
+            except ValueError:
+                err_msg = 'Metric: {} has non float value: {}. Only float values can be submitted as metrics.'.format(
+                    repr(name), repr(value)
+                )
+                if not AGENT_RUNNING:
+                    raise ValueError(err_msg)
+                self.warning(err_msg)
+                continue
+
+            submissions.append(
+                (mtype, name, value, tags, hostname, flush_first_value and mtype == aggregator.MONOTONIC_COUNT)
+            )
+
+        if not submissions:
+            return
+
+        # The Agent only exposes single submissions
+        submit_batch = getattr(aggregator, 'submit_metrics', None)
+        if submit_batch is not None:
+            submit_batch(self, self.check_id, submissions)
+        else:
+            check_id = self.check_id
+            for submission in submissions:
+                aggregator.submit_metric(self, check_id, *submission)
+
     def gauge(self, name, value, tags=None, hostname=None, device_name=None, raw=False):
         # type: (str, float, Sequence[str], str, str, bool) -> None
         """Sample a gauge metric.
@@ -999,18 +1147,77 @@ class AgentCheck(object):
                 The stream associated with this log, used for accurate cursor persistence.
                 Has no effect if `cursor` argument is `None`.
         """
+        datadog_agent.send_log(self._serialize_log(data, self.formatted_tags), self.check_id)
+        if cursor is not None:
+            self.write_persistent_cache('log_cursor_{}'.format(stream), to_json(cursor))
+
+    def send_logs(self, records, stream='default', batch_size=None):
+        # type: (Iterable[tuple[dict[str, str], dict[str, Any] | None]], str, int | None) -> int
+        """Send logs for submission, this is the same as calling `send_log` for each log but much faster.
+
+        Instead of being saved to disk after every log, the most recent cursor is only saved once every `batch_size`
+        logs and after the last one. It is also saved if an error interrupts the submission, so that the logs
+        that were already sent are not sent again. At most `batch_size` logs are sent again if the process is killed.
+
+        Parameters:
+            records (Iterable[tuple[dict[str, str], dict[str, Any] or None]]):
+                The `(data, cursor)` pairs of the logs to send, see `send_log`. The iterable is consumed lazily.
+            stream (str):
+                The stream associated with these logs, used for accurate cursor persistence.
+            batch_size (int or None):
+                The maximum number of logs sent between two writes of the cursor, defaults to `DEFAULT_LOG_BATCH_SIZE`.
+
+        Returns:
+            int: the number of logs sent.
+        """
+        if batch_size is None:
+            batch_size = self.DEFAULT_LOG_BATCH_SIZE
+        batch_size = max(batch_size, 1)
+
+        send_log = datadog_agent.send_log
+        serialize_log = self._serialize_log
+        check_id = self.check_id
+        formatted_tags = self.formatted_tags
+        cursor_key = 'log_cursor_{}'.format(stream)
+
+        records = iter(records)
+        sent = 0
+        last_cursor = None
+        try:
+            while True:
+                chunk = list(islice(records, batch_size))
+                if not chunk:
+                    break
+
+                for data, cursor in chunk:
+                    send_log(serialize_log(data, formatted_tags), check_id)
+                    if cursor is not None:
+                        last_cursor = cursor
+                sent += len(chunk)
+
+                if last_cursor is not None:
+                    self.write_persistent_cache(cursor_key, to_json(last_cursor))
+                    last_cursor = None
+        finally:
+            # Save the cursor of the last log that was sent before an error
+            if last_cursor is not None:
+                self.write_persistent_cache(cursor_key, to_json(last_cursor))
+
+        return sent
+
+    @staticmethod
+    def _serialize_log(data, formatted_tags):
+        # type: (dict[str, str], str) -> str
         attributes = data.copy()
-        if 'ddtags' not in attributes and self.formatted_tags:
-            attributes['ddtags'] = self.formatted_tags
+        if 'ddtags' not in attributes and formatted_tags:
+            attributes['ddtags'] = formatted_tags
 
         timestamp = attributes.get('timestamp')
         if timestamp is not None:
             # convert seconds to milliseconds
             attributes['timestamp'] = int(timestamp * 1000)
 
-        datadog_agent.send_log(to_json(attributes), self.check_id)
-        if cursor is not None:
-            self.write_persistent_cache('log_cursor_{}'.format(stream), to_json(cursor))
+        return to_json(attributes)
 
     def get_log_cursor(self, stream='default'):
         # type: (str) -> dict[str, Any] | None
@@ -1136,6 +1343,19 @@ class AgentCheck(object):
         Convert from CamelCase to camel_case
         And substitute illegal metric characters
         """
+        cache = self._convert_to_underscore_separated_cache
+        if cache is None:
+            return self._convert_to_underscore_separated_uncached(name)
+
+        metric_name = cache.get(name)
+        if metric_name is None:
+            metric_name = self._convert_to_underscore_separated_uncached(name)
+            cache.set(name, metric_name)
+
+        return metric_name
+
+    def _convert_to_underscore_separated_uncached(self, name):
+        # type: (Union[str, bytes]) -> bytes
         name = ensure_bytes(name)
         metric_name = self.FIRST_CAP_RE.sub(br'\1_\2', name)
         metric_name = self.ALL_CAP_RE.sub(br'\1_\2', metric_name).lower()
@@ -1206,6 +1426,20 @@ class AgentCheck(object):
         return proxies if proxies else no_proxy_settings
 
     def _format_namespace(self, s, raw=False):
+        # type: (str, bool) -> str
+        cache = self._format_namespace_cache
+        if cache is None:
+            return self._format_namespace_uncached(s, raw)
+
+        key = (s, raw, self.__NAMESPACE__)
+        name = cache.get(key)
+        if name is None:
+            name = self._format_namespace_uncached(s, raw)
+            cache.set(key, name)
+
+        return name
+
+    def _format_namespace_uncached(self, s, raw=False):
         # type: (str, bool) -> str
         if not raw and self.__NAMESPACE__:
             return '{}.{}'.format(self.__NAMESPACE__, to_native_string(s))
@@ -1222,6 +1456,20 @@ class AgentCheck(object):
             prefix: A prefix to to add to the normalized name, default None
             fix_case: A boolean, indicating whether to make sure that the metric name returned is in "snake_case"
         """
+        cache = self._normalize_cache
+        if cache is None:
+            return self._normalize_uncached(metric, prefix, fix_case)
+
+        key = (metric, prefix, fix_case)
+        name = cache.get(key)
+        if name is None:
+            name = self._normalize_uncached(metric, prefix, fix_case)
+            cache.set(key, name)
+
+        return name
+
+    def _normalize_uncached(self, metric, prefix=None, fix_case=False):
+        # type: (Union[str, bytes], Union[str, bytes], bool) -> str
         if isinstance(metric, text_type):
             metric = unicodedata.normalize('NFKD', metric).encode('ascii', 'ignore')
 
@@ -1247,6 +1495,19 @@ class AgentCheck(object):
         This happens for legacy reasons, when we cleaned up some characters (like '-')
         which are allowed in tags.
         """
+        cache = self._normalize_tag_cache
+        if cache is None:
+            return self._normalize_tag_uncached(tag)
+
+        normalized_tag = cache.get(tag)
+        if normalized_tag is None:
+            normalized_tag = self._normalize_tag_uncached(tag)
+            cache.set(tag, normalized_tag)
+
+        return normalized_tag
+
+    def _normalize_tag_uncached(self, tag):
+        # type: (Union[str, bytes]) -> str
         if isinstance(tag, text_type):
             tag = tag.encode('utf-8', 'ignore')
         tag = self.TAG_REPLACEMENT.sub(br'_', tag)
@@ -1316,8 +1577,28 @@ class AgentCheck(object):
 
                 self.metric_limiter.reset()
 
+            if is_affirmative(self.debug_metrics.get('normalization_cache', False)):
+                tags = self.get_debug_metric_tags()
+                for cache in self._get_normalization_caches():
+                    cache_tags = tags + ['cache:{}'.format(cache.name)]
+                    for metric_name, value in cache.get_debug_metrics():
+                        self.gauge(metric_name, value, tags=cache_tags, raw=True)
+
+                if self.metric_limiter:
+                    self.metric_limiter.reset()
+
         return error_report
 
+    def _get_normalization_caches(self):
+        # type: () -> List[LRUCache]
+        caches = (
+            self._normalize_cache,
+            self._convert_to_underscore_separated_cache,
+            self._format_namespace_cache,
+            self._normalize_tag_cache,
+        )
+        return [cache for cache in caches if cache is not None]
+
     def event(self, event):
         # type: (Event) -> None
         """Send an event.
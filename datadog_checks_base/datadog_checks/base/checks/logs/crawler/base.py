@@ -27,8 +27,9 @@ class LogCrawlerCheck(AgentCheck, ABC):
         """
         for stream in self.get_log_streams():
             last_cursor = self.get_log_cursor(stream.name)
-            for record in stream.records(cursor=last_cursor):
-                self.send_log(record.data, cursor=record.cursor, stream=stream.name)
+            self.send_logs(
+                ((record.data, record.cursor) for record in stream.records(cursor=last_cursor)), stream=stream.name
+            )
 
     def check(self, _) -> None:
         self.process_streams()
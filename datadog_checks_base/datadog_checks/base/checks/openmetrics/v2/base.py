@@ -4,6 +4,7 @@
 # TODO: remove ignore when we stop invoking Mypy with --py2
 # type: ignore
 from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 
 from requests.exceptions import RequestException
@@ -54,6 +55,9 @@ class OpenMetricsBaseCheckV2(AgentCheck):
         # All configured scrapers keyed by the endpoint
         self.scrapers = {}
 
+        # The maximum number of endpoints that are fetched and parsed at the same time
+        self.concurrent_scrapes = 1
+
         self.check_initializations.append(self.configure_scrapers)
 
     def check(self, _):
@@ -67,6 +71,9 @@ class OpenMetricsBaseCheckV2(AgentCheck):
         """
         self.refresh_scrapers()
 
+        if self.concurrent_scrapes > 1 and len(self.scrapers) > 1:
+            self.prefetch_scrapers()
+
         for endpoint, scraper in self.scrapers.items():
             self.log.debug('Scraping OpenMetrics endpoint: %s', endpoint)
 
@@ -77,11 +84,28 @@ class OpenMetricsBaseCheckV2(AgentCheck):
                     self.log.error("There was an error scraping endpoint %s: %s", endpoint, str(e))
                     raise_from(type(e)("There was an error scraping endpoint {}: {}".format(endpoint, e)), None)
 
+    def prefetch_scrapers(self):
+        """
+        Fetch and parse the metrics of every endpoint concurrently, using up to `concurrent_scrapes` threads.
+
+        Metrics are still submitted one scraper at a time from the calling thread.
+        """
+        with ThreadPoolExecutor(max_workers=min(self.concurrent_scrapes, len(self.scrapers))) as executor:
+            for endpoint, scraper in self.scrapers.items():
+                self.log.debug('Prefetching OpenMetrics endpoint: %s', endpoint)
+                executor.submit(scraper.prefetch)
+
     def configure_scrapers(self):
         """
         Creates a scraper configuration for each instance.
         """
 
+        concurrent_scrapes = self.instance.get('concurrent_scrapes', 1)
+        if not isinstance(concurrent_scrapes, int) or concurrent_scrapes < 1:
+            raise ConfigurationError('The setting `concurrent_scrapes` must be a positive integer')
+
+        self.concurrent_scrapes = concurrent_scrapes
+
         scrapers = {}
 
         for config in self.scraper_configs:
@@ -0,0 +1,245 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+"""
+A streaming parser for the Prometheus text exposition format.
+
+It yields the same metric families as `prometheus_client.parser.text_fd_to_metric_families` but avoids most of
+its per-sample overhead, and can skip the samples of entire families without tokenizing them. Anything that cannot
+be handled by the fast path is delegated to `prometheus_client`.
+"""
+import re
+
+from prometheus_client.metrics_core import METRIC_NAME_RE, METRIC_TYPES
+from prometheus_client.parser import _parse_sample, _replace_help_escaping
+from prometheus_client.samples import Sample
+
+from ....utils.functions import no_op
+
+# Read the response in large chunks rather than the 512 bytes used by `iter_lines`
+DEFAULT_CHUNK_SIZE = 65536
+
+# Label values without escape sequences cannot contain double quotes
+LABEL_PATTERN = re.compile(r'([^\s=,]+)\s*=\s*"([^"]*)"')
+
+ALLOWED_SUFFIXES = {
+    'counter': ('',),
+    'gauge': ('',),
+    'summary': ('_count', '_sum', ''),
+    'histogram': ('_count', '_sum', '_bucket'),
+}
+
+
+class MetricFamily(object):
+    """
+    A lightweight equivalent of `prometheus_client.metrics_core.Metric`.
+    """
+
+    __slots__ = ('name', 'documentation', 'unit', 'type', 'samples')
+
+    def __init__(self, name, documentation, typ, samples):
+        self.name = name
+        self.documentation = documentation
+        self.unit = ''
+        self.type = typ
+        self.samples = samples
+
+    def __repr__(self):
+        return f'MetricFamily({self.name!r}, {self.documentation!r}, {self.type!r}, {self.samples!r})'
+
+
+def iter_chunk_lines(chunks, encoding='utf-8'):
+    """
+    Split a stream of byte chunks into decoded lines.
+
+    Only complete lines are decoded so that multi-byte characters spanning chunk boundaries are preserved.
+    """
+    pending = b''
+    for chunk in chunks:
+        if pending:
+            chunk = pending + chunk
+
+        end = chunk.rfind(b'\n')
+        if end == -1:
+            pending = chunk
+            continue
+
+        pending = chunk[end + 1 :]
+        yield from chunk[:end].decode(encoding, 'replace').split('\n')
+
+    if pending:
+        yield from pending.decode(encoding, 'replace').split('\n')
+
+
+def parse_sample(line):
+    """
+    Tokenize a single sample line, falling back to `prometheus_client` for anything unusual like escape sequences.
+    """
+    label_start = line.find('{')
+    if label_start == -1:
+        parts = line.split()
+        if len(parts) < 2:
+            return _parse_sample(line)
+
+        return Sample(parts[0], {}, float(parts[1]), float(parts[-1]) / 1000 if len(parts) > 2 else None)
+
+    label_end = line.rfind('}')
+    labels_string = line[label_start + 1 : label_end]
+    if label_end == -1 or '\\' in labels_string:
+        return _parse_sample(line)
+
+    pairs = LABEL_PATTERN.findall(labels_string)
+    if labels_string.count('"') != len(pairs) * 2 or (not pairs and '=' in labels_string):
+        return _parse_sample(line)
+
+    parts = line[label_end + 1 :].split()
+    if not parts:
+        return _parse_sample(line)
+
+    return Sample(
+        line[:label_start].strip(),
+        dict(pairs),
+        float(parts[0]),
+        float(parts[-1]) / 1000 if len(parts) > 1 else None,
+    )
+
+
+def get_sample_name(line):
+    label_start = line.find('{')
+    if label_start == -1:
+        return line.split(None, 1)[0]
+
+    return line[:label_start].strip()
+
+
+def build_metric(name, documentation, typ, samples):
+    # Munge counters into the OpenMetrics representation exactly like `prometheus_client` does
+    if typ == 'counter':
+        if name.endswith('_total'):
+            name = name[:-6]
+        else:
+            samples = [Sample(s[0] + '_total', *s[1:]) for s in samples]
+    elif typ == 'untyped':
+        typ = 'unknown'
+
+    if not METRIC_NAME_RE.match(name):
+        raise ValueError(f'Invalid metric name: {name}')
+    elif typ not in METRIC_TYPES:
+        raise ValueError(f'Invalid metric type: {typ}')
+
+    return MetricFamily(name, documentation, typ, samples)
+
+
+def get_family_name(name, typ):
+    if typ == 'counter' and name.endswith('_total'):
+        return name[:-6]
+
+    return name
+
+
+def text_lines_to_metric_families(lines, exclude=None, on_exclude=no_op):
+    """
+    Parse Prometheus text format from an iterable of lines and yield metric families.
+
+    If `exclude` is set, it is called with the name of every metric family, as it would be yielded,
+    before its samples are tokenized. Samples of excluded families are only counted, `on_exclude`
+    is called with that number and the family is never yielded.
+    """
+    name = ''
+    documentation = ''
+    typ = 'untyped'
+    samples = []
+    allowed_names = ()
+
+    # None means that the exclusion status of the current family has not yet been determined
+    excluded = None
+    excluded_samples = 0
+
+    for line in lines:
+        line = line.strip()
+
+        if not line:
+            continue
+        elif line[0] == '#':
+            parts = line.split(None, 3)
+            if len(parts) < 2:
+                continue
+
+            directive = parts[1]
+            if directive == 'HELP':
+                if parts[2] != name:
+                    if excluded:
+                        on_exclude(excluded_samples)
+                    elif name != '':
+                        yield build_metric(name, documentation, typ, samples)
+
+                    name = parts[2]
+                    typ = 'untyped'
+                    samples = []
+                    allowed_names = (name,)
+                    excluded = None
+                    excluded_samples = 0
+
+                documentation = _replace_help_escaping(parts[3]) if len(parts) == 4 else ''
+            elif directive == 'TYPE':
+                if parts[2] != name:
+                    if excluded:
+                        on_exclude(excluded_samples)
+                    elif name != '':
+                        yield build_metric(name, documentation, typ, samples)
+
+                    name = parts[2]
+                    documentation = ''
+                    samples = []
+                    excluded = None
+                    excluded_samples = 0
+
+                typ = parts[3]
+                allowed_names = tuple(name + suffix for suffix in ALLOWED_SUFFIXES.get(typ, ('',)))
+        elif exclude is None:
+            sample = parse_sample(line)
+            if sample.name in allowed_names:
+                samples.append(sample)
+            else:
+                if name != '':
+                    yield build_metric(name, documentation, typ, samples)
+
+                name = ''
+                documentation = ''
+                typ = 'untyped'
+                samples = []
+                allowed_names = ()
+                yield build_metric(sample.name, documentation, typ, [sample])
+        else:
+            sample_name = get_sample_name(line)
+            if sample_name in allowed_names:
+                if excluded is None:
+                    excluded = exclude(get_family_name(name, typ))
+
+                if excluded:
+                    excluded_samples += 1
+                else:
+                    samples.append(parse_sample(line))
+            else:
+                if excluded:
+                    on_exclude(excluded_samples)
+                elif name != '':
+                    yield build_metric(name, documentation, typ, samples)
+
+                name = ''
+                documentation = ''
+                typ = 'untyped'
+                samples = []
+                allowed_names = ()
+                excluded = None
+                excluded_samples = 0
+
+                if exclude(sample_name):
+                    on_exclude(1)
+                else:
+                    yield build_metric(sample_name, documentation, typ, [parse_sample(line)])
+
+    if excluded:
+        on_exclude(excluded_samples)
+    elif name != '':
+        yield build_metric(name, documentation, typ, samples)
@@ -4,6 +4,7 @@
 import fnmatch
 import inspect
 import re
+from collections import OrderedDict
 from copy import copy, deepcopy
 from itertools import chain
 from math import isinf, isnan
@@ -20,8 +21,10 @@ from ....constants import ServiceCheck
 from ....errors import ConfigurationError
 from ....utils.functions import no_op, return_true
 from ....utils.http import RequestsWrapper
+from ....utils.time import get_precise_time
 from .first_scrape_handler import first_scrape_handler
 from .labels import LabelAggregator, get_label_normalizer
+from .parser import DEFAULT_CHUNK_SIZE, iter_chunk_lines, text_lines_to_metric_families
 from .transform import MetricTransformer
 
 
@@ -46,6 +49,19 @@ class OpenMetricsScraper:
 
     SERVICE_CHECK_HEALTH = 'openmetrics.health'
 
+    # Submission methods deferred while fetching and parsing metrics in another thread
+    DEFERRED_SUBMISSION_METHODS = (
+        'gauge',
+        'count',
+        'monotonic_count',
+        'rate',
+        'histogram',
+        'historate',
+        'service_check',
+        'event',
+        'set_metadata',
+    )
+
     def __init__(self, check, config):
         """
         The base class for any scraper overrides.
@@ -229,14 +245,40 @@ class OpenMetricsScraper:
 
         self.use_process_start_time = is_affirmative(config.get('use_process_start_time'))
 
+        # Parse the Prometheus text format with the built-in streaming parser rather than `prometheus_client`
+        self.use_fast_parser = is_affirmative(config.get('use_fast_parser', False))
+
+        # Reuse the tags computed for a label set across scrapes
+        self.cache_sample_tags = is_affirmative(config.get('cache_sample_tags', False))
+
+        self.sample_tags_cache_size = config.get('sample_tags_cache_size', 100000)
+        if not isinstance(self.sample_tags_cache_size, int) or self.sample_tags_cache_size < 1:
+            raise ConfigurationError('Setting `sample_tags_cache_size` must be a positive integer')
+
+        self.sample_tags_cache_max_age = config.get('sample_tags_cache_max_age', 5)
+        if not isinstance(self.sample_tags_cache_max_age, int) or self.sample_tags_cache_max_age < 1:
+            raise ConfigurationError('Setting `sample_tags_cache_max_age` must be a positive integer')
+
+        # (metric name, frozen label items) -> [labels, tags, hostname, excluded, scrape last seen],
+        # from the least to the most recently used
+        self.sample_tags_cache = OrderedDict()
+        self.sample_tags_cache_hits = 0
+        self.sample_tags_cache_misses = 0
+        self.scrape_count = 0
+
         # Used for monotonic counts
         self.flush_first_value = False
 
+        # Set by `prefetch` for the next scrape
+        self.prefetched = None
+
     def scrape(self):
         """
         Execute a scrape, and for each metric collected, transform the metric.
         """
+        start_time = get_precise_time()
         runtime_data = {'flush_first_value': self.flush_first_value, 'static_tags': self.static_tags}
+        self.scrape_count += 1
 
         for metric in self.consume_metrics(runtime_data):
             transformer = self.metric_transformer.get(metric)
@@ -247,6 +289,46 @@ class OpenMetricsScraper:
 
         self.flush_first_value = True
 
+        if self.cache_sample_tags:
+            self.evict_sample_tags_cache()
+            self.submit_telemetry_sample_tags_cache()
+
+        self.submit_telemetry_scrape_duration(get_precise_time() - start_time)
+
+    def prefetch(self):
+        """
+        Fetch and parse the metrics of the next scrape without submitting anything.
+
+        This may run in a separate thread, concurrently with other scrapers. Every submission that would
+        have happened, like the health service check, is deferred until the next call to `scrape`, which
+        then uses the prefetched metrics. Errors are also raised by `scrape`.
+
+        Only submissions made through the scraper's own methods, for example `self.monotonic_count`, are
+        deferred. Overrides of the fetching and parsing methods must not submit through the check directly.
+        """
+
+        start_time = get_precise_time()
+        self.prefetched = None
+        submissions = []
+
+        def defer(method):
+            return lambda *args, **kwargs: submissions.append((method, args, kwargs))
+
+        for method in self.DEFERRED_SUBMISSION_METHODS:
+            setattr(self, method, defer(method))
+
+        try:
+            metrics = list(self.parse_metrics())
+            self.submit_telemetry_prefetch_duration(get_precise_time() - start_time)
+        except Exception as e:
+            self.prefetched = (submissions, None, e)
+        else:
+            self.prefetched = (submissions, metrics, None)
+        finally:
+            # The check's methods will be used again
+            for method in self.DEFERRED_SUBMISSION_METHODS:
+                delattr(self, method)
+
     def consume_metrics(self, runtime_data):
         """
         Yield the processed metrics and filter out excluded metrics.
@@ -272,6 +354,19 @@ class OpenMetricsScraper:
         Get the line streamer and yield processed metrics.
         """
 
+        if self.prefetched is not None:
+            submissions, metrics, error = self.prefetched
+            self.prefetched = None
+
+            for method, args, kwargs in submissions:
+                getattr(self, method)(*args, **kwargs)
+
+            if error is not None:
+                raise error
+
+            yield from metrics
+            return
+
         line_streamer = self.stream_connection_lines()
         if self.raw_line_filter is not None:
             line_streamer = self.filter_connection_lines(line_streamer)
@@ -302,18 +397,56 @@ class OpenMetricsScraper:
         # the format will be chosen based on the media type specified in the response's content-header.
         # The selection is based on what Prometheus does:
         # https://github.com/prometheus/prometheus/blob/v2.43.0/model/textparse/interface.go#L83-L90
-        return (
-            parse_openmetrics
-            if self._use_latest_spec or media_type == 'application/openmetrics-text'
-            else parse_prometheus
+        if self._use_latest_spec or media_type == 'application/openmetrics-text':
+            return parse_openmetrics
+        elif self.use_fast_parser:
+            return self.parse_metric_families_fast
+        else:
+            return parse_prometheus
+
+    def parse_metric_families_fast(self, line_streamer):
+        """
+        Parse the Prometheus text format with the built-in parser, skipping the samples of excluded metrics.
+        """
+
+        exclude = None
+        if self.exclude_metrics or self.exclude_metrics_pattern is not None:
+            exclude = self.exclude_metric_family
+
+        return text_lines_to_metric_families(
+            line_streamer, exclude=exclude, on_exclude=self.submit_telemetry_number_of_excluded_metric_samples
         )
 
+    def exclude_metric_family(self, name):
+        """
+        Whether or not the samples of a metric family can be skipped before being parsed.
+        """
+
+        if self.raw_metric_prefix and name.startswith(self.raw_metric_prefix):
+            name = name[len(self.raw_metric_prefix) :]
+
+        if not (
+            name in self.exclude_metrics
+            or (self.exclude_metrics_pattern is not None and self.exclude_metrics_pattern.search(name))
+        ):
+            return False
+
+        # Excluded metrics may still be used before being filtered out
+        if self.label_aggregator.configured and name in self.label_aggregator.metric_config:
+            return False
+        elif self.use_process_start_time and name == 'process_start_time_seconds':
+            return False
+
+        return True
+
     def generate_sample_data(self, metric):
         """
         Yield a sample of processed data.
         """
 
         label_normalizer = get_label_normalizer(metric.type)
+        tags_cache = self.get_sample_tags_cache()
+        metric_name = metric.name
 
         for sample in metric.samples:
             value = sample.value
@@ -321,9 +454,30 @@ class OpenMetricsScraper:
                 self.log.debug('Ignoring sample for metric `%s` as it has an invalid value: %s', metric.name, value)
                 continue
 
+            labels = sample.labels
+
+            if tags_cache is not None:
+                cache_key = (metric_name, frozenset(labels.items()))
+                cached = tags_cache.get(cache_key)
+                if cached is not None:
+                    self.sample_tags_cache_hits += 1
+                    cached[4] = self.scrape_count
+                    tags_cache.move_to_end(cache_key)
+                    if cached[3]:
+                        continue
+
+                    # Transformers expect the labels to be populated and normalized
+                    labels.clear()
+                    labels.update(cached[0])
+
+                    self.submit_telemetry_number_of_processed_metric_samples()
+                    yield sample, list(cached[1]), cached[2]
+                    continue
+
+                self.sample_tags_cache_misses += 1
+
             tags = []
             skip_sample = False
-            labels = sample.labels
             self.label_aggregator.populate(labels)
             label_normalizer(labels)
 
@@ -341,6 +495,9 @@ class OpenMetricsScraper:
                 tags.append(f'{label_name}:{label_value}')
 
             if skip_sample:
+                if tags_cache is not None:
+                    self.add_sample_tags(tags_cache, cache_key, [None, None, None, True, self.scrape_count])
+
                 continue
 
             tags.extend(self.tags)
@@ -351,6 +508,10 @@ class OpenMetricsScraper:
                 if self.hostname_formatter is not None:
                     hostname = self.hostname_formatter(hostname)
 
+            if tags_cache is not None:
+                cached = [labels.copy(), tuple(tags), hostname, False, self.scrape_count]
+                self.add_sample_tags(tags_cache, cache_key, cached)
+
             self.submit_telemetry_number_of_processed_metric_samples()
             yield sample, tags, hostname
 
@@ -363,7 +524,14 @@ class OpenMetricsScraper:
             with self.get_connection() as connection:
                 # Media type will be used to select parser dynamically
                 self._content_type = connection.headers.get('Content-Type', '')
-                for line in connection.iter_lines(decode_unicode=True):
+                if self.use_fast_parser:
+                    lines = iter_chunk_lines(
+                        connection.iter_content(chunk_size=DEFAULT_CHUNK_SIZE), connection.encoding
+                    )
+                else:
+                    lines = connection.iter_lines(decode_unicode=True)
+
+                for line in lines:
                     yield line
         except ConnectionError as e:
             if self.ignore_connection_errors:
@@ -423,7 +591,55 @@ class OpenMetricsScraper:
         Set dynamic tags.
         """
 
-        self.tags = tuple(chain(self.static_tags, tags))
+        tags = tuple(chain(self.static_tags, tags))
+        if tags != self.tags:
+            self.tags = tags
+            self.sample_tags_cache.clear()
+
+    def get_sample_tags_cache(self):
+        """
+        Return the cache of tags by label set, or `None` if the tags of samples cannot be cached.
+        """
+
+        if not self.cache_sample_tags:
+            return
+
+        # Shared labels must be stable across scrapes
+        label_aggregator = self.label_aggregator
+        if label_aggregator.configured and not (
+            label_aggregator.cache_shared_labels and label_aggregator.shared_labels_cached
+        ):
+            return
+
+        return self.sample_tags_cache
+
+    def add_sample_tags(self, tags_cache, cache_key, cached):
+        """
+        Cache the tags of a label set, evicting the least recently used one if the cache is full.
+        """
+
+        if len(tags_cache) >= self.sample_tags_cache_size:
+            tags_cache.popitem(last=False)
+
+        tags_cache[cache_key] = cached
+
+    def evict_sample_tags_cache(self):
+        """
+        Remove cached label sets that have not been seen for `sample_tags_cache_max_age` scrapes.
+        """
+
+        if self.scrape_count % self.sample_tags_cache_max_age:
+            return
+
+        # Label sets are ordered by last use, so the stale ones come first
+        oldest_scrape = self.scrape_count - self.sample_tags_cache_max_age
+        tags_cache = self.sample_tags_cache
+        while tags_cache:
+            cache_key = next(iter(tags_cache))
+            if tags_cache[cache_key][4] > oldest_scrape:
+                break
+
+            del tags_cache[cache_key]
 
     def submit_health_check(self, status, **kwargs):
         """
@@ -439,12 +655,29 @@ class OpenMetricsScraper:
     def submit_telemetry_number_of_ignored_metric_samples(self, metric):
         self.count('telemetry.metrics.ignored.count', len(metric.samples), tags=self.tags)
 
+    def submit_telemetry_number_of_excluded_metric_samples(self, num_samples):
+        self.count('telemetry.metrics.input.count', num_samples, tags=self.tags)
+        self.count('telemetry.metrics.ignored.count', num_samples, tags=self.tags)
+
     def submit_telemetry_number_of_processed_metric_samples(self):
         self.count('telemetry.metrics.processed.count', 1, tags=self.tags)
 
     def submit_telemetry_number_of_ignored_lines(self):
         self.count('telemetry.metrics.blacklist.count', 1, tags=self.tags)
 
+    def submit_telemetry_sample_tags_cache(self):
+        self.count('telemetry.sample_tags_cache.hits.count', self.sample_tags_cache_hits, tags=self.tags)
+        self.count('telemetry.sample_tags_cache.misses.count', self.sample_tags_cache_misses, tags=self.tags)
+        self.gauge('telemetry.sample_tags_cache.size', len(self.sample_tags_cache), tags=self.tags)
+        self.sample_tags_cache_hits = 0
+        self.sample_tags_cache_misses = 0
+
+    def submit_telemetry_scrape_duration(self, duration):
+        self.gauge('telemetry.scrape.duration', duration, tags=self.tags)
+
+    def submit_telemetry_prefetch_duration(self, duration):
+        self.gauge('telemetry.prefetch.duration', duration, tags=self.tags)
+
     def submit_telemetry_endpoint_response_size(self, response):
         content_length = response.headers.get('Content-Length')
         if content_length is not None:
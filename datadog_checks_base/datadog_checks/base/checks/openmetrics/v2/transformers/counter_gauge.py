@@ -1,30 +1,27 @@
 # (C) Datadog, Inc. 2020-present
 # All rights reserved
 # Licensed under a 3-clause BSD style license (see LICENSE)
+from .....agent import aggregator
 
 
 def get_counter_gauge(check, metric_name, modifiers, global_options):
     """
     This submits metrics as both a `monotonic_count` suffixed by `.count` and a `gauge` suffixed by `.total`.
     """
-    gauge_method = check.gauge
-    monotonic_count_method = check.monotonic_count
+    submit_metrics_method = check.submit_metrics
+    gauge_type = aggregator.GAUGE
+    monotonic_count_type = aggregator.MONOTONIC_COUNT
 
     total_metric = f'{metric_name}.total'
     count_metric = f'{metric_name}.count'
 
     def counter_gauge(metric, sample_data, runtime_data):
-        flush_first_value = runtime_data['flush_first_value']
-
+        metrics = []
         for sample, tags, hostname in sample_data:
-            gauge_method(total_metric, sample.value, tags=tags, hostname=hostname)
-            monotonic_count_method(
-                count_metric,
-                sample.value,
-                tags=tags,
-                hostname=hostname,
-                flush_first_value=flush_first_value,
-            )
+            metrics.append((gauge_type, total_metric, sample.value, tags, hostname))
+            metrics.append((monotonic_count_type, count_metric, sample.value, tags, hostname))
+
+        submit_metrics_method(metrics, flush_first_value=runtime_data['flush_first_value'])
 
     del check
     del metric_name
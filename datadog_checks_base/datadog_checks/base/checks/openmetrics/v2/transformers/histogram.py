@@ -1,6 +1,7 @@
 # (C) Datadog, Inc. 2020-present
 # All rights reserved
 # Licensed under a 3-clause BSD style license (see LICENSE)
+from .....agent import aggregator
 from ..labels import canonicalize_numeric_label
 from ..utils import decumulate_histogram_buckets
 
@@ -16,31 +17,21 @@ def get_histogram(check, metric_name, modifiers, global_options):
             submit_histogram_bucket_method = check.submit_histogram_bucket
 
             if global_options['collect_counters_with_distributions']:
-                monotonic_count_method = check.monotonic_count
+                submit_metrics_method = check.submit_metrics
+                monotonic_count_type = aggregator.MONOTONIC_COUNT
                 sum_metric = f'{metric_name}.sum'
                 count_metric = f'{metric_name}.count'
 
                 def histogram(metric, sample_data, runtime_data):
                     flush_first_value = runtime_data['flush_first_value']
+                    metrics = []
 
                     for sample, tags, hostname in decumulate_histogram_buckets(sample_data):
                         sample_name = sample.name
                         if sample_name.endswith('_sum'):
-                            monotonic_count_method(
-                                sum_metric,
-                                sample.value,
-                                tags=tags,
-                                hostname=hostname,
-                                flush_first_value=flush_first_value,
-                            )
+                            metrics.append((monotonic_count_type, sum_metric, sample.value, tags, hostname))
                         elif sample_name.endswith('_count'):
-                            monotonic_count_method(
-                                count_metric,
-                                sample.value,
-                                tags=tags,
-                                hostname=hostname,
-                                flush_first_value=flush_first_value,
-                            )
+                            metrics.append((monotonic_count_type, count_metric, sample.value, tags, hostname))
                         elif sample_name.endswith('_bucket'):
                             lower_bound = canonicalize_numeric_label(sample.labels['lower_bound'])
                             upper_bound = canonicalize_numeric_label(sample.labels['upper_bound'])
@@ -63,6 +54,8 @@ def get_histogram(check, metric_name, modifiers, global_options):
                                 flush_first_value=flush_first_value,
                             )
 
+                    submit_metrics_method(metrics, flush_first_value=flush_first_value)
+
             else:
 
                 def histogram(metric, sample_data, runtime_data):
@@ -94,7 +87,8 @@ def get_histogram(check, metric_name, modifiers, global_options):
                         )
 
         else:
-            monotonic_count_method = check.monotonic_count
+            submit_metrics_method = check.submit_metrics
+            monotonic_count_type = aggregator.MONOTONIC_COUNT
             bucket_metric = f'{metric_name}.bucket'
             sum_metric = f'{metric_name}.sum'
             count_metric = f'{metric_name}.count'
@@ -102,98 +96,57 @@ def get_histogram(check, metric_name, modifiers, global_options):
             if global_options['non_cumulative_histogram_buckets']:
 
                 def histogram(metric, sample_data, runtime_data):
-                    flush_first_value = runtime_data['flush_first_value']
+                    metrics = []
 
                     for sample, tags, hostname in decumulate_histogram_buckets(sample_data):
                         sample_name = sample.name
                         if sample_name.endswith('_sum'):
-                            monotonic_count_method(
-                                sum_metric,
-                                sample.value,
-                                tags=tags,
-                                hostname=hostname,
-                                flush_first_value=flush_first_value,
-                            )
+                            metrics.append((monotonic_count_type, sum_metric, sample.value, tags, hostname))
                         elif sample_name.endswith('_count'):
-                            monotonic_count_method(
-                                count_metric,
-                                sample.value,
-                                tags=tags,
-                                hostname=hostname,
-                                flush_first_value=flush_first_value,
-                            )
+                            metrics.append((monotonic_count_type, count_metric, sample.value, tags, hostname))
                         # Skip infinity upper bound as that is otherwise the
                         # same context as the sample suffixed by `_count`
                         elif sample_name.endswith('_bucket') and not sample.labels['upper_bound'].endswith('inf'):
-                            monotonic_count_method(
-                                bucket_metric,
-                                sample.value,
-                                tags=tags,
-                                hostname=hostname,
-                                flush_first_value=flush_first_value,
-                            )
+                            metrics.append((monotonic_count_type, bucket_metric, sample.value, tags, hostname))
+
+                    submit_metrics_method(metrics, flush_first_value=runtime_data['flush_first_value'])
 
             # Default behavior
             else:
 
                 def histogram(metric, sample_data, runtime_data):
-                    flush_first_value = runtime_data['flush_first_value']
+                    metrics = []
 
                     for sample, tags, hostname in sample_data:
                         sample_name = sample.name
                         if sample_name.endswith('_sum'):
-                            monotonic_count_method(
-                                sum_metric,
-                                sample.value,
-                                tags=tags,
-                                hostname=hostname,
-                                flush_first_value=flush_first_value,
-                            )
+                            metrics.append((monotonic_count_type, sum_metric, sample.value, tags, hostname))
                         elif sample_name.endswith('_count'):
-                            monotonic_count_method(
-                                count_metric,
-                                sample.value,
-                                tags=tags,
-                                hostname=hostname,
-                                flush_first_value=flush_first_value,
-                            )
+                            metrics.append((monotonic_count_type, count_metric, sample.value, tags, hostname))
                         # Skip infinity upper bound as that is otherwise the
                         # same context as the sample suffixed by `_count`
                         elif sample_name.endswith('_bucket') and not sample.labels['upper_bound'].endswith('inf'):
-                            monotonic_count_method(
-                                bucket_metric,
-                                sample.value,
-                                tags=tags,
-                                hostname=hostname,
-                                flush_first_value=flush_first_value,
-                            )
+                            metrics.append((monotonic_count_type, bucket_metric, sample.value, tags, hostname))
+
+                    submit_metrics_method(metrics, flush_first_value=runtime_data['flush_first_value'])
 
     else:
-        monotonic_count_method = check.monotonic_count
+        submit_metrics_method = check.submit_metrics
+        monotonic_count_type = aggregator.MONOTONIC_COUNT
         sum_metric = f'{metric_name}.sum'
         count_metric = f'{metric_name}.count'
 
         def histogram(metric, sample_data, runtime_data):
-            flush_first_value = runtime_data['flush_first_value']
+            metrics = []
 
             for sample, tags, hostname in sample_data:
                 sample_name = sample.name
                 if sample_name.endswith('_sum'):
-                    monotonic_count_method(
-                        sum_metric,
-                        sample.value,
-                        tags=tags,
-                        hostname=hostname,
-                        flush_first_value=flush_first_value,
-                    )
+                    metrics.append((monotonic_count_type, sum_metric, sample.value, tags, hostname))
                 elif sample_name.endswith('_count'):
-                    monotonic_count_method(
-                        count_metric,
-                        sample.value,
-                        tags=tags,
-                        hostname=hostname,
-                        flush_first_value=flush_first_value,
-                    )
+                    metrics.append((monotonic_count_type, count_metric, sample.value, tags, hostname))
+
+            submit_metrics_method(metrics, flush_first_value=runtime_data['flush_first_value'])
 
     del check
     del modifiers
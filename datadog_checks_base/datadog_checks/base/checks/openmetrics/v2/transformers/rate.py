@@ -1,17 +1,20 @@
 # (C) Datadog, Inc. 2020-present
 # All rights reserved
 # Licensed under a 3-clause BSD style license (see LICENSE)
+from .....agent import aggregator
 
 
 def get_rate(check, metric_name, modifiers, global_options):
     """
     Send with the `AgentCheck.rate` method.
     """
-    rate_method = check.rate
+    submit_metrics_method = check.submit_metrics
+    rate_type = aggregator.RATE
 
     def rate(metric, sample_data, runtime_data):
-        for sample, tags, hostname in sample_data:
-            rate_method(metric_name, sample.value, tags=tags, hostname=hostname)
+        submit_metrics_method(
+            (rate_type, metric_name, sample.value, tags, hostname) for sample, tags, hostname in sample_data
+        )
 
     del check
     del modifiers
@@ -1,6 +1,7 @@
 # (C) Datadog, Inc. 2020-present
 # All rights reserved
 # Licensed under a 3-clause BSD style license (see LICENSE)
+from .....agent import aggregator
 
 
 def get_summary(check, metric_name, modifiers, global_options):
@@ -8,35 +9,25 @@ def get_summary(check, metric_name, modifiers, global_options):
     https://prometheus.io/docs/concepts/metric_types/#summary
     https://github.com/OpenObservability/OpenMetrics/blob/master/specification/OpenMetrics.md#summary-1
     """
-    gauge_method = check.gauge
-    monotonic_count_method = check.monotonic_count
+    submit_metrics_method = check.submit_metrics
+    gauge_type = aggregator.GAUGE
+    monotonic_count_type = aggregator.MONOTONIC_COUNT
     sum_metric = f'{metric_name}.sum'
     count_metric = f'{metric_name}.count'
     quantile_metric = f'{metric_name}.quantile'
 
     def summary(metric, sample_data, runtime_data):
-        flush_first_value = runtime_data['flush_first_value']
-
+        metrics = []
         for sample, tags, hostname in sample_data:
             sample_name = sample.name
             if sample_name.endswith('_sum'):
-                monotonic_count_method(
-                    sum_metric,
-                    sample.value,
-                    tags=tags,
-                    hostname=hostname,
-                    flush_first_value=flush_first_value,
-                )
+                metrics.append((monotonic_count_type, sum_metric, sample.value, tags, hostname))
             elif sample_name.endswith('_count'):
-                monotonic_count_method(
-                    count_metric,
-                    sample.value,
-                    tags=tags,
-                    hostname=hostname,
-                    flush_first_value=flush_first_value,
-                )
+                metrics.append((monotonic_count_type, count_metric, sample.value, tags, hostname))
             elif sample_name == metric.name:
-                gauge_method(quantile_metric, sample.value, tags=tags, hostname=hostname)
+                metrics.append((gauge_type, quantile_metric, sample.value, tags, hostname))
+
+        submit_metrics_method(metrics, flush_first_value=runtime_data['flush_first_value'])
 
     del check
     del modifiers
@@ -1,6 +1,7 @@
 # (C) Datadog, Inc. 2020-present
 # All rights reserved
 # Licensed under a 3-clause BSD style license (see LICENSE)
+from .....agent import aggregator
 from .....utils.common import total_time_to_temporal_percent
 from .....utils.constants import TIME_UNITS
 
@@ -37,13 +38,14 @@ def get_temporal_percent(check, metric_name, modifiers, global_options):
             'the `scale` parameter must be an integer representing parts of a second e.g. 1000 for millisecond'
         )
 
-    rate_method = check.rate
+    submit_metrics_method = check.submit_metrics
+    rate_type = aggregator.RATE
 
     def temporal_percent(metric, sample_data, runtime_data):
-        for sample, tags, hostname in sample_data:
-            rate_method(
-                metric_name, total_time_to_temporal_percent(sample.value, scale=scale), tags=tags, hostname=hostname
-            )
+        submit_metrics_method(
+            (rate_type, metric_name, total_time_to_temporal_percent(sample.value, scale=scale), tags, hostname)
+            for sample, tags, hostname in sample_data
+        )
 
     del check
     del modifiers
@@ -1,6 +1,7 @@
 # (C) Datadog, Inc. 2020-present
 # All rights reserved
 # Licensed under a 3-clause BSD style license (see LICENSE)
+from .....agent import aggregator
 from .....utils.time import get_timestamp
 
 
@@ -8,11 +9,14 @@ def get_time_elapsed(check, metric_name, modifiers, global_options):
     """
     This sends the number of seconds elapsed from a time in the past as a `gauge`.
     """
-    gauge_method = check.gauge
+    submit_metrics_method = check.submit_metrics
+    gauge_type = aggregator.GAUGE
 
     def time_elapsed(metric, sample_data, runtime_data):
-        for sample, tags, hostname in sample_data:
-            gauge_method(metric_name, get_timestamp() - sample.value, tags=tags, hostname=hostname)
+        submit_metrics_method(
+            (gauge_type, metric_name, get_timestamp() - sample.value, tags, hostname)
+            for sample, tags, hostname in sample_data
+        )
 
     del check
     del modifiers
@@ -109,6 +109,12 @@ class AggregatorStub(object):
         if not self.ignore_metric(name):
             self._metrics[name].append(MetricStub(name, mtype, value, tags, hostname, None, flush_first_value))
 
+    def submit_metrics(self, check, check_id, metrics):
+        for mtype, name, value, tags, hostname, flush_first_value in metrics:
+            check_tag_names(name, tags)
+            if not self.ignore_metric(name):
+                self._metrics[name].append(MetricStub(name, mtype, value, tags, hostname, None, flush_first_value))
+
     def submit_metric_e2e(
         self, check, check_id, mtype, name, value, tags, hostname, device=None, flush_first_value=False
     ):
@@ -12,7 +12,13 @@ from ...config import is_affirmative
 from ..containers import iter_unique
 from .query import Query
 from .transform import COLUMN_TRANSFORMERS, EXTRA_TRANSFORMERS
-from .utils import SUBMISSION_METHODS, create_submission_transformer, tracked_query
+from .utils import (
+    BATCHED_SUBMISSION_TYPES,
+    SUBMISSION_METHODS,
+    create_batched_submission_transformer,
+    create_submission_transformer,
+    tracked_query,
+)
 
 
 class QueryExecutor(object):
@@ -48,14 +54,23 @@ class QueryExecutor(object):
         self.logger = logger or logging.getLogger(__name__)
         self.track_operation_time = track_operation_time
 
+        # Metric samples queued during query execution, keyed by whether their names are raw
+        self.submission_batches = {False: [], True: []}  # type: Dict[bool, List[Tuple]]
+
     def compile_queries(self):
         """This method compiles every `Query` object."""
         column_transformers = COLUMN_TRANSFORMERS.copy()  # type: Dict[str, Transformer]
 
+        batch_submissions = hasattr(self.submitter, 'submit_metrics')
         for submission_method, transformer_name in SUBMISSION_METHODS.items():
             method = getattr(self.submitter, submission_method)
             # Save each method in the initializer -> callable format
-            column_transformers[transformer_name] = create_submission_transformer(method)
+            if batch_submissions and submission_method in BATCHED_SUBMISSION_TYPES:
+                column_transformers[transformer_name] = create_batched_submission_transformer(
+                    method, BATCHED_SUBMISSION_TYPES[submission_method], self.submission_batches
+                )
+            else:
+                column_transformers[transformer_name] = create_submission_transformer(method)
 
         for query in self.queries:
             query.compile(column_transformers, EXTRA_TRANSFORMERS.copy())
@@ -95,50 +110,60 @@ class QueryExecutor(object):
 
                 continue
 
-            for row in rows:
-                if not self._is_row_valid(query, row):
-                    continue
-
-                # It holds the query results
-                sources = {}  # type: Dict[str, str]
-                # It holds the transformers defined in query_columns along with the column value
-                submission_queue = []  # type: List[Tuple[Transformer, Any]]
-                tags = global_tags + query_tags
-
-                for (column_name, type_transformer), column_value in zip(query_columns, row):
-                    # Columns can be ignored via configuration
-                    if not column_name:
+            try:
+                for row in rows:
+                    if not self._is_row_valid(query, row):
                         continue
 
-                    sources[column_name] = column_value
-                    column_type, transformer = type_transformer
-
-                    # The transformer can be None for `source` types. Those such columns do not submit
-                    # anything but are collected into the row values for other columns to reference.
-                    if transformer is None:
-                        continue
-                    elif column_type == 'tag':
-                        tags.append(transformer(None, column_value))  # get_tag transformer
-                    elif column_type == 'tag_not_null':
-                        if column_value is not None:
+                    # It holds the query results
+                    sources = {}  # type: Dict[str, str]
+                    # It holds the transformers defined in query_columns along with the column value
+                    submission_queue = []  # type: List[Tuple[Transformer, Any]]
+                    tags = global_tags + query_tags
+
+                    for (column_name, type_transformer), column_value in zip(query_columns, row):
+                        # Columns can be ignored via configuration
+                        if not column_name:
+                            continue
+
+                        sources[column_name] = column_value
+                        column_type, transformer = type_transformer
+
+                        # The transformer can be None for `source` types. Those such columns do not submit
+                        # anything but are collected into the row values for other columns to reference.
+                        if transformer is None:
+                            continue
+                        elif column_type == 'tag':
                             tags.append(transformer(None, column_value))  # get_tag transformer
-                    elif column_type == 'tag_list':
-                        tags.extend(transformer(None, column_value))  # get_tag_list transformer
-                    else:
-                        submission_queue.append((transformer, column_value))
-
-                for transformer, value in submission_queue:
-                    transformer(sources, value, tags=tags, hostname=self.hostname, raw=query.metric_name_raw)
-
-                for name, transformer in extra_transformers:
-                    try:
-                        result = transformer(sources, tags=tags, hostname=self.hostname, raw=query.metric_name_raw)
-                    except Exception as e:
-                        self.logger.error('Error transforming %s: %s', name, e)
-                        continue
-                    else:
-                        if result is not None:
-                            sources[name] = result
+                        elif column_type == 'tag_not_null':
+                            if column_value is not None:
+                                tags.append(transformer(None, column_value))  # get_tag transformer
+                        elif column_type == 'tag_list':
+                            tags.extend(transformer(None, column_value))  # get_tag_list transformer
+                        else:
+                            submission_queue.append((transformer, column_value))
+
+                    for transformer, value in submission_queue:
+                        transformer(sources, value, tags=tags, hostname=self.hostname, raw=query.metric_name_raw)
+
+                    for name, transformer in extra_transformers:
+                        try:
+                            result = transformer(sources, tags=tags, hostname=self.hostname, raw=query.metric_name_raw)
+                        except Exception as e:
+                            self.logger.error('Error transforming %s: %s', name, e)
+                            continue
+                        else:
+                            if result is not None:
+                                sources[name] = result
+            finally:
+                self.submit_batches()
+
+    def submit_batches(self):
+        """This method submits every metric sample queued by the compiled queries."""
+        for raw, metrics in self.submission_batches.items():
+            if metrics:
+                self.submitter.submit_metrics(metrics, raw=raw)
+                del metrics[:]
 
     def _is_row_valid(self, query, row):
         # type: (Query, List) -> bool
@@ -2,6 +2,7 @@
 # All rights reserved
 # Licensed under a 3-clause BSD style license (see LICENSE)
 import logging
+from operator import itemgetter, sub
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +23,10 @@ class StatementMetrics:
     """
 
     def __init__(self):
-        self._previous_statements = {}
+        # The previous run's state is kept in columnar form: the position of every row key and, for every
+        # metric, a list of the values of all rows at those positions followed by a placeholder for new rows
+        self._previous_positions = {}
+        self._previous_columns = {}
 
     def compute_derivative_rows(self, rows, metrics, key):
         """
@@ -43,8 +47,7 @@ class StatementMetrics:
         :params key (_callable_): function for an ID which uniquely identifies a row across runs
         :return (_List[dict]_): a list of rows with the first derivative of the metrics
         """
-        result = []
-        metrics = set(metrics)
+        metrics = list(set(metrics))
 
         merged_rows, dropped_metrics = _merge_duplicate_rows(rows, metrics, key)
         if dropped_metrics:
@@ -52,45 +55,87 @@ class StatementMetrics:
                 'Some statement metrics are not available from the table: %s', ','.join(m for m in dropped_metrics)
             )
 
-        for row_key, row in merged_rows.items():
-            prev = self._previous_statements.get(row_key)
-            if prev is None:
-                continue
-
-            metric_columns = metrics & set(row.keys())
-
-            # Take the diff of all metric values between the current row and the previous run's row.
-            # There are a couple of edge cases to be aware of:
-            #
-            # 1. Table truncation or stats reset: Because the table values are always increasing, a negative value
-            #    suggests truncation or a stats reset. In this case, the row difference is discarded and the row should.
-            #    be tracked from this run forward.
-            #
-            # 2. No changes since the previous run: There is no need to store metrics of 0, since that is implied by
-            #    the absence of metrics. On any given check run, most rows will have no difference so this optimization
-            #    avoids having to send a lot of unnecessary metrics.
-
-            diffed_row = {k: row[k] - prev[k] if k in metric_columns else row[k] for k in row.keys()}
-
-            # Check for negative values, but only in the columns used for metrics
-            if any(diffed_row[k] < 0 for k in metric_columns):
-                # A "break" might be expected here instead of "continue," but there are cases where a subset of rows
-                # are removed. To avoid situations where all results are discarded every check run, we err on the side
-                # of potentially including truncated rows that exceed previous run counts.
+        row_keys = list(merged_rows)
+        rows = list(merged_rows.values())
+        del merged_rows
+
+        columns = [_get_column(rows, metric) for metric in metrics]
+
+        # New rows point to the extra last value of every previous column
+        previous_positions = self._previous_positions
+        new_position = len(previous_positions)
+        positions = [previous_positions.get(row_key, new_position) for row_key in row_keys]
+
+        # Take the diff of all metric values between the current rows and the previous run's rows, one column at a
+        # time. There are a couple of edge cases to be aware of:
+        #
+        # 1. Table truncation or stats reset: Because the table values are always increasing, a negative value
+        #    suggests truncation or a stats reset. In this case, the row difference is discarded and the row should.
+        #    be tracked from this run forward.
+        #
+        # 2. No changes since the previous run: There is no need to store metrics of 0, since that is implied by
+        #    the absence of metrics. On any given check run, most rows will have no difference so this optimization
+        #    avoids having to send a lot of unnecessary metrics.
+        #
+        # Rows are also skipped if they are new, or if one of their metrics was missing from the previous run.
+        skipped = [position == new_position for position in positions]
+        differences = []
+        for metric, column in zip(metrics, columns):
+            previous_column = self._previous_columns.get(metric)
+            if previous_column is None:
+                previous_values = [None] * len(column)
+            else:
+                previous_values = list(map(previous_column.__getitem__, positions))
+
+            try:
+                difference = list(map(sub, column, previous_values))
+            except TypeError:
+                # Some values are missing
+                difference = []
+                for i, (value, previous_value) in enumerate(zip(column, previous_values)):
+                    if value is None:
+                        difference.append(0)
+                    elif previous_value is None:
+                        skipped[i] = True
+                        difference.append(0)
+                    else:
+                        difference.append(value - previous_value)
+
+            differences.append(difference)
+
+        # Only rows with changes are materialized
+        result = []
+        for row, skip, deltas in zip(rows, skipped, zip(*differences)):
+            # A "break" might be expected here instead of "continue," but there are cases where a subset of rows
+            # are removed. To avoid situations where all results are discarded every check run, we err on the side
+            # of potentially including truncated rows that exceed previous run counts.
+            if skip or not any(deltas) or min(deltas) < 0:
                 continue
 
-            # No changes to the query; no metric needed
-            if all(diffed_row[k] == 0 for k in metric_columns):
-                continue
+            diffed_row = dict(row)
+            for metric, delta in zip(metrics, deltas):
+                if diffed_row.get(metric) is not None:
+                    diffed_row[metric] = delta
 
             result.append(diffed_row)
 
-        self._previous_statements.clear()
-        self._previous_statements = merged_rows
+        for column in columns:
+            column.append(0)
+
+        self._previous_positions = {row_key: position for position, row_key in enumerate(row_keys)}
+        self._previous_columns = dict(zip(metrics, columns))
 
         return result
 
 
+def _get_column(rows, metric):
+    # Values of metrics that are missing from a row are stored as `None`
+    try:
+        return list(map(itemgetter(metric), rows))
+    except KeyError:
+        return [row.get(metric) for row in rows]
+
+
 def _merge_duplicate_rows(rows, metrics, key):
     """
     Given a list of query rows, merge all duplicate rows as determined by the key function into a single row
@@ -18,7 +18,7 @@ from typing import Any, Callable, Dict, List, Tuple  # noqa: F401
 from cachetools import TTLCache
 
 from datadog_checks.base import is_affirmative
-from datadog_checks.base.agent import datadog_agent
+from datadog_checks.base.agent import aggregator, datadog_agent
 from datadog_checks.base.log import get_check_logger
 from datadog_checks.base.utils.db.types import Transformer  # noqa: F401
 from datadog_checks.base.utils.serialization import json
@@ -88,6 +88,41 @@ def create_submission_transformer(submit_method):
     return get_transformer
 
 
+# Submission methods whose samples may be sent with `AgentCheck.submit_metrics`
+BATCHED_SUBMISSION_TYPES = {
+    'gauge': aggregator.GAUGE,
+    'count': aggregator.COUNT,
+    'monotonic_count': aggregator.MONOTONIC_COUNT,
+    'rate': aggregator.RATE,
+    'histogram': aggregator.HISTOGRAM,
+    'historate': aggregator.HISTORATE,
+}
+BATCHED_SUBMISSION_OPTIONS = frozenset(('tags', 'hostname', 'raw'))
+
+
+def create_batched_submission_transformer(submit_method, metric_type, batches):
+    # type: (Any, int, Dict[bool, List[Tuple]]) -> Callable[[Any, Any, Any], Callable[[Any, List, Dict], Transformer]]
+    # Like `create_submission_transformer` except that samples are queued in `batches`, keyed by their `raw` option,
+    # for the caller to flush with `AgentCheck.submit_metrics`. Calls using any other option are sent directly.
+    def get_transformer(_transformers, *creation_args, **modifiers):
+        # type: (List[Transformer], Tuple, Dict[str, Any]) -> Transformer
+        def transformer(_sources, *call_args, **kwargs):
+            # type: (Dict[str, Any], Tuple[str, Any], Dict[str, Any]) -> None
+            kwargs.update(modifiers)
+
+            args = tuple(chain(creation_args, call_args))
+            if len(args) == 2 and BATCHED_SUBMISSION_OPTIONS.issuperset(kwargs):
+                batches[bool(kwargs.get('raw'))].append(
+                    (metric_type, args[0], args[1], kwargs.get('tags'), kwargs.get('hostname'))
+                )
+            else:
+                submit_method(*args, **kwargs)
+
+        return transformer
+
+    return get_transformer
+
+
 def create_extra_transformer(column_transformer, source=None):
     # type: (Transformer, str) -> Transformer
     # Every column transformer expects a value to be given but in the post-processing
@@ -0,0 +1,69 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+from collections import OrderedDict
+
+from .agent.common import METRIC_NAMESPACE_METRICS
+
+
+class LRUCache(object):
+    """
+    LRUCache is a bounded mapping that evicts the least recently used entries first.
+    It keeps track of lookups so that its efficiency can be reported as debug metrics.
+    """
+
+    def __init__(self, name, max_size):
+        """
+        :param name: name of the cache used as the `cache` tag of debug metrics
+        :param max_size: maximum number of entries to keep
+        """
+        self.name = name
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Returns the value of `key`, or `None` if it is not cached.
+        """
+        entries = self.entries
+        value = entries.pop(key, None)
+        if value is None:
+            self.misses += 1
+            return None
+
+        # Move the entry to the end
+        entries[key] = value
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        entries = self.entries
+        entries[key] = value
+        if len(entries) > self.max_size:
+            entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_debug_metrics(self):
+        """
+        Returns lookup statistics since the last call and resets them.
+        """
+        lookups = self.hits + self.misses
+        debug_metrics = (
+            ('{}.cache.hits'.format(METRIC_NAMESPACE_METRICS), self.hits),
+            ('{}.cache.misses'.format(METRIC_NAMESPACE_METRICS), self.misses),
+            ('{}.cache.hit_rate'.format(METRIC_NAMESPACE_METRICS), float(self.hits) / lookups if lookups else 0),
+            ('{}.cache.size'.format(METRIC_NAMESPACE_METRICS), len(self.entries)),
+            ('{}.cache.limit'.format(METRIC_NAMESPACE_METRICS), self.max_size),
+        )
+        self.hits = 0
+        self.misses = 0
+        return debug_metrics
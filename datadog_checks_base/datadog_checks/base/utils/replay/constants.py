@@ -14,3 +14,4 @@ class EnvVars(object):
     INIT_CONFIG = 'DD_REPLAY_INIT_CONFIG'
     INSTANCE = 'DD_REPLAY_INSTANCE'
     DDTRACE = 'DD_TRACE_ENABLED'
+    PERSISTENT = 'DD_REPLAY_PERSISTENT'
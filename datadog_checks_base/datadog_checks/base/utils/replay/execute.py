@@ -4,24 +4,39 @@
 import os
 import subprocess
 import sys
+import threading
+import weakref
 
+from ...config import is_affirmative
 from ..common import ensure_bytes, to_native_string
 from ..platform import Platform
 from ..serialization import json
 from .constants import KNOWN_DATADOG_AGENT_SETTER_METHODS, EnvVars
+from .protocol import read_frame, write_frame
 
+ISOLATION_OPTIONS = ('process_isolation', 'process_isolation_persistent', 'process_isolation_max_memory')
 
-def run_with_isolation(check, aggregator, datadog_agent):
-    message_indicator = os.urandom(8).hex()
+# Seconds to wait for a worker to exit before killing it
+WORKER_STOP_TIMEOUT = 5
+
+# The persistent worker of every check instance
+WORKERS = weakref.WeakKeyDictionary()
+
+
+def _get_option(check, name, default):
+    return check.instance.get(name, check.init_config.get(name, default))
+
+
+def _get_env_vars(check):
     instance = dict(check.instance)
     init_config = dict(check.init_config)
 
     # Prevent fork bomb
-    instance.pop('process_isolation', None)
-    init_config.pop('process_isolation', None)
+    for option in ISOLATION_OPTIONS:
+        instance.pop(option, None)
+        init_config.pop(option, None)
 
     env_vars = dict(os.environ)
-    env_vars[EnvVars.MESSAGE_INDICATOR] = message_indicator
     env_vars[EnvVars.CHECK_NAME] = check.name
     env_vars[EnvVars.CHECK_ID] = check.check_id
     env_vars[EnvVars.INIT_CONFIG] = to_native_string(json.dumps(init_config))
@@ -30,22 +45,64 @@ def run_with_isolation(check, aggregator, datadog_agent):
     if Platform.is_windows():
         env_vars[EnvVars.DDTRACE] = "false"
 
+    return env_vars
+
+
+def _get_command(check, entrypoint):
     check_module = check.__module__
     check_class = check.__class__.__name__
+    return [
+        sys.executable,
+        '-u',
+        '-c',
+        'from {check_module} import {check_class};'
+        'from datadog_checks.base.utils.replay.redirect import {entrypoint};'
+        '{entrypoint}({check_class})'.format(check_module=check_module, check_class=check_class, entrypoint=entrypoint),
+    ]
+
+
+def _handle_message(check, aggregator, datadog_agent, message_type, message, respond):
+    """Forward a message of the isolated process, return False if the communication must stop."""
+    if message_type == 'aggregator':
+        getattr(aggregator, message['method'])(check, *message['args'], **message['kwargs'])
+    elif message_type == 'log':
+        getattr(check.log, message['method'])(*message['args'])
+    elif message_type == 'datadog_agent':
+        method = message['method']
+        value = getattr(datadog_agent, method)(*message['args'], **message['kwargs'])
+        if method not in KNOWN_DATADOG_AGENT_SETTER_METHODS:
+            respond({'value': value})
+    elif message_type == 'error':
+        check.log.error(message[0]['traceback'])
+    else:
+        check.log.error(
+            'Unknown message type encountered during communication with the isolated process: %s', message_type
+        )
+        return False
+
+    return True
+
+
+def run_with_isolation(check, aggregator, datadog_agent):
+    if is_affirmative(_get_option(check, 'process_isolation_persistent', False)):
+        return run_with_persistent_isolation(check, aggregator, datadog_agent)
+
+    message_indicator = os.urandom(8).hex()
+    env_vars = _get_env_vars(check)
+    env_vars[EnvVars.MESSAGE_INDICATOR] = message_indicator
+
     process = subprocess.Popen(
-        [
-            sys.executable,
-            '-u',
-            '-c',
-            'from {check_module} import {check_class};'
-            'from datadog_checks.base.utils.replay.redirect import run_check;'
-            'run_check({check_class})'.format(check_module=check_module, check_class=check_class),
-        ],
+        _get_command(check, 'run_check'),
         stdin=subprocess.PIPE,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         env=env_vars,
     )
+
+    def respond(response):
+        process.stdin.write(b'%s\n' % ensure_bytes(json.dumps(response)))
+        process.stdin.flush()
+
     with process:
         check.log.info('Running check in a separate process')
 
@@ -60,23 +117,136 @@ def run_with_isolation(check, aggregator, datadog_agent):
             check.log.trace(line)
 
             message_type, _, message = procedure.partition(':')
-            message = json.loads(message)
-            if message_type == 'aggregator':
-                getattr(aggregator, message['method'])(check, *message['args'], **message['kwargs'])
-            elif message_type == 'log':
-                getattr(check.log, message['method'])(*message['args'])
-            elif message_type == 'datadog_agent':
-                method = message['method']
-                value = getattr(datadog_agent, method)(*message['args'], **message['kwargs'])
-                if method not in KNOWN_DATADOG_AGENT_SETTER_METHODS:
-                    process.stdin.write(b'%s\n' % ensure_bytes(json.dumps({'value': value})))
-                    process.stdin.flush()
-            elif message_type == 'error':
-                check.log.error(message[0]['traceback'])
+            if not _handle_message(check, aggregator, datadog_agent, message_type, json.loads(message), respond):
                 break
-            else:
+
+
+def run_with_persistent_isolation(check, aggregator, datadog_agent):
+    worker = WORKERS.get(check)
+    if worker is None:
+        worker = WORKERS[check] = IsolatedWorker(check)
+        weakref.finalize(check, worker.stop)
+
+    max_rss = worker.run(check, aggregator, datadog_agent)
+    if max_rss is None:
+        if not worker.running:
+            del WORKERS[check]
+        return
+
+    max_memory = int(_get_option(check, 'process_isolation_max_memory', 0)) * 1024 * 1024
+    if max_memory and max_rss > max_memory:
+        check.log.info(
+            'Restarting the isolated process, its memory usage of %d bytes exceeds the limit of %d bytes',
+            max_rss,
+            max_memory,
+        )
+        worker.stop()
+        del WORKERS[check]
+
+
+class IsolatedWorker(object):
+    """A process running the check every time it is asked to, until it is stopped.
+
+    The worker never references the check so that it is stopped once the check is garbage collected.
+    """
+
+    def __init__(self, check):
+        env_vars = _get_env_vars(check)
+        env_vars[EnvVars.PERSISTENT] = 'true'
+
+        self._process = subprocess.Popen(
+            _get_command(check, 'run_worker'),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env_vars,
+        )
+        self._ready = False
+        check.log.info('Started a persistent isolated process with pid %d', self._process.pid)
+
+        # Anything not sent through the protocol, like warnings or crash reports, is written to stderr
+        self._stderr_reader = threading.Thread(
+            target=self._forward_stderr, args=(self._process.stderr, check.log.logger), name='isolated-worker-stderr'
+        )
+        self._stderr_reader.daemon = True
+        self._stderr_reader.start()
+
+    @property
+    def pid(self):
+        return self._process.pid
+
+    @property
+    def running(self):
+        return self._process.poll() is None
+
+    @staticmethod
+    def _forward_stderr(stream, logger):
+        # To avoid blocking never use a pipe's file descriptor iterator. See https://bugs.python.org/issue3907
+        for line in iter(stream.readline, b''):
+            logger.debug(line.rstrip().decode('utf-8', 'replace'))
+
+    def _send(self, request):
+        try:
+            write_frame(self._process.stdin, request)
+        except (IOError, OSError, ValueError):
+            return False
+
+        return True
+
+    def _receive_until(self, check, aggregator, datadog_agent, end_type):
+        """Forward the messages of the worker until it sends `end_type`, return that message or None if the worker
+        can no longer be used."""
+        while True:
+            messages = read_frame(self._process.stdout)
+            if messages is None:
                 check.log.error(
-                    'Unknown message type encountered during communication with the isolated process: %s',
-                    message_type,
+                    'The persistent isolated process with pid %d exited with code %s, '
+                    'it will be restarted on the next run',
+                    self._process.pid,
+                    self._process.wait(),
                 )
-                break
+                return None
+
+            for message_type, message in messages:
+                if message_type == end_type:
+                    return message
+
+                if not _handle_message(check, aggregator, datadog_agent, message_type, message, self._send):
+                    return None
+
+    def run(self, check, aggregator, datadog_agent):
+        """Run the check once, return the peak memory usage of the worker or None if it can no longer be used."""
+        # Until the check is created the worker may need answers from the Agent, e.g. its configured log level
+        if not self._ready:
+            self._ready = self._receive_until(check, aggregator, datadog_agent, 'ready') is not None
+            if not self._ready:
+                self.stop()
+                return None
+
+        check.log.debug('Running check in the persistent isolated process with pid %d', self._process.pid)
+        if not self._send({'type': 'run'}):
+            self.stop()
+            return None
+
+        result = self._receive_until(check, aggregator, datadog_agent, 'done')
+        if result is None:
+            self.stop()
+            return None
+
+        return result['max_rss'] or 0
+
+    def stop(self):
+        if self.running:
+            self._send({'type': 'stop'})
+
+        for stream in (self._process.stdin, self._process.stdout):
+            try:
+                stream.close()
+            except (IOError, OSError):
+                pass
+
+        try:
+            self._process.wait(WORKER_STOP_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
@@ -0,0 +1,69 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+import struct
+
+from ..common import ensure_bytes
+from ..serialization import json
+
+# Every frame is a JSON payload prefixed by its length
+FRAME_HEADER = struct.Struct('>I')
+
+# The maximum number of messages the isolated process buffers before sending them
+MAX_BATCH_SIZE = 1000
+
+
+def write_frame(stream, payload):
+    data = ensure_bytes(json.dumps(payload))
+    stream.write(FRAME_HEADER.pack(len(data)) + data)
+    stream.flush()
+
+
+def read_frame(stream):
+    """Return the payload of the next frame, or None if the stream is closed."""
+    header = _read_exactly(stream, FRAME_HEADER.size)
+    if header is None:
+        return None
+
+    data = _read_exactly(stream, FRAME_HEADER.unpack(header)[0])
+    if data is None:
+        return None
+
+    return json.loads(data)
+
+
+def _read_exactly(stream, size):
+    chunks = []
+    while size:
+        chunk = stream.read(size)
+        if not chunk:
+            return None
+
+        chunks.append(chunk)
+        size -= len(chunk)
+
+    return b''.join(chunks)
+
+
+class FrameChannel(object):
+    """Batches the messages sent by the isolated process, the batch is sent when a response is expected from the
+    parent process, when the check run is over or when it reaches `MAX_BATCH_SIZE` messages."""
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._messages = []
+
+    def send(self, message_type, message):
+        self._messages.append([message_type, message])
+        if len(self._messages) >= MAX_BATCH_SIZE:
+            self.flush()
+
+    def receive(self):
+        self.flush()
+        return read_frame(self._reader)
+
+    def flush(self):
+        if self._messages:
+            messages, self._messages = self._messages, []
+            write_frame(self._writer, messages)
@@ -10,12 +10,35 @@ from ...log import LOG_LEVEL_MAP, TRACE_LEVEL, _get_py_loglevel
 from ...utils.common import to_native_string
 from ...utils.metadata import core
 from ...utils.replay.constants import KNOWN_DATADOG_AGENT_SETTER_METHODS, EnvVars
+from ...utils.replay.protocol import FrameChannel
 from ...utils.serialization import json
 
-MESSAGE_INDICATOR = os.environ[EnvVars.MESSAGE_INDICATOR]
+MESSAGE_INDICATOR = os.environ.get(EnvVars.MESSAGE_INDICATOR)
 LOG_METHODS = {log_level: log_method.lower() for log_method, log_level in LOG_LEVEL_MAP.items()}
 
 
+class LineChannel(object):
+    """Every message is printed on its own line, prefixed by the message indicator."""
+
+    def send(self, message_type, message):
+        print('{}:{}:{}'.format(MESSAGE_INDICATOR, message_type, to_native_string(json.dumps(message))))
+
+    def receive(self):
+        return json.loads(sys.stdin.readline())
+
+    def flush(self):
+        pass
+
+
+if os.environ.get(EnvVars.PERSISTENT):
+    # The original stdout is reserved for the frames, anything else printed by the check goes to stderr
+    sys.stdout.flush()
+    channel = FrameChannel(sys.stdin.buffer, os.fdopen(os.dup(sys.stdout.fileno()), 'wb'))
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+else:
+    channel = LineChannel()
+
+
 class ReplayAggregator(object):
     GAUGE, RATE, COUNT, MONOTONIC_COUNT, COUNTER, HISTOGRAM, HISTORATE = range(7)
 
@@ -27,12 +50,7 @@ class ReplayAggregator(object):
     @staticmethod
     def method_generator(method_name):
         def method(*args, **kwargs):
-            print(
-                '{}:aggregator:{}'.format(
-                    MESSAGE_INDICATOR,
-                    to_native_string(json.dumps({'method': method_name, 'args': list(args)[1:], 'kwargs': kwargs})),
-                )
-            )
+            channel.send('aggregator', {'method': method_name, 'args': list(args)[1:], 'kwargs': kwargs})
 
         return method
 
@@ -46,26 +64,16 @@ class ReplayDatadogAgent(object):
     @staticmethod
     def method_generator(method_name, read):
         def method(*args, **kwargs):
-            print(
-                '{}:datadog_agent:{}'.format(
-                    MESSAGE_INDICATOR,
-                    to_native_string(json.dumps({'method': method_name, 'args': list(args), 'kwargs': kwargs})),
-                )
-            )
+            channel.send('datadog_agent', {'method': method_name, 'args': list(args), 'kwargs': kwargs})
             if read:
-                return json.loads(sys.stdin.readline())['value']
+                return channel.receive()['value']
 
         return method
 
 
 class ReplayLogger(logging.Logger):
     def log(self, level, *args, **kwargs):
-        print(
-            '{}:log:{}'.format(
-                MESSAGE_INDICATOR,
-                to_native_string(json.dumps({'method': LOG_METHODS[level], 'args': [str(a) for a in args]})),
-            )
-        )
+        channel.send('log', {'method': LOG_METHODS[level], 'args': [str(a) for a in args]})
 
 
 base.AGENT_RUNNING = True
@@ -77,14 +85,47 @@ logging.setLoggerClass(ReplayLogger)
 logging.getLogger().setLevel(_get_py_loglevel(base.datadog_agent.get_config('log_level')))
 
 
-def run_check(check_class):
+def _create_check(check_class):
     check = check_class(
         os.environ[EnvVars.CHECK_NAME],
         json.loads(os.environ[EnvVars.INIT_CONFIG]),
         [json.loads(os.environ[EnvVars.INSTANCE])],
     )
     check.check_id = os.environ[EnvVars.CHECK_ID]
+    return check
+
+
+def _get_max_rss():
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kibibytes everywhere else
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def run_check(check_class):
+    check = _create_check(check_class)
 
     result = check.run()
     if result:
-        print('{}:error:{}'.format(MESSAGE_INDICATOR, result))
+        channel.send('error', json.loads(result))
+
+
+def run_worker(check_class):
+    """Run the check every time the parent process asks for it, until it asks to stop."""
+    check = _create_check(check_class)
+    channel.send('ready', {})
+
+    while True:
+        request = channel.receive()
+        if request is None or request['type'] == 'stop':
+            return
+
+        result = check.run()
+        if result:
+            channel.send('error', json.loads(result))
+        channel.send('done', {'max_rss': _get_max_rss()})
+        channel.flush()
@@ -5,12 +5,21 @@ import binascii
 import os
 from stat import ST_INO, ST_SIZE
 
-from .common import ensure_bytes
+from .common import to_native_string
+
+ROTATED = 'rotated'
+TRUNCATED = 'truncated'
 
 
 class TailFile(object):
+    """Follow a file and run a callback on each of its lines, even if the file is rotated or truncated.
+
+    The file is read by large chunks that are split into lines in memory. Whether the file was rotated or truncated
+    is only checked once all the available lines are read, that is once per call to `next` on the `tail` generator.
+    """
 
     CRC_SIZE = 16
+    CHUNK_SIZE = 64 * 1024
 
     def __init__(self, logger, path, callback):
         self._path = path
@@ -20,71 +29,86 @@ class TailFile(object):
         self._crc = None
         self._log = logger
         self._callback = callback
+        # Incomplete last line of what was read so far
+        self._buffer = b''
 
-    def _open_file(self, move_end=False, pos=False):
-
-        already_open = False
-        # close and reopen to handle logrotate
-        if self._f is not None:
-            self._f.close()
-            self._f = None
-            already_open = True
+    def _open_file(self, move_end=False):
+        self.close()
 
         stat = os.stat(self._path)
-        inode = stat[ST_INO]
-        size = stat[ST_SIZE]
-
-        # Compute CRC of the beginning of the file
-        crc = None
-        if size >= self.CRC_SIZE:
-            tmp_file = open(self._path, 'r')
-            data = ensure_bytes(tmp_file.read(self.CRC_SIZE))
-            crc = binascii.crc32(data)
-
         self._log.debug(
-            "Open file. path=%s, cur_inode=%s, new_inode=%s, cur_size=%s, new_size=%s, move_end=%s, pos=%s",
+            "Open file. path=%s, cur_inode=%s, new_inode=%s, move_end=%s",
             self._path,
             self._inode,
-            inode,
-            self._size,
-            size,
+            stat[ST_INO],
             move_end,
-            pos,
         )
-
-        if already_open:
-            # Check if file has been removed
-            if self._inode is not None and inode != self._inode:
-                self._log.debug("File removed, reopening")
-                move_end = False
-                pos = False
-
-            # Check if file has been truncated
-            elif self._size > 0 and size < self._size:
-                self._log.debug("File truncated, reopening")
-                move_end = False
-                pos = False
-
-            # Check if file has been truncated and too much data has
-            # already been written (copytruncate and opened files...)
-            if size >= self.CRC_SIZE and self._crc is not None and crc != self._crc:
-                self._log.debug("Beginning of file modified, reopening")
-                move_end = False
-                pos = False
-
-        self._inode = inode
-        self._size = size
-        self._crc = crc
-
-        self._f = open(self._path, 'r')
+        self._f = open(self._path, 'rb')
+        self._inode = stat[ST_INO]
+        self._size = stat[ST_SIZE]
+        self._crc = self._compute_crc(self._size)
         if move_end:
             self._log.debug("Opening file %s", self._path)
             self._f.seek(0, os.SEEK_END)
-        elif pos:
-            self._log.debug("Reopening file %s at %s", self._path, pos)
-            self._f.seek(pos)
 
-        return True
+    def _compute_crc(self, size):
+        # Compute CRC of the beginning of the file
+        if size < self.CRC_SIZE:
+            return None
+
+        pos = self._f.tell()
+        self._f.seek(0)
+        crc = binascii.crc32(self._f.read(self.CRC_SIZE))
+        self._f.seek(pos)
+        return crc
+
+    def _check_file(self):
+        """Return `ROTATED` or `TRUNCATED` if the file must be read again from its beginning, None otherwise."""
+        stat = os.stat(self._path)
+        inode = stat[ST_INO]
+        size = stat[ST_SIZE]
+
+        # Check if file has been removed
+        if inode != self._inode:
+            self._log.debug("File removed, reopening")
+            return ROTATED
+
+        # Check if file has been truncated
+        if size < self._size or size < self._f.tell():
+            self._log.debug("File truncated, reopening")
+            return TRUNCATED
+        self._size = size
+
+        # Check if file has been truncated and too much data has
+        # already been written (copytruncate and opened files...)
+        crc = self._compute_crc(size)
+        if crc is not None and self._crc is not None and crc != self._crc:
+            self._log.debug("Beginning of file modified, reopening")
+            return TRUNCATED
+        self._crc = crc
+
+        return None
+
+    def _read_lines(self):
+        """Yield the complete lines available in the file."""
+        while True:
+            chunk = self._f.read(self.CHUNK_SIZE)
+            if not chunk:
+                return
+
+            lines = (self._buffer + chunk).split(b'\n')
+            # The last line is only complete once its line break is written
+            self._buffer = lines.pop()
+            for line in lines:
+                if line.endswith(b'\r'):
+                    line = line[:-1]
+                # a truncate may have create holes in the file
+                yield to_native_string(line.strip(b'\x00'))
+
+    def _process_lines(self, line_by_line):
+        for line in self._read_lines():
+            if self._callback(line) and line_by_line:
+                yield True
 
     def tail(self, line_by_line=True, move_end=True):
         """Read line-by-line and run callback on each line.
@@ -94,23 +118,17 @@ class TailFile(object):
             self._open_file(move_end=move_end)
 
             while True:
-                pos = self._f.tell()
-                line = self._f.readline()
-                if line:
-                    line = line.strip(chr(0))  # a truncate may have create holes in the file
-                    if self._callback(line.rstrip("\n")):
-                        if line_by_line:
-                            yield True
-                            pos = self._f.tell()
-                            self._open_file(move_end=False, pos=pos)
-                        else:
-                            continue
-                    else:
-                        continue
-                else:
-                    yield True
-                    assert pos == self._f.tell()
-                    self._open_file(move_end=False, pos=pos)
+                for result in self._process_lines(line_by_line):
+                    yield result
+                yield True
+
+                change = self._check_file()
+                if change is not None:
+                    if change == ROTATED:
+                        # Read what was written to the previous file before it was rotated
+                        for result in self._process_lines(line_by_line):
+                            yield result
+                    self._open_file(move_end=False)
 
         except Exception as e:
             # log but survive
@@ -121,3 +139,4 @@ class TailFile(object):
         if self._f:
             self._f.close()
             self._f = None
+        self._buffer = b''
@@ -0,0 +1,67 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+import os
+
+import mock
+import pytest
+
+from datadog_checks.dev.testing import requires_py3
+
+pytestmark = [requires_py3]
+
+RECORDS = 10000
+
+
+@pytest.fixture
+def crawler_check(datadog_agent, tmp_path):
+    from datadog_checks.base.checks.logs.crawler.base import LogCrawlerCheck
+    from datadog_checks.base.checks.logs.crawler.stream import LogRecord, LogStream
+
+    class BenchLogStream(LogStream):
+        def records(self, cursor=None):
+            for i in range(RECORDS):
+                yield LogRecord(
+                    {'message': 'GET /api/v1/resource/{} 200'.format(i), 'timestamp': 1722958617.2842212 + i},
+                    cursor={'offset': i, 'file': '/var/log/app.log'},
+                )
+
+    class BenchLogCrawlerCheck(LogCrawlerCheck):
+        def get_log_streams(self):
+            return [BenchLogStream(check=self, name='stream')]
+
+    # Like the Agent, write every cursor to its own file
+    def write_persistent_cache(key, value):
+        with open(os.path.join(str(tmp_path), key), 'w') as f:
+            f.write(value)
+
+    check = BenchLogCrawlerCheck('test', {}, [{'tags': ['env:bench', 'service:app']}])
+    check.check_id = 'test'
+    with mock.patch.object(datadog_agent, 'send_log'), mock.patch.object(
+        datadog_agent, 'write_persistent_cache', side_effect=write_persistent_cache
+    ), mock.patch.object(datadog_agent, 'read_persistent_cache', return_value=''):
+        yield check
+
+
+def _record_throughput(benchmark):
+    # There are no statistics when benchmarks are disabled
+    if benchmark.stats:
+        benchmark.extra_info['records_per_second'] = int(RECORDS / benchmark.stats.stats.mean)
+
+
+def test_send_log_per_record(benchmark, crawler_check):
+    """Every record is sent with `send_log`, which saves its cursor to disk."""
+
+    def run():
+        for stream in crawler_check.get_log_streams():
+            for record in stream.records():
+                crawler_check.send_log(record.data, cursor=record.cursor, stream=stream.name)
+
+    benchmark(run)
+    _record_throughput(benchmark)
+
+
+def test_process_streams(benchmark, crawler_check):
+    """Records are sent with `send_logs`, which saves the cursor once per batch."""
+    benchmark(crawler_check.process_streams)
+    _record_throughput(benchmark)
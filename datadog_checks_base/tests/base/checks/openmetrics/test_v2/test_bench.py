@@ -2,10 +2,13 @@
 # All rights reserved
 # Licensed under a 3-clause BSD style license (see LICENSE)
 import os
+from io import StringIO
 
 import pytest
+from prometheus_client.parser import text_fd_to_metric_families
 
 from datadog_checks.base import OpenMetricsBaseCheckV2
+from datadog_checks.base.checks.openmetrics.v2.parser import text_lines_to_metric_families
 from datadog_checks.dev import get_here
 from datadog_checks.dev.testing import requires_py3
 
@@ -37,6 +40,40 @@ def test_ksm_new(benchmark, dd_run_check, mock_http_response, fixture_ksm):
     benchmark(c.check, None)
 
 
+def test_ksm_new_fast_parser(benchmark, dd_run_check, mock_http_response, fixture_ksm):
+    mock_http_response(file_path=fixture_ksm)
+    c = OpenMetricsBaseCheckV2(
+        'test', {}, [{'openmetrics_endpoint': 'foo', 'namespace': 'bar', 'metrics': ['.+'], 'use_fast_parser': True}]
+    )
+
+    # Run once to get initialization steps out of the way.
+    dd_run_check(c)
+
+    benchmark(c.check, None)
+
+
+@pytest.mark.parametrize('share_labels', [False, True], ids=['plain', 'label_joins'])
+def test_ksm_new_cache_sample_tags(benchmark, dd_run_check, mock_http_response, fixture_ksm, share_labels):
+    mock_http_response(file_path=fixture_ksm)
+    instance = {
+        'openmetrics_endpoint': 'foo',
+        'namespace': 'bar',
+        'hostname_label': 'node',
+        'metrics': ['.+'],
+        'cache_sample_tags': True,
+    }
+    if share_labels:
+        instance['share_labels'] = {'kube_pod_info': {'match': ['pod', 'namespace'], 'labels': ['node'], 'values': [1]}}
+
+    c = OpenMetricsBaseCheckV2('test', {}, [instance])
+
+    # Run twice to get initialization steps out of the way and populate the cache.
+    dd_run_check(c)
+    dd_run_check(c)
+
+    benchmark(c.check, None)
+
+
 def test_amazon_msk_jmx_metrics_new(benchmark, dd_run_check, mock_http_response, fixture_amazon_msk_jmx_metrics):
     mock_http_response(file_path=fixture_amazon_msk_jmx_metrics)
 
@@ -82,3 +119,40 @@ def test_label_joins_new(benchmark, dd_run_check, mock_http_response, fixture_ks
     dd_run_check(c)
 
     benchmark(c.check, None)
+
+
+@pytest.mark.parametrize('fast_parser', [False, True], ids=['prometheus_client', 'fast'])
+def test_amazon_msk_jmx_metrics_parser_exclude(
+    benchmark, dd_run_check, mock_http_response, fixture_amazon_msk_jmx_metrics, fast_parser
+):
+    mock_http_response(file_path=fixture_amazon_msk_jmx_metrics)
+    instance = {
+        'openmetrics_endpoint': 'foo',
+        'namespace': 'bar',
+        'metrics': ['.+'],
+        'exclude_metrics': ['kafka_log_.+', 'kafka_server_.+'],
+        'use_fast_parser': fast_parser,
+    }
+    c = OpenMetricsBaseCheckV2('test', {}, [instance])
+
+    # Run once to get initialization steps out of the way.
+    dd_run_check(c)
+
+    benchmark(c.check, None)
+
+
+@pytest.mark.parametrize('fixture', ['ksm.txt', 'amazon_msk_jmx_metrics.txt'])
+def test_parse_prometheus_client(benchmark, fixture):
+    with open(os.path.join(FIXTURE_PATH, fixture)) as f:
+        text = f.read()
+
+    benchmark(lambda: sum(len(metric.samples) for metric in text_fd_to_metric_families(StringIO(text))))
+
+
+@pytest.mark.parametrize('fixture', ['ksm.txt', 'amazon_msk_jmx_metrics.txt'])
+def test_parse_fast(benchmark, fixture):
+    with open(os.path.join(FIXTURE_PATH, fixture)) as f:
+        text = f.read()
+
+    lines = text.splitlines()
+    benchmark(lambda: sum(len(metric.samples) for metric in text_lines_to_metric_families(lines)))
@@ -1,7 +1,12 @@
 # (C) Datadog, Inc. 2020-present
 # All rights reserved
 # Licensed under a 3-clause BSD style license (see LICENSE)
+import threading
+
+import pytest
+
 from datadog_checks.base import OpenMetricsBaseCheckV2
+from datadog_checks.base.checks.openmetrics.v2.scraper import OpenMetricsScraper
 from datadog_checks.base.constants import ServiceCheck
 from datadog_checks.dev.testing import requires_py3
 
@@ -128,3 +133,110 @@ def test_custom_transformer(aggregator, dd_run_check, mock_http_response):
     dd_run_check(check)
 
     aggregator.assert_metric('test.server.watchdog_mega_miss', metric_type=aggregator.GAUGE, count=2)
+
+
+class TestConcurrentScrapes:
+    @staticmethod
+    def get_check(instance, payloads, mocker):
+        from datadog_checks.dev.http import MockResponse
+
+        class Check(OpenMetricsBaseCheckV2):
+            __NAMESPACE__ = 'test'
+
+            def __init__(self, name, init_config, instances):
+                super().__init__(name, init_config, instances)
+                self.scraper_configs = [
+                    {'openmetrics_endpoint': endpoint, 'metrics': ['.+'], 'telemetry': True} for endpoint in payloads
+                ]
+
+        def get(url, *args, **kwargs):
+            payload = payloads[url]
+            if isinstance(payload, Exception):
+                raise payload
+
+            return MockResponse(payload)
+
+        mocker.patch('requests.get', side_effect=get)
+        return Check('test', {}, [instance])
+
+    def test_concurrent(self, aggregator, dd_run_check, mocker):
+        payloads = {
+            f'http://endpoint{i}': f'# TYPE go_goroutines gauge\ngo_goroutines{{shard="{i}"}} {i}\n' for i in range(5)
+        }
+        check = self.get_check({'openmetrics_endpoint': 'http://endpoint0', 'concurrent_scrapes': 3}, payloads, mocker)
+        prefetch_scrapers = mocker.spy(check, 'prefetch_scrapers')
+        dd_run_check(check)
+
+        assert prefetch_scrapers.call_count == 1
+        for i in range(5):
+            endpoint_tag = f'endpoint:http://endpoint{i}'
+            aggregator.assert_metric('test.go_goroutines', i, tags=[endpoint_tag, f'shard:{i}'])
+            aggregator.assert_metric('test.telemetry.metrics.input.count', 1, tags=[endpoint_tag])
+            aggregator.assert_metric('test.telemetry.prefetch.duration', tags=[endpoint_tag])
+            aggregator.assert_metric('test.telemetry.scrape.duration', tags=[endpoint_tag])
+            aggregator.assert_service_check('test.openmetrics.health', ServiceCheck.OK, tags=[endpoint_tag])
+
+    def test_deferred_submissions(self, aggregator, dd_run_check, mocker):
+        class Scraper(OpenMetricsScraper):
+            def stream_connection_lines(self):
+                self.monotonic_count('fetched.count', 1, tags=self.tags)
+                self.histogram('fetched.histogram', 1, tags=self.tags)
+                self.event({'msg_title': 'fetched', 'msg_text': self.endpoint})
+                yield from super().stream_connection_lines()
+
+        payloads = {f'http://endpoint{i}': f'# TYPE go_goroutines gauge\ngo_goroutines {i}\n' for i in range(3)}
+        check = self.get_check({'openmetrics_endpoint': 'http://endpoint0', 'concurrent_scrapes': 3}, payloads, mocker)
+        check.create_scraper = lambda config: Scraper(check, check.get_config_with_defaults(config))
+
+        # Every submission happens from the check's thread
+        submission_threads = set()
+
+        def record_thread(submit):
+            def wrapper(*args, **kwargs):
+                submission_threads.add(threading.current_thread())
+                return submit(*args, **kwargs)
+
+            return wrapper
+
+        for method in ('monotonic_count', 'histogram', 'event', 'service_check'):
+            setattr(check, method, record_thread(getattr(check, method)))
+        dd_run_check(check)
+
+        assert submission_threads == {threading.current_thread()}
+        for i in range(3):
+            endpoint_tag = f'endpoint:http://endpoint{i}'
+            aggregator.assert_metric('test.fetched.count', 1, tags=[endpoint_tag], count=1)
+            aggregator.assert_metric('test.fetched.histogram', 1, tags=[endpoint_tag], count=1)
+            aggregator.assert_metric('test.go_goroutines', i, tags=[endpoint_tag])
+        assert sorted(event['msg_text'] for event in aggregator.events) == sorted(payloads)
+
+    def test_serial_by_default(self, dd_run_check, mocker):
+        payloads = {'http://endpoint0': 'go_goroutines 1\n', 'http://endpoint1': 'go_goroutines 2\n'}
+        check = self.get_check({'openmetrics_endpoint': 'http://endpoint0'}, payloads, mocker)
+        prefetch_scrapers = mocker.spy(check, 'prefetch_scrapers')
+        dd_run_check(check)
+
+        assert prefetch_scrapers.call_count == 0
+
+    def test_error(self, aggregator, dd_run_check, mocker):
+        from requests.exceptions import ConnectionError
+
+        payloads = {
+            'http://endpoint0': '# TYPE go_goroutines gauge\ngo_goroutines 1\n',
+            'http://endpoint1': ConnectionError('refused'),
+        }
+        check = self.get_check({'openmetrics_endpoint': 'http://endpoint0', 'concurrent_scrapes': 2}, payloads, mocker)
+
+        with pytest.raises(Exception, match='There was an error scraping endpoint http://endpoint1: refused'):
+            dd_run_check(check, extract_message=True)
+
+        aggregator.assert_metric('test.go_goroutines', 1, tags=['endpoint:http://endpoint0'])
+        aggregator.assert_service_check(
+            'test.openmetrics.health', ServiceCheck.CRITICAL, tags=['endpoint:http://endpoint1'], message='refused'
+        )
+
+    def test_invalid(self, dd_run_check, mocker):
+        check = self.get_check({'openmetrics_endpoint': 'http://endpoint0', 'concurrent_scrapes': 0}, {}, mocker)
+
+        with pytest.raises(Exception, match='The setting `concurrent_scrapes` must be a positive integer'):
+            dd_run_check(check, extract_message=True)
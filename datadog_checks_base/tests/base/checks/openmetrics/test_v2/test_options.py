@@ -745,3 +745,143 @@ class TestIgnoreTags:
         )
 
         aggregator.assert_all_metrics_covered()
+
+
+class TestCacheSampleTags:
+    PAYLOAD = """
+        # HELP go_memstats_alloc_bytes Number of bytes allocated and still in use.
+        # TYPE go_memstats_alloc_bytes gauge
+        go_memstats_alloc_bytes{foo="bar",node="a"} 6.396288e+06
+        go_memstats_alloc_bytes{foo="baz",node="b"} 6.396288e+06
+        # HELP http_request_duration_seconds A histogram of the request duration.
+        # TYPE http_request_duration_seconds histogram
+        http_request_duration_seconds_bucket{le="1"} 2
+        http_request_duration_seconds_bucket{le="+Inf"} 3
+        http_request_duration_seconds_sum 4
+        http_request_duration_seconds_count 3
+        """
+
+    def assert_metrics(self, aggregator, *extra_tags):
+        tags = ['endpoint:test', *extra_tags]
+        aggregator.assert_metric('test.go_memstats_alloc_bytes', tags=tags + ['foo:bar'], hostname='a', count=1)
+        aggregator.assert_metric('test.go_memstats_alloc_bytes', count=0, tags=tags + ['foo:baz'])
+        aggregator.assert_metric('test.http_request_duration_seconds.bucket', 2, tags=tags + ['upper_bound:1.0'])
+        aggregator.assert_metric('test.http_request_duration_seconds.sum', 4, tags=tags)
+        aggregator.assert_metric('test.http_request_duration_seconds.count', 3, tags=tags)
+        aggregator.assert_all_metrics_covered()
+
+    def test_cached(self, aggregator, dd_run_check, mock_http_response):
+        mock_http_response(self.PAYLOAD)
+        check = get_check(
+            {
+                'metrics': ['.+'],
+                'cache_sample_tags': True,
+                'hostname_label': 'node',
+                'exclude_labels': ['node'],
+                'exclude_metrics_by_labels': {'foo': ['baz']},
+            }
+        )
+
+        for _ in range(3):
+            dd_run_check(check)
+            self.assert_metrics(aggregator)
+            aggregator.reset()
+
+        # The `_sum` and `_count` samples share the same label set
+        scraper = check.scrapers['test']
+        assert len(scraper.sample_tags_cache) == 5
+
+        check.set_dynamic_tags('bar:baz')
+        assert not scraper.sample_tags_cache
+
+        dd_run_check(check)
+        self.assert_metrics(aggregator, 'bar:baz')
+
+    def test_eviction(self, dd_run_check, mock_http_response):
+        mock_http_response(self.PAYLOAD)
+        check = get_check({'metrics': ['.+'], 'cache_sample_tags': True, 'sample_tags_cache_max_age': 2})
+        dd_run_check(check)
+
+        scraper = check.scrapers['test']
+        key = ('go_memstats_alloc_bytes', frozenset({'foo': 'bar', 'node': 'a'}.items()))
+        assert key in scraper.sample_tags_cache
+
+        mock_http_response(
+            """
+            # HELP go_memstats_alloc_bytes Number of bytes allocated and still in use.
+            # TYPE go_memstats_alloc_bytes gauge
+            go_memstats_alloc_bytes{foo="baz",node="b"} 6.396288e+06
+            """
+        )
+        dd_run_check(check)
+        dd_run_check(check)
+        dd_run_check(check)
+
+        assert key not in scraper.sample_tags_cache
+        assert len(scraper.sample_tags_cache) == 1
+
+    def test_size_limit(self, dd_run_check, mock_http_response):
+        mock_http_response(self.PAYLOAD)
+        check = get_check({'metrics': ['.+'], 'cache_sample_tags': True, 'sample_tags_cache_size': 2})
+        dd_run_check(check)
+
+        # The least recently used label sets are evicted
+        scraper = check.scrapers['test']
+        assert list(scraper.sample_tags_cache) == [
+            ('http_request_duration_seconds', frozenset({'le': '+Inf'}.items())),
+            ('http_request_duration_seconds', frozenset()),
+        ]
+
+        mock_http_response(
+            """
+            # HELP go_memstats_alloc_bytes Number of bytes allocated and still in use.
+            # TYPE go_memstats_alloc_bytes gauge
+            go_memstats_alloc_bytes{foo="qux",node="c"} 6.396288e+06
+            """
+        )
+        dd_run_check(check)
+
+        # New label sets are still cached once the cache is full
+        assert list(scraper.sample_tags_cache) == [
+            ('http_request_duration_seconds', frozenset()),
+            ('go_memstats_alloc_bytes', frozenset({'foo': 'qux', 'node': 'c'}.items())),
+        ]
+
+    def test_shared_labels_not_cached_until_collected(self, aggregator, dd_run_check, mock_http_response):
+        mock_http_response(self.PAYLOAD)
+        check = get_check(
+            {
+                'metrics': ['.+'],
+                'cache_sample_tags': True,
+                'share_labels': {'http_request_duration_seconds': {'labels': ['le'], 'values': [3]}},
+            }
+        )
+        dd_run_check(check)
+
+        scraper = check.scrapers['test']
+        assert not scraper.sample_tags_cache
+
+        aggregator.reset()
+        dd_run_check(check)
+        aggregator.assert_metric(
+            'test.go_memstats_alloc_bytes', tags=['endpoint:test', 'foo:bar', 'node:a', 'le:+Inf'], count=1
+        )
+        assert len(scraper.sample_tags_cache) == 5
+
+    def test_telemetry(self, aggregator, dd_run_check, mock_http_response):
+        mock_http_response(self.PAYLOAD)
+        check = get_check({'metrics': ['.+'], 'cache_sample_tags': True, 'telemetry': True})
+        dd_run_check(check)
+        dd_run_check(check)
+
+        # Count values are aggregated across runs
+        aggregator.assert_metric('test.telemetry.sample_tags_cache.misses.count', 5, tags=['endpoint:test'])
+        aggregator.assert_metric('test.telemetry.sample_tags_cache.hits.count', 7, tags=['endpoint:test'])
+        aggregator.assert_metric('test.telemetry.sample_tags_cache.size', 5, tags=['endpoint:test'], count=2)
+
+    @pytest.mark.parametrize('option', ['sample_tags_cache_size', 'sample_tags_cache_max_age'])
+    def test_invalid_size(self, dd_run_check, option):
+        check = get_check({'metrics': ['.+'], option: 0})
+
+        with pytest.raises(Exception, match=f'Setting `{option}` must be a positive integer'):
+            dd_run_check(check, extract_message=True)
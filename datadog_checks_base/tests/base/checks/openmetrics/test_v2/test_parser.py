@@ -0,0 +1,176 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+import os
+from io import StringIO
+from textwrap import dedent
+
+import pytest
+from prometheus_client.parser import text_fd_to_metric_families
+
+from datadog_checks.base.checks.openmetrics.v2.parser import iter_chunk_lines, text_lines_to_metric_families
+from datadog_checks.dev import get_here
+from datadog_checks.dev.testing import requires_py3
+
+from .utils import get_check
+
+pytestmark = [requires_py3]
+
+HERE = get_here()
+FIXTURE_PATH = os.path.abspath(os.path.join(os.path.dirname(HERE), '..', '..', '..', 'fixtures', 'prometheus'))
+
+PAYLOAD = dedent(
+    """
+    # HELP go_memstats_alloc_bytes Number of bytes allocated and still in use.
+    # TYPE go_memstats_alloc_bytes gauge
+    go_memstats_alloc_bytes 6.396288e+06
+    # HELP http_requests_total The total number of HTTP requests.
+    # TYPE http_requests_total counter
+    http_requests_total{method="post",code="200"} 1027 1395066363000
+    http_requests_total{method="post",code="400"}    3 1395066363000
+    # TYPE http_errors counter
+    http_errors{code="500"} 3
+    # HELP msdos_file_access_time_seconds Escaped \\\\ help\\n text.
+    msdos_file_access_time_seconds{path="C:\\\\DIR\\\\FILE.TXT",error="No such file:\\n\\"FILE.TXT\\""} 1.458255915e9
+    metric_without_timestamp_and_labels 12.47
+    # TYPE rpc_duration_seconds summary
+    rpc_duration_seconds{quantile="0.5"} 4773
+    rpc_duration_seconds{quantile="0.99"} 76656
+    rpc_duration_seconds_sum 1.7560473e+07
+    rpc_duration_seconds_count 2693
+    # TYPE http_request_duration_seconds histogram
+    http_request_duration_seconds_bucket{le="0.05", url="/a=b"} 24054
+    http_request_duration_seconds_bucket{le="+Inf",url="/a=b",} 144320
+    http_request_duration_seconds_sum{url="/a=b"} 53423
+    http_request_duration_seconds_count{url="/a=b"} 144320
+    process_open_fds	15
+    nan_metric{foo="}"} NaN
+    """
+)
+
+
+def parse_reference(text):
+    return [
+        (metric.name, metric.documentation, metric.type, metric.samples)
+        for metric in text_fd_to_metric_families(StringIO(text))
+    ]
+
+
+def parse_fast(text, **kwargs):
+    return [
+        (metric.name, metric.documentation, metric.type, metric.samples)
+        for metric in text_lines_to_metric_families(text.splitlines(), **kwargs)
+    ]
+
+
+def get_submitted_metrics(aggregator):
+    return sorted(
+        (stub.name, stub.type, stub.value, tuple(sorted(stub.tags)), stub.hostname)
+        for name in aggregator.metric_names
+        for stub in aggregator.metrics(name)
+    )
+
+
+def assert_same_families(actual, expected):
+    # NaN never compares equal
+    assert repr(actual) == repr(expected)
+
+
+class TestParity:
+    def test_payload(self):
+        assert_same_families(parse_fast(PAYLOAD), parse_reference(PAYLOAD))
+
+    def test_payload_exclude_nothing(self):
+        assert_same_families(parse_fast(PAYLOAD, exclude=lambda name: False), parse_reference(PAYLOAD))
+
+    @pytest.mark.parametrize('fixture', ['ksm.txt', 'metrics.txt', 'amazon_msk_jmx_metrics.txt'])
+    def test_fixture(self, fixture):
+        with open(os.path.join(FIXTURE_PATH, fixture)) as f:
+            text = f.read()
+
+        assert_same_families(parse_fast(text), parse_reference(text))
+
+    def test_invalid_labels(self):
+        with pytest.raises(ValueError):
+            parse_fast('foo{bar=baz} 1')
+
+
+class TestExclude:
+    def test_families_skipped(self):
+        excluded = []
+        families = parse_fast(
+            PAYLOAD,
+            exclude=lambda name: name in ('http_requests', 'rpc_duration_seconds', 'process_open_fds'),
+            on_exclude=excluded.append,
+        )
+
+        names = [name for name, _, _, _ in families]
+        assert 'http_requests' not in names
+        assert 'rpc_duration_seconds' not in names
+        assert 'process_open_fds' not in names
+        assert 'http_errors' in names
+        assert excluded == [2, 4, 1]
+
+    def test_excluded_samples_not_tokenized(self):
+        # Labels of excluded families are never parsed, so invalid ones are not an issue
+        families = parse_fast('# TYPE foo gauge\nfoo{bar=baz} 1\nbar 2', exclude=lambda name: name == 'foo')
+
+        assert [name for name, _, _, _ in families] == ['bar']
+
+
+class TestChunkLines:
+    def test_boundaries(self):
+        data = 'foo{bar="ö"} 1\nbaz 2\n\nqux 3'.encode('utf-8')
+        chunks = [data[i : i + 3] for i in range(0, len(data), 3)]
+
+        assert list(iter_chunk_lines(chunks)) == ['foo{bar="ö"} 1', 'baz 2', '', 'qux 3']
+
+    def test_trailing_newline(self):
+        assert list(iter_chunk_lines([b'foo 1\n', b'bar 2\n'])) == ['foo 1', 'bar 2']
+
+
+class TestScraper:
+    def test_default(self, aggregator, dd_run_check, mock_http_response):
+        mock_http_response(PAYLOAD)
+        check = get_check({'metrics': ['.+'], 'use_fast_parser': True, 'exclude_metrics': ['http_errors']})
+        dd_run_check(check)
+
+        aggregator.assert_metric('test.go_memstats_alloc_bytes', 6396288, tags=['endpoint:test'])
+        aggregator.assert_metric('test.http_requests.count', 1027, tags=['endpoint:test', 'method:post', 'code:200'])
+        aggregator.assert_metric('test.rpc_duration_seconds.count', 2693, tags=['endpoint:test'])
+        aggregator.assert_metric('test.http_errors.count', count=0)
+
+    def test_same_metrics(self, aggregator, dd_run_check, mock_http_response):
+        mock_http_response(file_path=os.path.join(FIXTURE_PATH, 'ksm.txt'))
+        dd_run_check(get_check({'metrics': ['.+']}))
+        expected = get_submitted_metrics(aggregator)
+        aggregator.reset()
+
+        dd_run_check(get_check({'metrics': ['.+'], 'use_fast_parser': True}))
+        actual = get_submitted_metrics(aggregator)
+
+        assert actual == expected
+
+    def test_telemetry(self, aggregator, dd_run_check, mock_http_response):
+        mock_http_response(PAYLOAD)
+        check = get_check(
+            {'metrics': ['.+'], 'use_fast_parser': True, 'telemetry': True, 'exclude_metrics': ['rpc_.+']}
+        )
+        dd_run_check(check)
+
+        aggregator.assert_metric('test.telemetry.metrics.ignored.count', 4, tags=['endpoint:test'])
+
+    def test_shared_labels_not_skipped(self, aggregator, dd_run_check, mock_http_response):
+        mock_http_response(PAYLOAD)
+        check = get_check(
+            {
+                'metrics': ['.+'],
+                'use_fast_parser': True,
+                'exclude_metrics': ['http_errors'],
+                'share_labels': {'http_errors': {'labels': ['code']}},
+            }
+        )
+        dd_run_check(check)
+
+        aggregator.assert_metric('test.rpc_duration_seconds.count', 2693, tags=['endpoint:test', 'code:500'])
+        aggregator.assert_metric('test.http_errors.count', count=0)
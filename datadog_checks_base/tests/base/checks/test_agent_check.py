@@ -455,6 +455,114 @@ class TestMetrics:
         aggregator.assert_metric(metric_name, count=0)
 
 
+class TestSubmitMetrics:
+    def test_equivalent(self, aggregator):
+        check = AgentCheck()
+        check.__NAMESPACE__ = 'test'
+        tags = ['foo:bar', b'bar:baz', None]
+
+        check.gauge('gauge', 1, tags=tags)
+        check.count('count', 2, tags=tags, hostname='host')
+        check.monotonic_count('monotonic_count', 3, tags=tags, flush_first_value=True)
+        check.rate('rate', 4)
+        check.histogram('histogram', 5, tags=tags)
+        expected = [(name, aggregator.metrics(name)) for name in sorted(aggregator.metric_names)]
+        aggregator.reset()
+
+        check.submit_metrics(
+            [
+                (aggregator.GAUGE, 'gauge', 1, tags, None),
+                (aggregator.COUNT, 'count', 2, tags, 'host'),
+                (aggregator.MONOTONIC_COUNT, 'monotonic_count', 3, tags, None),
+                (aggregator.RATE, 'rate', 4, None, None),
+                (aggregator.HISTOGRAM, 'histogram', 5, tags, None),
+            ],
+            flush_first_value=True,
+        )
+
+        assert [(name, aggregator.metrics(name)) for name in sorted(aggregator.metric_names)] == expected
+
+    def test_generator(self, aggregator):
+        check = AgentCheck()
+
+        check.submit_metrics((aggregator.GAUGE, 'metric', i, ['index:{}'.format(i)], None) for i in range(3))
+
+        for i in range(3):
+            aggregator.assert_metric('metric', i, tags=['index:{}'.format(i)], count=1)
+
+    def test_raw(self, aggregator):
+        check = AgentCheck()
+        check.__NAMESPACE__ = 'test'
+
+        check.submit_metrics([(aggregator.GAUGE, 'metric', 0, None, None)])
+        check.submit_metrics([(aggregator.GAUGE, 'metric', 0, None, None)], raw=True)
+
+        aggregator.assert_metric('test.metric', count=1)
+        aggregator.assert_metric('metric', count=1)
+
+    def test_namespace_change(self, aggregator):
+        check = AgentCheck()
+
+        check.submit_metrics([(aggregator.GAUGE, 'metric', 0, None, None)])
+        check.__NAMESPACE__ = 'test'
+        check.submit_metrics([(aggregator.GAUGE, 'metric', 0, None, None)])
+
+        aggregator.assert_metric('metric', count=1)
+        aggregator.assert_metric('test.metric', count=1)
+
+    def test_none_value(self, aggregator):
+        check = AgentCheck()
+
+        check.submit_metrics([(aggregator.GAUGE, 'metric', None, None, None)])
+
+        aggregator.assert_metric('metric', count=0)
+
+    def test_metric_patterns(self, aggregator):
+        check = AgentCheck('test', {}, [{'metric_patterns': {'exclude': ['^excluded$']}}])
+
+        for _ in range(2):
+            check.submit_metrics(
+                [
+                    (aggregator.GAUGE, 'excluded', 0, None, None),
+                    (aggregator.GAUGE, 'included', 0, None, None),
+                ]
+            )
+
+        aggregator.assert_metric('excluded', count=0)
+        aggregator.assert_metric('included', count=2)
+
+    def test_tags_normalized_once(self, aggregator):
+        check = AgentCheck()
+        tags = [b'foo:bar']
+
+        with mock.patch.object(check, '_normalize_tags_type', wraps=check._normalize_tags_type) as normalize:
+            check.submit_metrics(
+                [
+                    (aggregator.GAUGE, 'metric1', 0, tags, None),
+                    (aggregator.GAUGE, 'metric2', 0, tags, None),
+                    (aggregator.GAUGE, 'metric3', 0, list(tags), None),
+                ]
+            )
+
+        assert normalize.call_count == 2
+        for name in ('metric1', 'metric2', 'metric3'):
+            aggregator.assert_metric(name, tags=['foo:bar'], count=1)
+
+    def test_non_float_metric(self, aggregator):
+        check = AgentCheck()
+
+        with pytest.raises(ValueError):
+            check.submit_metrics([(aggregator.GAUGE, 'metric', '85k', None, None)])
+
+    def test_metric_limit(self, aggregator):
+        check = LimitedCheck()
+
+        check.submit_metrics((aggregator.GAUGE, 'metric', 0, None, None) for _ in range(20))
+
+        assert len(check.get_warnings()) == 1
+        assert len(aggregator.metrics('metric')) == 10
+
+
 class TestEvents:
     def test_valid_event(self, aggregator):
         check = AgentCheck()
@@ -632,6 +740,45 @@ class TestLogSubmission:
         )
         assert check.get_log_cursor() is None
 
+    def test_batch(self, datadog_agent):
+        check = AgentCheck('check_name', {}, [{'tags': ['foo:bar']}])
+        check.check_id = 'test'
+        records = [
+            ({'message': str(i), 'timestamp': 1722958617.2842212}, {'data': str(i)} if i != 4 else None)
+            for i in range(5)
+        ]
+
+        with mock.patch.object(check, 'write_persistent_cache', wraps=check.write_persistent_cache) as write:
+            assert check.send_logs(iter(records), stream='stream1', batch_size=2) == 5
+
+        datadog_agent.assert_logs(
+            check.check_id,
+            [{'message': str(i), 'timestamp': 1722958617284, 'ddtags': 'foo:bar'} for i in range(5)],
+        )
+        # Only the last cursor of each batch is saved, the last batch has no cursor
+        assert [c[0][1] for c in write.call_args_list] == ['{"data":"1"}', '{"data":"3"}']
+        assert check.get_log_cursor(stream='stream1') == {'data': '3'}
+
+    def test_batch_error(self, datadog_agent):
+        check = AgentCheck('check_name', {}, [{}])
+        check.check_id = 'test'
+
+        def records():
+            yield {'message': 'foo'}, {'data': '1'}
+            yield {'message': 'bar'}, {'data': '2'}
+            raise Exception('stream closed')
+
+        with pytest.raises(Exception, match='stream closed'):
+            check.send_logs(records(), batch_size=1)
+        assert check.get_log_cursor() == {'data': '2'}
+
+        with mock.patch.object(
+            datadog_agent, 'send_log', side_effect=[None, Exception('agent stopped')]
+        ), pytest.raises(Exception, match='agent stopped'):
+            check.send_logs([({'message': 'foo'}, {'data': '3'}), ({'message': 'bar'}, {'data': '4'})])
+        # The cursor of the log that was sent before the error is saved
+        assert check.get_log_cursor() == {'data': '3'}
+
 
 class TestLogsEnabledDetection:
     def test_default(self, datadog_agent):
@@ -1020,6 +1167,75 @@ class TestLimits:
         aggregator.assert_metric('datadog.agent.metrics.contexts.total', 5)
 
 
+class TestNormalizationCache:
+    def test_memoized(self):
+        check = AgentCheck()
+
+        with mock.patch.object(check, '_normalize_uncached', wraps=check._normalize_uncached) as normalize:
+            for _ in range(3):
+                assert check.normalize('Foo Bar', prefix='prefix', fix_case=True) == 'prefix.foo_bar'
+
+        assert normalize.call_count == 1
+
+    def test_memoized_tag(self):
+        check = AgentCheck()
+
+        with mock.patch.object(check, '_normalize_tag_uncached', wraps=check._normalize_tag_uncached) as normalize:
+            for _ in range(3):
+                assert check.normalize_tag('foo-bar') == 'foo_bar'
+
+        assert normalize.call_count == 1
+
+    def test_namespace_change(self):
+        check = AgentCheck()
+
+        assert check._format_namespace('metric') == 'metric'
+        check.__NAMESPACE__ = 'test'
+        assert check._format_namespace('metric') == 'test.metric'
+
+    def test_size(self):
+        check = AgentCheck('test', {'metric_name_cache_size': 2, 'tag_cache_size': 1}, [{}])
+
+        for name in ('a', 'b', 'c'):
+            check.normalize(name)
+            check.normalize_tag(name)
+
+        assert len(check._normalize_cache) == 2
+        assert len(check._normalize_tag_cache) == 1
+
+    def test_disabled(self):
+        check = AgentCheck('test', {'metric_name_cache_size': 0, 'tag_cache_size': 0}, [{}])
+
+        assert check._get_normalization_caches() == []
+        assert check.normalize('foo-bar') == 'foo_bar'
+        assert check.normalize_tag('foo-bar') == 'foo_bar'
+        assert check.convert_to_underscore_separated('FooBar') == b'foo_bar'
+        assert check._format_namespace('foo') == 'foo'
+
+    @pytest.mark.parametrize('size', [-1, 'foo'])
+    def test_invalid_size(self, size):
+        check = AgentCheck('test', {'tag_cache_size': size}, [{}])
+
+        assert check._normalize_tag_cache.max_size == AgentCheck.DEFAULT_TAG_CACHE_SIZE
+        assert len(check.get_warnings()) == 1
+
+    def test_debug_metrics(self, aggregator, dd_run_check):
+        class TestCheck(AgentCheck):
+            def check(self, _):
+                for _ in range(4):
+                    self.normalize_tag('foo-bar')
+
+        check = TestCheck('test', {}, [{'debug_metrics': {'normalization_cache': True}}])
+        dd_run_check(check)
+
+        tags = check.get_debug_metric_tags() + ['cache:normalize_tag']
+        aggregator.assert_metric('datadog.agent.metrics.cache.hits', 3, tags=tags)
+        aggregator.assert_metric('datadog.agent.metrics.cache.misses', 1, tags=tags)
+        aggregator.assert_metric('datadog.agent.metrics.cache.hit_rate', 0.75, tags=tags)
+        aggregator.assert_metric('datadog.agent.metrics.cache.size', 1, tags=tags)
+        aggregator.assert_metric('datadog.agent.metrics.cache.limit', AgentCheck.DEFAULT_TAG_CACHE_SIZE, tags=tags)
+
+
 class TestCheckInitializations:
     def test_success_only_once(self):
         class TestCheck(AgentCheck):
@@ -0,0 +1,42 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+import pytest
+
+from datadog_checks.base import AgentCheck
+
+# JMX/WMI-style names, as seen on every run of such checks
+METRIC_NAMES = [
+    'BrokerTopicMetrics.{}PerSec.Topic{}-{}'.format(attribute, i // 10, i % 10)
+    for attribute in ('MessagesIn', 'BytesIn', 'BytesOut', 'FailedFetchRequests', 'TotalProduceRequests')
+    for i in range(500)
+]
+TAGS = ['topic:Topic{}-{}'.format(i // 10, i % 10) for i in range(500)] + ['partition:{}'.format(i) for i in range(500)]
+
+
+@pytest.fixture(params=[True, False], ids=['memoized', 'uncached'])
+def check(request):
+    size = AgentCheck.DEFAULT_METRIC_NAME_CACHE_SIZE if request.param else 0
+    return AgentCheck('test', {'metric_name_cache_size': size, 'tag_cache_size': size}, [{}])
+
+
+def test_normalize(benchmark, check):
+    normalize = check.normalize
+
+    def run():
+        for name in METRIC_NAMES:
+            normalize(name, prefix='kafka', fix_case=True)
+
+    run()
+    benchmark(run)
+
+
+def test_normalize_tag(benchmark, check):
+    normalize_tag = check.normalize_tag
+
+    def run():
+        for tag in TAGS:
+            normalize_tag(tag)
+
+    run()
+    benchmark(run)
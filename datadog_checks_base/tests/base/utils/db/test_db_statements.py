@@ -302,3 +302,40 @@ class TestStatementMetrics:
     def test_compute_derivative_rows_benchmark(self, benchmark):
         sm = StatementMetrics()
         benchmark(self.__run_compute_derivative_rows, sm)
+
+    def test_compute_derivative_rows_50k_benchmark(self, benchmark):
+        metrics = ['calls', 'total_time', 'rows', 'shared_blks_hit', 'shared_blks_read', 'temp_blks_written']
+
+        def generate_rows(increment):
+            rows = []
+            for i in range(50000):
+                row = {
+                    'query': 'SELECT * FROM table{} WHERE id = ?'.format(i),
+                    'query_signature': 'sig{}'.format(i),
+                    'db': 'db{}'.format(i % 5),
+                    'user': 'dog',
+                }
+                # Only 10% of the statements run between check runs
+                value = i * 10 + (increment if i % 10 == 0 else 0)
+                for j, metric in enumerate(metrics):
+                    row[metric] = value + j
+
+                rows.append(row)
+
+            return rows
+
+        def key(row):
+            return row['query_signature'], row['db'], row['user']
+
+        first_rows = generate_rows(0)
+        second_rows = generate_rows(1)
+
+        def setup():
+            sm = StatementMetrics()
+            sm.compute_derivative_rows([dict(row) for row in first_rows], metrics, key)
+            return (sm, [dict(row) for row in second_rows]), {}
+
+        def run(sm, rows):
+            assert len(sm.compute_derivative_rows(rows, metrics, key)) == 5000
+
+        benchmark.pedantic(run, setup=setup, rounds=5)
@@ -3,6 +3,7 @@
 # Licensed under a 3-clause BSD style license (see LICENSE)
 import time
 
+import mock
 import pytest
 
 from datadog_checks.base import AgentCheck
@@ -154,6 +155,35 @@ class TestQueryExecutor:
         for i in range(num_queries):
             aggregator.assert_metric('test.metric.{}'.format(i), i, metric_type=aggregator.GAUGE, tags=tags)
 
+    def test_batched_submissions(self, aggregator):
+        """Test that metric samples of a query are submitted at once"""
+        queries = [
+            {
+                'name': 'query1',
+                'query': 'select 1',
+                'columns': [
+                    {'name': 'test.gauge', 'type': 'gauge'},
+                    {'name': 'test.count', 'type': 'monotonic_count'},
+                    {'name': 'test', 'type': 'service_check', 'status_map': {'1': 'OK'}},
+                ],
+            }
+        ]
+
+        check = AgentCheck('test', {}, [{}])
+        qe = QueryExecutor(mock_executor([[1, 2, '1'], [3, 4, '1']]), check, queries, tags=['foo:bar'])
+        qe.compile_queries()
+        with mock.patch.object(check, 'submit_metrics', wraps=check.submit_metrics) as submit_metrics:
+            qe.execute()
+
+        assert submit_metrics.call_count == 1
+        assert qe.submission_batches == {False: [], True: []}
+        aggregator.assert_metric('test.gauge', 1, metric_type=aggregator.GAUGE, tags=['foo:bar'])
+        aggregator.assert_metric('test.gauge', 3, metric_type=aggregator.GAUGE, tags=['foo:bar'])
+        aggregator.assert_metric('test.count', 2, metric_type=aggregator.MONOTONIC_COUNT, tags=['foo:bar'])
+        aggregator.assert_metric('test.count', 4, metric_type=aggregator.MONOTONIC_COUNT, tags=['foo:bar'])
+        aggregator.assert_service_check('test', AgentCheck.OK, tags=['foo:bar'], count=2)
+        aggregator.assert_all_metrics_covered()
+
     def test_query_with_collection_interval(self, aggregator):
         """Test running a query with a custom collection interval"""
         collection_interval = 1
@@ -2,11 +2,14 @@
 # All rights reserved
 # Licensed under a 3-clause BSD style license (see LICENSE)
 import logging
+import os
+import sys
 
 import pytest
 
 from datadog_checks.base import AgentCheck
 from datadog_checks.base.constants import ServiceCheck
+from datadog_checks.base.utils.replay.execute import WORKERS
 from datadog_checks.dev.testing import requires_py3
 
 pytestmark = [requires_py3]
@@ -30,6 +33,9 @@ class ReplayCheck(AgentCheck):
         self.log.debug('Initializing - %s - %s', self.name, self.check_id)
 
     def check(self, _):
+        if self.instance.get('crash'):
+            os._exit(1)
+
         self.gauge('metric', 0, tags=self.tags)
         self.service_check('sc', ServiceCheck.OK if self.redirecting else ServiceCheck.CRITICAL, tags=self.tags)
 
@@ -65,3 +71,68 @@ def test_replay_all(caplog, dd_run_check, aggregator, datadog_agent, init_config
             break
     else:
         raise AssertionError('Expected DEBUG log with message: {}'.format(expected_message))
+
+
+@pytest.fixture
+def persistent_check(datadog_agent):
+    datadog_agent._config['log_level'] = 'debug'
+
+    def create_check(**options):
+        instance = {'process_isolation': True, 'process_isolation_persistent': True, 'tags': ['foo:bar']}
+        instance.update(options)
+        check = ReplayCheck('replay', {}, [instance])
+        check.check_id = 'test:123'
+        return check
+
+    yield create_check
+
+    for worker in list(WORKERS.values()):
+        worker.stop()
+
+
+def test_persistent_worker_reused(dd_run_check, aggregator, persistent_check):
+    check = persistent_check()
+
+    dd_run_check(check)
+    worker = WORKERS[check]
+    dd_run_check(check)
+    dd_run_check(check)
+
+    assert WORKERS[check] is worker
+    assert worker.running
+
+    expected_tags = ['redirecting:true', 'foo:bar']
+    aggregator.assert_metric('replay.initialize', 0, count=1, tags=expected_tags)
+    aggregator.assert_metric('replay.metric', 0, count=3, tags=expected_tags)
+    aggregator.assert_service_check('replay.sc', ServiceCheck.OK, count=3, tags=expected_tags)
+    aggregator.assert_all_metrics_covered()
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='The peak memory usage is only reported on POSIX systems')
+def test_persistent_worker_memory_limit(dd_run_check, aggregator, persistent_check):
+    check = persistent_check(process_isolation_max_memory=1)
+
+    dd_run_check(check)
+
+    assert check not in WORKERS
+    aggregator.assert_metric('replay.metric', 0, count=1)
+
+
+def test_persistent_worker_crash(caplog, dd_run_check, aggregator, persistent_check):
+    check = persistent_check(crash=True)
+
+    dd_run_check(check)
+
+    assert check not in WORKERS
+    assert 'The persistent isolated process with pid' in caplog.text
+    aggregator.assert_metric('replay.initialize', 0, count=1)
+    aggregator.assert_metric('replay.metric', count=0)
+
+
+def test_persistent_worker_disabled_as_string(dd_run_check, aggregator, persistent_check):
+    check = persistent_check(process_isolation_persistent='false')
+
+    dd_run_check(check)
+
+    assert check not in WORKERS
+    aggregator.assert_metric('replay.metric', 0, count=1)
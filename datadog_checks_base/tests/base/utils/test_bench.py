@@ -0,0 +1,47 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+import logging
+
+import pytest
+
+from datadog_checks.base.utils.tailfile import TailFile
+
+LINES = 100000
+# Nagios service perfdata, as tailed by the Nagios check
+PERFDATA_LINE = (
+    'DATATYPE::SERVICEPERFDATA\tTIMET::1722958617\tHOSTNAME::db{}.example.com\tSERVICEDESC::Current Load\t'
+    'SERVICEPERFDATA::load1=0.06;5.000;10.000;0; load5=0.09;4.000;6.000;0; load15=0.10;3.000;4.000;0;\t'
+    'SERVICECHECKCOMMAND::check_load\tSERVICESTATE::OK\tSERVICESTATETYPE::HARD\n'
+)
+
+
+@pytest.fixture
+def perfdata_file(tmp_path):
+    path = str(tmp_path / 'service-perfdata')
+    with open(path, 'w') as f:
+        for i in range(LINES):
+            f.write(PERFDATA_LINE.format(i))
+    return path
+
+
+def _record_throughput(benchmark):
+    # There are no statistics when benchmarks are disabled
+    if benchmark.stats:
+        benchmark.extra_info['lines_per_second'] = int(LINES / benchmark.stats.stats.mean)
+
+
+@pytest.mark.parametrize('line_by_line', [False, True], ids=['bulk', 'line_by_line'])
+def test_tail_file(benchmark, perfdata_file, line_by_line):
+    log = logging.getLogger(__name__)
+
+    def run():
+        parsed = []
+        tailer = TailFile(log, perfdata_file, lambda line: parsed.append(line) or True)
+        gen = tailer.tail(line_by_line=line_by_line, move_end=False)
+        while len(parsed) < LINES:
+            next(gen)
+        tailer.close()
+
+    benchmark(run)
+    _record_throughput(benchmark)
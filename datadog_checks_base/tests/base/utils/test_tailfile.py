@@ -0,0 +1,119 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+import logging
+import os
+
+import pytest
+
+from datadog_checks.base.utils.tailfile import TailFile
+
+log = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    return str(tmp_path / 'nagios.log')
+
+
+def write(path, data, mode='ab'):
+    with open(path, mode) as f:
+        f.write(data)
+
+
+def tail(path, line_by_line=False, move_end=False):
+    lines = []
+
+    def callback(line):
+        lines.append(line)
+        return True
+
+    return TailFile(log, path, callback).tail(line_by_line=line_by_line, move_end=move_end), lines
+
+
+def test_read_whole_file(log_file):
+    write(log_file, b'foo\r\nbar\n\x00\x00baz\nqux')
+    gen, lines = tail(log_file)
+
+    next(gen)
+    # The last line is incomplete
+    assert lines == ['foo', 'bar', 'baz']
+
+    write(log_file, b'\n')
+    next(gen)
+    assert lines == ['foo', 'bar', 'baz', 'qux']
+
+
+def test_move_end(log_file):
+    write(log_file, b'foo\n')
+    gen, lines = tail(log_file, move_end=True)
+
+    next(gen)
+    assert lines == []
+
+    write(log_file, b'bar\n')
+    next(gen)
+    assert lines == ['bar']
+
+
+def test_line_by_line(log_file):
+    write(log_file, b'foo\nbar\n')
+    gen, lines = tail(log_file, line_by_line=True)
+
+    next(gen)
+    assert lines == ['foo']
+    next(gen)
+    assert lines == ['foo', 'bar']
+
+
+def test_large_file(log_file):
+    expected = ['line {}'.format(i) for i in range(50000)]
+    write(log_file, '\n'.join(expected).encode('utf-8') + b'\n')
+    gen, lines = tail(log_file)
+
+    next(gen)
+    assert lines == expected
+
+
+def test_rotation(log_file):
+    write(log_file, b'foo\n')
+    gen, lines = tail(log_file)
+    next(gen)
+
+    write(log_file, b'bar\n')
+    os.rename(log_file, log_file + '.1')
+    write(log_file, b'baz\n')
+    next(gen)
+    # The end of the rotated file is read before the new file
+    assert lines == ['foo', 'bar', 'baz']
+
+
+def test_truncation(log_file):
+    write(log_file, b'foo\nbar\n')
+    gen, lines = tail(log_file)
+    next(gen)
+
+    write(log_file, b'baz\n', mode='wb')
+    next(gen)
+    assert lines == ['foo', 'bar', 'baz']
+
+
+def test_copytruncate(log_file):
+    write(log_file, b'first line of the file\n')
+    gen, lines = tail(log_file)
+    next(gen)
+
+    # The file is truncated and more data than before is written before the next read
+    write(log_file, b'other line of the file\nqux\n', mode='wb')
+    next(gen)
+    assert lines == ['first line of the file', 'other line of the file', 'qux']
+
+
+def test_removed_file(log_file):
+    write(log_file, b'foo\n')
+    gen, lines = tail(log_file)
+    next(gen)
+
+    os.remove(log_file)
+    with pytest.raises(Exception):
+        next(gen)
@@ -13,6 +13,7 @@ from six import PY2, PY3
 from datadog_checks.base.utils.common import ensure_bytes, ensure_unicode, pattern_filter, round_value, to_native_string
 from datadog_checks.base.utils.containers import hash_mutable, iter_unique
 from datadog_checks.base.utils.limiter import Limiter
+from datadog_checks.base.utils.lru import LRUCache
 from datadog_checks.base.utils.secrets import SecretsSanitizer
 
 
@@ -118,6 +119,38 @@ class TestLimiter:
         assert limiter.get_status() == (1, 10, False)
 
 
+class TestLRUCache:
+    def test_eviction(self):
+        cache = LRUCache('test', 2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+
+        # Make `b` the least recently used entry
+        assert cache.get('a') == 1
+        cache.set('c', 3)
+
+        assert len(cache) == 2
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+
+    def test_debug_metrics(self):
+        cache = LRUCache('test', 10)
+        cache.get('a')
+        cache.set('a', 1)
+        for _ in range(3):
+            cache.get('a')
+
+        assert dict(cache.get_debug_metrics()) == {
+            'datadog.agent.metrics.cache.hits': 3,
+            'datadog.agent.metrics.cache.misses': 1,
+            'datadog.agent.metrics.cache.hit_rate': 0.75,
+            'datadog.agent.metrics.cache.size': 1,
+            'datadog.agent.metrics.cache.limit': 10,
+        }
+        assert dict(cache.get_debug_metrics())['datadog.agent.metrics.cache.hit_rate'] == 0
+
+
 class TestRounding:
     def test_round_half_up(self):
         assert round_value(3.5) == 4.0
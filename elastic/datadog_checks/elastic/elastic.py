@@ -8,10 +8,11 @@ from copy import deepcopy
 from itertools import product
 
 import requests
-from six import iteritems, itervalues
+from six import iteritems, itervalues, string_types
 from six.moves.urllib.parse import urljoin, urlparse
 
 from datadog_checks.base import AgentCheck, is_affirmative, to_string
+from datadog_checks.base.utils.serialization import from_json
 
 from .config import from_instance
 from .metrics import (
@@ -29,6 +30,22 @@ from .metrics import (
 
 REGEX = r'(?<!\\)\.'  # This regex string is used to traverse through nested dictionaries for JSON responses
 
+# Elasticsearch rejects requests whose first line is longer than 4kB by default
+# https://www.elastic.co/guide/en/elasticsearch/reference/current/modules-network.html#http-settings
+MAX_FILTER_PATH_LENGTH = 2048
+
+# Columns of the `_cat/indices` API used by the index metrics
+CAT_INDICES_COLUMNS = ('index', 'health', 'pri', 'rep', 'docs.count', 'docs.deleted', 'store.size', 'pri.store.size')
+
+# Fields of the pending tasks used by the pending tasks metrics
+PENDING_TASKS_PATHS = ('tasks.priority', 'tasks.time_in_queue_millis')
+
+# Fields of the nodes used to tag their metrics
+NODE_TAG_PATHS = ('nodes.*.name', 'nodes.*.host', 'nodes.*.hostname')
+
+# Paths already split into their keys
+COMPILED_PATHS = {}
+
 DatadogESHealth = namedtuple('DatadogESHealth', ['status', 'reverse_status', 'tag'])
 ES_HEALTH_TO_DD_STATUS = {
     'green': DatadogESHealth(AgentCheck.OK, AgentCheck.CRITICAL, 'OK'),
@@ -71,23 +88,68 @@ def get_dynamic_tags(columns):
     return dynamic_tags
 
 
+def compile_path(path):
+    """
+    Split a dotted path into the keys to traverse, dots escaped with a backslash being part of the keys.
+    """
+    keys = COMPILED_PATHS.get(path)
+    if keys is None:
+        keys = COMPILED_PATHS[path] = tuple(key.replace('\\', '') for key in re.split(REGEX, path))
+
+    return keys
+
+
 def get_value_from_path(value, path):
     result = value
 
     # Traverse the nested dictionaries
-    for key in re.split(REGEX, path):
-        if result is not None:
-            key = key.replace('\\', '')
-            if key.isdigit() and isinstance(result, list):
-                result = result[int(key)]
-            else:
-                result = result.get(key)
-        else:
+    for key in compile_path(path) if isinstance(path, string_types) else path:
+        if result is None:
             break
 
+        if isinstance(result, list) and key.isdigit():
+            result = result[int(key)]
+        else:
+            result = result.get(key)
+
     return result
 
 
+def compile_metrics(metrics):
+    """
+    Turn a metrics definition into a list of (datadog_metric_name, datadog_metric_type, keys, conversion_func).
+    """
+    return [
+        (metric, desc[0], compile_path(desc[1]), desc[2] if len(desc) > 2 else None)
+        for metric, desc in iteritems(metrics)
+    ]
+
+
+def get_filter_path(paths, max_length=MAX_FILTER_PATH_LENGTH):
+    """
+    Build the `filter_path` parameter restricting a response to the given paths.
+
+    The paths are shortened to their common prefixes until the parameter fits in `max_length`. Return None
+    if that's not possible or if a key contains a dot, which `filter_path` can't express.
+    """
+    paths = [compile_path(path) if isinstance(path, string_types) else path for path in paths]
+    if not paths or any('.' in key for path in paths for key in path):
+        return None
+
+    for depth in range(max(len(path) for path in paths), 0, -1):
+        prefixes = []
+        for path in sorted({path[:depth] for path in paths}):
+            # Sorting puts a prefix right before the paths it covers
+            if not prefixes or path[: len(prefixes[-1])] != prefixes[-1]:
+                prefixes.append(path)
+
+        filter_path = ','.join('.'.join(prefix) for prefix in prefixes)
+        if len(filter_path) <= max_length:
+            return filter_path
+
+    return None
+
+
 class ESCheck(AgentCheck):
     HTTP_CONFIG_REMAPPER = {
         'aws_service': {'name': 'aws_service', 'default': 'es'},
@@ -139,6 +201,11 @@ class ESCheck(AgentCheck):
         # This must happen before other URL processing as the cluster name
         # is retrieved here, and added to the tag list.
         stats_url = self._join_url(stats_url, admin_forwarder)
+        stats_url = self._filter_url(
+            stats_url,
+            version,
+            ('cluster_name',) + NODE_TAG_PATHS + tuple('nodes.*.' + desc[1] for desc in itervalues(stats_metrics)),
+        )
         stats_data = self._get_data(stats_url)
 
         if stats_data.get('cluster_name'):
@@ -161,6 +228,9 @@ class ESCheck(AgentCheck):
         if self._config.pshard_stats:
             send_sc = bubble_ex = not self._config.pshard_graceful_to
             pshard_stats_url = self._join_url(pshard_stats_url, admin_forwarder)
+            pshard_stats_url = self._filter_url(
+                pshard_stats_url, version, [desc[1] for desc in itervalues(pshard_stats_metrics)]
+            )
             try:
                 pshard_stats_data = self._get_data(pshard_stats_url, send_sc=send_sc)
                 self._process_pshard_stats_data(pshard_stats_data, pshard_stats_metrics, base_tags)
@@ -183,6 +253,7 @@ class ESCheck(AgentCheck):
         if self._config.pending_task_stats:
             # Load the pending_tasks data.
             pending_tasks_url = self._join_url(pending_tasks_url, admin_forwarder)
+            pending_tasks_url = self._filter_url(pending_tasks_url, version, PENDING_TASKS_PATHS)
             pending_tasks_data = self._get_data(pending_tasks_url)
             self._process_pending_tasks_data(pending_tasks_data, base_tags)
 
@@ -240,8 +311,25 @@ class ESCheck(AgentCheck):
         else:
             return urljoin(self._config.url, url)
 
+    @staticmethod
+    def _filter_url(url, version, paths):
+        """
+        Restrict the response of `url` to the given paths, if the running version supports response filtering.
+        """
+        # https://www.elastic.co/guide/en/elasticsearch/reference/current/common-options.html#common-options-response-filtering # noqa: E501
+        if version < [1, 6, 0]:
+            return url
+
+        filter_path = get_filter_path(paths)
+        if filter_path is None:
+            return url
+
+        return '{}{}filter_path={}'.format(url, '&' if '?' in url else '?', filter_path)
+
     def _get_index_metrics(self, admin_forwarder, version, base_tags):
-        index_resp = self._get_data(self._join_url('/_cat/indices?format=json&bytes=b', admin_forwarder))
+        index_resp = self._get_data(
+            self._join_url('/_cat/indices?format=json&bytes=b&h=' + ','.join(CAT_INDICES_COLUMNS), admin_forwarder)
+        )
         for idx in index_resp:
             # we need to remap metric names because the ones from elastic
             # contain dots and that would confuse `_process_metric()` (sic)
@@ -270,7 +358,7 @@ class ESCheck(AgentCheck):
             tags = base_tags + ['index_name:' + idx['index']]
             for metric, desc in iteritems(index_stats_for_version(version)):
                 self._process_metric(index_data, metric, *desc, tags=tags)
-        self._get_index_search_stats(admin_forwarder, base_tags)
+        self._get_index_search_stats(admin_forwarder, version, base_tags)
 
     def _get_template_metrics(self, admin_forwarder, base_tags):
 
@@ -285,7 +373,7 @@ class ESCheck(AgentCheck):
         for metric, desc in iteritems(TEMPLATE_METRICS):
             self._process_metric({'templates': filtered_templates}, metric, *desc, tags=base_tags)
 
-    def _get_index_search_stats(self, admin_forwarder, base_tags):
+    def _get_index_search_stats(self, admin_forwarder, version, base_tags):
         """
         Stats for searches in every index.
         """
@@ -293,7 +381,13 @@ class ESCheck(AgentCheck):
         # This endpoint can return more data, all of what the /_cat/indices endpoint returns except index health.
         # The health we can get from /_cluster/health if we pass level=indices query param. Reference:
         # https://www.elastic.co/guide/en/elasticsearch/reference/current/cluster-health.html#cluster-health-api-query-params # noqa: E501
-        indices = self._get_data(self._join_url('/_stats/search', admin_forwarder))['indices']
+        search_stats_url = self._filter_url(
+            self._join_url('/_stats/search', admin_forwarder),
+            version,
+            ['indices.*.' + path for _, path in INDEX_SEARCH_STATS],
+        )
+        # Without any index, the filtered response is empty
+        indices = self._get_data(search_stats_url).get('indices', {})
         for (idx_name, data), (m_name, path) in product(iteritems(indices), INDEX_SEARCH_STATS):
             tags = base_tags + ['index_name:' + idx_name]
             self._process_metric(data, m_name, 'gauge', path, tags=tags)
@@ -352,7 +446,8 @@ class ESCheck(AgentCheck):
 
         self.log.debug("request to url %s returned: %s", url, resp)
 
-        return resp.json()
+        # Parsing the raw body skips the decoding of the whole response to text
+        return from_json(resp.content)
 
     def _process_pending_tasks_data(self, data, base_tags):
         p_tasks = defaultdict(int)
@@ -377,6 +472,7 @@ class ESCheck(AgentCheck):
             self._process_metric(node_data, metric, *desc, tags=base_tags)
 
     def _process_stats_data(self, data, stats_metrics, base_tags):
+        stats_metrics = compile_metrics(stats_metrics)
         for node_data in itervalues(data.get('nodes', {})):
             metric_hostname = None
             metrics_tags = list(base_tags)
@@ -396,34 +492,35 @@ class ESCheck(AgentCheck):
                         metric_hostname = node_data[k]
                         break
 
-            for metric, desc in iteritems(stats_metrics):
-                self._process_metric(node_data, metric, *desc, tags=metrics_tags, hostname=metric_hostname)
+            for metric, xtype, path, xform in stats_metrics:
+                self._process_metric(node_data, metric, xtype, path, xform, tags=metrics_tags, hostname=metric_hostname)
 
     def _process_pshard_stats_data(self, data, pshard_stats_metrics, base_tags):
-        for metric, desc in iteritems(pshard_stats_metrics):
+        pshard_stats_metrics = compile_metrics(pshard_stats_metrics)
+        for metric, xtype, path, xform in pshard_stats_metrics:
             pshard_tags = base_tags
-            if desc[1].startswith('_all.'):
+            if path[0] == '_all':
                 pshard_tags = pshard_tags + ['index_name:_all']
-            self._process_metric(data, metric, *desc, tags=pshard_tags)
+            self._process_metric(data, metric, xtype, path, xform, tags=pshard_tags)
         # process index-level metrics
         if self._config.cluster_stats and self._config.detailed_index_stats:
-            for metric, desc in iteritems(pshard_stats_metrics):
-                if desc[1].startswith('_all.'):
-                    for index in data['indices']:
-                        self.log.debug("Processing index %s", index)
-                        escaped_index = index.replace('.', '\.')  # noqa: W605
-                        index_desc = (
-                            desc[0],
-                            'indices.' + escaped_index + '.' + desc[1].replace('_all.', ''),
-                            desc[2] if 2 < len(desc) else None,
-                        )
-                        self._process_metric(data, metric, *index_desc, tags=base_tags + ['index_name:' + index])
+            # The same metrics, read from the data of every index instead of `_all`
+            index_metrics = [
+                (metric, xtype, path[1:], xform)
+                for metric, xtype, path, xform in pshard_stats_metrics
+                if path[0] == '_all' and len(path) > 1
+            ]
+            for index, index_data in iteritems(data.get('indices', {})):
+                self.log.debug("Processing index %s", index)
+                index_tags = base_tags + ['index_name:' + index]
+                for metric, xtype, path, xform in index_metrics:
+                    self._process_metric(index_data, metric, xtype, path, xform, tags=index_tags)
 
     def _process_metric(self, data, metric, xtype, path, xform=None, tags=None, hostname=None):
         """
         data: dictionary containing all the stats
         metric: datadog metric
-        path: corresponding path in data, flattened, e.g. thread_pool.bulk.queue
+        path: corresponding path in data, flattened, e.g. thread_pool.bulk.queue, or already split into its keys
         xform: a lambda to apply to the numerical value
         """
         value = get_value_from_path(data, path)
@@ -438,7 +535,9 @@ class ESCheck(AgentCheck):
             else:
                 self.rate(metric, value, tags=tags, hostname=hostname)
         else:
-            self.log.debug("Metric not found: %s -> %s", path, metric)
+            self.log.debug(
+                "Metric not found: %s -> %s", path if isinstance(path, string_types) else '.'.join(path), metric
+            )
 
     def _process_health_data(self, data, version, base_tags, service_check_tags):
         prev_status = self.cluster_status.get(self._config.url)
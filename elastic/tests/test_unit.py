@@ -10,8 +10,8 @@ import pytest
 from datadog_checks.base import ConfigurationError
 from datadog_checks.dev.http import MockResponse
 from datadog_checks.elastic import ESCheck
-from datadog_checks.elastic.elastic import AuthenticationError, get_value_from_path
-from datadog_checks.elastic.metrics import stats_for_version
+from datadog_checks.elastic.elastic import AuthenticationError, compile_path, get_filter_path, get_value_from_path
+from datadog_checks.elastic.metrics import pshard_stats_for_version, stats_for_version
 
 from .common import URL, get_fixture_path
 
@@ -149,6 +149,62 @@ def test_get_value_from_path():
     assert value == "foo"
 
 
+def test_get_value_from_compiled_path():
+    path = compile_path('indices.\\.kibana.primaries')
+    assert path == ('indices', '.kibana', 'primaries')
+    assert compile_path('indices.\\.kibana.primaries') is path
+    assert get_value_from_path({'indices': {'.kibana': {'primaries': 1}}}, path) == 1
+    assert get_value_from_path({'indices': {}}, path) is None
+
+
+@pytest.mark.parametrize(
+    'paths, max_length, expected',
+    [
+        pytest.param(['a.b', 'a.c.d', 'e'], 100, 'a.b,a.c.d,e', id='full paths'),
+        pytest.param(['a.b.c', 'a.b', 'a.d'], 100, 'a.b,a.d', id='covered paths'),
+        pytest.param(['a.b.c', 'a.b.d', 'a.e'], 8, 'a.b,a.e', id='shortened paths'),
+        pytest.param(['a.b.c', 'f.b.d'], 2, None, id='too long'),
+        pytest.param(['a.b\\.c'], 100, None, id='dotted key'),
+        pytest.param([], 100, None, id='no paths'),
+    ],
+)
+def test_get_filter_path(paths, max_length, expected):
+    assert get_filter_path(paths, max_length=max_length) == expected
+
+
+@pytest.mark.parametrize(
+    'url, version, expected',
+    [
+        pytest.param('/_stats', [7, 0, 0], '/_stats?filter_path=_all.a,indices', id='filtered'),
+        pytest.param(
+            '/_nodes/stats?all=true', [1, 6, 0], '/_nodes/stats?all=true&filter_path=_all.a,indices', id='query'
+        ),
+        pytest.param('/_stats', [1, 5, 0], '/_stats', id='unsupported'),
+    ],
+)
+def test_filter_url(url, version, expected):
+    assert ESCheck._filter_url(url, version, ['_all.a', 'indices', 'indices.*.b']) == expected
+
+
+def test_process_detailed_index_stats(aggregator, instance):
+    instance = dict(instance, cluster_stats=True, detailed_index_stats=True)
+    check = ESCheck('elastic', {}, instances=[instance])
+    data = {
+        '_all': {'primaries': {'docs': {'count': 3}}},
+        'indices': {
+            '.kibana': {'primaries': {'docs': {'count': 1}}},
+            'logs': {'primaries': {'docs': {'count': 2}}},
+        },
+    }
+
+    check._process_pshard_stats_data(data, pshard_stats_for_version([7, 0, 0]), ['foo:bar'])
+
+    aggregator.assert_metric('elasticsearch.indices.count', value=2, tags=['foo:bar'])
+    aggregator.assert_metric('elasticsearch.primaries.docs.count', value=3, tags=['foo:bar', 'index_name:_all'])
+    aggregator.assert_metric('elasticsearch.primaries.docs.count', value=1, tags=['foo:bar', 'index_name:.kibana'])
+    aggregator.assert_metric('elasticsearch.primaries.docs.count', value=2, tags=['foo:bar', 'index_name:logs'])
+
+
 def test__get_data_throws_authentication_error(instance):
     with mock.patch(
         'requests.get',
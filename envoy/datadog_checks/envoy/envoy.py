@@ -23,6 +23,9 @@ class Envoy(AgentCheck):
     HTTP_CONFIG_REMAPPER = {'verify_ssl': {'name': 'tls_verify'}}
     SERVICE_CHECK_NAME = 'envoy.can_connect'
 
+    # Maximum number of stat names whose parsing result is kept between runs
+    PARSE_CACHE_SIZE = 100000
+
     def __new__(cls, name, init_config, instances):
         instance = instances[0]
 
@@ -47,6 +50,7 @@ class Envoy(AgentCheck):
 
         self.custom_tags = self.instance.get('tags', [])
         self.caching_metrics = self.instance.get('cache_metrics', True)
+        self.caching_parse_results = is_affirmative(self.caching_metrics)
 
         self.collect_server_info = self.instance.get('collect_server_info', True)
         self.stats_url = self.instance.get('stats_url')
@@ -91,6 +95,13 @@ class Envoy(AgentCheck):
         self.excluded_metrics_cache = set()
 
         self.caching_metrics = None
+
+        # Raw stat name -> result of its parsing, only the names seen during the last run are kept:
+        # - None if the stat is excluded
+        # - (metric, tags, method) if the stat is known
+        # - the UnknownMetric or UnknownTags error otherwise
+        self.parse_cache = {}
+
         self.parse_unknown_metrics = is_affirmative(self.instance.get('parse_unknown_metrics', False))
         self.disable_legacy_cluster_tag = is_affirmative(self.instance.get('disable_legacy_cluster_tag', False))
 
@@ -120,46 +131,74 @@ class Envoy(AgentCheck):
         # Avoid repeated global lookups.
         get_method = getattr
 
-        for line in response.content.decode().splitlines():
+        previous_cache = self.parse_cache
+        parse_cache = {}
+        cache_size = self.PARSE_CACHE_SIZE if self.caching_parse_results else 0
+
+        # Stats are read line by line as raw bytes, names are only decoded when they weren't parsed before.
+        for line in response.iter_lines():
             try:
-                envoy_metric, value = line.split(': ')
+                envoy_metric, value = line.split(b': ')
             except ValueError:
                 continue
 
-            if not self.included_metrics(envoy_metric):
-                continue
-
             try:
-                metric, tags, method = parse_metric(
-                    envoy_metric,
-                    retry=self.parse_unknown_metrics,
-                    disable_legacy_cluster_tag=self.disable_legacy_cluster_tag,
-                )
-            except UnknownMetric:
-                if envoy_metric not in self.unknown_metrics:
-                    self.log.debug('Unknown metric `%s`', envoy_metric)
-                self.unknown_metrics[envoy_metric] += 1
+                parsed = previous_cache[envoy_metric]
+            except KeyError:
+                parsed = self._parse_stat(envoy_metric.decode('utf-8'))
+
+            if len(parse_cache) < cache_size:
+                parse_cache[envoy_metric] = parsed
+
+            if parsed is None:
                 continue
-            except UnknownTags as e:
-                unknown_tags = str(e).split('|||')
-                for tag in unknown_tags:
-                    if tag not in self.unknown_tags:
-                        self.log.debug('Unknown tag `%s` in metric `%s`', tag, envoy_metric)
-                    self.unknown_tags[tag] += 1
+            elif type(parsed) is not tuple:
+                self._record_unknown(envoy_metric.decode('utf-8'), parsed)
                 continue
 
-            tags.extend(self.custom_tags)
+            metric, tags, method = parsed
             try:
                 value = int(value)
                 get_method(self, method)(metric, value, tags=tags)
 
             # If the value isn't an integer assume it's pre-computed histogram data.
             except (ValueError, TypeError):
-                for histo_metric, histo_value in parse_histogram(metric, value):
+                for histo_metric, histo_value in parse_histogram(metric, value.decode('utf-8')):
                     self.gauge(histo_metric, histo_value, tags=tags)
 
+        # Stats that are no longer exposed are forgotten
+        self.parse_cache = parse_cache
+
         self.service_check(self.SERVICE_CHECK_NAME, AgentCheck.OK, tags=self.custom_tags)
 
+    def _parse_stat(self, envoy_metric):
+        if not self.included_metrics(envoy_metric):
+            return None
+
+        try:
+            metric, tags, method = parse_metric(
+                envoy_metric,
+                retry=self.parse_unknown_metrics,
+                disable_legacy_cluster_tag=self.disable_legacy_cluster_tag,
+            )
+        except (UnknownMetric, UnknownTags) as e:
+            return e
+
+        tags.extend(self.custom_tags)
+        return metric, tuple(tags), method
+
+    def _record_unknown(self, envoy_metric, error):
+        if isinstance(error, UnknownMetric):
+            if envoy_metric not in self.unknown_metrics:
+                self.log.debug('Unknown metric `%s`', envoy_metric)
+            self.unknown_metrics[envoy_metric] += 1
+        else:
+            unknown_tags = str(error).split('|||')
+            for tag in unknown_tags:
+                if tag not in self.unknown_tags:
+                    self.log.debug('Unknown tag `%s` in metric `%s`', tag, envoy_metric)
+                self.unknown_tags[tag] += 1
+
     def included_metrics(self, metric):
         if self.caching_metrics:
             if metric in self.included_metrics_cache:
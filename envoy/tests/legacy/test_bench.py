@@ -5,6 +5,7 @@
 import pytest
 
 from datadog_checks.envoy import Envoy
+from datadog_checks.envoy.metrics import METRIC_PREFIX, METRICS
 
 from .common import INSTANCES
 
@@ -24,9 +25,47 @@ def test_fixture(benchmark, fixture_path, mock_http_response):
     instance = INSTANCES['main']
     c = Envoy('envoy', {}, [instance])
 
-    mock_http_response(file_path=fixture_path('multiple_services'))
+    mock_http_response(file_path=fixture_path('./legacy/multiple_services'))
 
     # Run once to get logging of unknown metrics out of the way.
     c.check(instance)
 
     benchmark(c.check, instance)
+
+
+def test_fixture_without_cache(benchmark, fixture_path, mock_http_response):
+    instance = dict(INSTANCES['main'], cache_metrics=False)
+    c = Envoy('envoy', {}, [instance])
+
+    mock_http_response(file_path=fixture_path('./legacy/multiple_services'))
+
+    # Run once to get logging of unknown metrics out of the way.
+    c.check(instance)
+
+    benchmark(c.check, instance)
+
+
+def _submitted_metrics(aggregator):
+    return {
+        (metric.name, metric.value, tuple(metric.tags))
+        for name in METRICS
+        for metric in aggregator.metrics(METRIC_PREFIX + name)
+    }
+
+
+def test_fixture_cached_parsing(benchmark, aggregator, fixture_path, mock_http_response):
+    instance = INSTANCES['main']
+    c = Envoy('envoy', {}, [instance])
+
+    mock_http_response(file_path=fixture_path('./legacy/multiple_services'))
+
+    c.check(instance)
+    cache = dict(c.parse_cache)
+    submitted = _submitted_metrics(aggregator)
+    aggregator.reset()
+
+    benchmark(c.check, instance)
+
+    # Every stat is parsed once and its cached result submits the same metrics
+    assert c.parse_cache == cache
+    assert _submitted_metrics(aggregator) == submitted
@@ -10,6 +10,7 @@ import requests
 from datadog_checks.dev.utils import get_metadata_metrics
 from datadog_checks.envoy import Envoy
 from datadog_checks.envoy.metrics import METRIC_PREFIX, METRICS
+from datadog_checks.envoy.parser import parse_metric
 
 from .common import (
     CONNECTION_LIMIT_METRICS,
@@ -341,3 +342,50 @@ def test_connection_limit_metrics(aggregator, fixture_path, mock_http_response,
             aggregator.assert_metric_has_tag(metric, tag, count=1)
 
     aggregator.assert_metrics_using_metadata(get_metadata_metrics())
+
+
+def test_parse_cache(aggregator, fixture_path, mock_http_response, check, dd_run_check):
+    instance = INSTANCES['main']
+    c = check(instance)
+
+    mock_http_response(file_path=fixture_path('./legacy/unknown_metrics'))
+    dd_run_check(c)
+    dd_run_check(c)
+
+    # Unknown metrics are cached as well but still counted on every run
+    assert sum(c.unknown_metrics.values()) == 10
+    assert c.parse_cache
+
+    mock_http_response(file_path=fixture_path('./legacy/multiple_services'))
+    with mock.patch('datadog_checks.envoy.envoy.parse_metric', wraps=parse_metric) as parse:
+        dd_run_check(c)
+        parsed = parse.call_count
+        dd_run_check(c)
+
+    assert parsed > 0
+    assert parse.call_count == parsed
+
+    # The stats that are no longer exposed are evicted
+    with open(fixture_path('./legacy/multiple_services'), 'rb') as f:
+        assert set(c.parse_cache) == {line.split(b': ')[0] for line in f.read().splitlines() if b': ' in line}
+
+
+def test_parse_cache_size(aggregator, fixture_path, mock_http_response, check, dd_run_check):
+    instance = INSTANCES['main']
+    c = check(instance)
+    c.PARSE_CACHE_SIZE = 10
+
+    mock_http_response(file_path=fixture_path('./legacy/multiple_services'))
+    dd_run_check(c)
+
+    assert len(c.parse_cache) == 10
+
+
+def test_parse_cache_disabled(aggregator, fixture_path, mock_http_response, check, dd_run_check):
+    instance = dict(INSTANCES['main'], cache_metrics=False)
+    c = check(instance)
+
+    mock_http_response(file_path=fixture_path('./legacy/multiple_services'))
+    dd_run_check(c)
+
+    assert not c.parse_cache
@@ -36,6 +36,10 @@ def instance_cache_metric_wildcards():
     return True
 
 
+def instance_cache_sample_tags():
+    return False
+
+
 def instance_cache_shared_labels():
     return True
 
@@ -60,6 +64,10 @@ def instance_collect_status_metrics_by_host():
     return False
 
 
+def instance_concurrent_scrapes():
+    return 1
+
+
 def instance_count_status_by_service():
     return True
 
@@ -128,6 +136,14 @@ def instance_request_size():
     return 16
 
 
+def instance_sample_tags_cache_max_age():
+    return 5
+
+
+def instance_sample_tags_cache_size():
+    return 100000
+
+
 def instance_send_distribution_buckets():
     return False
 
@@ -192,6 +208,10 @@ def instance_tls_verify():
     return True
 
 
+def instance_use_fast_parser():
+    return False
+
+
 def instance_use_latest_spec():
     return False
 
@@ -120,6 +120,7 @@ class InstanceConfig(BaseModel):
     bearer_token_path: Optional[str] = None
     bearer_token_refresh_interval: Optional[int] = None
     cache_metric_wildcards: Optional[bool] = None
+    cache_sample_tags: Optional[bool] = None
     cache_shared_labels: Optional[bool] = None
     collate_status_tags_per_host: Optional[bool] = None
     collect_aggregates_only: Optional[Union[bool, str]] = None
@@ -127,6 +128,7 @@ class InstanceConfig(BaseModel):
     collect_histogram_buckets: Optional[bool] = None
     collect_status_metrics: Optional[bool] = None
     collect_status_metrics_by_host: Optional[bool] = None
+    concurrent_scrapes: Optional[int] = None
     connect_timeout: Optional[float] = None
     count_status_by_service: Optional[bool] = None
     disable_generic_tags: Optional[bool] = None
@@ -177,6 +179,8 @@ class InstanceConfig(BaseModel):
     read_timeout: Optional[float] = None
     rename_labels: Optional[MappingProxyType[str, Any]] = None
     request_size: Optional[float] = None
+    sample_tags_cache_max_age: Optional[int] = None
+    sample_tags_cache_size: Optional[int] = None
     send_distribution_buckets: Optional[bool] = None
     send_distribution_counts_as_monotonic: Optional[bool] = None
     send_distribution_sums_as_monotonic: Optional[bool] = None
@@ -205,6 +209,7 @@ class InstanceConfig(BaseModel):
     tls_verify: Optional[bool] = None
     type_overrides: Optional[MappingProxyType[str, Any]] = None
     url: Optional[str] = None
+    use_fast_parser: Optional[bool] = None
     use_latest_spec: Optional[bool] = None
     use_legacy_auth_encoding: Optional[bool] = None
     use_openmetrics: Optional[bool] = None
@@ -0,0 +1,230 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+import base64
+import json
+import operator
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+
+# Prefix of the binary serialization format, the legacy format is a JSON object
+FORMAT_PREFIX = 'v1:'
+HEADER_LENGTH = struct.Struct('<I')
+
+
+class PartitionTimestamps:
+    """History of the broker timestamps of a single partition, sorted by offset.
+
+    The offsets and timestamps are kept in typed arrays used as a ring buffer: the oldest entries are
+    dropped by moving `start` forward and the arrays are only compacted once enough entries are dropped.
+    """
+
+    __slots__ = ('offsets', 'timestamps', 'start')
+
+    def __init__(self):
+        self.offsets = array('q')
+        self.timestamps = array('d')
+        self.start = 0
+
+    def __len__(self):
+        return len(self.offsets) - self.start
+
+    def add(self, offset, timestamp, max_size):
+        offsets = self.offsets
+        if len(offsets) == self.start or offset > offsets[-1]:
+            # Highwater offsets only increase, so this is by far the most common case
+            offsets.append(offset)
+            self.timestamps.append(timestamp)
+        else:
+            index = bisect_left(offsets, offset, self.start)
+            if offsets[index] == offset:
+                self.timestamps[index] = timestamp
+                return
+            offsets.insert(index, offset)
+            self.timestamps.insert(index, timestamp)
+
+        self._trim(max_size)
+
+    def extend(self, offsets, timestamps, max_size):
+        """Add entries sorted by offset, usually loaded from the persistent cache."""
+        if not offsets:
+            return
+        # A journal holds the same offset several times when the partition is idle
+        if (len(self) and offsets[0] <= self.offsets[-1]) or not all(map(operator.lt, offsets, offsets[1:])):
+            for offset, timestamp in zip(offsets, timestamps):
+                self.add(offset, timestamp, max_size)
+            return
+
+        self.offsets.extend(offsets)
+        self.timestamps.extend(timestamps)
+        self._trim(max_size)
+
+    def get(self, offset):
+        """Return the timestamp recorded for exactly this offset, or `None`."""
+        index = bisect_left(self.offsets, offset, self.start)
+        if index < len(self.offsets) and self.offsets[index] == offset:
+            return self.timestamps[index]
+        return None
+
+    def interpolate(self, offset):
+        """Return the estimated timestamp at which the broker received `offset`, or `None`."""
+        offsets = self.offsets
+        end = len(offsets)
+        index = bisect_left(offsets, offset, self.start)
+        if index < end and offsets[index] == offset:
+            return self.timestamps[index]
+
+        if index == self.start or index == end:
+            if len(self) < 2:
+                return None
+            # We couldn't find offsets before and after the current consumer offset.
+            # This happens when you start a consumer to replay data in the past:
+            #   - We provision a consumer at t0 that will start consuming from t1 (t1 << t0).
+            #   - It starts building a history of offset/timestamp pairs from the moment it started to run, i.e. t0.
+            #   - So there is no offset/timestamp pair in the local history between t1 -> t0.
+            # We'll take the min and max offsets available and assume the timestamp is an affine function
+            # of the offset to compute an approximate broker timestamp corresponding to the current consumer offset.
+            before, after = self.start, end - 1
+        else:
+            before, after = index - 1, index
+
+        # We assume that the timestamp is an affine function of the offset
+        offset_after = offsets[after]
+        timestamp_before = self.timestamps[before]
+        timestamp_after = self.timestamps[after]
+        if offset_after == offsets[before]:
+            return timestamp_after
+        slope = (timestamp_after - timestamp_before) / float(offset_after - offsets[before])
+        return slope * (offset - offset_after) + timestamp_after
+
+    def items(self):
+        return self.offsets[self.start :], self.timestamps[self.start :]
+
+    def _trim(self, max_size):
+        if len(self) <= max_size:
+            return
+
+        self.start = len(self.offsets) - max_size
+        # Compact once the dropped entries take as much room as the retained ones
+        if self.start >= max_size:
+            del self.offsets[: self.start]
+            del self.timestamps[: self.start]
+            self.start = 0
+
+
+class BrokerTimestamps:
+    """Broker timestamps of highwater offsets for every partition, used to estimate consumer lag in seconds.
+
+    The history is persisted as a full snapshot and a journal holding the entries added since the last
+    snapshot, so that most check runs only need to serialize the latest entries.
+    """
+
+    def __init__(self, max_timestamps):
+        self.max_timestamps = max_timestamps
+        # {"<topic>_<partition>": PartitionTimestamps}
+        self.partitions = {}
+        # {"<topic>_<partition>": (offsets, timestamps)} added since the last snapshot
+        self.pending = {}
+        self.pending_runs = 0
+        # Whether the persisted snapshot misses entries that are not pending, e.g. loaded from a journal
+        self.snapshot_outdated = False
+
+    def get(self, topic, partition):
+        return self.partitions.get('{}_{}'.format(topic, partition))
+
+    def add_highwater_offsets(self, highwater_offsets, timestamp):
+        max_timestamps = self.max_timestamps
+        for (topic, partition), highwater_offset in highwater_offsets.items():
+            key = '{}_{}'.format(topic, partition)
+            timestamps = self.partitions.get(key)
+            if timestamps is None:
+                timestamps = self.partitions[key] = PartitionTimestamps()
+            timestamps.add(highwater_offset, timestamp, max_timestamps)
+
+            pending = self.pending.get(key)
+            if pending is None:
+                pending = self.pending[key] = (array('q'), array('d'))
+            if pending[0] and pending[0][-1] == highwater_offset:
+                # Same as the history, only the latest timestamp of an offset is kept
+                pending[1][-1] = timestamp
+            else:
+                pending[0].append(highwater_offset)
+                pending[1].append(timestamp)
+
+        self.pending_runs += 1
+
+    def load(self, value):
+        """Add the entries of a serialized snapshot or journal, in either the binary or the legacy JSON format."""
+        for key, offsets, timestamps in _deserialize(value):
+            partition_timestamps = self.partitions.get(key)
+            if partition_timestamps is None:
+                partition_timestamps = self.partitions[key] = PartitionTimestamps()
+            partition_timestamps.extend(offsets, timestamps, self.max_timestamps)
+
+    def serialize(self):
+        """Serialize the whole history and reset the journal."""
+        self.pending = {}
+        self.pending_runs = 0
+        self.snapshot_outdated = False
+        return _serialize((key, timestamps.items()) for key, timestamps in self.partitions.items())
+
+    def serialize_pending(self):
+        """Serialize the entries added since the last snapshot."""
+        return _serialize(self.pending.items())
+
+
+def _serialize(partitions):
+    keys = []
+    counts = []
+    offsets = array('q')
+    timestamps = array('d')
+    for key, (partition_offsets, partition_timestamps) in partitions:
+        keys.append(key)
+        counts.append(len(partition_offsets))
+        offsets.extend(partition_offsets)
+        timestamps.extend(partition_timestamps)
+
+    if sys.byteorder == 'big':
+        offsets.byteswap()
+        timestamps.byteswap()
+
+    header = json.dumps([keys, counts]).encode('utf-8')
+    payload = b''.join((HEADER_LENGTH.pack(len(header)), header, offsets.tobytes(), timestamps.tobytes()))
+    return FORMAT_PREFIX + base64.b64encode(zlib.compress(payload)).decode('ascii')
+
+
+def _deserialize(value):
+    if not value:
+        return
+
+    if value.startswith('{'):
+        # Legacy format: {"<topic>_<partition>": {"<offset>": timestamp}}
+        for key, content in json.loads(value).items():
+            entries = sorted((int(offset), timestamp) for offset, timestamp in content.items())
+            yield key, array('q', (e[0] for e in entries)), array('d', (e[1] for e in entries))
+        return
+
+    if not value.startswith(FORMAT_PREFIX):
+        raise ValueError('Unknown broker timestamps format')
+
+    payload = zlib.decompress(base64.b64decode(value[len(FORMAT_PREFIX) :]))
+    header_end = HEADER_LENGTH.size + HEADER_LENGTH.unpack_from(payload)[0]
+    keys, counts = json.loads(payload[HEADER_LENGTH.size : header_end].decode('utf-8'))
+    total = sum(counts)
+
+    offsets = array('q')
+    timestamps = array('d')
+    offsets_end = header_end + total * offsets.itemsize
+    offsets.frombytes(payload[header_end:offsets_end])
+    timestamps.frombytes(payload[offsets_end : offsets_end + total * timestamps.itemsize])
+    if sys.byteorder == 'big':
+        offsets.byteswap()
+        timestamps.byteswap()
+
+    start = 0
+    for key, count in zip(keys, counts):
+        yield key, offsets[start : start + count], timestamps[start : start + count]
+        start += count
@@ -1,12 +1,19 @@
 # (C) Datadog, Inc. 2023-present
 # All rights reserved
 # Licensed under a 3-clause BSD style license (see LICENSE)
-from concurrent.futures import as_completed
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from time import time
 
 from confluent_kafka import Consumer, ConsumerGroupTopicPartitions, KafkaException, TopicPartition
 from confluent_kafka.admin import AdminClient
 
-from datadog_checks.kafka_consumer.constants import KAFKA_INTERNAL_TOPICS, OFFSET_INVALID
+from datadog_checks.kafka_consumer.constants import (
+    HIGHWATER_CONSUMER_GROUP,
+    KAFKA_INTERNAL_TOPICS,
+    MAX_HIGHWATER_OFFSET_WORKERS,
+    OFFSET_INVALID,
+)
 
 
 class KafkaClient:
@@ -14,7 +21,10 @@ class KafkaClient:
         self.config = config
         self.log = log
         self._kafka_client = None
+        self._highwater_consumer = None
         self.topic_partition_cache = {}
+        # Time spent (in seconds) in each phase of the last highwater offsets collection
+        self.highwater_offsets_timings = {'metadata': 0.0, 'offsets': 0.0}
 
     @property
     def kafka_client(self):
@@ -81,6 +91,10 @@ class KafkaClient:
 
     def get_highwater_offsets(self, consumer_offsets):
         self.log.debug('Getting highwater offsets')
+        self.highwater_offsets_timings = {'metadata': 0.0, 'offsets': 0.0}
+
+        if self.config._shared_highwater_consumer:
+            return self._get_highwater_offsets_shared(consumer_offsets)
 
         cluster_id = ""
         highwater_offsets = {}
@@ -102,9 +116,11 @@ class KafkaClient:
 
             topic_partitions_for_highwater_offsets = set()
 
+            start_time = time()
             consumer = self.__create_consumer(consumer_group)
             self.log.debug("Consumer instance %s created for group %s", consumer, consumer_group)
             cluster_metadata = consumer.list_topics(timeout=self.config._request_timeout)
+            self.highwater_offsets_timings['metadata'] += time() - start_time
             try:
                 cluster_id = cluster_metadata.cluster_id
             except AttributeError:
@@ -140,10 +156,13 @@ class KafkaClient:
                     len(topic_partitions_for_highwater_offsets),
                     consumer_group,
                 )
-                for topic_partition_with_highwater_offset in consumer.offsets_for_times(
+                start_time = time()
+                topic_partitions_with_highwater_offset = consumer.offsets_for_times(
                     partitions=list(topic_partitions_for_highwater_offsets),
                     timeout=self.config._request_timeout,
-                ):
+                )
+                self.highwater_offsets_timings['offsets'] += time() - start_time
+                for topic_partition_with_highwater_offset in topic_partitions_with_highwater_offset:
                     self.log.debug('Topic partition with highwater offset: %s', topic_partition_with_highwater_offset)
                     topic = topic_partition_with_highwater_offset.topic
                     partition = topic_partition_with_highwater_offset.partition
@@ -160,6 +179,92 @@ class KafkaClient:
         self.log.debug('Got %s highwater offsets', len(highwater_offsets))
         return highwater_offsets, cluster_id
 
+    def _get_highwater_offsets_shared(self, consumer_offsets):
+        """Fetch the cluster metadata once, then query the highwater offsets of every relevant partition
+        through a single long-lived consumer, with one concurrent request per partition leader."""
+        highwater_offsets = {}
+        topic_partition_with_consumer_offset = {(topic, partition) for _, topic, partition in consumer_offsets}
+
+        start_time = time()
+        cluster_metadata = self.kafka_client.list_topics(timeout=self.config._request_timeout)
+        self.highwater_offsets_timings['metadata'] = time() - start_time
+        cluster_id = cluster_metadata.cluster_id or ""
+
+        # {leader_id: [TopicPartition]}
+        topic_partitions_by_leader = defaultdict(list)
+        for topic, topic_metadata in cluster_metadata.topics.items():
+            if topic in KAFKA_INTERNAL_TOPICS:
+                self.log.debug("Skipping internal topic %s", topic)
+                continue
+
+            for partition, partition_metadata in topic_metadata.partitions.items():
+                if (
+                    not self.config._monitor_all_broker_highwatermarks
+                    and (topic, partition) not in topic_partition_with_consumer_offset
+                ):
+                    continue
+                if partition_metadata.leader == -1:
+                    self.log.debug("Skipping leaderless partition %s of topic %s", partition, topic)
+                    continue
+
+                # Setting offset to -1 will return the latest highwater offset while calling offsets_for_times
+                topic_partitions_by_leader[partition_metadata.leader].append(
+                    TopicPartition(topic=topic, partition=partition, offset=-1)
+                )
+
+        if not topic_partitions_by_leader:
+            self.log.debug('No highwater offsets to query')
+            return highwater_offsets, cluster_id
+
+        start_time = time()
+        consumer = self._get_highwater_consumer()
+        with ThreadPoolExecutor(
+            max_workers=min(len(topic_partitions_by_leader), MAX_HIGHWATER_OFFSET_WORKERS)
+        ) as executor:
+            futures = {
+                executor.submit(
+                    consumer.offsets_for_times, partitions=topic_partitions, timeout=self.config._request_timeout
+                ): leader
+                for leader, topic_partitions in topic_partitions_by_leader.items()
+            }
+            for future in as_completed(futures):
+                leader = futures[future]
+                try:
+                    topic_partitions = future.result()
+                except KafkaException as e:
+                    self.log.warning("Failed to get highwater offsets from broker %s: %s", leader, e)
+                    continue
+
+                for topic_partition in topic_partitions:
+                    if topic_partition.error:
+                        self.log.debug(
+                            "Encountered error: %s. Occurred with topic: %s; partition: [%s]",
+                            topic_partition.error.str(),
+                            topic_partition.topic,
+                            str(topic_partition.partition),
+                        )
+                        continue
+                    highwater_offsets[(topic_partition.topic, topic_partition.partition)] = topic_partition.offset
+        self.highwater_offsets_timings['offsets'] = time() - start_time
+
+        self.log.debug(
+            'Got %s highwater offsets from %s brokers', len(highwater_offsets), len(topic_partitions_by_leader)
+        )
+        return highwater_offsets, cluster_id
+
+    def _get_highwater_consumer(self):
+        if self._highwater_consumer is None:
+            self._highwater_consumer = self.__create_consumer(HIGHWATER_CONSUMER_GROUP)
+            self.log.debug("Consumer instance %s created for highwater offsets", self._highwater_consumer)
+
+        return self._highwater_consumer
+
+    def close_highwater_consumer(self):
+        if self._highwater_consumer is not None:
+            self.log.debug("Closing consumer instance %s", self._highwater_consumer)
+            self._highwater_consumer.close()
+            self._highwater_consumer = None
+
     def get_partitions_for_topic(self, topic):
         if partitions := self.topic_partition_cache.get(topic):
             return partitions
@@ -22,6 +22,7 @@ class KafkaConfig:
         self._monitor_all_broker_highwatermarks = is_affirmative(
             instance.get('monitor_all_broker_highwatermarks', False)
         )
+        self._shared_highwater_consumer = is_affirmative(instance.get('shared_highwater_consumer', False))
         self._consumer_groups = instance.get('consumer_groups', {})
         self._consumer_groups_regex = instance.get('consumer_groups_regex', {})
 
@@ -56,6 +56,10 @@ def instance_security_protocol():
     return 'PLAINTEXT'
 
 
+def instance_shared_highwater_consumer():
+    return False
+
+
 def instance_tls_validate_hostname():
     return True
 
@@ -68,6 +68,7 @@ class InstanceConfig(BaseModel):
     sasl_plain_username: Optional[str] = None
     security_protocol: Optional[str] = None
     service: Optional[str] = None
+    shared_highwater_consumer: Optional[bool] = None
     tags: Optional[tuple[str, ...]] = None
     tls_ca_cert: Optional[str] = None
     tls_cert: Optional[str] = None
@@ -5,6 +5,12 @@ DEFAULT_KAFKA_TIMEOUT = 5
 
 CONTEXT_UPPER_BOUND = 500
 
+# Group id of the long-lived consumer used to query highwater offsets, it never joins the group nor commits offsets
+HIGHWATER_CONSUMER_GROUP = 'datadog-agent'
+
+# Maximum number of brokers queried concurrently for highwater offsets
+MAX_HIGHWATER_OFFSET_WORKERS = 10
+
 # No sense fetching highwater offsets for internal topics
 KAFKA_INTERNAL_TOPICS = {
     '__consumer_offsets',
@@ -1,15 +1,18 @@
 # (C) Datadog, Inc. 2019-present
 # All rights reserved
 # Licensed under Simplified BSD License (see LICENSE)
-import json
-from collections import defaultdict
 from time import time
 
 from datadog_checks.base import AgentCheck, is_affirmative
+from datadog_checks.kafka_consumer.broker_timestamps import BrokerTimestamps
 from datadog_checks.kafka_consumer.client import KafkaClient
 from datadog_checks.kafka_consumer.config import KafkaConfig
 
 MAX_TIMESTAMPS = 1000
+# Number of check runs between two full snapshots of the broker timestamps, other runs only persist a journal
+BROKER_TIMESTAMPS_SNAPSHOT_INTERVAL = 30
+BROKER_TIMESTAMPS_CACHE_KEY = 'broker_timestamps_'
+BROKER_TIMESTAMPS_JOURNAL_CACHE_KEY = 'broker_timestamps_journal_'
 
 
 class KafkaCheck(AgentCheck):
@@ -21,6 +24,7 @@ class KafkaCheck(AgentCheck):
         self._context_limit = self.config._context_limit
         self._data_streams_enabled = is_affirmative(self.instance.get('data_streams_enabled', False))
         self._max_timestamps = int(self.instance.get('timestamp_history_size', MAX_TIMESTAMPS))
+        self._broker_timestamps = None
         self.client = KafkaClient(self.config, self.log)
         self.check_initializations.insert(0, self.config.validate_config)
 
@@ -47,18 +51,18 @@ class KafkaCheck(AgentCheck):
 
         # Fetch the broker highwater offsets
         highwater_offsets = {}
-        broker_timestamps = defaultdict(dict)
         cluster_id = ""
-        persistent_cache_key = "broker_timestamps_"
         try:
             if len(consumer_offsets) < self._context_limit:
                 # Fetch highwater offsets
                 # Expected format: ({(topic, partition): offset}, cluster_id)
                 highwater_offsets, cluster_id = self.client.get_highwater_offsets(consumer_offsets)
+                self.report_highwater_offsets_timings()
                 if self._data_streams_enabled:
-                    broker_timestamps = self._load_broker_timestamps(persistent_cache_key)
-                    self._add_broker_timestamps(broker_timestamps, highwater_offsets)
-                    self._save_broker_timestamps(broker_timestamps, persistent_cache_key)
+                    if self._broker_timestamps is None:
+                        self._broker_timestamps = self._load_broker_timestamps()
+                    self._broker_timestamps.add_highwater_offsets(highwater_offsets, time())
+                    self._save_broker_timestamps()
             else:
                 self.warning("Context limit reached. Skipping highwater offset collection.")
         except Exception:
@@ -66,6 +70,7 @@ class KafkaCheck(AgentCheck):
             # Unlike consumer offsets, fail immediately because we can't calculate consumer lag w/o highwater_offsets
             if self.config._close_admin_client:
                 self.client.close_admin_client()
+            self.client.close_highwater_consumer()
             raise
 
         total_contexts = len(consumer_offsets) + len(highwater_offsets)
@@ -89,34 +94,53 @@ class KafkaCheck(AgentCheck):
             consumer_offsets,
             highwater_offsets,
             self._context_limit - len(highwater_offsets),
-            broker_timestamps,
+            self._broker_timestamps,
             cluster_id,
         )
         if self.config._close_admin_client:
             self.client.close_admin_client()
 
-    def _load_broker_timestamps(self, persistent_cache_key):
+    def cancel(self):
+        self.client.close_highwater_consumer()
+
+    def report_highwater_offsets_timings(self):
+        """Report the time spent fetching the cluster metadata and the highwater offsets."""
+        for phase, elapsed in self.client.highwater_offsets_timings.items():
+            self.gauge(
+                'dd.kafka_consumer.highwater_offsets.{}.time'.format(phase),
+                elapsed * 1000,
+                tags=self.config._custom_tags,
+                raw=True,
+            )
+
+    def _load_broker_timestamps(self):
         """Loads broker timestamps from persistent cache."""
-        broker_timestamps = defaultdict(dict)
-        try:
-            for topic_partition, content in json.loads(self.read_persistent_cache(persistent_cache_key)).items():
-                for offset, timestamp in content.items():
-                    broker_timestamps[topic_partition][int(offset)] = timestamp
-        except Exception as e:
-            self.log.warning('Could not read broker timestamps from cache: %s', str(e))
+        broker_timestamps = BrokerTimestamps(self._max_timestamps)
+        for key in (BROKER_TIMESTAMPS_CACHE_KEY, BROKER_TIMESTAMPS_JOURNAL_CACHE_KEY):
+            try:
+                value = self.read_persistent_cache(key)
+                broker_timestamps.load(value)
+            except Exception as e:
+                self.log.warning('Could not read broker timestamps from cache: %s', str(e))
+                continue
+
+            # The next journal would overwrite the loaded one, so the next save writes a full snapshot
+            if key == BROKER_TIMESTAMPS_JOURNAL_CACHE_KEY and value:
+                broker_timestamps.snapshot_outdated = True
         return broker_timestamps
 
-    def _add_broker_timestamps(self, broker_timestamps, highwater_offsets):
-        for (topic, partition), highwater_offset in highwater_offsets.items():
-            timestamps = broker_timestamps["{}_{}".format(topic, partition)]
-            timestamps[highwater_offset] = time()
-            # If there's too many timestamps, we delete the oldest
-            if len(timestamps) > self._max_timestamps:
-                del timestamps[min(timestamps)]
+    def _save_broker_timestamps(self):
+        """Saves broker timestamps to persistent cache.
 
-    def _save_broker_timestamps(self, broker_timestamps, persistent_cache_key):
-        """Saves broker timestamps to persistent cache."""
-        self.write_persistent_cache(persistent_cache_key, json.dumps(broker_timestamps))
+        A full snapshot is only written every `BROKER_TIMESTAMPS_SNAPSHOT_INTERVAL` runs, other runs only write
+        the entries added since the last snapshot, unless the snapshot misses entries that were loaded from a journal.
+        """
+        broker_timestamps = self._broker_timestamps
+        if broker_timestamps.snapshot_outdated or broker_timestamps.pending_runs >= BROKER_TIMESTAMPS_SNAPSHOT_INTERVAL:
+            self.write_persistent_cache(BROKER_TIMESTAMPS_CACHE_KEY, broker_timestamps.serialize())
+            self.write_persistent_cache(BROKER_TIMESTAMPS_JOURNAL_CACHE_KEY, '')
+        else:
+            self.write_persistent_cache(BROKER_TIMESTAMPS_JOURNAL_CACHE_KEY, broker_timestamps.serialize_pending())
 
     def report_highwater_offsets(self, highwater_offsets, contexts_limit, cluster_id):
         """Report the broker highwater offsets."""
@@ -194,13 +218,15 @@ class KafkaCheck(AgentCheck):
                     self.send_event(title, message, consumer_group_tags, 'consumer_lag', key, severity="error")
                     self.log.debug(message)
 
-                if not self._data_streams_enabled:
+                if not self._data_streams_enabled or broker_timestamps is None:
                     continue
 
-                timestamps = broker_timestamps["{}_{}".format(topic, partition)]
+                timestamps = broker_timestamps.get(topic, partition)
+                if timestamps is None:
+                    continue
                 # The producer timestamp can be not set if there was an error fetching broker offsets.
-                producer_timestamp = timestamps.get(producer_offset, None)
-                consumer_timestamp = _get_interpolated_timestamp(timestamps, consumer_offset)
+                producer_timestamp = timestamps.get(producer_offset)
+                consumer_timestamp = timestamps.interpolate(consumer_offset)
                 if consumer_timestamp is None or producer_timestamp is None:
                     continue
                 lag = producer_timestamp - consumer_timestamp
@@ -233,32 +259,3 @@ class KafkaCheck(AgentCheck):
             'aggregation_key': aggregation_key,
         }
         self.event(event_dict)
-
-
-def _get_interpolated_timestamp(timestamps, offset):
-    if offset in timestamps:
-        return timestamps[offset]
-    offsets = timestamps.keys()
-    try:
-        # Get the closest saved offsets to the consumer_offset
-        offset_before = max([o for o in offsets if o < offset])
-        offset_after = min([o for o in offsets if o > offset])
-    except ValueError:
-        if len(offsets) < 2:
-            return None
-        # We couldn't find offsets before and after the current consumer offset.
-        # This happens when you start a consumer to replay data in the past:
-        #   - We provision a consumer at t0 that will start consuming from t1 (t1 << t0).
-        #   - It starts building a history of offset/timestamp pairs from the moment it started to run, i.e. t0.
-        #   - So there is no offset/timestamp pair in the local history between t1 -> t0.
-        # We'll take the min and max offsets available and assume the timestamp is an affine function
-        # of the offset to compute an approximate broker timestamp corresponding to the current consumer offset.
-        offset_before = min(offsets)
-        offset_after = max(offsets)
-
-    # We assume that the timestamp is an affine function of the offset
-    timestamp_before = timestamps[offset_before]
-    timestamp_after = timestamps[offset_after]
-    slope = (timestamp_after - timestamp_before) / float(offset_after - offset_before)
-    timestamp = slope * (offset - offset_after) + timestamp_after
-    return timestamp
@@ -19,6 +19,10 @@ TOPICS = ['marvel', 'dc', 'unconsumed_topic']
 PARTITIONS = [0, 1]
 BROKER_METRICS = ['kafka.broker_offset']
 CONSUMER_METRICS = ['kafka.consumer_offset', 'kafka.consumer_lag']
+TELEMETRY_METRICS = [
+    'dd.kafka_consumer.highwater_offsets.metadata.time',
+    'dd.kafka_consumer.highwater_offsets.offsets.time',
+]
 AUTHENTICATION = os.environ.get('AUTHENTICATION', 'noauth')
 DOCKER_IMAGE_PATH = os.path.join(HERE, 'docker', AUTHENTICATION, "docker-compose.yaml")
 
@@ -107,8 +111,11 @@ def assert_check_kafka(aggregator, consumer_groups):
                     for tag in tags:
                         aggregator.assert_metric_has_tag(mname, tag)
 
+    for mname in TELEMETRY_METRICS:
+        aggregator.assert_metric(mname)
+
     aggregator.assert_all_metrics_covered()
-    aggregator.assert_metrics_using_metadata(get_metadata_metrics())
+    aggregator.assert_metrics_using_metadata(get_metadata_metrics(), exclude=TELEMETRY_METRICS)
 
 
 def assert_check_kafka_has_consumer_group_state_tag(aggregator, consumer_groups):
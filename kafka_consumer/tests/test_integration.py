@@ -34,10 +34,15 @@ def mocked_time():
     return 400
 
 
-def test_check_kafka(aggregator, check, kafka_instance, dd_run_check):
+@pytest.mark.parametrize(
+    'shared_highwater_consumer',
+    [pytest.param(False, id="Consumer per consumer group"), pytest.param(True, id="Shared highwater consumer")],
+)
+def test_check_kafka(aggregator, check, kafka_instance, dd_run_check, shared_highwater_consumer):
     """
     Testing Kafka_consumer check.
     """
+    kafka_instance['shared_highwater_consumer'] = shared_highwater_consumer
     dd_run_check(check(kafka_instance))
     assert_check_kafka(aggregator, kafka_instance['consumer_groups'])
     assert_check_kafka_has_consumer_group_state_tag(aggregator, kafka_instance['consumer_groups'])
@@ -120,7 +125,7 @@ def test_monitor_broker_highwatermarks(
                 count=1,
             )
 
-    aggregator.assert_metrics_using_metadata(get_metadata_metrics())
+    aggregator.assert_metrics_using_metadata(get_metadata_metrics(), exclude=common.TELEMETRY_METRICS)
 
 
 @pytest.mark.flaky
@@ -203,7 +208,7 @@ def test_config(dd_run_check, check, kafka_instance, override, aggregator, expec
     for m in metrics:
         aggregator.assert_metric(m, count=metric_count)
 
-    aggregator.assert_metrics_using_metadata(get_metadata_metrics())
+    aggregator.assert_metrics_using_metadata(get_metadata_metrics(), exclude=common.TELEMETRY_METRICS)
 
 
 @mock.patch('datadog_checks.kafka_consumer.kafka_consumer.time', mocked_time)
@@ -3,6 +3,7 @@
 # Licensed under a 3-clause BSD style license (see LICENSE)
 import concurrent.futures
 import logging
+from array import array
 from contextlib import nullcontext as does_not_raise
 
 import mock
@@ -10,7 +11,7 @@ import pytest
 from confluent_kafka.admin._group import ConsumerGroupListing, ListConsumerGroupsResult
 
 from datadog_checks.kafka_consumer import KafkaCheck
-from datadog_checks.kafka_consumer.kafka_consumer import _get_interpolated_timestamp
+from datadog_checks.kafka_consumer.broker_timestamps import BrokerTimestamps, PartitionTimestamps, _serialize
 
 pytestmark = [pytest.mark.unit]
 
@@ -384,8 +385,136 @@ def test_when_empty_string_consumer_group_then_skip(kafka_instance):
         assert kafka_consumer_check.client._get_consumer_groups() == ["my_consumer"]
 
 
+def test_shared_highwater_consumer(kafka_instance):
+    kafka_instance['shared_highwater_consumer'] = True
+    kafka_instance['consumer_groups'] = {'group1': {'topic1': None}, 'group2': {'topic1': None}}
+    # {topic: {partition: leader}}
+    cluster_topics = {'topic1': {0: 1, 1: 2, 2: -1}, 'topic2': {0: 1}, '__consumer_offsets': {0: 1}}
+    cluster_metadata = mock.MagicMock(cluster_id='cluster_id')
+    cluster_metadata.topics = {
+        topic: mock.MagicMock(partitions={partition: mock.MagicMock(leader=leader) for partition, leader in p.items()})
+        for topic, p in cluster_topics.items()
+    }
+    consumer = mock.MagicMock()
+    consumer.offsets_for_times.side_effect = lambda partitions, timeout: [
+        mock.MagicMock(topic=tp.topic, partition=tp.partition, offset=10, error=None) for tp in partitions
+    ]
+
+    kafka_consumer_check = KafkaCheck('kafka_consumer', {}, [kafka_instance])
+    client = kafka_consumer_check.client
+    consumer_offsets = {
+        ('group1', 'topic1', 0): 1,
+        ('group1', 'topic1', 1): 1,
+        ('group1', 'topic1', 2): 1,
+        ('group2', 'topic1', 0): 1,
+    }
+    with mock.patch.object(client, '_kafka_client') as admin_client, mock.patch(
+        'datadog_checks.kafka_consumer.client.Consumer', return_value=consumer
+    ) as consumer_class:
+        admin_client.list_topics.return_value = cluster_metadata
+        for _ in range(2):
+            highwater_offsets, cluster_id = client.get_highwater_offsets(consumer_offsets)
+
+    assert highwater_offsets == {('topic1', 0): 10, ('topic1', 1): 10}
+    assert cluster_id == 'cluster_id'
+    # A single consumer is reused across check runs, with one metadata fetch and one request per leader each run
+    assert consumer_class.call_count == 1
+    assert admin_client.list_topics.call_count == 2
+    assert consumer.offsets_for_times.call_count == 4
+    assert set(client.highwater_offsets_timings) == {'metadata', 'offsets'}
+
+    kafka_consumer_check.cancel()
+    consumer.close.assert_called_once()
+
+
+def _partition_timestamps(timestamps, max_size=1000):
+    partition_timestamps = PartitionTimestamps()
+    for offset, timestamp in timestamps.items():
+        partition_timestamps.add(offset, timestamp, max_size)
+    return partition_timestamps
+
+
 def test_get_interpolated_timestamp():
-    assert _get_interpolated_timestamp({0: 100, 10: 200}, 5) == 150
-    assert _get_interpolated_timestamp({10: 100, 20: 200}, 5) == 50
-    assert _get_interpolated_timestamp({0: 100, 10: 200}, 15) == 250
-    assert _get_interpolated_timestamp({10: 200}, 15) is None
+    assert _partition_timestamps({0: 100, 10: 200}).interpolate(5) == 150
+    assert _partition_timestamps({10: 100, 20: 200}).interpolate(5) == 50
+    assert _partition_timestamps({0: 100, 10: 200}).interpolate(15) == 250
+    assert _partition_timestamps({10: 200}).interpolate(15) is None
+    assert _partition_timestamps({10: 200}).interpolate(10) == 200
+    assert _partition_timestamps({0: 100, 10: 200, 20: 400}).interpolate(15) == 300
+
+
+def test_partition_timestamps_evicts_lowest_offsets():
+    timestamps = _partition_timestamps({offset: offset * 10 for offset in range(100)}, max_size=10)
+    # Offsets going backwards are inserted in order, and an already known offset gets its timestamp updated
+    timestamps.add(95, 1, 10)
+    timestamps.add(99, 2, 10)
+
+    assert len(timestamps) == 10
+    assert list(timestamps.items()[0]) == list(range(90, 100))
+    assert timestamps.get(89) is None
+    assert timestamps.get(95) == 1
+    assert timestamps.get(99) == 2
+
+
+def test_broker_timestamps_persistence():
+    broker_timestamps = BrokerTimestamps(3)
+    for run in range(5):
+        broker_timestamps.add_highwater_offsets({('topic_a', 0): run * 10, ('topic_b', 1): 5}, 1000 + run)
+        if run == 2:
+            snapshot = broker_timestamps.serialize()
+    journal = broker_timestamps.serialize_pending()
+    assert broker_timestamps.pending_runs == 2
+
+    restored = BrokerTimestamps(3)
+    restored.load(snapshot)
+    restored.load(journal)
+
+    for key in ('topic_a_0', 'topic_b_1'):
+        assert list(restored.partitions[key].items()[0]) == list(broker_timestamps.partitions[key].items()[0])
+        assert list(restored.partitions[key].items()[1]) == list(broker_timestamps.partitions[key].items()[1])
+    assert restored.get('topic_a', 0).get(40) == 1004
+    assert restored.get('topic_b', 1).get(5) == 1004
+
+
+def test_broker_timestamps_load_repeated_offsets():
+    # Journals written before deduplication hold the same highwater offset once per run of an idle partition
+    journal = _serialize([('topic_a_0', (array('q', [5, 5, 5, 15]), array('d', [1000, 1001, 1002, 1012])))])
+
+    restored = BrokerTimestamps(10)
+    restored.load(journal)
+    restored.add_highwater_offsets({('topic_a', 0): 15}, 1013)
+    restored.add_highwater_offsets({('topic_a', 0): 15}, 1014)
+    assert list(restored.pending['topic_a_0'][0]) == [15]
+    restored.load(restored.serialize_pending())
+
+    partition_timestamps = restored.get('topic_a', 0)
+    assert list(partition_timestamps.items()[0]) == [5, 15]
+    assert partition_timestamps.get(5) == 1002
+    assert partition_timestamps.get(15) == 1014
+    assert partition_timestamps.interpolate(10) == 1008
+
+
+def test_broker_timestamps_reload(check, kafka_instance):
+    kafka_consumer_check = check(kafka_instance)
+    kafka_consumer_check._broker_timestamps = BrokerTimestamps(10)
+    kafka_consumer_check._broker_timestamps.add_highwater_offsets({('topic_a', 0): 10}, 1000)
+    kafka_consumer_check._save_broker_timestamps()
+
+    # The agent restarts before the next snapshot
+    kafka_consumer_check._broker_timestamps = kafka_consumer_check._load_broker_timestamps()
+    kafka_consumer_check._broker_timestamps.add_highwater_offsets({('topic_a', 0): 20}, 1001)
+    kafka_consumer_check._save_broker_timestamps()
+    kafka_consumer_check._broker_timestamps.add_highwater_offsets({('topic_a', 0): 30}, 1002)
+    kafka_consumer_check._save_broker_timestamps()
+
+    restored = kafka_consumer_check._load_broker_timestamps()
+    assert list(restored.get('topic_a', 0).items()[0]) == [10, 20, 30]
+    assert list(restored.get('topic_a', 0).items()[1]) == [1000, 1001, 1002]
+
+
+def test_broker_timestamps_legacy_format():
+    broker_timestamps = BrokerTimestamps(1000)
+    broker_timestamps.load('{"marvel_0": {"40": 200, "25": 150}}')
+
+    assert broker_timestamps.get('marvel', 0).interpolate(30) == pytest.approx(150 + 50 / 3)
+    assert broker_timestamps.get('marvel', 1) is None
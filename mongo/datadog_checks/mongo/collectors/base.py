@@ -17,6 +17,10 @@ class MongoCollector(object):
     """The base collector object, can be considered abstract.
     Used by the mongo check to collect and submit metric of a certain type."""
 
+    # Key of the collector in the `metrics_collection_interval` option, the collectors without one run on every
+    # check run.
+    collection_interval_key = None
+
     def __init__(self, check, tags):
         """
         :param check: An instance of the mongo check class. Required to access specific properties and methods exposed
@@ -29,6 +33,23 @@ class MongoCollector(object):
         self.base_tags = tags
         self.metrics_to_collect = self.check.metrics_to_collect
 
+    @property
+    def name(self):
+        """The name of the collector, e.g. `coll_stats` for the `CollStatsCollector`."""
+        return re.sub(r'(?<!^)(?=[A-Z])', '_', type(self).__name__[: -len('Collector')]).lower()
+
+    @property
+    def key(self):
+        """Identifies the collector across check runs, the same collector can run for multiple databases."""
+        return self.name, getattr(self, 'db_name', None)
+
+    @property
+    def collection_interval(self):
+        """The minimum number of seconds between two collections, or None to collect on every check run."""
+        if self.collection_interval_key is None:
+            return None
+        return self.check._config.metrics_collection_interval.get(self.collection_interval_key)
+
     def collect(self, api):
         """The main method exposed by the collector classes, needs to be implemented by every subclass.
         Performs the actual collection and submission of the metrics."""
@@ -15,6 +15,8 @@ class CollStatsCollector(MongoCollector):
     Note: Collecting those metrics requires that 'collection' is set in the 'additional_metrics' section of the config.
     """
 
+    collection_interval_key = 'collection'
+
     def __init__(self, check, db_name, tags, coll_names=None):
         super(CollStatsCollector, self).__init__(check, tags)
         self.coll_names = coll_names
@@ -27,7 +29,7 @@ class CollStatsCollector(MongoCollector):
     def _get_collections(self, api):
         if self.coll_names:
             return self.coll_names
-        return api.list_authorized_collections(self.db_name)
+        return self.check.list_authorized_collections(api, self.db_name)
 
     def __calculate_oplatency_avg(self, latency_stats):
         """Calculate the average operation latency."""
@@ -13,6 +13,8 @@ class DbStatCollector(MongoCollector):
     You can choose to exclude the database name as a tag using the parameter 'dbstats_tag_dbname'.
     """
 
+    collection_interval_key = 'db_stats'
+
     def __init__(self, check, db_name, dbstats_tag_dbname, tags):
         super(DbStatCollector, self).__init__(check, tags)
         self.db_name = db_name
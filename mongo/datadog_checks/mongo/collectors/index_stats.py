@@ -10,6 +10,8 @@ from datadog_checks.mongo.collectors.base import MongoCollector
 class IndexStatsCollector(MongoCollector):
     """Collect statistics on collection indexes by running the indexStats command."""
 
+    collection_interval_key = 'collections_indexes_stats'
+
     def __init__(self, check, db_name, tags, coll_names=None):
         super(IndexStatsCollector, self).__init__(check, tags)
         self.coll_names = coll_names
@@ -22,7 +24,7 @@ class IndexStatsCollector(MongoCollector):
     def _get_collections(self, api):
         if self.coll_names:
             return self.coll_names
-        return api.list_authorized_collections(self.db_name)
+        return self.check.list_authorized_collections(api, self.db_name)
 
     def collect(self, api):
         coll_names = self._get_collections(api)
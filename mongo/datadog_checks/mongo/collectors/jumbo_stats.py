@@ -13,6 +13,8 @@ class JumboStatsCollector(MongoCollector):
     or number of documents.
     Sometimes, chunks grow beyond their maximum size but cannot be split they are considered 'jumbo'."""
 
+    collection_interval_key = 'jumbo_chunks'
+
     def compatible_with(self, deployment):
         # Can only be run on mongos nodes.
         return isinstance(deployment, MongosDeployment)
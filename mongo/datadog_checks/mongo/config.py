@@ -96,6 +96,17 @@ class MongoConfig(object):
         self.coll_names = instance.get('collections', [])
         self.custom_queries = instance.get("custom_queries", [])
 
+        # Collection interval of the collectors that don't need to run on every check run
+        self.metrics_collection_interval = instance.get('metrics_collection_interval') or {}
+        for key, interval in self.metrics_collection_interval.items():
+            if not isinstance(interval, int) or interval <= 0:
+                raise ConfigurationError(
+                    '`metrics_collection_interval.{}` must be a positive integer, got: {}'.format(key, interval)
+                )
+        self.collectors_max_concurrency = int(instance.get('collectors_max_concurrency', 1))
+        if self.collectors_max_concurrency < 1:
+            raise ConfigurationError('`collectors_max_concurrency` must be greater than or equal to 1')
+
         self._base_tags = list(set(instance.get('tags', [])))
 
         # DBM config options
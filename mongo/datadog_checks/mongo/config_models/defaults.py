@@ -16,6 +16,10 @@ def instance_collections_indexes_stats():
     return False
 
 
+def instance_collectors_max_concurrency():
+    return 1
+
+
 def instance_connection_scheme():
     return 'mongodb'
 
@@ -4,7 +4,9 @@
 from __future__ import division
 
 import json
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 
 from cachetools import TTLCache
@@ -97,6 +99,13 @@ class MongoDb(AgentCheck):
         self.metrics_to_collect = self._build_metric_list_to_collect()
         self.collectors = []
         self.last_states_by_server = {}
+        # Start time of the last collection of every collector, for those with their own collection interval
+        self._last_collection_timestamps = {}
+        # Authorized collections of every database, listed once per check run
+        self._authorized_collections = {}
+        # One lock per database, so that listing the collections of a database doesn't block the other ones
+        self._authorized_collections_locks = {}
+        self._authorized_collections_lock = threading.Lock()
 
         self.deployment_type = None
         self._mongo_version = None
@@ -298,18 +307,88 @@ class MongoDb(AgentCheck):
 
         dbnames = self._get_db_names(tags)
         self.refresh_collectors(deployment, dbnames, tags)
+        self._authorized_collections.clear()
+        collectors = self._get_due_collectors()
+
+        max_workers = min(self._config.collectors_max_concurrency, len(collectors))
+        if max_workers <= 1:
+            for collector in collectors:
+                self._run_collector(collector, tags)
+            return
+
+        # The pymongo client is thread-safe and opens a connection for every concurrent operation
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='mongo-collector') as executor:
+            futures = [executor.submit(self._run_collector, collector, tags) for collector in collectors]
+
+        for future in futures:
+            # Critical failures must bubble up to trigger a CRITICAL service check.
+            future.result()
+
+    def _get_due_collectors(self):
+        """
+        The collectors to run on this check run, the ones with their own collection interval
+        only running once it has elapsed since their last collection.
+        """
+        now = time.time()
+        # Check runs don't start exactly every `min_collection_interval` seconds
+        tolerance = self._config.min_collection_interval / 2
+
+        collectors = []
+        last_collection_timestamps = {}
         for collector in self.collectors:
-            try:
-                collector.collect(self.api_client)
-            except CRITICAL_FAILURE as e:
-                self.log.info(
-                    "Unable to collect logs from collector %s. Some metrics will be missing.", collector, exc_info=True
-                )
-                raise e  # Critical failures must bubble up to trigger a CRITICAL service check.
-            except Exception:
-                self.log.info(
-                    "Unable to collect logs from collector %s. Some metrics will be missing.", collector, exc_info=True
-                )
+            last_collection_timestamp = self._last_collection_timestamps.get(collector.key)
+            interval = collector.collection_interval
+            if (
+                interval
+                and last_collection_timestamp is not None
+                and now - last_collection_timestamp < interval - tolerance
+            ):
+                self.log.debug("Skipping collector %s, its collection interval has not elapsed", collector.name)
+                last_collection_timestamps[collector.key] = last_collection_timestamp
+                continue
+
+            last_collection_timestamps[collector.key] = now
+            collectors.append(collector)
+
+        # Forget about the collectors that are not running anymore
+        self._last_collection_timestamps = last_collection_timestamps
+        return collectors
+
+    def _run_collector(self, collector, tags):
+        start_time = time.time()
+        try:
+            collector.collect(self.api_client)
+        except CRITICAL_FAILURE as e:
+            self.log.info(
+                "Unable to collect logs from collector %s. Some metrics will be missing.", collector, exc_info=True
+            )
+            raise e  # Critical failures must bubble up to trigger a CRITICAL service check.
+        except Exception:
+            self.log.info(
+                "Unable to collect logs from collector %s. Some metrics will be missing.", collector, exc_info=True
+            )
+        finally:
+            collector_tags = tags + ['collector:{}'.format(collector.name)]
+            db_name = getattr(collector, 'db_name', None)
+            if db_name:
+                collector_tags.append('db:{}'.format(db_name))
+            self.histogram(
+                'dd.mongo.collector.time',
+                (time.time() - start_time) * 1000,
+                tags=collector_tags,
+                raw=True,
+            )
+
+    def list_authorized_collections(self, api, db_name):
+        """
+        The authorized collections of a database, listed once per check run for all the collectors.
+        """
+        with self._authorized_collections_lock:
+            db_lock = self._authorized_collections_locks.setdefault(db_name, threading.Lock())
+        with db_lock:
+            if db_name not in self._authorized_collections:
+                self._authorized_collections[db_name] = api.list_authorized_collections(db_name)
+            return self._authorized_collections[db_name]
 
     def _get_db_names(self, tags):
         dbnames, database_count = self._database_autodiscovery.get_databases_and_count()
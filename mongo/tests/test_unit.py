@@ -5,6 +5,8 @@ import copy
 import json
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import nullcontext  # type: ignore
 from urllib.parse import quote_plus
 
@@ -775,3 +777,99 @@ def seed_mock_client():
 def load_json_fixture(name):
     with open(os.path.join(common.HERE, "fixtures", name), 'r') as f:
         return json.load(f)
+
+
+def test_collectors_own_collection_interval(aggregator, check, instance, dd_run_check):
+    instance['additional_metrics'] = ['collection']
+    instance['collections'] = ['bar', 'foo']
+    instance['collections_indexes_stats'] = True
+    instance['metrics_collection_interval'] = {'collection': 60}
+    check = check(instance)
+
+    with mock_pymongo("standalone"), mock.patch('time.time', return_value=1000):
+        dd_run_check(check)
+    collection_count = len(aggregator.metrics('mongodb.collection.size'))
+    index_count = len(aggregator.metrics('mongodb.collection.indexes.accesses.ops'))
+    assert collection_count and index_count
+
+    # The collection metrics are not collected again before their interval elapsed
+    with mock_pymongo("standalone"), mock.patch('time.time', return_value=1015):
+        dd_run_check(check)
+    assert len(aggregator.metrics('mongodb.collection.size')) == collection_count
+    assert len(aggregator.metrics('mongodb.collection.indexes.accesses.ops')) == 2 * index_count
+
+    with mock_pymongo("standalone"), mock.patch('time.time', return_value=1059):
+        dd_run_check(check)
+    assert len(aggregator.metrics('mongodb.collection.size')) == 2 * collection_count
+
+
+def test_collectors_max_concurrency(aggregator, check, instance, dd_run_check):
+    instance['additional_metrics'] = ['collection']
+    instance['collections'] = ['bar', 'foo']
+    instance['collections_indexes_stats'] = True
+
+    with mock_pymongo("standalone"):
+        dd_run_check(check(instance))
+    expected = sorted(
+        (m.name, m.value, tuple(sorted(m.tags)))
+        for name in aggregator.metric_names
+        if not name.startswith('dd.')
+        for m in aggregator.metrics(name)
+    )
+    aggregator.reset()
+
+    instance['collectors_max_concurrency'] = 4
+    with mock_pymongo("standalone"):
+        dd_run_check(check(instance))
+    collected = sorted(
+        (m.name, m.value, tuple(sorted(m.tags)))
+        for name in aggregator.metric_names
+        if not name.startswith('dd.')
+        for m in aggregator.metrics(name)
+    )
+
+    assert collected == expected
+    for collector in ('server_status', 'coll_stats', 'index_stats'):
+        aggregator.assert_metric_has_tag('dd.mongo.collector.time', 'collector:{}'.format(collector))
+    aggregator.assert_metric_has_tag('dd.mongo.collector.time', 'db:test')
+
+
+def test_list_authorized_collections(check, instance):
+    check = check(instance)
+    listed_other_db = threading.Event()
+
+    def list_authorized_collections(db_name):
+        if db_name == 'test':
+            # The collections of another database are listed in the meantime
+            assert listed_other_db.wait(5)
+        else:
+            listed_other_db.set()
+        return ['{}_collection'.format(db_name)]
+
+    api = mock.Mock()
+    api.list_authorized_collections.side_effect = list_authorized_collections
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        test_collections = executor.submit(check.list_authorized_collections, api, 'test')
+        other_collections = executor.submit(check.list_authorized_collections, api, 'other')
+        assert test_collections.result() == ['test_collection']
+        assert other_collections.result() == ['other_collection']
+
+    # The collections are only listed once per database
+    assert check.list_authorized_collections(api, 'test') == ['test_collection']
+    assert api.list_authorized_collections.call_count == 2
+
+
+def test_collectors_max_concurrency_critical_failure(aggregator, check, instance, dd_run_check):
+    instance['collectors_max_concurrency'] = 4
+    check = check(instance)
+
+    with mock_pymongo("standalone"):
+        dd_run_check(check)
+        with mock.patch(
+            'datadog_checks.mongo.collectors.ServerStatusCollector.collect',
+            side_effect=ConnectionFailure('Service not available'),
+        ):
+            with pytest.raises(Exception, match='Service not available'):
+                dd_run_check(check)
+
+    aggregator.assert_service_check('mongodb.can_connect', MongoDb.CRITICAL)
@@ -171,3 +171,30 @@ def test_database_autodiscovery_dbnames_deprecation(instance_user):
     assert config.database_autodiscovery_config is not None
     assert config.database_autodiscovery_config['enabled'] is True
     assert config.database_autodiscovery_config['include'] == ['test$', 'integration$']
+
+
+def test_metrics_collection_interval_null(instance):
+    instance['metrics_collection_interval'] = None
+    config = MongoConfig(instance, mock.Mock())
+    assert config.metrics_collection_interval == {}
+
+
+@pytest.mark.parametrize(
+    'options, message',
+    [
+        pytest.param(
+            {'metrics_collection_interval': {'collection': 0}},
+            '`metrics_collection_interval.collection` must be a positive integer',
+            id='interval',
+        ),
+        pytest.param(
+            {'collectors_max_concurrency': 0},
+            '`collectors_max_concurrency` must be greater than or equal to 1',
+            id='concurrency',
+        ),
+    ],
+)
+def test_invalid_collectors_options(instance, options, message):
+    instance.update(options)
+    with pytest.raises(ConfigurationError, match=message):
+        MongoConfig(instance, mock.Mock())
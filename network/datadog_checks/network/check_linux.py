@@ -3,6 +3,7 @@
 # Licensed under Simplified BSD License (see LICENSE)
 import os
 import socket
+from collections import Counter
 
 from six import PY3, iteritems
 
@@ -10,7 +11,7 @@ from datadog_checks.base import is_affirmative
 from datadog_checks.base.utils.common import pattern_filter
 from datadog_checks.base.utils.subprocess_output import SubprocessOutputEmptyError, get_subprocess_output
 from datadog_checks.network import ethtool
-from datadog_checks.network.const import ENA_METRIC_NAMES, ENA_METRIC_PREFIX
+from datadog_checks.network.const import ENA_METRIC_NAMES, ENA_METRIC_PREFIX, PROC_NET_TCP_STATES
 
 from . import Network
 
@@ -27,6 +28,7 @@ class LinuxNetwork(Network):
     def __init__(self, name, init_config, instances):
         super(LinuxNetwork, self).__init__(name, init_config, instances)
         self._collect_cx_queues = self.instance.get('collect_connection_queues', False)
+        self._read_cx_state_from_procfs = is_affirmative(self.instance.get('read_connection_state_from_procfs', False))
 
     def check(self, _):
         """
@@ -43,7 +45,12 @@ class LinuxNetwork(Network):
         self._get_iface_sys_metrics(custom_tags)
         net_proc_base_location = self.get_net_proc_base_location(proc_location)
 
-        if self.is_collect_cx_state_runnable(net_proc_base_location):
+        collected_cx_state = (
+            self._collect_cx_state
+            and self._read_cx_state_from_procfs
+            and self._collect_cx_state_from_procfs(net_proc_base_location, custom_tags)
+        )
+        if not collected_cx_state and self.is_collect_cx_state_runnable(net_proc_base_location):
             try:
                 self.log.debug("Using `ss` to collect connection state")
                 # Try using `ss` for increased performance over `netstat`
@@ -382,6 +389,66 @@ class LinuxNetwork(Network):
         except SubprocessOutputEmptyError:
             self.log.debug("Couldn't use %s to get conntrack stats", conntrack_path)
 
+    def _collect_cx_state_from_procfs(self, net_proc_base_location, custom_tags):
+        """
+        Count the connections by state, and optionally collect their queues, in a single pass over the sockets
+        listed by procfs. Return False if they could not be read.
+        """
+        metrics = self._get_metrics()
+        tcp_states = self.tcp_states['ss']
+        for ip_version in ['4', '6']:
+            suffix = '' if ip_version == '4' else '6'
+            tcp_path = os.path.join(net_proc_base_location, 'net', 'tcp' + suffix)
+            udp_path = os.path.join(net_proc_base_location, 'net', 'udp' + suffix)
+            try:
+                udp_connections = sum(1 for _ in self._read_proc_net_sockets(udp_path))
+                states = Counter()
+                for state, queues in self._read_proc_net_sockets(tcp_path):
+                    states[state] += 1
+                    if self._collect_cx_queues:
+                        state = PROC_NET_TCP_STATES.get(state)
+                        if state in tcp_states:
+                            # tx_queue:rx_queue
+                            sendq, _, recvq = queues.partition(':')
+                            tags = custom_tags + ["state:" + tcp_states[state]]
+                            self.histogram('system.net.tcp.recv_q', int(recvq, 16), tags)
+                            self.histogram('system.net.tcp.send_q', int(sendq, 16), tags)
+            except IOError as e:
+                # Without IPv6 support the IPv6 files don't exist, there are no such connections
+                if ip_version == '4':
+                    self.log.debug("Unable to read the connection states from procfs: %s", e)
+                    return False
+                self.log.debug("Unable to read the IPv6 connection states from procfs: %s", e)
+                continue
+
+            metrics[self.cx_state_gauge[('udp{}'.format(ip_version), 'connections')]] = udp_connections
+            proto = "tcp{0}".format(ip_version)
+            for state, count in iteritems(states):
+                state = PROC_NET_TCP_STATES.get(state)
+                if state in tcp_states:
+                    metrics[self.cx_state_gauge[proto, tcp_states[state]]] += count
+
+        for metric, value in iteritems(metrics):
+            self.gauge(metric, value, tags=custom_tags)
+
+        return True
+
+    @staticmethod
+    def _read_proc_net_sockets(path):
+        """
+        Yield the hexadecimal state and the `tx_queue:rx_queue` field of every socket listed in `path`.
+        """
+        #   sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode
+        #    0: 0100007F:0CEA 00000000:0000 0A 00000000:00000000 00:00000000 00000000   999        0 21830 1 ...
+        with open(path, 'r') as f:
+            # Skip the header
+            next(f, None)
+            for line in f:
+                fields = line.split(None, 5)
+                if len(fields) < 5:
+                    continue
+                yield fields[3], fields[4]
+
     def _parse_short_state_lines(self, lines, metrics, tcp_states, ip_version):
         for line in lines:
             value, state = line.split()
@@ -52,6 +52,10 @@ def instance_min_collection_interval():
     return 15
 
 
+def instance_read_connection_state_from_procfs():
+    return False
+
+
 def instance_use_sudo_conntrack():
     return True
 
@@ -49,6 +49,7 @@ class InstanceConfig(BaseModel):
     excluded_interfaces: Optional[tuple[str, ...]] = None
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    read_connection_state_from_procfs: Optional[bool] = None
     service: Optional[str] = None
     tags: Optional[tuple[str, ...]] = None
     use_sudo_conntrack: Optional[bool] = None
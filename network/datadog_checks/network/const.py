@@ -19,6 +19,23 @@ SOLARIS_TCP_METRICS = [
     (re.compile(r"\s*tcpInSegs\s*=\s*(\d+)\s*"), "system.net.tcp.out_segs"),
 ]
 
+# TCP states of the sockets listed in /proc/net/tcp and /proc/net/tcp6, named like `ss` does
+# https://github.com/torvalds/linux/blob/master/include/net/tcp_states.h
+PROC_NET_TCP_STATES = {
+    '01': 'ESTAB',
+    '02': 'SYN-SENT',
+    '03': 'SYN-RECV',
+    '04': 'FIN-WAIT-1',
+    '05': 'FIN-WAIT-2',
+    '06': 'TIME-WAIT',
+    '07': 'UNCONN',
+    '08': 'CLOSE-WAIT',
+    '09': 'LAST-ACK',
+    '0A': 'LISTEN',
+    '0B': 'CLOSING',
+    '0C': 'SYN-RECV',
+}
+
 # constants for extracting ethtool data via ioctl
 SIOCETHTOOL = 0x8946
 ETHTOOL_GDRVINFO = 0x00000003
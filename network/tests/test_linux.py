@@ -334,3 +334,42 @@ def test_proc_net_metrics(aggregator):
         aggregator.assert_metric(metric, value=value)
 
     aggregator.assert_metrics_using_metadata(get_metadata_metrics(), check_submission_type=True)
+
+
+def test_cx_state_procfs(aggregator):
+    instance = copy.deepcopy(common.INSTANCE)
+    instance['collect_connection_state'] = True
+    instance['collect_connection_queues'] = True
+    instance['read_connection_state_from_procfs'] = True
+    check_instance = LinuxNetwork('network', {}, [instance])
+    check_instance.get_net_proc_base_location = lambda x: os.path.join(FIXTURE_DIR, 'procfs')
+
+    with mock.patch('datadog_checks.network.check_linux.get_subprocess_output') as out:
+        check_instance.check({})
+        out.assert_not_called()
+
+    for metric, value in iteritems(CX_STATE_GAUGES_VALUES):
+        aggregator.assert_metric(metric, value=value)
+
+    aggregator.assert_metric('system.net.tcp.send_q', value=16, count=1, tags=['state:established'])
+    aggregator.assert_metric('system.net.tcp.send_q', value=1, count=1, tags=['state:opening'])
+    aggregator.assert_metric('system.net.tcp.recv_q', value=2, count=1, tags=['state:listening'])
+    aggregator.assert_metric('system.net.tcp.recv_q', value=256, count=1, tags=['state:established'])
+    aggregator.assert_metric('system.net.tcp.recv_q', count=13)
+    aggregator.assert_metric('system.net.tcp.send_q', count=13)
+
+
+def test_cx_state_procfs_unavailable(aggregator):
+    instance = copy.deepcopy(common.INSTANCE)
+    instance['collect_connection_state'] = True
+    instance['read_connection_state_from_procfs'] = True
+    check_instance = LinuxNetwork('network', {}, [instance])
+    check_instance.is_collect_cx_state_runnable = lambda x: True
+    check_instance.get_net_proc_base_location = lambda x: os.path.join(FIXTURE_DIR, 'missing')
+
+    # `ss` is used instead
+    with mock.patch('datadog_checks.network.check_linux.get_subprocess_output', side_effect=ss_subprocess_mock):
+        check_instance.check({})
+
+    for metric, value in iteritems(CX_STATE_GAUGES_VALUES):
+        aggregator.assert_metric(metric, value=value)
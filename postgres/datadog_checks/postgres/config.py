@@ -105,6 +105,7 @@ class PostgresConfig:
         # database monitoring adds additional telemetry for query metrics & samples
         self.dbm_enabled = is_affirmative(instance.get('dbm', instance.get('deep_database_monitoring', False)))
         self.full_statement_text_cache_max_size = instance.get('full_statement_text_cache_max_size', 10000)
+        self.obfuscation_cache_max_size = int(instance.get('obfuscation_cache_max_size', 10000))
         self.full_statement_text_samples_per_hour_per_query = instance.get(
             'full_statement_text_samples_per_hour_per_query', 1
         )
@@ -112,6 +112,10 @@ def instance_min_collection_interval():
     return 15
 
 
+def instance_obfuscation_cache_max_size():
+    return 10000
+
+
 def instance_only_custom_queries():
     return False
 
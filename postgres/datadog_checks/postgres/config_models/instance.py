@@ -107,6 +107,8 @@ class DatabaseAutodiscovery(BaseModel):
     exclude: Optional[tuple[str, ...]] = None
     global_view_db: Optional[str] = None
     include: Optional[tuple[str, ...]] = None
+    max_collection_time: Optional[int] = None
+    max_concurrency: Optional[int] = None
     max_databases: Optional[int] = None
     refresh: Optional[int] = None
 
@@ -249,6 +251,7 @@ class InstanceConfig(BaseModel):
     max_relations: Optional[int] = None
     metric_patterns: Optional[MetricPatterns] = None
     min_collection_interval: Optional[float] = None
+    obfuscation_cache_max_size: Optional[int] = None
     obfuscator_options: Optional[ObfuscatorOptions] = None
     only_custom_queries: Optional[bool] = None
     password: Optional[str] = None
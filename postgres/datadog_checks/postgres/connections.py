@@ -5,7 +5,6 @@ import contextlib
 import datetime
 import inspect
 import threading
-import time
 from typing import Callable, Dict
 
 import psycopg2
@@ -70,6 +69,8 @@ class MultiDatabaseConnectionPool(object):
         self.max_conns: int = max_conns
         self._stats = self.Stats()
         self._mu = threading.RLock()
+        # Notified when a connection is given back to the pool
+        self._released = threading.Condition(self._mu)
         self._conns: Dict[str, ConnectionInfo] = {}
 
         if hasattr(inspect, 'signature'):
@@ -107,7 +108,8 @@ class MultiDatabaseConnectionPool(object):
                         self.evict_lru()
                         if timeout is not None and (datetime.datetime.now() - start).total_seconds() > timeout:
                             raise ConnectionPoolFullError(self.max_conns, timeout)
-                        time.sleep(0.01)
+                        # Release the lock so that the threads using a connection can give it back
+                        self._released.wait(0.01)
                         continue
                 self._stats.connection_opened += 1
                 db = self.connect_fn(dbname)
@@ -161,6 +163,7 @@ class MultiDatabaseConnectionPool(object):
                 except KeyError:
                     # if self._get_connection_raw hit an exception, self._conns[dbname] didn't get populated
                     pass
+                self._released.notify_all()
 
     def prune_connections(self):
         """
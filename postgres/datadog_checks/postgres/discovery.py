@@ -13,6 +13,51 @@ AUTODISCOVERY_QUERY: str = """select datname from pg_catalog.pg_database where d
 DEFAULT_EXCLUDES = ["cloudsqladmin", "rdsadmin"]
 DEFAULT_MAX_DATABASES = 100
 DEFAULT_REFRESH = 600
+DEFAULT_MAX_CONCURRENCY = 1
+DEFAULT_MAX_COLLECTION_TIME = 0
+# Number of consecutive collections over budget after which a database starts being skipped
+MAX_OVERRUNS = 3
+# Maximum number of consecutive check runs a database can be skipped for
+MAX_SKIPPED_RUNS = 32
+
+
+class DatabaseCollectionBudget(object):
+    """
+    Tracks how long the collection of every autodiscovered database takes. A database whose collection exceeds
+    `max_time_ms` `MAX_OVERRUNS` times in a row is skipped for a number of check runs which doubles every time it
+    goes over budget again, up to `MAX_SKIPPED_RUNS`. A collection within budget resets its state.
+    """
+
+    def __init__(self, max_time_ms: int) -> None:
+        self.max_time_ms = max_time_ms
+        self._overruns: Dict[str, int] = {}
+        self._skipped_runs: Dict[str, int] = {}
+        self._remaining_skips: Dict[str, int] = {}
+
+    def should_skip(self, key: str) -> bool:
+        remaining = self._remaining_skips.get(key)
+        if not remaining:
+            return False
+
+        self._remaining_skips[key] = remaining - 1
+        return True
+
+    def record(self, key: str, elapsed_ms: float) -> int:
+        """
+        Record the collection time of a database, return the number of check runs it will be skipped for.
+        """
+        if not self.max_time_ms or elapsed_ms <= self.max_time_ms:
+            self._overruns.pop(key, None)
+            self._skipped_runs.pop(key, None)
+            return 0
+
+        overruns = self._overruns[key] = self._overruns.get(key, 0) + 1
+        if overruns < MAX_OVERRUNS and key not in self._skipped_runs:
+            return 0
+
+        skipped_runs = self._skipped_runs[key] = min(self._skipped_runs.get(key, 1) * 2, MAX_SKIPPED_RUNS)
+        self._remaining_skips[key] = skipped_runs
+        return skipped_runs
 
 
 class PostgresAutodiscovery(Discovery):
@@ -36,6 +81,10 @@ class PostgresAutodiscovery(Discovery):
         self._log = self._check.log
         self.db_pool = self._check.db_pool
         self._max_databases = autodiscovery_config.get("max_databases", DEFAULT_MAX_DATABASES)
+        self.max_concurrency = max(1, autodiscovery_config.get("max_concurrency", DEFAULT_MAX_CONCURRENCY))
+        self.budget = DatabaseCollectionBudget(
+            autodiscovery_config.get("max_collection_time", DEFAULT_MAX_COLLECTION_TIME)
+        )
         self._cache_filtered = []
 
     def get_items(self) -> List[str]:
@@ -0,0 +1,84 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+import threading
+
+from cachetools import LRUCache
+
+from datadog_checks.base.utils.db.sql import compute_sql_signature
+from datadog_checks.base.utils.db.utils import obfuscate_sql_with_metadata
+
+
+class _EvictionTrackingLRUCache(LRUCache):
+    def __init__(self, maxsize):
+        super(_EvictionTrackingLRUCache, self).__init__(maxsize=maxsize)
+        self.evictions = 0
+
+    def popitem(self):
+        item = super(_EvictionTrackingLRUCache, self).popitem()
+        self.evictions += 1
+        return item
+
+
+class ObfuscationCache:
+    """Maintains a bounded LRU cache of obfuscated statements keyed by their raw query text.
+
+    The cache is shared between the statement metrics and the statement samples jobs, which run in
+    separate threads, so every access to the underlying cache is done while holding a lock. Failed
+    obfuscations are never cached, so their errors are reported on every collection."""
+
+    def __init__(self, max_size):
+        self._max_size = max_size
+        self._cache = _EvictionTrackingLRUCache(max_size) if max_size > 0 else None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def obfuscate(self, query, obfuscate_options):
+        """Returns the obfuscated query, its signature, and its tables, commands & comments metadata."""
+        cache = self._cache
+        if cache is not None:
+            with self._lock:
+                statement = cache.get(query)
+                if statement is not None:
+                    self._hits += 1
+                    return statement
+                self._misses += 1
+
+        # Obfuscation is done outside of the lock so that the other job is never blocked on it
+        obfuscated = obfuscate_sql_with_metadata(query, obfuscate_options)
+        obfuscated_query = obfuscated['query']
+        metadata = obfuscated['metadata']
+        statement = (
+            obfuscated_query,
+            compute_sql_signature(obfuscated_query),
+            metadata.get('tables', None),
+            metadata.get('commands', None),
+            metadata.get('comments', None),
+        )
+
+        if cache is not None:
+            with self._lock:
+                cache[query] = statement
+
+        return statement
+
+    def get_stats(self):
+        """Returns the hits, misses and evictions since the last call along with the current size & hit rate."""
+        with self._lock:
+            hits, misses = self._hits, self._misses
+            evictions = self._cache.evictions if self._cache is not None else 0
+            size = len(self._cache) if self._cache is not None else 0
+            self._hits = 0
+            self._misses = 0
+            if self._cache is not None:
+                self._cache.evictions = 0
+
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'evictions': evictions,
+            'size': size,
+            'hit_rate': hits / lookups if lookups else 0,
+        }
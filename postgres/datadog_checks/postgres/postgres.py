@@ -5,6 +5,8 @@ import contextlib
 import copy
 import functools
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor, wait
 from time import time
 
 import psycopg2
@@ -26,6 +28,7 @@ from datadog_checks.postgres.cursor import CommenterCursor, CommenterDictCursor
 from datadog_checks.postgres.discovery import PostgresAutodiscovery
 from datadog_checks.postgres.metadata import PostgresMetadata
 from datadog_checks.postgres.metrics_cache import PostgresMetricsCache
+from datadog_checks.postgres.obfuscation_cache import ObfuscationCache
 from datadog_checks.postgres.relationsmanager import (
     DYNAMIC_RELATION_QUERIES,
     INDEX_BLOAT,
@@ -81,6 +84,9 @@ except ImportError:
     from ..stubs import datadog_agent
 
 MAX_CUSTOM_RESULTS = 100
+# Number of rows fetched at once when consuming the results of a scope query. The cursors are client-side, so
+# libpq still holds the whole result set: only the limit pushed into the query bounds its size.
+FETCH_BATCH_SIZE = 100
 
 PG_SETTINGS_QUERY = "SELECT name, setting FROM pg_settings WHERE name IN (%s, %s, %s)"
 
@@ -126,6 +132,7 @@ class PostgreSql(AgentCheck):
         self._warnings_by_code = {}
         self.db_pool = MultiDatabaseConnectionPool(self._new_connection, self._config.max_connections)
         self.metrics_cache = PostgresMetricsCache(self._config)
+        self.obfuscation_cache = ObfuscationCache(self._config.obfuscation_cache_max_size)
         self.statement_metrics = PostgresStatementMetrics(self, self._config, shutdown_callback=self._close_db_pool)
         self.statement_samples = PostgresStatementSamples(self, self._config, shutdown_callback=self._close_db_pool)
         self.metadata_samples = PostgresMetadata(self, self._config, shutdown_callback=self._close_db_pool)
@@ -141,6 +148,8 @@ class PostgreSql(AgentCheck):
         self.tags_without_db = [t for t in copy.copy(self.tags) if not t.startswith("db:")]
         self.autodiscovery = self._build_autodiscovery()
         self._dynamic_queries = []
+        # query executors of the autodiscovered databases, by database name
+        self._autodiscovery_dynamic_queries = {}
         # _database_instance_emitted: limit the collection and transmission of the database instance metadata
         self._database_instance_emitted = TTLCache(
             maxsize=1,
@@ -371,6 +380,7 @@ class PostgreSql(AgentCheck):
         self.log.debug("Cleaning state")
         self.metrics_cache.clean_state()
         self._dynamic_queries = []
+        self._autodiscovery_dynamic_queries = {}
 
     def _get_debug_tags(self):
         return ['agent_hostname:{}'.format(self.agent_hostname)]
@@ -471,6 +481,22 @@ class PostgreSql(AgentCheck):
     def resolve_db_host(self):
         return agent_host_resolver(self._config.host)
 
+    @staticmethod
+    def _limit_query(query, limit):
+        """
+        Wrap a SELECT query so that the server returns at most `limit + 1` rows, the extra row telling whether
+        the results are truncated. Other statements, including common table expressions since they may modify
+        data, are left untouched.
+        """
+        if limit is None:
+            return query
+
+        statement = query.strip().rstrip(';').rstrip()
+        if ';' in statement or not re.match(r'select\b', statement, re.IGNORECASE):
+            return query
+
+        return 'SELECT * FROM ({}\n) AS limited_results LIMIT {}'.format(statement, limit + 1)
+
     def _run_query_scope(self, cursor, scope, is_custom_metrics, cols, descriptors):
         if scope is None:
             return None
@@ -479,8 +505,14 @@ class PostgreSql(AgentCheck):
         else:
             log_func = self.log.warning
 
-        results = None
         is_relations = scope.get('relation') and self._relations_manager.has_relations
+        if is_custom_metrics:
+            limit = MAX_CUSTOM_RESULTS
+        elif is_relations:
+            limit = self._config.max_relations
+        else:
+            limit = None
+
         try:
             query = fmt.format(scope['query'], metrics_columns=", ".join(cols))
             with tracked_query(check=self, operation='custom_metrics' if is_custom_metrics else scope['name']):
@@ -488,18 +520,17 @@ class PostgreSql(AgentCheck):
                 if is_relations:
                     schema_field = get_schema_field(descriptors)
                     formatted_query = self._relations_manager.filter_relation_query(query, schema_field)
-                    cursor.execute(formatted_query)
+                    cursor.execute(self._limit_query(formatted_query, limit))
                 else:
                     self.log.debug("Running query: %s", str(query))
-                    cursor.execute(query.replace(r'%', r'%%'))
-
-                results = cursor.fetchall()
+                    cursor.execute(self._limit_query(query, limit).replace(r'%', r'%%'))
         except psycopg2.errors.FeatureNotSupported as e:
             # This happens for example when trying to get replication metrics from readers in Aurora. Let's ignore it.
             log_func(e)
             self.log.debug("Disabling replication metrics")
             self.is_aurora = False
             self.metrics_cache.replication_metrics = {}
+            return None
         except psycopg2.errors.UndefinedFunction as e:
             log_func(e)
             log_func(
@@ -507,29 +538,43 @@ class PostgreSql(AgentCheck):
                 "A reattempt to identify the right version will happen on next agent run." % self.version
             )
             self._clean_state()
+            return None
         except (psycopg2.ProgrammingError, psycopg2.errors.QueryCanceled) as e:
             log_func("Not all metrics may be available: %s" % str(e))
-
-        if not results:
             return None
 
-        if is_custom_metrics and len(results) > MAX_CUSTOM_RESULTS:
-            self.log.debug(
-                "Query: %s returned more than %s results (%s). Truncating", query, MAX_CUSTOM_RESULTS, len(results)
-            )
-            results = results[:MAX_CUSTOM_RESULTS]
-
-        if is_relations and len(results) > self._config.max_relations:
-            self.log.debug(
-                "Query: %s returned more than %s results (%s). "
-                "Truncating. You can edit this limit by setting the `max_relations` config option",
-                query,
-                self._config.max_relations,
-                len(results),
-            )
-            results = results[: self._config.max_relations]
+        return self._iter_results(cursor, query, limit, is_relations, log_func)
 
-        return results
+    def _iter_results(self, cursor, query, limit, is_relations, log_func):
+        """
+        Yield the rows of the executed query by batches of `FETCH_BATCH_SIZE`, up to `limit` rows.
+        """
+        num_rows = 0
+        while True:
+            try:
+                rows = cursor.fetchmany(FETCH_BATCH_SIZE)
+            except (psycopg2.ProgrammingError, psycopg2.errors.QueryCanceled) as e:
+                log_func("Not all metrics may be available: %s" % str(e))
+                return
+
+            if not rows:
+                return
+
+            for row in rows:
+                if limit is not None and num_rows >= limit:
+                    if is_relations:
+                        self.log.debug(
+                            "Query: %s returned more than %s results. "
+                            "Truncating. You can edit this limit by setting the `max_relations` config option",
+                            query,
+                            limit,
+                        )
+                    else:
+                        self.log.debug("Query: %s returned more than %s results. Truncating", query, limit)
+                    return
+
+                num_rows += 1
+                yield row
 
     def _query_scope(self, cursor, scope, instance_tags, is_custom_metrics, dbname=None):
         if scope is None:
@@ -542,7 +587,7 @@ class PostgreSql(AgentCheck):
         # to a tag name (e.g. 'schema').
         descriptors = scope['descriptors']
         results = self._run_query_scope(cursor, scope, is_custom_metrics, cols, descriptors)
-        if not results:
+        if results is None:
             return None
 
         # Parse and submit results.
@@ -599,7 +644,8 @@ class PostgreSql(AgentCheck):
 
             num_results += 1
 
-        return num_results
+        # Queries without results are reported like failed ones
+        return num_results or None
 
     def _cache_table_activity(
         self,
@@ -625,11 +671,10 @@ class PostgreSql(AgentCheck):
 
         start_time = time()
         databases = self.autodiscovery.get_items()
-        for db in databases:
-            with self.db_pool.get_connection(db, self._config.idle_connection_timeout) as conn:
-                with conn.cursor(cursor_factory=CommenterCursor) as cursor:
-                    for scope in scopes:
-                        self._query_scope(cursor, scope, instance_tags, False, db)
+        self._run_autodiscovery_collection(
+            scope_type,
+            [(db, functools.partial(self._query_database_scopes, db, instance_tags, scopes)) for db in databases],
+        )
         elapsed_ms = (time() - start_time) * 1000
         self.histogram(
             f"dd.postgres.{scope_type}.time",
@@ -651,6 +696,57 @@ class PostgreSql(AgentCheck):
                 ),
             )
 
+    def _query_database_scopes(self, dbname, instance_tags, scopes):
+        with self.db_pool.get_connection(dbname, self._config.idle_connection_timeout) as conn:
+            with conn.cursor(cursor_factory=CommenterCursor) as cursor:
+                for scope in scopes:
+                    self._query_scope(cursor, scope, instance_tags, False, dbname)
+
+    def _run_autodiscovery_collection(self, scope_type, tasks):
+        """
+        Run the collection of every autodiscovered database, `tasks` being a list of `(dbname, function)` pairs.
+        Up to `max_concurrency` databases are collected at the same time, each with its own connection of the pool.
+        """
+        budget = self.autodiscovery.budget
+        tasks = [(dbname, task) for dbname, task in tasks if not budget.should_skip(f"{scope_type}:{dbname}")]
+        if not tasks:
+            return
+
+        def timed(task):
+            start_time = time()
+            task()
+            return (time() - start_time) * 1000
+
+        max_workers = min(self.autodiscovery.max_concurrency, self._config.max_connections, len(tasks))
+        if max_workers == 1:
+            elapsed = [(dbname, timed(task)) for dbname, task in tasks]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='postgres-autodiscovery') as executor:
+                futures = [(dbname, executor.submit(timed, task)) for dbname, task in tasks]
+                # Wait for all the databases before raising the first error, like a sequential collection would
+                wait([future for _, future in futures])
+                elapsed = [(dbname, future.result()) for dbname, future in futures]
+
+        for dbname, elapsed_ms in elapsed:
+            self.histogram(
+                f"dd.postgres.{scope_type}.database.time",
+                elapsed_ms,
+                tags=self.tags_without_db + ["db:{}".format(dbname)] + self._get_debug_tags(),
+                hostname=self.resolved_hostname,
+                raw=True,
+            )
+            skipped_runs = budget.record(f"{scope_type}:{dbname}", elapsed_ms)
+            if skipped_runs:
+                self.log.warning(
+                    "Collecting %s on database %s took %d ms, which keeps exceeding the `max_collection_time` "
+                    "of %d ms. The database will be skipped for the next %d check runs.",
+                    scope_type,
+                    dbname,
+                    int(elapsed_ms),
+                    budget.max_time_ms,
+                    skipped_runs,
+                )
+
     def _collect_dynamic_queries_autodiscovery(self, queries):
         if not self.autodiscovery:
             return
@@ -660,7 +756,9 @@ class PostgreSql(AgentCheck):
             db = functools.partial(
                 self.db_pool.get_connection, dbname=dbname, ttl_ms=self._config.idle_connection_timeout
             )
-            self._dynamic_queries.append(self._new_query_executor(queries, db=db))
+            query_executor = self._new_query_executor(queries, db=db)
+            self._autodiscovery_dynamic_queries[dbname] = query_executor
+            self._dynamic_queries.append(query_executor)
 
     def _emit_running_metric(self):
         self.gauge("running", 1, tags=self.tags_without_db, hostname=self.resolved_hostname)
@@ -768,8 +866,16 @@ class PostgreSql(AgentCheck):
                     self._query_scope(cursor, scope, instance_tags, True)
 
         if self.dynamic_queries:
+            autodiscovery_queries = list(self._autodiscovery_dynamic_queries.values())
             for dynamic_query in self.dynamic_queries:
-                dynamic_query.execute()
+                if dynamic_query not in autodiscovery_queries:
+                    dynamic_query.execute()
+
+            if self._autodiscovery_dynamic_queries:
+                self._run_autodiscovery_collection(
+                    '_collect_dynamic_queries_autodiscovery',
+                    [(dbname, query.execute) for dbname, query in self._autodiscovery_dynamic_queries.items()],
+                )
 
     def _new_connection(self, dbname):
         if self._config.host == 'localhost' and self._config.password == '':
@@ -960,6 +1066,7 @@ class PostgreSql(AgentCheck):
                 self.statement_metrics.run_job_loop(tags)
                 self.statement_samples.run_job_loop(tags)
                 self.metadata_samples.run_job_loop(tags)
+                self._report_obfuscation_cache_stats()
             if self._config.collect_wal_metrics:
                 # collect wal metrics for pg < 10, disabled by enabled
                 self._collect_wal_metrics()
@@ -990,6 +1097,25 @@ class PostgreSql(AgentCheck):
             # Add the warnings saved during the execution of the check
             self._report_warnings()
 
+    def _report_obfuscation_cache_stats(self):
+        stats = self.obfuscation_cache.get_stats()
+        for name in ('hits', 'misses', 'evictions'):
+            self.count(
+                "dd.postgres.obfuscation_cache.{}".format(name),
+                stats[name],
+                tags=self.tags + self._get_debug_tags(),
+                hostname=self.resolved_hostname,
+                raw=True,
+            )
+        for name in ('size', 'hit_rate'):
+            self.gauge(
+                "dd.postgres.obfuscation_cache.{}".format(name),
+                stats[name],
+                tags=self.tags + self._get_debug_tags(),
+                hostname=self.resolved_hostname,
+                raw=True,
+            )
+
     def _update_tag_sets(self, tags):
         self._non_internal_tags = list(set(self._non_internal_tags) | set(tags))
         self.tags_without_db = list(set(self.tags_without_db) | set(tags))
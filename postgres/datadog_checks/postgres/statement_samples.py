@@ -26,7 +26,6 @@ from datadog_checks.base.utils.db.utils import (
     DBMAsyncJob,
     RateLimitingTTLCache,
     default_json_event_encoding,
-    obfuscate_sql_with_metadata,
 )
 from datadog_checks.base.utils.serialization import json
 from datadog_checks.base.utils.time import get_timestamp
@@ -373,13 +372,13 @@ class PostgresStatementSamples(DBMAsyncJob):
                 obfuscated_query = backend_type
                 normalized_row['query_signature'] = compute_sql_signature(backend_type)
             else:
-                statement = obfuscate_sql_with_metadata(row['query'], self._obfuscate_options)
-                obfuscated_query = statement['query']
-                metadata = statement['metadata']
-                normalized_row['query_signature'] = compute_sql_signature(obfuscated_query)
-                normalized_row['dd_tables'] = metadata.get('tables', None)
-                normalized_row['dd_commands'] = metadata.get('commands', None)
-                normalized_row['dd_comments'] = metadata.get('comments', None)
+                obfuscated_query, query_signature, tables, commands, comments = self._check.obfuscation_cache.obfuscate(
+                    row['query'], self._obfuscate_options
+                )
+                normalized_row['query_signature'] = query_signature
+                normalized_row['dd_tables'] = tables
+                normalized_row['dd_commands'] = commands
+                normalized_row['dd_comments'] = comments
         except Exception as e:
             if self._config.log_unobfuscated_queries:
                 self._log.warning("Failed to obfuscate query=[%s] | err=[%s]", row['query'], e)
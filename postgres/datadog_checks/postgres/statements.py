@@ -12,9 +12,8 @@ from cachetools import TTLCache
 
 from datadog_checks.base import is_affirmative
 from datadog_checks.base.utils.common import to_native_string
-from datadog_checks.base.utils.db.sql import compute_sql_signature
 from datadog_checks.base.utils.db.statement_metrics import StatementMetrics
-from datadog_checks.base.utils.db.utils import DBMAsyncJob, default_json_event_encoding, obfuscate_sql_with_metadata
+from datadog_checks.base.utils.db.utils import DBMAsyncJob, default_json_event_encoding
 from datadog_checks.base.utils.serialization import json
 from datadog_checks.base.utils.tracking import tracked_method
 from datadog_checks.postgres.cursor import CommenterCursor, CommenterDictCursor
@@ -580,7 +579,9 @@ class PostgresStatementMetrics(DBMAsyncJob):
         for row in rows:
             normalized_row = dict(copy.copy(row))
             try:
-                statement = obfuscate_sql_with_metadata(row['query'], self._obfuscate_options)
+                obfuscated_query, query_signature, tables, commands, comments = self._check.obfuscation_cache.obfuscate(
+                    row['query'], self._obfuscate_options
+                )
             except Exception as e:
                 if self._config.log_unobfuscated_queries:
                     self._log.warning("Failed to obfuscate query=[%s] | err=[%s]", row['query'], e)
@@ -588,13 +589,11 @@ class PostgresStatementMetrics(DBMAsyncJob):
                     self._log.debug("Failed to obfuscate query | err=[%s]", e)
                 continue
 
-            obfuscated_query = statement['query']
             normalized_row['query'] = obfuscated_query
-            normalized_row['query_signature'] = compute_sql_signature(obfuscated_query)
-            metadata = statement['metadata']
-            normalized_row['dd_tables'] = metadata.get('tables', None)
-            normalized_row['dd_commands'] = metadata.get('commands', None)
-            normalized_row['dd_comments'] = metadata.get('comments', None)
+            normalized_row['query_signature'] = query_signature
+            normalized_row['dd_tables'] = tables
+            normalized_row['dd_commands'] = commands
+            normalized_row['dd_comments'] = comments
             normalized_rows.append(normalized_row)
 
         return normalized_rows
@@ -5,6 +5,7 @@
 import copy
 import os
 import re
+import threading
 import time
 from contextlib import contextmanager
 
@@ -13,6 +14,7 @@ import psycopg2.sql
 import pytest
 
 from datadog_checks.base import ConfigurationError
+from datadog_checks.postgres.discovery import MAX_OVERRUNS, MAX_SKIPPED_RUNS, DatabaseCollectionBudget
 
 from .common import HOST, PASSWORD_ADMIN, USER_ADMIN, _get_expected_tags
 from .utils import requires_over_13, run_one_check
@@ -298,3 +300,109 @@ def test_autodiscovery_dbname_specified(integration_check, pg_instance):
 
     with pytest.raises(ConfigurationError):
         integration_check(pg_instance)
+
+
+@pytest.mark.integration
+@pytest.mark.usefixtures('dd_environment')
+def test_autodiscovery_max_concurrency(aggregator, integration_check, pg_instance):
+    """
+    Check that metrics get collected for each database discovered when databases are queried concurrently.
+    """
+    pg_instance["database_autodiscovery"] = copy.deepcopy(DISCOVERY_CONFIG)
+    pg_instance["database_autodiscovery"]["max_concurrency"] = 4
+    pg_instance['relations'] = [
+        {'relation_regex': '.*'},
+    ]
+    del pg_instance['dbname']
+
+    check = integration_check(pg_instance)
+    check.check(pg_instance)
+
+    databases = check.autodiscovery.get_items()
+    assert len(databases) == NUM_DOGS_DATABASES - 2
+    for db in databases:
+        relation_metrics_expected_tags = _get_expected_tags(check, pg_instance, db=db, table='breed', schema='public')
+        for metric in RELATION_METRICS:
+            aggregator.assert_metric(metric, tags=relation_metrics_expected_tags)
+        aggregator.assert_metric(
+            'dd.postgres._collect_relations_autodiscovery.database.time',
+            tags=check.tags_without_db + ['db:{}'.format(db)] + check._get_debug_tags(),
+        )
+    assert len(check.db_pool._conns) <= check._config.max_connections
+
+
+@pytest.mark.unit
+def test_autodiscovery_concurrent_collection(integration_check, pg_instance):
+    pg_instance["database_autodiscovery"] = copy.deepcopy(DISCOVERY_CONFIG)
+    pg_instance["database_autodiscovery"]["max_concurrency"] = 4
+    del pg_instance['dbname']
+    check = integration_check(pg_instance)
+
+    barrier = threading.Barrier(4, timeout=5)
+    threads = set()
+
+    def task():
+        # Fails if the 4 databases are not collected at the same time
+        barrier.wait()
+        threads.add(threading.current_thread().name)
+
+    check._run_autodiscovery_collection('test', [('dogs_{}'.format(i), task) for i in range(4)])
+
+    assert len(threads) == 4
+
+
+@pytest.mark.unit
+def test_autodiscovery_collection_budget(integration_check, pg_instance):
+    pg_instance["database_autodiscovery"] = copy.deepcopy(DISCOVERY_CONFIG)
+    pg_instance["database_autodiscovery"]["max_collection_time"] = 10
+    del pg_instance['dbname']
+    check = integration_check(pg_instance)
+
+    collected = []
+
+    def task(dbname):
+        collected.append(dbname)
+        if dbname == 'dogs_slow':
+            time.sleep(0.02)
+
+    def run():
+        del collected[:]
+        check._run_autodiscovery_collection('test', [(db, lambda db=db: task(db)) for db in ('dogs_0', 'dogs_slow')])
+        return list(collected)
+
+    for _ in range(MAX_OVERRUNS):
+        assert run() == ['dogs_0', 'dogs_slow']
+
+    # The slow database is skipped for 2 runs, then for 4 runs once it goes over budget again
+    assert run() == ['dogs_0']
+    assert run() == ['dogs_0']
+    assert run() == ['dogs_0', 'dogs_slow']
+    for _ in range(4):
+        assert run() == ['dogs_0']
+    assert run() == ['dogs_0', 'dogs_slow']
+
+
+@pytest.mark.unit
+def test_database_collection_budget():
+    budget = DatabaseCollectionBudget(100)
+
+    for _ in range(MAX_OVERRUNS - 1):
+        assert budget.record('db', 150) == 0
+    assert budget.record('db', 150) == 2
+    assert budget.should_skip('db')
+    assert budget.should_skip('db')
+    assert not budget.should_skip('db')
+
+    # A collection within budget resets the database state
+    assert budget.record('db', 50) == 0
+    assert budget.record('db', 150) == 0
+
+    for _ in range(10):
+        budget.record('other', 150)
+    assert budget.record('other', 150) == MAX_SKIPPED_RUNS
+
+    # Disabled
+    budget = DatabaseCollectionBudget(0)
+    for _ in range(MAX_OVERRUNS):
+        assert budget.record('db', 1000) == 0
+    assert not budget.should_skip('db')
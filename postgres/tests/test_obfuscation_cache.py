@@ -0,0 +1,55 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+import mock
+import pytest
+
+from datadog_checks.postgres.obfuscation_cache import ObfuscationCache
+
+pytestmark = [pytest.mark.unit]
+
+OBFUSCATE_OPTIONS = '{}'
+
+
+def test_obfuscation_cache_hit():
+    cache = ObfuscationCache(10)
+    first = cache.obfuscate('SELECT * FROM persons', OBFUSCATE_OPTIONS)
+    with mock.patch('datadog_checks.postgres.obfuscation_cache.obfuscate_sql_with_metadata') as obfuscate:
+        second = cache.obfuscate('SELECT * FROM persons', OBFUSCATE_OPTIONS)
+
+    assert not obfuscate.called
+    assert first == second
+    assert first[0] == 'SELECT * FROM persons'
+    assert cache.get_stats() == {'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1, 'hit_rate': 0.5}
+    # statistics are reset once reported
+    assert cache.get_stats() == {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 1, 'hit_rate': 0}
+
+
+def test_obfuscation_cache_eviction():
+    cache = ObfuscationCache(2)
+    for i in range(3):
+        cache.obfuscate('SELECT {}'.format(i), OBFUSCATE_OPTIONS)
+    cache.obfuscate('SELECT 2', OBFUSCATE_OPTIONS)
+
+    assert cache.get_stats() == {'hits': 1, 'misses': 3, 'evictions': 1, 'size': 2, 'hit_rate': 0.25}
+
+
+def test_obfuscation_cache_errors_are_not_cached():
+    cache = ObfuscationCache(10)
+    with mock.patch(
+        'datadog_checks.postgres.obfuscation_cache.obfuscate_sql_with_metadata', side_effect=Exception('failed')
+    ):
+        for _ in range(2):
+            with pytest.raises(Exception):
+                cache.obfuscate('SELECT 1', OBFUSCATE_OPTIONS)
+
+    assert cache.get_stats()['size'] == 0
+    assert cache.obfuscate('SELECT 1', OBFUSCATE_OPTIONS)[0] == 'SELECT 1'
+
+
+def test_obfuscation_cache_disabled():
+    cache = ObfuscationCache(0)
+    cache.obfuscate('SELECT 1', OBFUSCATE_OPTIONS)
+    cache.obfuscate('SELECT 1', OBFUSCATE_OPTIONS)
+
+    assert cache.get_stats() == {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'hit_rate': 0}
@@ -11,6 +11,7 @@ from semver import VersionInfo
 from six import iteritems
 
 from datadog_checks.postgres import PostgreSql, util
+from datadog_checks.postgres.postgres import FETCH_BATCH_SIZE
 
 pytestmark = pytest.mark.unit
 
@@ -177,3 +178,63 @@ def test_resolved_hostname(disable_generic_tags, expected_hostname, pg_instance)
         check = PostgreSql('test_instance', {}, [instance])
         assert check.resolved_hostname == expected_hostname
         assert resolve_db_host_mock.called is True
+
+
+@pytest.mark.parametrize(
+    'query, expected_query',
+    [
+        pytest.param(
+            'SELECT a, b FROM t;',
+            'SELECT * FROM (SELECT a, b FROM t\n) AS limited_results LIMIT 11',
+            id='select with semicolon',
+        ),
+        pytest.param(
+            '\nselect\ta FROM t\n',
+            'SELECT * FROM (select\ta FROM t\n) AS limited_results LIMIT 11',
+            id='lowercase select',
+        ),
+        pytest.param(
+            'WITH x AS (DELETE FROM t RETURNING *) SELECT * FROM x',
+            'WITH x AS (DELETE FROM t RETURNING *) SELECT * FROM x',
+            id='common table expression',
+        ),
+        pytest.param('SELECTED', 'SELECTED', id='not a select keyword'),
+        pytest.param('SHOW data_checksums', 'SHOW data_checksums', id='not a select'),
+        pytest.param('SELECT 1; SELECT 2', 'SELECT 1; SELECT 2', id='multiple statements'),
+    ],
+)
+def test_limit_query(query, expected_query):
+    assert PostgreSql._limit_query(query, 10) == expected_query
+    assert PostgreSql._limit_query(query, None) == query
+
+
+@pytest.mark.parametrize(
+    'num_rows, limit, expected_rows',
+    [
+        pytest.param(0, None, 0, id='no rows'),
+        pytest.param(FETCH_BATCH_SIZE * 3 + 1, None, FETCH_BATCH_SIZE * 3 + 1, id='no limit'),
+        pytest.param(FETCH_BATCH_SIZE * 3 + 1, FETCH_BATCH_SIZE + 1, FETCH_BATCH_SIZE + 1, id='truncated'),
+    ],
+)
+def test_iter_results(integration_check, pg_instance, num_rows, limit, expected_rows):
+    check = integration_check(pg_instance)
+    rows = iter([(i,) for i in range(num_rows)])
+    cursor = mock.MagicMock()
+    cursor.fetchmany.side_effect = lambda size: [row for _, row in zip(range(size), rows)]
+
+    results = check._iter_results(cursor, 'SELECT 1', limit, False, check.log.warning)
+
+    # Rows are only fetched while the results are consumed
+    cursor.fetchmany.assert_not_called()
+    assert list(results) == [(i,) for i in range(expected_rows)]
+    assert cursor.fetchmany.call_count <= expected_rows // FETCH_BATCH_SIZE + 2
+
+
+def test_iter_results_fetch_error(integration_check, pg_instance):
+    check = integration_check(pg_instance)
+    cursor = mock.MagicMock()
+    cursor.fetchmany.side_effect = psycopg2.ProgrammingError('no results to fetch')
+    log_func = mock.MagicMock()
+
+    assert list(check._iter_results(cursor, 'SELECT 1', None, False, log_func)) == []
+    log_func.assert_called_once_with('Not all metrics may be available: no results to fetch')
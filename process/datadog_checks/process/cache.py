@@ -6,6 +6,7 @@ import time
 import psutil
 
 from .lock import ReadWriteLock
+from .matcher import ProcessMatcher
 
 DEFAULT_SHARED_PROCESS_LIST_CACHE_DURATION = 120
 
@@ -17,6 +18,7 @@ class ProcessListCache(object):
     lock = ReadWriteLock()
     last_ts = 0
     cache_duration = DEFAULT_SHARED_PROCESS_LIST_CACHE_DURATION
+    matcher = ProcessMatcher()
 
     def read_lock(self):
         return self.lock.read_lock()
@@ -39,6 +41,7 @@ class ProcessListCache(object):
             if self._should_refresh():
                 self.elements = list(psutil.process_iter(attrs=['pid', 'name']))
                 self.last_ts = time.time()
+                self.matcher.clear()
                 return True
             else:
                 return False
@@ -0,0 +1,193 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under a 3-clause BSD style license (see LICENSE)
+import os
+import re
+import threading
+import weakref
+
+import psutil
+
+# Flags of the patterns that don't set any flag inline
+DEFAULT_FLAGS = re.compile('').flags
+
+
+class ProcessSearch(object):
+    """The processes an instance is looking for, by name or by command line."""
+
+    def __init__(self, search_string, exact_match):
+        self.key = (tuple(search_string), exact_match)
+        self.search_string = list(search_string)
+        self.exact_match = exact_match
+        # FIXME 8.x: All has been deprecated
+        # from the doc, should be removed
+        self.match_all = 'All' in self.search_string
+
+        if os.name == 'nt':
+            self.search_string = [string.lower() for string in self.search_string]
+
+        if exact_match:
+            self.names = set(self.search_string)
+            self.patterns = []
+        else:
+            self.names = set()
+            self.patterns = [re.compile(string) for string in self.search_string]
+
+        # Combining patterns would change the numbering of their groups, and so their backreferences,
+        # and their inline global flags would apply to every other pattern.
+        self.combinable = not any(pattern.groups or pattern.flags != DEFAULT_FLAGS for pattern in self.patterns)
+
+    def matches(self, text):
+        if self.exact_match:
+            return text in self.names
+
+        for pattern in self.patterns:
+            if pattern.search(text):
+                return True
+
+        return False
+
+
+class SearchResult(object):
+    def __init__(self):
+        # PIDs of the matching processes
+        self.pids = set()
+        # PIDs of the processes that could not be inspected
+        self.denied = set()
+
+
+class ProcessMatcher(object):
+    """Matches the processes of the shared process list against the searches of all the instances at once.
+
+    Every process name and command line is read at most once per pass, and the command lines are kept for as long
+    as their process lives. The results of a pass are kept until the process list is refreshed, every instance
+    retrieving its own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Searches of all the instances, the instances keep them alive
+        self._searches = weakref.WeakSet()
+        self._results = weakref.WeakKeyDictionary()
+        # Command line of every process, along with its creation time to detect reused PIDs
+        self._cmdlines = {}
+        self._prefilter = None
+
+    def register(self, search):
+        with self._lock:
+            self._searches.add(search)
+            self._prefilter = None
+
+    def clear(self):
+        """Forget about the results of the previous process list."""
+        with self._lock:
+            self._results.clear()
+
+    def match(self, processes, search):
+        with self._lock:
+            result = self._results.pop(search, None)
+            if result is None:
+                self._searches.add(search)
+                pending = [s for s in self._searches if s not in self._results]
+                self._results.update(self._match(processes, pending))
+                result = self._results.pop(search)
+
+            return result
+
+    def _get_prefilter(self):
+        """A single regular expression matching the command lines that may match any combinable search, or False."""
+        if self._prefilter is None:
+            self._prefilter = self._build_prefilter()
+
+        return self._prefilter
+
+    def _build_prefilter(self):
+        patterns = []
+        for search in self._searches:
+            if search.exact_match or not search.combinable:
+                continue
+            if search.match_all:
+                return False
+            for pattern in search.patterns:
+                patterns.append('(?:{})'.format(pattern.pattern))
+
+        if not patterns:
+            return False
+
+        try:
+            return re.compile('|'.join(patterns))
+        except re.error:
+            return False
+
+    def _get_cmdline(self, process):
+        cached = self._cmdlines.get(process.pid)
+        create_time = process.create_time()
+        if cached is not None and cached[0] == create_time:
+            return cached[1]
+
+        cmdline = ' '.join(process.cmdline())
+        if os.name == 'nt':
+            cmdline = cmdline.lower()
+
+        self._cmdlines[process.pid] = (create_time, cmdline)
+        return cmdline
+
+    def _match(self, processes, searches):
+        results = {search: SearchResult() for search in searches}
+        name_searches = [search for search in searches if search.exact_match and not search.match_all]
+        cmdline_searches = [search for search in searches if not search.exact_match and not search.match_all]
+        all_searches = [search for search in searches if search.match_all]
+        prefilter = self._get_prefilter()
+
+        # The searches whose patterns aren't part of the prefilter check every command line
+        if prefilter:
+            filtered_searches = [search for search in cmdline_searches if search.combinable]
+            unfiltered_searches = [search for search in cmdline_searches if not search.combinable]
+        else:
+            filtered_searches = []
+            unfiltered_searches = cmdline_searches
+
+        alive = set()
+        for process in processes:
+            alive.add(process.pid)
+            for search in all_searches:
+                results[search].pids.add(process.pid)
+
+            for process_searches, read, filtered in (
+                (name_searches, self._read_name, False),
+                (filtered_searches, self._get_cmdline, True),
+                (unfiltered_searches, self._get_cmdline, False),
+            ):
+                if not process_searches:
+                    continue
+
+                try:
+                    text = read(process)
+                except psutil.NoSuchProcess:
+                    # As the process list isn't necessarily scanned right after it's created
+                    # (since we're using a shared cache), there can be cases where processes
+                    # in the list are dead when an instance of the check tries to scan them.
+                    break
+                except psutil.AccessDenied:
+                    for search in process_searches:
+                        results[search].denied.add(process.pid)
+                    continue
+
+                # Most processes match no search at all
+                if filtered and not prefilter.search(text):
+                    continue
+
+                for search in process_searches:
+                    if search.matches(text):
+                        results[search].pids.add(process.pid)
+
+        # Forget about the processes that no longer exist
+        for pid in set(self._cmdlines) - alive:
+            del self._cmdlines[pid]
+
+        return results
+
+    @staticmethod
+    def _read_name(process):
+        name = process.name()
+        return name.lower() if os.name == 'nt' else name
@@ -3,8 +3,7 @@
 # Licensed under a 3-clause BSD style license (see LICENSE)
 from __future__ import division
 
-import os
-import re
+import logging
 import subprocess
 import time
 from collections import defaultdict
@@ -16,6 +15,7 @@ from datadog_checks.base import AgentCheck, is_affirmative
 from datadog_checks.base.utils.platform import Platform
 
 from .cache import DEFAULT_SHARED_PROCESS_LIST_CACHE_DURATION, ProcessListCache
+from .matcher import ProcessSearch
 
 try:
     import datadog_agent
@@ -78,6 +78,9 @@ class ProcessCheck(AgentCheck):
         self.user = self.instance.get('user', False)
         self.try_sudo = self.instance.get('try_sudo', False)
         self.use_oneshot = is_affirmative(self.instance.get('use_oneshot', True))
+        self._search = None
+        if self.search_string:
+            self._get_search(self.search_string, self.exact_match)
 
         # ad stands for access denied
         # We cache the PIDs getting this error and don't iterate on them more often than `access_denied_cache_duration``
@@ -122,6 +125,13 @@ class ProcessCheck(AgentCheck):
         now = time.time()
         return now - self.last_pid_cache_ts.get(name, 0) > self.pid_cache_duration
 
+    def _get_search(self, search_string, exact_match):
+        """Return the search shared with the other instances, so that they all match processes at once."""
+        if self._search is None or self._search.key != (tuple(search_string), exact_match):
+            self._search = ProcessSearch(search_string, exact_match)
+            self.process_list_cache.matcher.register(self._search)
+        return self._search
+
     def find_pids(self, name, search_string, exact_match, ignore_ad=True):
         """
         Create a set of pids of selected processes.
@@ -136,8 +146,6 @@ class ProcessCheck(AgentCheck):
 
         refresh_ad_cache = self.should_refresh_ad_cache(name)
 
-        matching_pids = set()
-
         self.log.debug("Refreshing process list")
 
         # If refresh returns True, then the cache has been refreshed.
@@ -147,56 +155,21 @@ class ProcessCheck(AgentCheck):
         else:
             self.log.debug("Using process list cache")
 
+        search = self._get_search(search_string, exact_match)
         with self.process_list_cache.read_lock():
-            for proc in self.process_list_cache.elements:
-                # Skip access denied processes
-                if not refresh_ad_cache and proc.pid in self.ad_cache:
-                    continue
-
-                found = False
-                for string in search_string:
-                    try:
-                        # FIXME 8.x: All has been deprecated
-                        # from the doc, should be removed
-                        if string == 'All':
-                            found = True
-                        if exact_match:
-                            if os.name == 'nt':
-                                if proc.name().lower() == string.lower():
-                                    found = True
-                            else:
-                                if proc.name() == string:
-                                    found = True
-
-                        else:
-                            cmdline = proc.cmdline()
-                            if os.name == 'nt':
-                                lstring = string.lower()
-                                if re.search(lstring, ' '.join(cmdline).lower()):
-                                    found = True
-                            else:
-                                if re.search(string, ' '.join(cmdline)):
-                                    found = True
-                    except psutil.NoSuchProcess:
-                        # As the process list isn't necessarily scanned right after it's created
-                        # (since we're using a shared cache), there can be cases where processes
-                        # in the list are dead when an instance of the check tries to scan them.
-                        self.log.debug('Process disappeared while scanning')
-                    except psutil.AccessDenied as e:
-                        ad_error_logger('Access denied to process with PID {}'.format(proc.pid))
-                        ad_error_logger('Error: {}'.format(e))
-                        if refresh_ad_cache:
-                            self.ad_cache.add(proc.pid)
-                        if not ignore_ad:
-                            raise
-                    else:
-                        if refresh_ad_cache:
-                            self.ad_cache.discard(proc.pid)
-                        if found:
-                            matching_pids.add(proc.pid)
-                            break
-
-            if not matching_pids:
+            result = self.process_list_cache.matcher.match(self.process_list_cache.elements, search)
+            matching_pids = result.pids
+
+            # Skip access denied processes
+            denied_pids = result.denied if refresh_ad_cache else result.denied - self.ad_cache
+            for pid in sorted(denied_pids):
+                ad_error_logger('Access denied to process with PID {}'.format(pid))
+            if refresh_ad_cache:
+                self.ad_cache = set(result.denied)
+            if denied_pids and not ignore_ad:
+                raise psutil.AccessDenied(min(denied_pids))
+
+            if not matching_pids and self.log.isEnabledFor(logging.DEBUG):
                 # Allow debug logging while preserving warning check state.
                 # Uncaught psutil exceptions trigger an Error state
                 try:
@@ -34,3 +34,26 @@ def test_run_oneshot(benchmark, dd_run_check):
     dd_run_check(process)
 
     benchmark(dd_run_check, process)
+
+
+def test_run_many_instances(benchmark, dd_run_check):
+    """All the instances share the process list, its processes are only inspected once for all of them."""
+    checks = []
+    for i in range(60):
+        instance = {
+            'name': 'proc_{}'.format(i),
+            'search_string': ['daemon_{}$'.format(i), 'python'],
+            'exact_match': False,
+            'pid_cache_duration': 0,
+            'thresholds': {'warning': [1, 10], 'critical': [1, 100]},
+        }
+        checks.append(ProcessCheck(common.CHECK_NAME, {'pid_cache_duration': 0}, [instance]))
+
+    def run():
+        # Like when the shared process list expires
+        ProcessCheck.process_list_cache.reset()
+        for check in checks:
+            dd_run_check(check)
+
+    run()
+    benchmark(run)
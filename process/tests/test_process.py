@@ -10,6 +10,7 @@ from mock import patch
 from six import iteritems
 
 from datadog_checks.process import ProcessCheck
+from datadog_checks.process.matcher import ProcessMatcher, ProcessSearch
 
 from . import common
 
@@ -68,6 +69,9 @@ class NamedMockProcess(object):
     def cmdline(self):
         return []
 
+    def create_time(self):
+        return 0
+
 
 def get_psutil_proc():
     return psutil.Process(os.getpid())
@@ -400,3 +404,91 @@ def test_process_service_check(aggregator):
     aggregator.assert_service_check('process.up', count=1, tags=['process:warning'], status=process.WARNING)
     aggregator.assert_service_check('process.up', count=1, tags=['process:no_top_ok'], status=process.OK)
     aggregator.assert_service_check('process.up', count=1, tags=['process:no_top_critical'], status=process.CRITICAL)
+
+
+class CmdlineMockProcess(object):
+    def __init__(self, pid, cmdline, create_time=0):
+        self.pid = pid
+        self._cmdline = cmdline
+        self._create_time = create_time
+        self.cmdline_calls = 0
+
+    def name(self):
+        return self._cmdline[0]
+
+    def cmdline(self):
+        self.cmdline_calls += 1
+        return self._cmdline
+
+    def create_time(self):
+        return self._create_time
+
+
+def test_matcher_single_pass():
+    matcher = ProcessMatcher()
+    processes = [
+        CmdlineMockProcess(1, ['python', 'app.py']),
+        CmdlineMockProcess(2, ['nginx', '-g', 'daemon off;']),
+        CmdlineMockProcess(3, ['postgres', '-D', '/data']),
+    ]
+    python = ProcessSearch(['app\\.py'], False)
+    nginx = ProcessSearch(['^nginx', 'httpd'], False)
+    postgres = ProcessSearch(['postgres'], True)
+    for search in (python, nginx, postgres):
+        matcher.register(search)
+
+    assert matcher.match(processes, python).pids == {1}
+    assert matcher.match(processes, nginx).pids == {2}
+    assert matcher.match(processes, postgres).pids == {3}
+    # The command line of every process was read once for all the searches
+    assert [process.cmdline_calls for process in processes] == [1, 1, 1]
+
+    # The command lines are kept for as long as the processes live
+    matcher.clear()
+    processes[1] = CmdlineMockProcess(2, ['httpd'], create_time=1)
+    assert matcher.match(processes, nginx).pids == {2}
+    assert [process.cmdline_calls for process in processes] == [1, 1, 1]
+    assert matcher.match(processes, python).pids == {1}
+    assert [process.cmdline_calls for process in processes] == [1, 1, 1]
+
+
+def test_matcher_backreference():
+    matcher = ProcessMatcher()
+    processes = [CmdlineMockProcess(1, ['worker', 'worker']), CmdlineMockProcess(2, ['worker', 'main'])]
+    first = ProcessSearch(['(main)'], False)
+    second = ProcessSearch(['(\\w+) \\1'], False)
+    matcher.register(first)
+    matcher.register(second)
+
+    assert matcher.match(processes, first).pids == {2}
+    assert matcher.match(processes, second).pids == {1}
+
+
+def test_matcher_inline_flags():
+    matcher = ProcessMatcher()
+    processes = [
+        CmdlineMockProcess(1, ['python', 'app.py']),
+        CmdlineMockProcess(2, ['nginx']),
+        CmdlineMockProcess(3, ['postgres']),
+    ]
+    python = ProcessSearch(['(?i)PYTHON'], False)
+    nginx = ProcessSearch(['nginx'], False)
+    matcher.register(python)
+    matcher.register(nginx)
+
+    assert matcher.match(processes, python).pids == {1}
+    assert matcher.match(processes, nginx).pids == {2}
+    # Only the pattern without inline flags is part of the prefilter
+    assert matcher._get_prefilter().pattern == '(?:nginx)'
+
+
+def test_matcher_access_denied():
+    matcher = ProcessMatcher()
+    process = CmdlineMockProcess(1, ['python'])
+    search = ProcessSearch(['python'], False)
+    matcher.register(search)
+
+    with patch.object(process, 'cmdline', side_effect=psutil.AccessDenied(1)):
+        result = matcher.match([process], search)
+    assert result.pids == set()
+    assert result.denied == {1}
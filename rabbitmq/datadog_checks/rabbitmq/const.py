@@ -118,6 +118,15 @@ TAGS_MAP = {
     OVERVIEW_TYPE: {'cluster_name': 'cluster'},
 }
 
+# Fields fetched when paginating, the family tags are computed by the check
+PAGINATED_COLUMNS = {
+    object_type: tuple(key for key in TAGS_MAP[object_type] if not key.endswith('_family'))
+    + tuple(path.replace('/', '.') for path, _, _ in ATTRIBUTES[object_type])
+    for object_type in (EXCHANGE_TYPE, QUEUE_TYPE)
+}
+# The management API rejects larger pages
+MAX_PAGE_SIZE = 500
+
 METRIC_SUFFIX = {EXCHANGE_TYPE: "exchange", QUEUE_TYPE: "queue", NODE_TYPE: "node", OVERVIEW_TYPE: "overview"}
 
 
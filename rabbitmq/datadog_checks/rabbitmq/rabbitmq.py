@@ -10,7 +10,7 @@ from requests.exceptions import RequestException
 from six import iteritems
 from six.moves.urllib.parse import quote_plus, urljoin, urlparse
 
-from datadog_checks.base import AgentCheck, is_affirmative, to_native_string
+from datadog_checks.base import AgentCheck, ConfigurationError, is_affirmative, to_native_string
 
 from .const import (
     ALERT_THRESHOLD,
@@ -21,9 +21,11 @@ from .const import (
     MAX_DETAILED_EXCHANGES,
     MAX_DETAILED_NODES,
     MAX_DETAILED_QUEUES,
+    MAX_PAGE_SIZE,
     METRIC_SUFFIX,
     NODE_TYPE,
     OVERVIEW_TYPE,
+    PAGINATED_COLUMNS,
     QUEUE_TYPE,
     SOURCE_TYPE_NAME,
     TAG_PREFIX,
@@ -93,6 +95,10 @@ class RabbitMQManagement(AgentCheck):
                 if type(filter_objects) != list:
                     raise TypeError("{0} / {0}_regexes parameter must be a list".format(object_type))
 
+        page_size = instance.get('page_size')
+        if page_size is not None and not 0 < int(page_size) <= MAX_PAGE_SIZE:
+            raise ConfigurationError('`page_size` must be between 1 and {}'.format(MAX_PAGE_SIZE))
+
         return base_url, max_detailed, specified, custom_tags, collect_nodes
 
     def _collect_metadata(self, overview_response):
@@ -233,7 +239,7 @@ class RabbitMQManagement(AgentCheck):
         if object_type == EXCHANGE_TYPE:
             object_tag_name = "exchange_family"
         for p in regex_filters:
-            match = re.search(p, name)
+            match = p.search(name)
             if match:
                 if is_affirmative(tag_families) and match.groups():
                     named_groups_dict = match.groupdict()
@@ -375,6 +381,61 @@ class RabbitMQManagement(AgentCheck):
             data = self._get_data(urljoin(base_url, object_type))
         return data
 
+    def _get_object_urls(self, instance, base_url, object_type, limit_vhosts):
+        """
+        Return the urls to query the queues or exchanges from, along with whether there is one per vhost.
+        """
+        # Same as `_get_object_data`, only queues can be queried per vhost
+        per_vhost = self._limit_vhosts(instance) and object_type == QUEUE_TYPE
+        if per_vhost:
+            urls = [urljoin(base_url, '{}/{}'.format(object_type, quote_plus(vhost))) for vhost in limit_vhosts]
+        else:
+            urls = [urljoin(base_url, object_type)]
+        return urls, per_vhost
+
+    def _get_object_pages(self, instance, base_url, object_type, limit_vhosts, page_size):
+        """
+        Yield the queues or exchanges page by page, with only the fields used by the check, along with
+        whether there are more pages to fetch.
+        """
+        urls, per_vhost = self._get_object_urls(instance, base_url, object_type, limit_vhosts)
+        columns = ','.join(PAGINATED_COLUMNS[object_type])
+
+        for i, url in enumerate(urls):
+            page = 1
+            while True:
+                page_url = '{}?page={}&page_size={}&columns={}'.format(url, page, page_size, columns)
+                try:
+                    response = self._get_data(page_url)
+                except Exception as e:
+                    if not per_vhost:
+                        raise
+                    self.log.debug("Couldn't grab %s data from url %s: %s", object_type, url, e)
+                    break
+
+                page_count = response.get('page_count', 0)
+                yield response.get('items', []), page < page_count or i < len(urls) - 1
+                if page >= page_count:
+                    break
+                page += 1
+
+    def _count_objects(self, instance, base_url, object_type, limit_vhosts):
+        """
+        Return the number of queues or exchanges, as reported by the management API with a single object per page.
+        """
+        urls, per_vhost = self._get_object_urls(instance, base_url, object_type, limit_vhosts)
+        count = 0
+        for url in urls:
+            try:
+                response = self._get_data('{}?page=1&page_size=1&columns=name'.format(url))
+            except Exception as e:
+                if not per_vhost:
+                    raise
+                self.log.debug("Couldn't grab %s data from url %s: %s", object_type, url, e)
+                continue
+            count += response.get('filtered_count', 0)
+        return count
+
     def get_stats(self, instance, base_url, object_type, max_detailed, filters, limit_vhosts, custom_tags):
         """
         instance: the check instance
@@ -388,12 +449,27 @@ class RabbitMQManagement(AgentCheck):
         # Make a copy of this list as we will remove items from it at each
         # iteration
         explicit_filters = list(filters['explicit'])
-        regex_filters = filters['regexes']
-        data = self._get_object_data(instance, base_url, object_type, limit_vhosts)
+        regex_filters = [re.compile(p) for p in filters['regexes']]
 
         if len(explicit_filters) > max_detailed:
             raise Exception("The maximum number of {} you can specify is {}.".format(object_type, max_detailed))
 
+        page_size = instance.get('page_size')
+        if page_size and object_type in PAGINATED_COLUMNS:
+            return self._get_paginated_stats(
+                instance,
+                base_url,
+                object_type,
+                max_detailed,
+                explicit_filters,
+                regex_filters,
+                limit_vhosts,
+                custom_tags,
+                int(page_size),
+            )
+
+        data = self._get_object_data(instance, base_url, object_type, limit_vhosts)
+
         # a list of queues/nodes is specified. We process only those
         data = self._filter_list(
             data, explicit_filters, regex_filters, object_type, instance.get("tag_families", False)
@@ -407,13 +483,7 @@ class RabbitMQManagement(AgentCheck):
         data_lines_sent = 0
         for data_line in data:
             if data_lines_sent >= max_detailed:
-                # Display a warning in the info page
-                msg = (
-                    "Too many items to fetch. "
-                    "You must choose the {} you are interested in by editing the rabbitmq.d/conf.yaml configuration "
-                    "file or get in touch with Datadog support"
-                ).format(object_type)
-                self.warning(msg)
+                self._warn_too_many_items(object_type)
                 break
             # We truncate the list if it's above the limit
             metrics_sent = self._get_metrics(data_line, object_type, custom_tags)
@@ -425,6 +495,74 @@ class RabbitMQManagement(AgentCheck):
         if object_type is QUEUE_TYPE:
             self._get_queue_bindings_metrics(base_url, custom_tags, data, object_type)
 
+    def _get_paginated_stats(
+        self,
+        instance,
+        base_url,
+        object_type,
+        max_detailed,
+        explicit_filters,
+        regex_filters,
+        limit_vhosts,
+        custom_tags,
+        page_size,
+    ):
+        """
+        Same as `get_stats`, processing the objects page by page and fetching no more pages
+        once metrics have been collected for `max_detailed` objects.
+        """
+        tag_families = instance.get("tag_families", False)
+        matching_lines = 0
+        data_lines_sent = 0
+        limit_reached = False
+        processed = []
+        filtered = bool(explicit_filters or regex_filters)
+        for page, has_more in self._get_object_pages(instance, base_url, object_type, limit_vhosts, page_size):
+            for data_line in self._filter_list(page, explicit_filters, regex_filters, object_type, tag_families):
+                matching_lines += 1
+                if data_lines_sent >= max_detailed:
+                    limit_reached = True
+                    break
+
+                processed.append(data_line)
+                if self._get_metrics(data_line, object_type, custom_tags) >= 1:
+                    data_lines_sent += 1
+
+            # The remaining objects may not match the filters, but finding out would require fetching them all
+            if limit_reached or (data_lines_sent >= max_detailed and has_more):
+                limit_reached = True
+                break
+
+            # Found objects are removed from the explicit filters, once they are all found no other object can match
+            if filtered and not explicit_filters and not regex_filters:
+                break
+
+        if matching_lines > ALERT_THRESHOLD * max_detailed:
+            size = matching_lines
+            # Without filters, every object counts, the management API tells how many there are in total.
+            # Otherwise the objects that were not fetched may not match the filters, only the ones found are counted.
+            key = "{}{}".format(base_url, object_type)
+            if limit_reached and not filtered and key not in self.already_alerted:
+                size = self._count_objects(instance, base_url, object_type, limit_vhosts)
+            # Post a message on the dogweb stream to warn
+            self.alert(base_url, max_detailed, size, object_type, custom_tags)
+        if limit_reached:
+            self._warn_too_many_items(object_type)
+
+        # get a list of the number of bindings on a given queue
+        # /api/queues/vhost/name/bindings
+        if object_type is QUEUE_TYPE:
+            self._get_queue_bindings_metrics(base_url, custom_tags, processed, object_type)
+
+    def _warn_too_many_items(self, object_type):
+        # Display a warning in the info page
+        msg = (
+            "Too many items to fetch. "
+            "You must choose the {} you are interested in by editing the rabbitmq.d/conf.yaml configuration "
+            "file or get in touch with Datadog support"
+        ).format(object_type)
+        self.warning(msg)
+
     def get_overview_stats(self, base_url, custom_tags):
         data = self._get_data(urljoin(base_url, "overview"))
         self._collect_metadata(data)
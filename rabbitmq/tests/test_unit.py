@@ -8,12 +8,15 @@ import mock
 import pytest
 import requests
 
+from datadog_checks.base import ConfigurationError
 from datadog_checks.dev.utils import get_metadata_metrics
 from datadog_checks.rabbitmq import RabbitMQ
+from datadog_checks.rabbitmq.const import PAGINATED_COLUMNS
 from datadog_checks.rabbitmq.rabbitmq import (
     EXCHANGE_TYPE,
     NODE_TYPE,
     OVERVIEW_TYPE,
+    QUEUE_TYPE,
     RabbitMQException,
     RabbitMQManagement,
 )
@@ -224,3 +227,121 @@ def test_queues_regexes_exclude_with_negative_lookahead(aggregator, dd_run_check
             count=0,
         )
     aggregator.assert_metrics_using_metadata(get_metadata_metrics())
+
+
+def _mock_paginated_get_data(pages, requested):
+    def mock_get_data(url):
+        requested.append(url)
+        if url.endswith('/bindings'):
+            return []
+        page = int(url.split('page=')[1].split('&')[0])
+        page_size = int(url.split('page_size=')[1].split('&')[0])
+        items = [item for page_items in pages for item in page_items]
+        if page_size == 1:
+            # Only the count of objects is requested
+            return {'items': items[:1], 'page': 1, 'page_count': len(items), 'filtered_count': len(items)}
+        return {'items': pages[page - 1], 'page': page, 'page_count': len(pages), 'filtered_count': len(items)}
+
+    return mock_get_data
+
+
+def test_get_stats_paginated(instance, check, aggregator):
+    pages = [
+        [{'name': 'q1', 'vhost': '/', 'messages': 1}, {'name': 'other', 'vhost': '/', 'messages': 2}],
+        [{'name': 'q2', 'vhost': '/', 'messages': 3}],
+    ]
+    requested = []
+    check._get_data = _mock_paginated_get_data(pages, requested)
+    instance = dict(instance, page_size=2)
+
+    check.get_stats(instance, 'http://example.com/api/', QUEUE_TYPE, 10, {'explicit': [], 'regexes': ['q']}, [], [])
+
+    aggregator.assert_metric('rabbitmq.queue.messages', value=1, tags=['rabbitmq_queue:q1', 'rabbitmq_vhost:/'])
+    aggregator.assert_metric('rabbitmq.queue.messages', value=3, tags=['rabbitmq_queue:q2', 'rabbitmq_vhost:/'])
+    aggregator.assert_metric('rabbitmq.queue.messages', count=2)
+    aggregator.assert_metric('rabbitmq.queue.bindings.count', count=2)
+
+    assert requested[0] == 'http://example.com/api/queues?page=1&page_size=2&columns={}'.format(
+        ','.join(PAGINATED_COLUMNS[QUEUE_TYPE])
+    )
+    assert [url for url in requested if 'page=' in url] == [requested[0], requested[0].replace('page=1', 'page=2')]
+    assert not check.warnings
+
+
+def test_get_stats_paginated_limit(instance, check, aggregator):
+    pages = [
+        [{'name': 'ex1', 'message_stats': EXCHANGE_MESSAGE_STATS}, {'name': 'ex2', 'message_stats': {}}],
+        [{'name': 'ex3', 'message_stats': EXCHANGE_MESSAGE_STATS}, {'name': 'ex4', 'message_stats': {}}],
+        [{'name': 'ex5', 'message_stats': EXCHANGE_MESSAGE_STATS}],
+    ]
+    requested = []
+    check._get_data = _mock_paginated_get_data(pages, requested)
+    instance = dict(instance, page_size=2)
+
+    check.get_stats(instance, 'http://example.com/api/', EXCHANGE_TYPE, 2, {'explicit': [], 'regexes': []}, [], [])
+
+    aggregator.assert_metric('rabbitmq.exchange.messages.ack.count', tags=['rabbitmq_exchange:ex1'])
+    aggregator.assert_metric('rabbitmq.exchange.messages.ack.count', tags=['rabbitmq_exchange:ex3'])
+    aggregator.assert_metric('rabbitmq.exchange.messages.ack.count', count=2)
+    # No page is fetched after the limit is reached, only the number of exchanges to report it
+    assert len(requested) == 3
+    assert 'page=1&page_size=1&columns=name' in requested[2]
+    assert len(check.warnings) == 1
+    assert len(aggregator.events) == 1
+    assert aggregator.events[0]['msg_text'].startswith('5 exchanges are present. The limit is 2.')
+
+
+def test_get_stats_paginated_limit_filtered(instance, check, aggregator):
+    pages = [
+        [{'name': 'ex1', 'message_stats': EXCHANGE_MESSAGE_STATS}, {'name': 'ex2', 'message_stats': {}}],
+        [{'name': 'ex3', 'message_stats': EXCHANGE_MESSAGE_STATS}, {'name': 'ex4', 'message_stats': {}}],
+        [{'name': 'ex5', 'message_stats': EXCHANGE_MESSAGE_STATS}, {'name': 'other', 'message_stats': {}}],
+    ]
+    requested = []
+    check._get_data = _mock_paginated_get_data(pages, requested)
+    instance = dict(instance, page_size=2)
+
+    check.get_stats(instance, 'http://example.com/api/', EXCHANGE_TYPE, 2, {'explicit': [], 'regexes': ['ex']}, [], [])
+
+    # The exchanges that were not fetched may not match the filters, only the ones found are reported
+    assert len(requested) == 2
+    assert len(aggregator.events) == 1
+    assert aggregator.events[0]['msg_text'].startswith('4 exchanges are present. The limit is 2.')
+
+
+def test_get_stats_paginated_under_threshold(instance, check, aggregator):
+    pages = [
+        [{'name': 'ex1', 'message_stats': EXCHANGE_MESSAGE_STATS}, {'name': 'ex2', 'message_stats': {}}],
+        [{'name': 'other', 'message_stats': EXCHANGE_MESSAGE_STATS}],
+    ]
+    check._get_data = _mock_paginated_get_data(pages, [])
+    instance = dict(instance, page_size=2)
+
+    check.get_stats(instance, 'http://example.com/api/', EXCHANGE_TYPE, 3, {'explicit': [], 'regexes': ['ex']}, [], [])
+
+    # Same as without pagination, the limit is only approached when most of the limit is used by matching objects
+    assert not check.warnings
+    assert not aggregator.events
+
+
+def test_get_stats_paginated_explicit_filters(instance, check, aggregator):
+    pages = [
+        [{'name': 'q1', 'vhost': '/', 'messages': 1}, {'name': 'q2', 'vhost': '/', 'messages': 2}],
+        [{'name': 'q3', 'vhost': '/', 'messages': 3}],
+    ]
+    requested = []
+    check._get_data = _mock_paginated_get_data(pages, requested)
+    instance = dict(instance, page_size=2)
+
+    check.get_stats(instance, 'http://example.com/api/', QUEUE_TYPE, 10, {'explicit': ['q1'], 'regexes': []}, [], [])
+
+    aggregator.assert_metric('rabbitmq.queue.messages', value=1, tags=['rabbitmq_queue:q1', 'rabbitmq_vhost:/'])
+    aggregator.assert_metric('rabbitmq.queue.messages', count=1)
+    # No page is fetched once all the explicitly listed queues are found
+    assert [url for url in requested if 'page=' in url] == [requested[0]]
+
+
+@pytest.mark.parametrize('page_size', [0, 501])
+def test_invalid_page_size(check, page_size):
+    with pytest.raises(ConfigurationError, match='`page_size` must be between 1 and 500'):
+        check._get_config({'rabbitmq_api_url': 'http://example.com', 'page_size': page_size})
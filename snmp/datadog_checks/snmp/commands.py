@@ -1,7 +1,9 @@
 # (C) Datadog, Inc. 2020-present
 # All rights reserved
 # Licensed under Simplified BSD License (see LICENSE)
-from typing import Any, Dict, Generator  # noqa: F401
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Generator, List, Optional  # noqa: F401
 
 from pyasn1.type.univ import Null
 from pysnmp import hlapi  # noqa: F401
@@ -13,6 +15,10 @@ from pysnmp.proto.rfc1905 import endOfMibView
 from datadog_checks.base.errors import CheckException
 
 from .config import InstanceConfig  # noqa: F401
+from .exceptions import PySnmpError
+
+# `error-status` of a response whose PDU would exceed the maximum message size of the device, see RFC 3416
+TOO_BIG = 1
 
 
 def _handle_error(ctx, config):
@@ -160,3 +166,209 @@ def snmp_bulk(config, oid, non_repeaters, max_repetitions, lookup_mib, ignore_no
                 yield var_binds[0]
             else:
                 return
+
+
+class RequestPipeline(object):
+    """
+    Send SNMP requests to a device, keeping up to `window` of them in flight on the pysnmp transport dispatcher.
+
+    Requests are queued with `get`, `getnext` and `bulk`, then sent by `run`. Follow-up requests of a walk are sent
+    as soon as the previous response is received. When the device answers `tooBig`, the request is split (GET and
+    GETNEXT) or retried with fewer repetitions (GETBULK), and the limit is remembered for the next check runs.
+    """
+
+    def __init__(self, config, window, lookup_mib, ignore_nonincreasing_oid):
+        # type: (InstanceConfig, int, bool, bool) -> None
+        if config.device is None:
+            raise RuntimeError('No device set')  # pragma: no cover
+
+        self._config = config
+        self._window = max(window, 1)
+        self._lookup_mib = lookup_mib
+        self._ignore_nonincreasing_oid = ignore_nonincreasing_oid
+        self._queue = deque()  # type: Deque[Callable[[], None]]
+        self._in_flight = 0
+        self._failure = None  # type: Optional[Exception]
+
+        # Results of the requests sent since the last call to `run`
+        self.var_binds = []  # type: List[Any]
+        self.errors = []  # type: List[str]
+
+    def get(self, oids):
+        # type: (list) -> None
+        """Queue a GET request for a list of oids."""
+        self._queue.append(lambda: self._send_get(oids))
+
+    def getnext(self, oids):
+        # type: (list) -> None
+        """Queue a walk with GETNEXT requests on a list of oids, as long as results stay under the same prefixes."""
+        initial_vars = [x[0] for x in vbProcessor.makeVarBinds(self._config._snmp_engine, oids)]
+        self._queue.append(lambda: self._send_getnext(oids, initial_vars))
+
+    def bulk(self, oid, non_repeaters, max_repetitions):
+        # type: (hlapi.ObjectType, int, int) -> None
+        """Queue a walk with GETBULK requests on an oid, as long as results stay under the same prefix."""
+        max_repetitions = self._config.repetitions_limit.get(max_repetitions)
+        initial_var = vbProcessor.makeVarBinds(self._config._snmp_engine, [oid])[0][0]
+        self._queue.append(lambda: self._send_bulk([oid], initial_var, non_repeaters, max_repetitions))
+
+    def run(self):
+        # type: () -> None
+        """Send all queued requests and wait for their responses."""
+        self._fill_window()
+        self._config._snmp_engine.transportDispatcher.runDispatcher()
+
+        failure, self._failure = self._failure, None
+        if failure is not None:
+            raise failure
+
+    def _fill_window(self):
+        # type: () -> None
+        while self._queue and self._in_flight < self._window:
+            send = self._queue.popleft()
+            self._in_flight += 1
+            try:
+                send()
+            except (PySnmpError, CheckException) as e:
+                self._in_flight -= 1
+                self.errors.append(str(e))
+
+    def _send(self, generator, args, handler):
+        # type: (Any, tuple, Callable[..., None]) -> None
+        config = self._config
+        sent_at = time.time()
+
+        def callback(  # type: ignore
+            snmpEngine, sendRequestHandle, errorIndication, errorStatus, errorIndex, varBinds, cbCtx
+        ):
+            self._in_flight -= 1
+            config.request_stats.record(time.time() - sent_at)
+            try:
+                handler(errorIndication, errorStatus, varBinds)
+            except (PySnmpError, CheckException) as e:
+                self.errors.append(str(e))
+            except Exception as e:
+                # Raising from the callback would leave the dispatcher in an inconsistent state,
+                # so stop sending requests and raise once the in-flight ones are done.
+                self._failure = e
+                self._queue.clear()
+            self._fill_window()
+
+        generator.sendVarBinds(
+            config._snmp_engine,
+            config.device.target,
+            config._context_data.contextEngineId,
+            config._context_data.contextName,
+            *(args + (callback,))
+        )
+
+    def _split(self, size, send):
+        # type: (int, Callable[[int, int], None]) -> None
+        """Retry a request that was too big as two requests, each with half of the oids."""
+        config = self._config
+        half = size // 2
+        config.oid_batch_size_limit.reject(size)
+        config.request_stats.retries += 1
+        self._queue.appendleft(lambda: send(half, size))
+        self._queue.appendleft(lambda: send(0, half))
+
+    def _send_get(self, oids):
+        # type: (list) -> None
+        engine = self._config._snmp_engine
+
+        def handle(error_indication, error_status, var_binds):
+            # type: (Any, Any, Any) -> None
+            if not error_indication and error_status == TOO_BIG and len(oids) > 1:
+                self._split(len(oids), lambda start, end: self._send_get(oids[start:end]))
+                return
+
+            if not error_indication:
+                self._config.oid_batch_size_limit.accept(len(oids))
+            _handle_error({'error': error_indication}, self._config)
+            self.var_binds.extend(vbProcessor.unmakeVarBinds(engine, var_binds, self._lookup_mib))
+
+        self._send(cmdgen.GetCommandGenerator(), (vbProcessor.makeVarBinds(engine, oids),), handle)
+
+    def _send_getnext(self, oids, initial_vars):
+        # type: (list, list) -> None
+        engine = self._config._snmp_engine
+
+        def handle(error_indication, error_status, var_bind_table):
+            # type: (Any, Any, Any) -> None
+            if not error_indication and error_status == TOO_BIG and len(oids) > 1:
+                self._split(len(oids), lambda start, end: self._send_getnext(oids[start:end], initial_vars[start:end]))
+                return
+
+            if not error_indication:
+                self._config.oid_batch_size_limit.accept(len(oids))
+
+            if (
+                self._ignore_nonincreasing_oid
+                and error_indication
+                and isinstance(error_indication, errind.OidNotIncreasing)
+            ):
+                error_indication = None
+            _handle_error({'error': error_indication}, self._config)
+
+            var_binds = []
+            next_initial_vars = []
+            if var_bind_table:
+                row = vbProcessor.unmakeVarBinds(engine, var_bind_table[0], self._lookup_mib)
+                for col, var_bind in enumerate(row):
+                    name, val = var_bind
+                    if not isinstance(val, Null) and initial_vars[col].isPrefixOf(name):
+                        var_binds.append(var_bind)
+                        next_initial_vars.append(initial_vars[col])
+            self.var_binds.extend(var_binds)
+
+            if var_binds:
+                # Continue the walk before sending any other request
+                self._queue.appendleft(lambda: self._send_getnext(var_binds, next_initial_vars))
+
+        self._send(cmdgen.NextCommandGenerator(), (oids,), handle)
+
+    def _send_bulk(self, var_binds, initial_var, non_repeaters, max_repetitions):
+        # type: (list, Any, int, int) -> None
+        engine = self._config._snmp_engine
+
+        def handle(error_indication, error_status, var_bind_table):
+            # type: (Any, Any, Any) -> None
+            if not error_indication and error_status == TOO_BIG and max_repetitions > 1:
+                config = self._config
+                repetitions = max_repetitions // 2
+                config.repetitions_limit.reject(max_repetitions)
+                config.request_stats.retries += 1
+                self._queue.appendleft(lambda: self._send_bulk(var_binds, initial_var, non_repeaters, repetitions))
+                return
+
+            if not error_indication:
+                self._config.repetitions_limit.accept(max_repetitions)
+
+            if (
+                self._ignore_nonincreasing_oid
+                and error_indication
+                and isinstance(error_indication, errind.OidNotIncreasing)
+            ):
+                error_indication = None
+            _handle_error({'error': error_indication}, self._config)
+
+            last_var_binds = None
+            for row in var_bind_table:
+                row = vbProcessor.unmakeVarBinds(engine, row, self._lookup_mib)
+                name, value = row[0]
+                if endOfMibView.isSameTypeWith(value) or not initial_var.isPrefixOf(name):
+                    return
+                self.var_binds.append(row[0])
+                last_var_binds = row
+
+            if last_var_binds is not None:
+                # Continue the walk before sending any other request
+                self._queue.appendleft(
+                    lambda: self._send_bulk(last_var_binds, initial_var, non_repeaters, max_repetitions)
+                )
+
+        self._send(
+            cmdgen.BulkCommandGenerator(),
+            (non_repeaters, max_repetitions, vbProcessor.makeVarBinds(engine, var_binds)),
+            handle,
+        )
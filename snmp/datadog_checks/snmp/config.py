@@ -39,6 +39,7 @@ class InstanceConfig:
     DEFAULT_ALLOWED_FAILURES = 3
     DEFAULT_BULK_THRESHOLD = 0
     DEFAULT_WORKERS = 5
+    DEFAULT_DISCOVERY_WORKERS = 5
     DEFAULT_REFRESH_OIDS_CACHE_INTERVAL = 0  # `0` means disabled
 
     AUTH_PROTOCOL_MAPPING = {
@@ -106,9 +107,19 @@ class InstanceConfig:
         self.failing_instances = defaultdict(int)  # type: DefaultDict[str, int]
         self.allowed_failures = int(instance.get('discovery_allowed_failures', self.DEFAULT_ALLOWED_FAILURES))
         self.workers = int(instance.get('workers', self.DEFAULT_WORKERS))
+        self.discovery_workers = int(instance.get('discovery_workers', self.DEFAULT_DISCOVERY_WORKERS))
+        discovery_timeout = instance.get('discovery_timeout')
+        self.discovery_timeout = float(discovery_timeout) if discovery_timeout is not None else None
+        # Duration and number of hosts probed of the last discovery pass, until they are reported
+        self.discovery_stats = None  # type: Optional[Tuple[float, int]]
 
         self.bulk_threshold = int(instance.get('bulk_threshold', self.DEFAULT_BULK_THRESHOLD))
 
+        # Request limits learned from the `tooBig` responses of the device
+        self.oid_batch_size_limit = RequestSizeLimit()
+        self.repetitions_limit = RequestSizeLimit()
+        self.request_stats = RequestStats()
+
         self._auth_data = self.get_auth_data(instance)
         self._context_data = ContextData(*self.get_context_data(instance))
 
@@ -412,3 +423,72 @@ class OIDConfig(object):
         """
         self._all_scalar_oids = []
         self._use_scalar_oids_cache = False
+
+
+class RequestSizeLimit(object):
+    """
+    Largest size of the requests accepted by a device, learned from its `tooBig` responses.
+
+    The limit is searched between the largest size that was answered and the smallest one that was rejected.
+    The rejected size is forgotten every `RETRY_INTERVAL` fetches, so that bigger requests are tried again
+    in case the device now accepts them.
+    """
+
+    RETRY_INTERVAL = 10
+
+    def __init__(self):
+        # type: () -> None
+        self.accepted = 0
+        self.rejected = None  # type: Optional[int]
+        self._fetches = 0
+
+    def get(self, size):
+        # type: (int) -> int
+        """Return the size to use for requests of at most `size` items."""
+        if self.rejected is None:
+            return size
+        return min(size, max(1, (self.accepted + self.rejected) // 2))
+
+    def accept(self, size):
+        # type: (int) -> None
+        self.accepted = max(self.accepted, size)
+        if self.rejected is not None and size >= self.rejected:
+            self.rejected = None
+
+    def reject(self, size):
+        # type: (int) -> None
+        self.rejected = size if self.rejected is None else min(self.rejected, size)
+        if self.accepted >= self.rejected:
+            self.accepted = 0
+
+    def next_fetch(self):
+        # type: () -> None
+        if self.rejected is None:
+            return
+        self._fetches += 1
+        if self._fetches >= self.RETRY_INTERVAL:
+            self._fetches = 0
+            self.rejected = None
+
+
+class RequestStats(object):
+    """
+    Round-trip time and retry statistics of the requests sent to a device since the last report.
+    """
+
+    def __init__(self):
+        # type: () -> None
+        self.reset()
+
+    def record(self, rtt):
+        # type: (float) -> None
+        self.requests += 1
+        self.total_rtt += rtt
+        self.max_rtt = max(self.max_rtt, rtt)
+
+    def reset(self):
+        # type: () -> None
+        self.requests = 0
+        self.retries = 0
+        self.total_rtt = 0.0
+        self.max_rtt = 0.0
@@ -5,7 +5,8 @@
 import json
 import time
 import weakref  # noqa: F401
-from typing import TYPE_CHECKING
+from concurrent import futures
+from typing import TYPE_CHECKING, Dict, List, Optional  # noqa: F401
 
 from datadog_checks.base import ConfigurationError
 
@@ -15,6 +16,9 @@ from .config import InstanceConfig  # noqa: F401
 if TYPE_CHECKING:
     from .snmp import SnmpCheck  # noqa: F401
 
+# Number of newly discovered hosts after which the persistent cache is written during a discovery pass
+CACHE_FLUSH_BATCH_SIZE = 100
+
 
 def discover_instances(config, interval, check_ref):
     # type: (InstanceConfig, float, weakref.ref[SnmpCheck]) -> None
@@ -24,47 +28,104 @@ def discover_instances(config, interval, check_ref):
     the check instance. This way if the agent unschedules the check and deletes
     the reference to the instance, the check is garbage collected properly and
     that function can stop.
+
+    Up to `discovery_workers` hosts are probed at the same time. A pass stops probing new hosts once it lasts
+    longer than `discovery_timeout` (defaults to the discovery interval), and the next pass starts with the hosts
+    it didn't probe.
     """
+    timeout = config.discovery_timeout if config.discovery_timeout is not None else interval
+    skipped_hosts = []  # type: List[str]
 
-    while True:
-        start_time = time.time()
-        for host in config.network_hosts():
-            check = check_ref()
-            if check is None or not check._running:
-                return
+    with futures.ThreadPoolExecutor(max_workers=config.discovery_workers) as executor:
+        while True:
+            start_time = time.time()
 
-            host_config = check._build_autodiscovery_config(config.instance, host)
+            # Hosts that were not probed by the previous pass go first, in the same order
+            hosts = list(config.network_hosts())
+            if skipped_hosts:
+                remaining_hosts = set(hosts)
+                skipped = set(skipped_hosts)
+                hosts = [host for host in skipped_hosts if host in remaining_hosts] + [
+                    host for host in hosts if host not in skipped
+                ]
 
-            try:
-                sys_object_oid = check.fetch_sysobject_oid(host_config)
-            except Exception as e:
-                check.log.debug("Error scanning host %s: %s", host, e)
-                del check
-                continue
+            submitted = [(host, executor.submit(_probe_host, config, host, check_ref)) for host in hosts]
+            pending = {future: host for host, future in submitted}  # type: Dict[futures.Future, str]
 
+            skipped_hosts = []
+            unflushed = 0
             try:
-                profile = check._profile_for_sysobject_oid(sys_object_oid)
-            except ConfigurationError:
-                if not host_config.oid_config.has_oids():
-                    check.log.warning("Host %s didn't match a profile for sysObjectID %s", host, sys_object_oid)
-                    del check
-                    continue
-            else:
-                host_config.refresh_with_profile(check.profiles[profile])
-                host_config.add_profile_tag(profile)
-
-            config.discovered_instances[host] = host_config
-
-            write_persistent_cache(check.check_id, json.dumps(list(config.discovered_instances)))
-            del check
-
-        check = check_ref()
-        if check is None:
-            return
-        # Write again at the end of the loop, in case some host have been removed since last
-        write_persistent_cache(check.check_id, json.dumps(list(config.discovered_instances)))
-        del check
-
-        time_elapsed = time.time() - start_time
-        if interval - time_elapsed > 0:
-            time.sleep(interval - time_elapsed)
+                for future in futures.as_completed(list(pending), timeout=timeout or None):
+                    if _collect_host(config, pending.pop(future), future):
+                        unflushed += 1
+                    if unflushed >= CACHE_FLUSH_BATCH_SIZE:
+                        if not _write_cache(config, check_ref):
+                            return
+                        unflushed = 0
+            except futures.TimeoutError:
+                for host, future in submitted:
+                    if future in pending and future.cancel():
+                        skipped_hosts.append(host)
+                        del pending[future]
+                # Keep the results of the probes that are already running
+                for future in futures.as_completed(list(pending)):
+                    _collect_host(config, pending.pop(future), future)
+
+            time_elapsed = time.time() - start_time
+            config.discovery_stats = (time_elapsed, len(hosts) - len(skipped_hosts))
+
+            # Write again at the end of the loop, in case some host have been removed since last
+            if not _write_cache(config, check_ref):
+                return
+
+            if interval - time_elapsed > 0:
+                time.sleep(interval - time_elapsed)
+
+
+def _probe_host(config, host, check_ref):
+    # type: (InstanceConfig, str, weakref.ref[SnmpCheck]) -> Optional[InstanceConfig]
+    check = check_ref()
+    if check is None or not check._running:
+        return None
+
+    host_config = check._build_autodiscovery_config(config.instance, host)
+
+    try:
+        sys_object_oid = check.fetch_sysobject_oid(host_config)
+    except Exception as e:
+        check.log.debug("Error scanning host %s: %s", host, e)
+        return None
+
+    try:
+        profile = check._profile_for_sysobject_oid(sys_object_oid)
+    except ConfigurationError:
+        if not host_config.oid_config.has_oids():
+            check.log.warning("Host %s didn't match a profile for sysObjectID %s", host, sys_object_oid)
+            return None
+    else:
+        host_config.refresh_with_profile(check.profiles[profile])
+        host_config.add_profile_tag(profile)
+
+    return host_config
+
+
+def _collect_host(config, host, future):
+    # type: (InstanceConfig, str, futures.Future) -> bool
+    """Add the host to the discovered instances if it was successfully probed."""
+    host_config = future.result()
+    if host_config is None:
+        return False
+
+    config.discovered_instances[host] = host_config
+    return True
+
+
+def _write_cache(config, check_ref):
+    # type: (InstanceConfig, weakref.ref[SnmpCheck]) -> bool
+    """Write the discovered hosts to the persistent cache, return whether the discovery should go on."""
+    check = check_ref()
+    if check is None or not check._running:
+        return False
+
+    write_persistent_cache(check.check_id, json.dumps(list(config.discovered_instances)))
+    return True
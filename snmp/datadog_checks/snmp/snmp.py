@@ -12,7 +12,7 @@ import time
 import weakref
 from collections import defaultdict
 from concurrent import futures
-from typing import Any, DefaultDict, Dict, List, Optional, Pattern, Tuple  # noqa: F401
+from typing import Any, DefaultDict, Dict, List, Mapping, Optional, Pattern, Sequence, Tuple  # noqa: F401
 
 from six import iteritems
 
@@ -20,7 +20,7 @@ from datadog_checks.base import AgentCheck, ConfigurationError, is_affirmative
 from datadog_checks.base.errors import CheckException
 from datadog_checks.snmp.utils import extract_value
 
-from .commands import snmp_bulk, snmp_get, snmp_getnext
+from .commands import RequestPipeline, snmp_get
 from .compat import read_persistent_cache, write_persistent_cache
 from .config import InstanceConfig
 from .discovery import discover_instances
@@ -32,6 +32,7 @@ from .parsing import ColumnTag, IndexTag, ParsedMetric, ParsedTableMetric, Symbo
 from .pysnmp_types import ObjectIdentity, ObjectType, noSuchInstance, noSuchObject
 from .utils import (
     OIDPrinter,
+    ProfileCatalog,
     batches,
     get_default_profiles,
     get_profile_definition,
@@ -41,6 +42,7 @@ from .utils import (
 )
 
 DEFAULT_OID_BATCH_SIZE = 10
+DEFAULT_REQUEST_WINDOW = 4
 LOADER_TAG = 'loader:python'
 
 _MAX_FETCH_NUMBER = 10**6
@@ -68,6 +70,9 @@ class SnmpCheck(AgentCheck):
         # Set OID batch size
         self.oid_batch_size = int(self.init_config.get('oid_batch_size', DEFAULT_OID_BATCH_SIZE))
 
+        # Set the number of requests in flight per device
+        self.request_window = int(self.init_config.get('request_window', DEFAULT_REQUEST_WINDOW))
+
         # Load Custom MIB directory
         self.mibs_path = self.init_config.get('mibs_folder')
 
@@ -80,6 +85,8 @@ class SnmpCheck(AgentCheck):
 
         self.profiles = self._load_profiles()
         self.profiles_by_oid = self._get_profiles_mapping()
+        # Profiles already matched, as devices of the same model share the same sysObjectID
+        self._profiles_by_sysobject_oid = {}  # type: Dict[str, str]
 
         self._config = self._build_config(self.instance)
 
@@ -103,7 +110,7 @@ class SnmpCheck(AgentCheck):
         return '{}-{}'.format(self.check_id, self._last_fetch_number)
 
     def _load_profiles(self):
-        # type: () -> Dict[str, Dict[str, Any]]
+        # type: () -> Mapping[str, Dict[str, Any]]
         """
         Load the configured SNMP profiles.
         """
@@ -136,8 +143,14 @@ class SnmpCheck(AgentCheck):
         Get the mapping from sysObjectID to profile.
         """
         profiles_by_oid = {}  # type: Dict[str, str]
-        for name, profile in self.profiles.items():
-            sys_object_oids = profile['definition'].get('sysobjectid')
+        if isinstance(self.profiles, ProfileCatalog):
+            # Avoid loading the definitions of the default profiles that are never used
+            sys_object_oids_by_profile = self.profiles.iter_sysobjectids()
+        else:
+            sys_object_oids_by_profile = (
+                (name, profile['definition'].get('sysobjectid')) for name, profile in self.profiles.items()
+            )
+        for name, sys_object_oids in sys_object_oids_by_profile:
             if sys_object_oids is None:
                 continue
             if isinstance(sys_object_oids, str):
@@ -216,29 +229,8 @@ class SnmpCheck(AgentCheck):
             config.oid_config.next_oids,
             enforce_constraints=enforce_constraints,
             fetch_id=fetch_id,
+            bulk_oids=config.oid_config.bulk_oids,
         )
-        for oid in config.oid_config.bulk_oids:
-            try:
-                oid_object_type = oid.as_object_type()
-                self.log.debug(
-                    '[%s] Running SNMP command getBulk on OID %s',
-                    fetch_id,
-                    OIDPrinter((oid_object_type,), with_values=False),
-                )
-                binds = snmp_bulk(
-                    config,
-                    oid_object_type,
-                    self._NON_REPEATERS,
-                    self._MAX_REPETITIONS,
-                    enforce_constraints,
-                    self.ignore_nonincreasing_oid,
-                )
-                all_binds.extend(binds)
-            except (PySnmpError, CheckException) as e:
-                message = '[{}] Failed to collect some metrics: {}'.format(fetch_id, e)
-                if not error:
-                    error = message
-                self.warning(message)
 
         scalar_oids = []
         for result_oid, value in all_binds:
@@ -251,72 +243,83 @@ class SnmpCheck(AgentCheck):
         results.default_factory = None  # type: ignore
         return results, scalar_oids, error
 
-    def fetch_oids(self, config, scalar_oids, next_oids, enforce_constraints, fetch_id):
-        # type: (InstanceConfig, List[OID], List[OID], bool, str) -> Tuple[List[Any], Optional[str]]
+    def fetch_oids(self, config, scalar_oids, next_oids, enforce_constraints, fetch_id, bulk_oids=()):
+        # type: (InstanceConfig, List[OID], List[OID], bool, str, Sequence[OID]) -> Tuple[List[Any], Optional[str]]
         # UPDATE: We used to perform only a snmpgetnext command to fetch metric values.
         # It returns the wrong value when the OID passed is referring to a specific leaf.
         # For example:
         # snmpgetnext -v2c -c public localhost:11111 1.3.6.1.2.1.25.4.2.1.7.222
         # iso.3.6.1.2.1.25.4.2.1.7.224 = INTEGER: 2
         # SOLUTION: perform a snmpget command and fallback with snmpgetnext if not found
-        error = None
+        errors = []  # type: List[str]
         scalar_oids = [oid.as_object_type() for oid in scalar_oids]
         next_oids = [oid.as_object_type() for oid in next_oids]
         all_binds = []
+        config.oid_batch_size_limit.next_fetch()
+        config.repetitions_limit.next_fetch()
+        batch_size = config.oid_batch_size_limit.get(self.oid_batch_size)
 
-        for oids_batch in batches(scalar_oids, size=self.oid_batch_size):
-            try:
-                self.log.debug(
-                    '[%s] Running SNMP command get on OIDS: %s', fetch_id, OIDPrinter(oids_batch, with_values=False)
-                )
-
-                var_binds = snmp_get(config, oids_batch, lookup_mib=enforce_constraints)
-                self.log.debug('[%s] Returned vars: %s', fetch_id, OIDPrinter(var_binds, with_values=True))
-
-                missing_results = []
-
-                for var in var_binds:
-                    result_oid, value = var
-                    if reply_invalid(value):
-                        oid_tuple = result_oid.asTuple()
-                        missing_results.append(ObjectType(ObjectIdentity(oid_tuple)))
-                    else:
-                        all_binds.append(var)
-
-                if missing_results:
-                    # If we didn't catch the metric using snmpget, try snmpnext
-                    next_oids.extend(missing_results)
+        pipeline = RequestPipeline(
+            config,
+            self.request_window,
+            lookup_mib=enforce_constraints,
+            ignore_nonincreasing_oid=self.ignore_nonincreasing_oid,
+        )
 
-            except (PySnmpError, CheckException) as e:
-                message = '[{}] Failed to collect some metrics: {}'.format(fetch_id, e)
-                if not error:
-                    error = message
-                self.warning(message)
+        for oids_batch in batches(scalar_oids, size=batch_size):
+            self.log.debug(
+                '[%s] Running SNMP command get on OIDS: %s', fetch_id, OIDPrinter(oids_batch, with_values=False)
+            )
+            pipeline.get(oids_batch)
+        self._run_pipeline(pipeline, errors)
+        self.log.debug('[%s] Returned vars: %s', fetch_id, OIDPrinter(pipeline.var_binds, with_values=True))
+
+        for var in pipeline.var_binds:
+            result_oid, value = var
+            if reply_invalid(value):
+                # If we didn't catch the metric using snmpget, try snmpnext
+                oid_tuple = result_oid.asTuple()
+                next_oids.append(ObjectType(ObjectIdentity(oid_tuple)))
+            else:
+                all_binds.append(var)
 
-        for oids_batch in batches(next_oids, size=self.oid_batch_size):
-            try:
-                self.log.debug(
-                    '[%s] Running SNMP command getNext on OIDS: %s', fetch_id, OIDPrinter(oids_batch, with_values=False)
-                )
-                binds = list(
-                    snmp_getnext(
-                        config,
-                        oids_batch,
-                        lookup_mib=enforce_constraints,
-                        ignore_nonincreasing_oid=self.ignore_nonincreasing_oid,
-                    )
-                )
-                self.log.debug('[%s] Returned vars: %s', fetch_id, OIDPrinter(binds, with_values=True))
-                all_binds.extend(binds)
+        pipeline.var_binds = []
+        for oids_batch in batches(next_oids, size=batch_size):
+            self.log.debug(
+                '[%s] Running SNMP command getNext on OIDS: %s', fetch_id, OIDPrinter(oids_batch, with_values=False)
+            )
+            pipeline.getnext(oids_batch)
+        for oid in bulk_oids:
+            oid_object_type = oid.as_object_type()
+            self.log.debug(
+                '[%s] Running SNMP command getBulk on OID %s',
+                fetch_id,
+                OIDPrinter((oid_object_type,), with_values=False),
+            )
+            pipeline.bulk(oid_object_type, self._NON_REPEATERS, self._MAX_REPETITIONS)
+        self._run_pipeline(pipeline, errors)
+        self.log.debug('[%s] Returned vars: %s', fetch_id, OIDPrinter(pipeline.var_binds, with_values=True))
+        all_binds.extend(pipeline.var_binds)
 
-            except (PySnmpError, CheckException) as e:
-                message = '[{}] Failed to collect some metrics: {}'.format(fetch_id, e)
-                if not error:
-                    error = message
-                self.warning(message)
+        error = None
+        for e in errors:
+            message = '[{}] Failed to collect some metrics: {}'.format(fetch_id, e)
+            if not error:
+                error = message
+            self.warning(message)
 
         return all_binds, error
 
+    @staticmethod
+    def _run_pipeline(pipeline, errors):
+        # type: (RequestPipeline, List[str]) -> None
+        try:
+            pipeline.run()
+        except (PySnmpError, CheckException) as e:
+            errors.append(str(e))
+        errors.extend(pipeline.errors)
+        pipeline.errors = []
+
     def fetch_sysobject_oid(self, config):
         # type: (InstanceConfig) -> str
         """Return the sysObjectID of the instance."""
@@ -332,6 +335,10 @@ class SnmpCheck(AgentCheck):
         """
         Return the most specific profile that matches the given sysObjectID.
         """
+        profile = self._profiles_by_sysobject_oid.get(sys_object_oid)
+        if profile is not None:
+            return profile
+
         matched_profiles_by_oid = {
             oid: self.profiles_by_oid[oid] for oid in self.profiles_by_oid if fnmatch.fnmatch(sys_object_oid, oid)
         }
@@ -341,7 +348,8 @@ class SnmpCheck(AgentCheck):
 
         oid = max(matched_profiles_by_oid.keys(), key=lambda oid: oid_pattern_specificity(oid))
 
-        return matched_profiles_by_oid[oid]
+        profile = self._profiles_by_sysobject_oid[sys_object_oid] = matched_profiles_by_oid[oid]
+        return profile
 
     def _start_discovery(self):
         # type: () -> None
@@ -395,6 +403,7 @@ class SnmpCheck(AgentCheck):
             tags = ['network:{}'.format(config.ip_network), 'autodiscovery_subnet:{}'.format(config.ip_network)]
             tags.extend(config.tags)
             self.gauge('snmp.discovered_devices_count', len(config.discovered_instances), tags=tags)
+            self.submit_discovery_telemetry_metrics(config, tags)
         else:
             error, tags = self._check_device(config)
             # no need to handle error here since it's already handled inside `self._check_device`
@@ -412,6 +421,30 @@ class SnmpCheck(AgentCheck):
         self.gauge('datadog.snmp.check_duration', check_duration, tags=telemetry_tags)
         self.gauge('datadog.snmp.submitted_metrics', self._submitted_metrics, tags=telemetry_tags)
 
+    def submit_discovery_telemetry_metrics(self, config, tags):
+        # type: (InstanceConfig, List[str]) -> None
+        # Discovery Metrics, reported once per discovery pass
+        stats, config.discovery_stats = config.discovery_stats, None
+        if stats is None:
+            return
+        duration, hosts_probed = stats
+        telemetry_tags = tags + [LOADER_TAG]
+        self.gauge('datadog.snmp.discovery.duration', duration, tags=telemetry_tags)
+        if duration > 0:
+            self.gauge('datadog.snmp.discovery.hosts_probed_per_second', hosts_probed / duration, tags=telemetry_tags)
+
+    def submit_request_telemetry_metrics(self, config, tags):
+        # type: (InstanceConfig, List[str]) -> None
+        telemetry_tags = tags + [LOADER_TAG]
+        # Request Metrics, always reported per device
+        stats = config.request_stats
+        self.count('datadog.snmp.requests', stats.requests, tags=telemetry_tags)
+        self.count('datadog.snmp.request_retries', stats.retries, tags=telemetry_tags)
+        if stats.requests:
+            self.gauge('datadog.snmp.request_rtt.avg', stats.total_rtt / stats.requests, tags=telemetry_tags)
+            self.gauge('datadog.snmp.request_rtt.max', stats.max_rtt, tags=telemetry_tags)
+        stats.reset()
+
     def _on_check_device_done(self, host, future):
         # type: (str, futures.Future) -> None
         config = self._config
@@ -467,6 +500,7 @@ class SnmpCheck(AgentCheck):
             # Sending `snmp.devices_monitored` with value 1 will allow users to count devices
             # by using `sum by {X}` queries in UI. X being a tag like `autodiscovery_subnet`, `snmp_profile`, etc
             self.gauge('snmp.devices_monitored', 1, tags=tags + [LOADER_TAG])
+            self.submit_request_telemetry_metrics(config, tags)
 
             # Report service checks
             status = self.OK
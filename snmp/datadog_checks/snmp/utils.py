@@ -1,8 +1,14 @@
 # (C) Datadog, Inc. 2020-present
 # All rights reserved
 # Licensed under Simplified BSD License (see LICENSE)
+import hashlib
 import logging
+import marshal
 import os
+import struct
+import sys
+import tempfile
+import threading
 from typing import Any, Dict, Iterator, List, Mapping, Optional, Pattern, Sequence, Tuple, Union  # noqa: F401
 
 import yaml
@@ -22,6 +28,11 @@ from .pysnmp_types import (
 )
 from .types import T  # noqa: F401
 
+try:
+    from collections.abc import Mapping as MappingABC
+except ImportError:
+    from collections import Mapping as MappingABC
+
 logger = logging.getLogger(__name__)
 
 
@@ -144,14 +155,14 @@ def _is_abstract_profile(name):
     return name.startswith('_')
 
 
-def _load_default_profiles():
-    # type: () -> Dict[str, Any]
-    """Load all the profiles installed on the system."""
-    profiles = {}
+def _iter_default_profiles():
+    # type: () -> Iterator[Tuple[str, str, Dict[str, Any]]]
+    """Yield the name, path and expanded definition of all the profiles installed on the system."""
+    names = set()
 
     for path in _iter_default_profile_file_paths():
         name = _get_profile_name(path)
-        if name in profiles:
+        if name in names:
             continue
 
         if _is_abstract_profile(name):
@@ -164,17 +175,233 @@ def _load_default_profiles():
             logger.warning("Failed to expand base profiles in profile '%s': %s", name, exc)
             continue
 
-        profiles[name] = {'definition': definition}
+        names.add(name)
+        yield name, path, definition
+
+
+def _load_default_profiles():
+    # type: () -> Dict[str, Any]
+    """Load all the profiles installed on the system."""
+    return {name: {'definition': definition} for name, _, definition in _iter_default_profiles()}
+
+
+# Bump when the layout of the compiled profile catalog changes
+_PROFILE_CATALOG_VERSION = 1
+_PROFILE_CATALOG_PREFIX = 'snmp_profiles_'
+_PROFILE_CATALOG_EXTENSION = '.catalog'
+_PROFILE_CATALOG_HEADER = struct.Struct('<I')
+
+
+def _get_profiles_cache_root():
+    # type: () -> Optional[str]
+    # NOTE: this separate helper function exists for mocking purposes.
+    # Only the run directory of the Agent is used, shared directories like the system temporary directory could
+    # let other users tamper with a catalog that is then loaded with `marshal`.
+    return get_config('run_path') or None
+
+
+def _get_profile_catalog_key(paths):
+    # type: (List[str]) -> str
+    """
+    Return a hash of the content of the profile files, along with the Python version since the format of
+    `marshal` depends on it.
+    """
+    digest = hashlib.sha1()
+    digest.update('{}:{}'.format(_PROFILE_CATALOG_VERSION, sys.version_info[:2]).encode('utf-8'))
+
+    for path in paths:
+        digest.update(path.encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+
+    return digest.hexdigest()
+
+
+class ProfileCatalog(MappingABC):
+    """
+    Read-only mapping of the profiles installed on the system, backed by a compiled catalog file.
 
-    return profiles
+    The catalog file holds the fully expanded definition of every profile along with an index of their
+    sysObjectIDs, so only the index is read when the catalog is opened and definitions are only loaded
+    when a profile is actually used.
+    """
 
+    def __init__(self, index, catalog_file=None, definitions=None):
+        # type: (Dict[str, Tuple[int, int, List[str], str]], Optional[str], Optional[Dict[str, Any]]) -> None
+        # {name: (offset, length, sysobjectids, source_path)}
+        self._index = index
+        self._catalog_file = catalog_file
+        self._profiles = {}  # type: Dict[str, Dict[str, Any]]
+        if definitions is not None:
+            self._profiles.update((name, {'definition': definition}) for name, definition in definitions.items())
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls):
+        # type: () -> ProfileCatalog
+        """
+        Open the compiled catalog of the profiles installed on the system, compiling it first if any profile changed.
 
-_default_profiles = _load_default_profiles()
+        Outside of the Agent, profiles are loaded in memory without any catalog.
+        """
+        cache_root = _get_profiles_cache_root()
+        catalog_file = None
+        if cache_root:
+            paths = sorted(_iter_default_profile_file_paths())
+            catalog_file = os.path.join(
+                cache_root,
+                '{}{}{}'.format(_PROFILE_CATALOG_PREFIX, _get_profile_catalog_key(paths), _PROFILE_CATALOG_EXTENSION),
+            )
+
+            try:
+                return cls.open(catalog_file)
+            except (IOError, OSError, ValueError, EOFError, TypeError, struct.error):
+                pass
+
+        definitions = {}
+        index = {}
+        for name, path, definition in _iter_default_profiles():
+            definitions[name] = definition
+            sysobjectids = definition.get('sysobjectid', [])
+            if isinstance(sysobjectids, str):
+                sysobjectids = [sysobjectids]
+            index[name] = (0, 0, sysobjectids, path)
+
+        if catalog_file is None:
+            return cls(index, definitions=definitions)
+
+        try:
+            _write_profile_catalog(catalog_file, index, definitions)
+            return cls.open(catalog_file)
+        except (IOError, OSError, ValueError, EOFError, TypeError, struct.error) as exc:
+            logger.debug("Could not compile the profile catalog to %s: %s", catalog_file, exc)
+            return cls(index, definitions=definitions)
+
+    @classmethod
+    def open(cls, catalog_file):
+        # type: (str) -> ProfileCatalog
+        with open(catalog_file, 'rb') as f:
+            (length,) = _PROFILE_CATALOG_HEADER.unpack(f.read(_PROFILE_CATALOG_HEADER.size))
+            index = marshal.loads(f.read(length))
+        return cls(index, catalog_file=catalog_file)
+
+    def iter_sysobjectids(self):
+        # type: () -> Iterator[Tuple[str, List[str]]]
+        """Yield the name and sysObjectIDs of every profile, without loading their definitions."""
+        for name, (_, _, sysobjectids, _) in self._index.items():
+            yield name, sysobjectids
+
+    def __getitem__(self, name):
+        # type: (str) -> Dict[str, Any]
+        profile = self._profiles.get(name)
+        if profile is not None:
+            return profile
+
+        offset, length, _, source_path = self._index[name]
+        with self._lock:
+            profile = self._profiles.get(name)
+            if profile is None:
+                profile = self._profiles[name] = {'definition': self._load_definition(offset, length, source_path)}
+        return profile
+
+    def __iter__(self):
+        # type: () -> Iterator[str]
+        return iter(self._index)
+
+    def __len__(self):
+        # type: () -> int
+        return len(self._index)
+
+    def __contains__(self, name):
+        # type: (object) -> bool
+        return name in self._index
+
+    def _load_definition(self, offset, length, source_path):
+        # type: (int, int, str) -> Dict[str, Any]
+        try:
+            with open(self._catalog_file, 'rb') as f:  # type: ignore
+                f.seek(offset)
+                return marshal.loads(f.read(length))
+        except (IOError, OSError, ValueError, EOFError, TypeError) as exc:
+            # The catalog may have been removed in the meantime, fall back to the profile file itself
+            logger.debug("Could not read the profile catalog %s: %s", self._catalog_file, exc)
+
+        definition = _read_profile_definition(source_path)
+        recursively_expand_base_profiles(definition)
+        return definition
+
+
+def _write_profile_catalog(catalog_file, index, definitions):
+    # type: (str, Dict[str, Tuple[int, int, List[str], str]], Dict[str, Any]) -> None
+    blobs = []
+    offsets = {}
+    position = 0
+    for name in index:
+        blob = marshal.dumps(definitions[name])
+        offsets[name] = (position, len(blob))
+        blobs.append(blob)
+        position += len(blob)
+
+    # Definitions are stored right after the index, which needs to know its own size to compute their offsets
+    header_size = 0
+    while True:
+        compiled_index = {
+            name: (header_size + offsets[name][0], offsets[name][1], sysobjectids, path)
+            for name, (_, _, sysobjectids, path) in index.items()
+        }
+        index_blob = marshal.dumps(compiled_index)
+        size = _PROFILE_CATALOG_HEADER.size + len(index_blob)
+        if size == header_size:
+            break
+        header_size = size
+
+    # Write to a temporary file first so that other processes never read a partial catalog
+    cache_root = os.path.dirname(catalog_file)
+    fd, tmp_file = tempfile.mkstemp(prefix=_PROFILE_CATALOG_PREFIX, dir=cache_root)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_PROFILE_CATALOG_HEADER.pack(len(index_blob)))
+            f.write(index_blob)
+            for blob in blobs:
+                f.write(blob)
+        try:
+            os.rename(tmp_file, catalog_file)
+        except OSError:
+            # On Windows the catalog may have been written by another process in the meantime
+            if not os.path.isfile(catalog_file):
+                raise
+            os.remove(tmp_file)
+    except Exception:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+
+    # Remove the catalogs compiled from older versions of the profiles
+    for filename in os.listdir(cache_root):
+        path = os.path.join(cache_root, filename)
+        if (
+            filename.startswith(_PROFILE_CATALOG_PREFIX)
+            and filename.endswith(_PROFILE_CATALOG_EXTENSION)
+            and path != catalog_file
+        ):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+_default_profiles = None  # type: Optional[ProfileCatalog]
+_default_profiles_lock = threading.Lock()
 
 
 def get_default_profiles():
-    # type: () -> Dict[str, Any]
+    # type: () -> ProfileCatalog
     """Return all the profiles installed on the system."""
+    global _default_profiles
+
+    with _default_profiles_lock:
+        if _default_profiles is None:
+            _default_profiles = ProfileCatalog.load()
     return _default_profiles
 
 
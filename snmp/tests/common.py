@@ -276,6 +276,19 @@ def generate_v3_instance_config(metrics, name=None, user=None, auth=None, auth_k
     return instance_config
 
 
+REQUEST_TELEMETRY_METRICS = [
+    'datadog.snmp.requests',
+    'datadog.snmp.request_retries',
+    'datadog.snmp.request_rtt.avg',
+    'datadog.snmp.request_rtt.max',
+]
+
+DISCOVERY_TELEMETRY_METRICS = [
+    'datadog.snmp.discovery.duration',
+    'datadog.snmp.discovery.hosts_probed_per_second',
+]
+
+
 def create_check(instance):
     return SnmpCheck('snmp', {}, [instance])
 
@@ -313,6 +326,9 @@ def assert_common_device_metrics(
     aggregator.assert_metric(
         'snmp.devices_monitored', metric_type=aggregator.GAUGE, tags=tags, count=count, value=devices_monitored_value
     )
+    if loader == 'python':
+        for metric in REQUEST_TELEMETRY_METRICS:
+            aggregator.assert_metric(metric, tags=tags, at_least=1)
 
 
 def remove_tags(tags, tag_keys_to_remove):
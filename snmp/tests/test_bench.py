@@ -0,0 +1,49 @@
+# (C) Datadog, Inc. 2024-present
+# All rights reserved
+# Licensed under Simplified BSD License (see LICENSE)
+import mock
+
+from datadog_checks.dev import temp_dir
+from datadog_checks.snmp import utils
+from datadog_checks.snmp.utils import ProfileCatalog, _load_default_profiles
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+def _record_peak_memory(benchmark, func):
+    if tracemalloc is None:
+        return func()
+
+    tracemalloc.start()
+    try:
+        result = func()
+        benchmark.extra_info['peak_memory_kib'] = tracemalloc.get_traced_memory()[1] // 1024
+    finally:
+        tracemalloc.stop()
+    return result
+
+
+def test_load_default_profiles(benchmark):
+    """Every profile parsed and expanded from its YAML file, as done on every startup without the catalog."""
+
+    def run():
+        return _load_default_profiles()['generic-device']
+
+    _record_peak_memory(benchmark, run)
+    benchmark(run)
+
+
+def test_load_profile_from_catalog(benchmark):
+    """Only the index of a compiled catalog is read, then the definition of a single profile."""
+    with temp_dir() as cache_root, mock.patch.object(utils, '_get_profiles_cache_root', return_value=cache_root):
+        # Compile the catalog, as done by the first check instance after an installation or an upgrade
+        ProfileCatalog.load()
+
+        def run():
+            return ProfileCatalog.load()['generic-device']
+
+        _record_peak_memory(benchmark, run)
+        benchmark(run)
@@ -928,6 +928,14 @@ def test_discovery(aggregator):
                 break
             time.sleep(1)
             aggregator.reset()
+
+        # Discovery telemetry is reported by the first check run after a discovery pass ends
+        for _ in range(30):
+            if check._config.discovery_stats is not None:
+                break
+            time.sleep(1)
+        aggregator.reset()
+        check.check(instance)
     finally:
         check._running = False
         del check  # This is what the Agent would do when unscheduling the check.
@@ -941,6 +949,8 @@ def test_discovery(aggregator):
 
     common.assert_common_device_metrics(aggregator, tags=check_tags)
     common.assert_common_check_run_metrics(aggregator, network_tags)
+    for metric in common.DISCOVERY_TELEMETRY_METRICS:
+        aggregator.assert_metric(metric, tags=network_tags + ['loader:python'], count=1)
     aggregator.assert_all_metrics_covered()
 
 
@@ -969,6 +979,8 @@ def test_discovery_devices_monitored_count(read_mock, aggregator):
         }
     }
     check = SnmpCheck('snmp', init_config, [instance])
+    # No discovery pass runs, the monitored devices all come from the cache
+    check._thread_factory = lambda **kwargs: mock.Mock()
     check.check(instance)
     check._running = False
 
@@ -979,6 +991,8 @@ def test_discovery_devices_monitored_count(read_mock, aggregator):
         common.assert_common_device_metrics(aggregator, devices_monitored_value=1, count=1, tags=tags)
 
     common.assert_common_check_run_metrics(aggregator, network_tags)
+    for metric in common.DISCOVERY_TELEMETRY_METRICS:
+        aggregator.assert_metric(metric, tags=network_tags + ['loader:python'], count=0)
     aggregator.assert_all_metrics_covered()
 
 
@@ -1351,7 +1365,7 @@ def test_oids_cache_command_calls(refresh_interval, getnext_call_counts, getnext
     instance['refresh_oids_cache_interval'] = refresh_interval
     check = common.create_check(instance)
 
-    with mock.patch('datadog_checks.snmp.snmp.snmp_getnext') as snmp_getnext:
+    with mock.patch('datadog_checks.snmp.commands.RequestPipeline.getnext') as snmp_getnext:
         assert snmp_getnext.call_count == 0
         for call_count in getnext_call_counts:
             check.check(instance)
@@ -683,7 +683,12 @@ def assert_python_vs_core(
     core_config = deepcopy(config)
     core_config['init_config']['loader'] = 'core'
     core_config['init_config']['collect_device_metadata'] = 'false'
-    metrics_to_skip = (metrics_to_skip or []) + SKIPPED_CORE_ONLY_METRICS
+    metrics_to_skip = (
+        (metrics_to_skip or [])
+        + SKIPPED_CORE_ONLY_METRICS
+        + common.REQUEST_TELEMETRY_METRICS
+        + common.DISCOVERY_TELEMETRY_METRICS
+    )
     tags_to_skip = tags_to_skip or []
     tags_to_skip += DEFAULT_TAGS_TO_SKIP
 
@@ -3,6 +3,7 @@
 # Licensed under Simplified BSD License (see LICENSE)
 
 import copy
+import json
 import logging
 import os
 import time
@@ -16,12 +17,15 @@ import yaml
 
 from datadog_checks.base import ConfigurationError
 from datadog_checks.dev import temp_dir
-from datadog_checks.snmp import SnmpCheck
-from datadog_checks.snmp.config import InstanceConfig
+from datadog_checks.snmp import SnmpCheck, utils
+from datadog_checks.snmp.commands import TOO_BIG, RequestPipeline
+from datadog_checks.snmp.config import InstanceConfig, RequestSizeLimit
 from datadog_checks.snmp.discovery import discover_instances
 from datadog_checks.snmp.parsing import ParsedSymbolMetric, ParsedTableMetric
+from datadog_checks.snmp.pysnmp_types import ObjectIdentity, ObjectType
 from datadog_checks.snmp.resolver import OIDTrie
 from datadog_checks.snmp.utils import (
+    ProfileCatalog,
     _load_default_profiles,
     batches,
     oid_pattern_specificity,
@@ -484,6 +488,69 @@ def test_default_profiles():
             assert profiles['profile'] == {'definition': profile}
 
 
+def test_profile_catalog():
+    profile = {
+        'sysobjectid': '1.3.6.1.4.1.99999.*',
+        'metrics': [{'MIB': 'TCP-MIB', 'symbol': 'tcpPassiveOpens', 'forced_type': 'monotonic_count'}],
+    }
+
+    with temp_dir() as tmp:
+        profiles_root = os.path.join(tmp, 'profiles')
+        cache_root = os.path.join(tmp, 'cache')
+        mkdir_p(profiles_root)
+        mkdir_p(cache_root)
+        with mock_profiles_confd_default_root(profiles_root), mock.patch.object(
+            utils, '_get_profiles_site_root', return_value=os.path.join(tmp, 'missing')
+        ), mock.patch.object(utils, '_get_profiles_cache_root', return_value=cache_root):
+            with open(os.path.join(profiles_root, 'profile.yaml'), 'wb') as f:
+                f.write(yaml.safe_dump(profile))
+
+            catalog = ProfileCatalog.load()
+            assert list(catalog.iter_sysobjectids()) == [('profile', ['1.3.6.1.4.1.99999.*'])]
+            assert catalog['profile'] == {'definition': profile}
+            catalog_files = os.listdir(cache_root)
+            assert len(catalog_files) == 1
+
+            # Definitions are read from the compiled catalog
+            with mock.patch.object(utils, '_read_profile_definition', side_effect=Exception('not compiled')):
+                catalog = ProfileCatalog.load()
+                assert 'profile' in catalog
+                assert catalog['profile'] == {'definition': profile}
+
+            # The catalog is compiled again when a profile changes
+            profile['metrics'].append({'MIB': 'TCP-MIB', 'symbol': 'tcpActiveOpens', 'forced_type': 'monotonic_count'})
+            with open(os.path.join(profiles_root, 'profile.yaml'), 'wb') as f:
+                f.write(yaml.safe_dump(profile))
+
+            catalog = ProfileCatalog.load()
+            assert catalog['profile'] == {'definition': profile}
+            assert len(os.listdir(cache_root)) == 1
+            assert os.listdir(cache_root) != catalog_files
+
+
+def test_profile_catalog_without_run_path():
+    profile = {
+        'sysobjectid': '1.3.6.1.4.1.99999.*',
+        'metrics': [{'MIB': 'TCP-MIB', 'symbol': 'tcpPassiveOpens', 'forced_type': 'monotonic_count'}],
+    }
+
+    with temp_dir() as tmp:
+        profiles_root = os.path.join(tmp, 'profiles')
+        mkdir_p(profiles_root)
+        with mock_profiles_confd_default_root(profiles_root), mock.patch.object(
+            utils, '_get_profiles_site_root', return_value=os.path.join(tmp, 'missing')
+        ), mock.patch.object(utils, 'get_config', return_value=''), mock.patch.object(
+            utils, '_write_profile_catalog'
+        ) as write_mock:
+            with open(os.path.join(profiles_root, 'profile.yaml'), 'wb') as f:
+                f.write(yaml.safe_dump(profile))
+
+            # No catalog is written outside of the run directory of the Agent
+            catalog = ProfileCatalog.load()
+            assert catalog['profile'] == {'definition': profile}
+            write_mock.assert_not_called()
+
+
 def test_profile_override():
     profile = {
         'metrics': [{'MIB': 'TCP-MIB', 'symbol': 'tcpPassiveOpens', 'forced_type': 'monotonic_count'}],
@@ -592,6 +659,8 @@ def test_discovery_tags():
 
     instance['network_address'] = '192.168.0.0/29'
     instance['tags'] = ['test:check']
+    # Probe hosts in order
+    instance['discovery_workers'] = 1
 
     check = SnmpCheck('snmp', {}, [instance])
 
@@ -616,6 +685,77 @@ def test_discovery_tags():
     }
 
 
+@mock.patch("datadog_checks.snmp.discovery.write_persistent_cache")
+def test_discovery_concurrent_sweep(write_mock, aggregator):
+    instance = common.generate_instance_config([])
+    instance.pop('ip_address')
+    instance['network_address'] = '192.168.0.0/28'
+    instance['discovery_workers'] = 14
+
+    check = SnmpCheck('snmp', {}, [instance])
+
+    def mock_fetch(cfg):
+        time.sleep(0.5)
+        if cfg.instance['ip_address'] in ('192.168.0.1', '192.168.0.2'):
+            return '1.3.6.1.4.5'
+        raise RuntimeError("No SNMP response")
+
+    passes = []
+
+    def stop_discovery(*args):
+        passes.append(check._config.discovery_stats)
+        check._running = False
+
+    check.fetch_sysobject_oid = mock_fetch
+    write_mock.side_effect = stop_discovery
+
+    discover_instances(check._config, 0, weakref.ref(check))
+
+    assert sorted(check._config.discovered_instances) == ['192.168.0.1', '192.168.0.2']
+    # The persistent cache is written once per pass instead of once per discovered host
+    assert write_mock.call_count == 1
+    assert sorted(json.loads(write_mock.call_args[0][1])) == ['192.168.0.1', '192.168.0.2']
+
+    # The 14 hosts of the subnet are probed at the same time
+    duration, hosts_probed = passes[0]
+    assert duration < 3
+    assert hosts_probed == 14
+
+    check._config.discovery_stats = passes[0]
+    check.submit_discovery_telemetry_metrics(check._config, ['test:check'])
+    aggregator.assert_metric('datadog.snmp.discovery.duration', value=duration, tags=['test:check', 'loader:python'])
+    aggregator.assert_metric(
+        'datadog.snmp.discovery.hosts_probed_per_second', value=14 / duration, tags=['test:check', 'loader:python']
+    )
+    assert check._config.discovery_stats is None
+
+
+@mock.patch("datadog_checks.snmp.discovery.write_persistent_cache")
+def test_discovery_timeout(write_mock):
+    instance = common.generate_instance_config([])
+    instance.pop('ip_address')
+    instance['network_address'] = '192.168.0.0/29'
+    instance['discovery_workers'] = 1
+    instance['discovery_timeout'] = 0.5
+
+    check = SnmpCheck('snmp', {}, [instance])
+    probed = []
+
+    def mock_fetch(cfg):
+        probed.append(cfg.instance['ip_address'])
+        if len(probed) == 6:
+            check._running = False
+        time.sleep(0.3)
+        raise RuntimeError("No SNMP response")
+
+    check.fetch_sysobject_oid = mock_fetch
+
+    discover_instances(check._config, 0, weakref.ref(check))
+
+    # Each pass stops after 2 hosts, the next one starts with the hosts that were not probed
+    assert probed == ['192.168.0.{}'.format(i) for i in range(1, 7)]
+
+
 @mock.patch("datadog_checks.snmp.snmp.read_persistent_cache")
 @mock.patch("threading.Thread")
 def test_cache_loading_tags(thread_mock, read_mock):
@@ -674,6 +814,61 @@ def test_batches_size_must_be_strictly_positive(size):
         list(batches([1, 2, 3], size=size))
 
 
+@mock.patch("datadog_checks.snmp.commands.cmdgen.GetCommandGenerator")
+def test_request_pipeline_too_big(generator_mock):
+    config = InstanceConfig(
+        {"ip_address": "127.0.0.123", "community_string": "public", "metrics": [{"OID": "1.2.3", "name": "foo"}]}
+    )
+    requests = []
+
+    def send_var_binds(snmp_engine, target, context_engine_id, context_name, var_binds, callback):
+        # The device can't answer with more than 2 values in the same response
+        requests.append(len(var_binds))
+        error_status = TOO_BIG if len(var_binds) > 2 else 0
+        callback(snmp_engine, None, None, error_status, 0, [] if error_status else var_binds, None)
+
+    generator_mock.return_value.sendVarBinds.side_effect = send_var_binds
+    oids = [ObjectType(ObjectIdentity('1.3.6.1.2.1.1.{}.0'.format(i))) for i in range(1, 6)]
+
+    with mock.patch.object(config._snmp_engine.transportDispatcher, 'runDispatcher'):
+        pipeline = RequestPipeline(config, 2, lookup_mib=False, ignore_nonincreasing_oid=False)
+        pipeline.get(oids)
+        pipeline.run()
+
+    assert sorted(str(oid) for oid, _ in pipeline.var_binds) == ['1.3.6.1.2.1.1.{}.0'.format(i) for i in range(1, 6)]
+    assert pipeline.errors == []
+    assert requests == [5, 2, 3, 1, 2]
+    # The device answers requests of up to 2 oids
+    assert config.oid_batch_size_limit.get(10) == 2
+    assert config.request_stats.requests == 5
+    assert config.request_stats.retries == 2
+
+
+def test_request_size_limit():
+    limit = RequestSizeLimit()
+    assert limit.get(10) == 10
+
+    # The limit is searched between the largest accepted size and the smallest rejected one
+    limit.reject(10)
+    assert limit.get(10) == 5
+    limit.accept(5)
+    assert limit.get(10) == 7
+    limit.reject(7)
+    assert limit.get(10) == 6
+    limit.accept(6)
+    assert limit.get(10) == 6
+    assert limit.get(4) == 4
+
+    # Bigger requests are tried again from time to time
+    for _ in range(RequestSizeLimit.RETRY_INTERVAL - 1):
+        limit.next_fetch()
+        assert limit.get(10) == 6
+    limit.next_fetch()
+    assert limit.get(10) == 10
+    limit.accept(10)
+    assert limit.get(20) == 20
+
+
 def test_try_submit_bandwidth_usage_metric_if_bandwidth_metric():
     instance = common.generate_instance_config([])
 
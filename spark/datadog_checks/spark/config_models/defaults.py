@@ -60,6 +60,10 @@ def instance_log_requests():
     return False
 
 
+def instance_max_concurrent_requests():
+    return 1
+
+
 def instance_metricsservlet_path():
     return '/metrics/json'
 
@@ -72,6 +76,10 @@ def instance_persist_connections():
     return False
 
 
+def instance_report_completed_objects_once():
+    return False
+
+
 def instance_request_size():
     return 16
 
@@ -77,6 +77,7 @@ class InstanceConfig(BaseModel):
     kerberos_keytab: Optional[str] = None
     kerberos_principal: Optional[str] = None
     log_requests: Optional[bool] = None
+    max_concurrent_requests: Optional[int] = None
     metric_patterns: Optional[MetricPatterns] = None
     metricsservlet_path: Optional[str] = None
     min_collection_interval: Optional[float] = None
@@ -85,6 +86,7 @@ class InstanceConfig(BaseModel):
     persist_connections: Optional[bool] = None
     proxy: Optional[Proxy] = None
     read_timeout: Optional[float] = None
+    report_completed_objects_once: Optional[bool] = None
     request_size: Optional[float] = None
     service: Optional[str] = None
     skip_proxy: Optional[bool] = None
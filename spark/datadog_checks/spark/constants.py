@@ -48,6 +48,10 @@ UUID_REGEX = re.compile(r"[a-fA-F0-9]{8}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-
 YARN_APPLICATION_TYPES = 'SPARK'
 APPLICATION_STATES = 'RUNNING'
 
+# Statuses of the jobs and stages that are done
+SPARK_COMPLETED_JOB_STATUSES = {'SUCCEEDED', 'FAILED'}
+SPARK_COMPLETED_STAGE_STATUSES = {'COMPLETE', 'FAILED', 'SKIPPED'}
+
 # Event types
 JOB_EVENT = 'job'
 STAGE_EVENT = 'stage'
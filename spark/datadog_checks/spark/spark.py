@@ -1,6 +1,7 @@
 # (C) Datadog, Inc. 2018-present
 # All rights reserved
 # Licensed under a 3-clause BSD style license (see LICENSE)
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from bs4 import BeautifulSoup
 from requests.exceptions import ConnectionError, HTTPError, InvalidURL, Timeout
@@ -21,6 +22,8 @@ from .constants import (
     MONOTONIC_COUNT,
     SPARK_APPS_PATH,
     SPARK_CLUSTER_MODE,
+    SPARK_COMPLETED_JOB_STATUSES,
+    SPARK_COMPLETED_STAGE_STATUSES,
     SPARK_DRIVER_METRICS,
     SPARK_DRIVER_MODE,
     SPARK_DRIVER_SERVICE_CHECK,
@@ -82,6 +85,23 @@ class SparkCheck(AgentCheck):
 
         self.master_address = self._get_master_address()
 
+        try:
+            self._max_concurrent_requests = int(self.instance.get('max_concurrent_requests', 1))
+        except (TypeError, ValueError):
+            raise ConfigurationError('`max_concurrent_requests` must be an integer')
+        if self._max_concurrent_requests < 1:
+            raise ConfigurationError('`max_concurrent_requests` must be greater than or equal to 1')
+
+        # Responses of the application endpoints that are requested ahead of their processing
+        self._prefetched_responses = {}
+        # Concurrent requests reuse the connections to the application masters
+        self._persist_connections = True if self._max_concurrent_requests > 1 else None
+
+        # Identifiers of the completed jobs and stages already reported for every running application
+        self._report_completed_objects_once = is_affirmative(self.instance.get('report_completed_objects_once', False))
+        self._reported_completed_jobs = {}
+        self._reported_completed_stages = {}
+
     def check(self, _):
         tags = list(self.tags)
 
@@ -95,22 +115,38 @@ class SparkCheck(AgentCheck):
             self.log.warning('No running apps found. No metrics will be collected.')
             return
 
-        # Get the job metrics
-        self._spark_job_metrics(spark_apps, tags)
+        streaming_metrics = is_affirmative(self.instance.get('streaming_metrics', True))
 
-        # Get the stage metrics
-        self._spark_stage_metrics(spark_apps, tags)
+        with ThreadPoolExecutor(max_workers=self._max_concurrent_requests) as executor:
+            if self._max_concurrent_requests > 1:
+                self._prefetch_app_responses(executor, spark_apps, tags, streaming_metrics)
+
+            try:
+                # Get the job metrics
+                self._spark_job_metrics(spark_apps, tags)
 
-        # Get the executor metrics
-        self._spark_executor_metrics(spark_apps, tags)
+                # Get the stage metrics
+                self._spark_stage_metrics(spark_apps, tags)
 
-        # Get the rdd metrics
-        self._spark_rdd_metrics(spark_apps, tags)
+                # Get the executor metrics
+                self._spark_executor_metrics(spark_apps, tags)
 
-        # Get the streaming statistics metrics
-        if is_affirmative(self.instance.get('streaming_metrics', True)):
-            self._spark_streaming_statistics_metrics(spark_apps, tags)
-            self._spark_structured_streams_metrics(spark_apps, tags)
+                # Get the rdd metrics
+                self._spark_rdd_metrics(spark_apps, tags)
+
+                # Get the streaming statistics metrics
+                if streaming_metrics:
+                    self._spark_streaming_statistics_metrics(spark_apps, tags)
+                    self._spark_structured_streams_metrics(spark_apps, tags)
+            finally:
+                for future in itervalues(self._prefetched_responses):
+                    future.cancel()
+                self._prefetched_responses = {}
+
+        # Forget about the applications that are no longer running
+        for reported in (self._reported_completed_jobs, self._reported_completed_stages):
+            for app_id in set(reported) - set(spark_apps):
+                del reported[app_id]
 
         # Report success after gathering all metrics from the ApplicationMaster
         if spark_apps:
@@ -390,6 +426,73 @@ class SparkCheck(AgentCheck):
 
         return spark_apps
 
+    def _prefetch_app_responses(self, executor, running_apps, addl_tags, streaming_metrics):
+        """
+        Request the endpoints of all the running applications concurrently, their responses
+        are then processed in order by the `_spark_*_metrics` methods.
+        """
+        endpoints = ['jobs', 'stages', 'executors', 'storage/rdd']
+        if streaming_metrics:
+            endpoints.append('streaming/statistics')
+
+        # A proxy in front of the applications may set a cookie on the first request, which is then
+        # sent by all the others, so the first request is made before the concurrent ones
+        sequential = self.proxy_redirect_cookies is None
+        for app_id, (_, tracking_url) in iteritems(running_apps):
+            base_url = self._get_request_url(tracking_url)
+            paths = [(SPARK_APPS_PATH, app_id, endpoint) for endpoint in endpoints]
+            if streaming_metrics:
+                paths.append((self.metricsservlet_path,))
+
+            for path in paths:
+                key = (base_url,) + path
+                if key in self._prefetched_responses:
+                    continue
+
+                request_args = (base_url, path[0], SPARK_SERVICE_CHECK, addl_tags) + path[1:]
+                if sequential:
+                    sequential = False
+                    future = Future()
+                    try:
+                        future.set_result(self._rest_request_to_json(*request_args))
+                    except Exception as e:
+                        future.set_exception(e)
+                else:
+                    future = executor.submit(self._rest_request_to_json, *request_args)
+                self._prefetched_responses[key] = future
+
+    def _app_request_to_json(self, address, object_path, tags, *args):
+        """
+        Return the JSON response of an application endpoint, using the prefetched one if any
+        """
+        future = self._prefetched_responses.pop((address, object_path) + args, None)
+        if future is not None:
+            return future.result()
+
+        return self._rest_request_to_json(address, object_path, SPARK_SERVICE_CHECK, tags, *args)
+
+    def _filter_completed_objects(self, app_id, objects, get_key, completed_statuses, reported_objects):
+        """
+        Skip the completed jobs or stages already reported by previous runs
+        """
+        if not self._report_completed_objects_once:
+            return objects
+
+        reported = reported_objects.get(app_id, set())
+        # Only the objects still exposed by the application are remembered
+        completed = set()
+        filtered = []
+        for obj in objects:
+            if obj.get('status') in completed_statuses:
+                key = get_key(obj)
+                completed.add(key)
+                if key in reported:
+                    continue
+            filtered.append(obj)
+
+        reported_objects[app_id] = completed
+        return filtered
+
     def _spark_job_metrics(self, running_apps, addl_tags):
         """
         Get metrics for each Spark job.
@@ -397,8 +500,14 @@ class SparkCheck(AgentCheck):
         for app_id, (app_name, tracking_url) in iteritems(running_apps):
 
             base_url = self._get_request_url(tracking_url)
-            response = self._rest_request_to_json(
-                base_url, SPARK_APPS_PATH, SPARK_SERVICE_CHECK, addl_tags, app_id, 'jobs'
+            response = self._app_request_to_json(base_url, SPARK_APPS_PATH, addl_tags, app_id, 'jobs')
+
+            response = self._filter_completed_objects(
+                app_id,
+                response,
+                lambda job: job.get('jobId'),
+                SPARK_COMPLETED_JOB_STATUSES,
+                self._reported_completed_jobs,
             )
 
             for job in response:
@@ -426,8 +535,14 @@ class SparkCheck(AgentCheck):
         for app_id, (app_name, tracking_url) in iteritems(running_apps):
 
             base_url = self._get_request_url(tracking_url)
-            response = self._rest_request_to_json(
-                base_url, SPARK_APPS_PATH, SPARK_SERVICE_CHECK, addl_tags, app_id, 'stages'
+            response = self._app_request_to_json(base_url, SPARK_APPS_PATH, addl_tags, app_id, 'stages')
+
+            response = self._filter_completed_objects(
+                app_id,
+                response,
+                lambda stage: (stage.get('stageId'), stage.get('attemptId')),
+                SPARK_COMPLETED_STAGE_STATUSES,
+                self._reported_completed_stages,
             )
 
             for stage in response:
@@ -452,9 +567,7 @@ class SparkCheck(AgentCheck):
         for app_id, (app_name, tracking_url) in iteritems(running_apps):
 
             base_url = self._get_request_url(tracking_url)
-            response = self._rest_request_to_json(
-                base_url, SPARK_APPS_PATH, SPARK_SERVICE_CHECK, addl_tags, app_id, 'executors'
-            )
+            response = self._app_request_to_json(base_url, SPARK_APPS_PATH, addl_tags, app_id, 'executors')
 
             tags = ['app_name:%s' % str(app_name)]
             tags.extend(addl_tags)
@@ -482,9 +595,7 @@ class SparkCheck(AgentCheck):
         for app_id, (app_name, tracking_url) in iteritems(running_apps):
 
             base_url = self._get_request_url(tracking_url)
-            response = self._rest_request_to_json(
-                base_url, SPARK_APPS_PATH, SPARK_SERVICE_CHECK, addl_tags, app_id, 'storage/rdd'
-            )
+            response = self._app_request_to_json(base_url, SPARK_APPS_PATH, addl_tags, app_id, 'storage/rdd')
 
             tags = ['app_name:%s' % str(app_name)]
             tags.extend(addl_tags)
@@ -502,8 +613,8 @@ class SparkCheck(AgentCheck):
         for app_id, (app_name, tracking_url) in iteritems(running_apps):
             try:
                 base_url = self._get_request_url(tracking_url)
-                response = self._rest_request_to_json(
-                    base_url, SPARK_APPS_PATH, SPARK_SERVICE_CHECK, addl_tags, app_id, 'streaming/statistics'
+                response = self._app_request_to_json(
+                    base_url, SPARK_APPS_PATH, addl_tags, app_id, 'streaming/statistics'
                 )
                 self.log.debug('streaming/statistics: %s', response)
                 tags = ['app_name:%s' % str(app_name)]
@@ -528,9 +639,7 @@ class SparkCheck(AgentCheck):
         for app_name, tracking_url in itervalues(running_apps):
             try:
                 base_url = self._get_request_url(tracking_url)
-                response = self._rest_request_to_json(
-                    base_url, self.metricsservlet_path, SPARK_SERVICE_CHECK, addl_tags
-                )
+                response = self._app_request_to_json(base_url, self.metricsservlet_path, addl_tags)
                 self.log.debug('Structured streaming metrics: %s', response)
                 response = {
                     metric_name: v['value']
@@ -630,7 +739,7 @@ class SparkCheck(AgentCheck):
 
         try:
             self.log.debug('Spark check URL: %s', url)
-            response = self.http.get(url, cookies=self.proxy_redirect_cookies)
+            response = self.http.get(url, cookies=self.proxy_redirect_cookies, persist=self._persist_connections)
             response.raise_for_status()
             content = response.text
             proxy_redirect_url = self._parse_proxy_redirect_url(content)
@@ -641,7 +750,9 @@ class SparkCheck(AgentCheck):
                 # This page displays a redirect link (which appends `proxyapproved=true`) and also
                 # sets a cookie to the current http session. Let's follow the link.
                 # https://github.com/apache/hadoop/blob/2064ca015d1584263aac0cc20c60b925a3aff612/hadoop-yarn-project/hadoop-yarn/hadoop-yarn-server/hadoop-yarn-server-web-proxy/src/main/java/org/apache/hadoop/yarn/server/webproxy/WebAppProxyServlet.java#L368
-                response = self.http.get(proxy_redirect_url, cookies=self.proxy_redirect_cookies)
+                response = self.http.get(
+                    proxy_redirect_url, cookies=self.proxy_redirect_cookies, persist=self._persist_connections
+                )
                 response.raise_for_status()
 
         except Timeout as e:
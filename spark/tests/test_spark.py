@@ -15,6 +15,7 @@ from six import iteritems
 from six.moves import BaseHTTPServer
 from six.moves.urllib.parse import parse_qsl, unquote_plus, urlencode, urljoin, urlparse, urlunparse
 
+from datadog_checks.base import ConfigurationError
 from datadog_checks.dev.http import MockResponse
 from datadog_checks.dev.utils import get_metadata_metrics
 from datadog_checks.spark import SparkCheck
@@ -1267,6 +1268,138 @@ def test_do_not_crash_on_single_app_failure():
         assert rest_requests_to_json.call_count == 2
 
 
+def _submitted_metrics(aggregator):
+    return sorted(
+        (metric.name, metric.type, metric.value, tuple(sorted(metric.tags)))
+        for name in aggregator.metric_names
+        for metric in aggregator.metrics(name)
+    )
+
+
+@pytest.mark.unit
+def test_yarn_concurrent_requests(aggregator, dd_run_check):
+    with mock.patch('requests.get', yarn_requests_get_mock):
+        dd_run_check(SparkCheck('spark', {}, [YARN_CONFIG]))
+    expected_metrics = _submitted_metrics(aggregator)
+    aggregator.reset()
+
+    instance = dict(YARN_CONFIG, max_concurrent_requests=4)
+    with mock.patch('requests.get', yarn_requests_get_mock), mock.patch(
+        'requests.Session.get', side_effect=yarn_requests_get_mock
+    ) as session_get:
+        c = SparkCheck('spark', {}, [instance])
+        dd_run_check(c)
+
+    # The connections are reused for all the requests, the 6 endpoints of the application included
+    assert session_get.call_count == 9
+    assert not c._prefetched_responses
+    assert _submitted_metrics(aggregator) == expected_metrics
+
+
+@pytest.mark.unit
+def test_concurrent_requests_failure(dd_run_check):
+    def requests_get_mock(url, *args, **kwargs):
+        if Url(url) == YARN_SPARK_STAGE_URL:
+            return MockResponse(status_code=500)
+        return yarn_requests_get_mock(url, *args, **kwargs)
+
+    instance = dict(YARN_CONFIG, max_concurrent_requests=4)
+    with mock.patch('requests.get', requests_get_mock), mock.patch(
+        'requests.Session.get', side_effect=requests_get_mock
+    ):
+        with pytest.raises(Exception, match='500 Server Error'):
+            dd_run_check(SparkCheck('spark', {}, [instance]), extract_message=True)
+
+
+@pytest.mark.unit
+def test_concurrent_requests_with_proxy_warning_page(aggregator, dd_run_check):
+    warning_pages = []
+
+    def requests_get_mock(url, *args, **kwargs):
+        # The proxy in front of the applications displays the warning page until its cookie is sent,
+        # only on the endpoints of the applications so that no request sets it before they are fetched
+        cookies = kwargs.get('cookies') or {}
+        url_parts = list(urlparse(url))
+        query = dict(parse_qsl(url_parts[4]))
+        app_endpoint = '/proxy/' in url and url_parts[2].rstrip('/').split('/')[-1] not in ('applications', 'version')
+        if app_endpoint and not (cookies.get('proxy_cookie') and query.get('proxyapproved') == 'true'):
+            warning_pages.append(url)
+            # Let the other requests start in the meantime, if any
+            time.sleep(0.1)
+            return proxy_with_warning_page_mock(url, *args, **kwargs)
+        query.pop('proxyapproved', None)
+        url_parts[4] = urlencode(query)
+        return yarn_requests_get_mock(urlunparse(url_parts), *args, **kwargs)
+
+    with mock.patch('requests.get', yarn_requests_get_mock):
+        dd_run_check(SparkCheck('spark', {}, [YARN_CONFIG]))
+    expected_metrics = _submitted_metrics(aggregator)
+    aggregator.reset()
+
+    instance = dict(YARN_CONFIG, max_concurrent_requests=4)
+    with mock.patch('requests.get', requests_get_mock), mock.patch(
+        'requests.Session.get', side_effect=requests_get_mock
+    ):
+        dd_run_check(SparkCheck('spark', {}, [instance]))
+
+    # The proxy cookie is set by a first request, before the concurrent ones
+    assert len(warning_pages) == 1
+    assert _submitted_metrics(aggregator) == expected_metrics
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    'max_concurrent_requests, message',
+    [
+        pytest.param(0, '`max_concurrent_requests` must be greater than or equal to 1', id='zero'),
+        pytest.param('four', '`max_concurrent_requests` must be an integer', id='not a number'),
+    ],
+)
+def test_invalid_max_concurrent_requests(max_concurrent_requests, message):
+    with pytest.raises(ConfigurationError, match=message):
+        SparkCheck('spark', {}, [dict(YARN_CONFIG, max_concurrent_requests=max_concurrent_requests)])
+
+
+@pytest.mark.unit
+def test_report_completed_objects_once(aggregator, dd_run_check):
+    instance = dict(YARN_CONFIG, report_completed_objects_once=True, streaming_metrics=False)
+    with mock.patch('requests.get', yarn_requests_get_mock):
+        c = SparkCheck('spark', {}, [instance])
+        dd_run_check(c)
+
+        for metric, value in iteritems(SPARK_JOB_SUCCEEDED_METRIC_VALUES):
+            aggregator.assert_metric(metric, value=value, tags=SPARK_JOB_SUCCEEDED_METRIC_TAGS + CUSTOM_TAGS)
+        for metric, value in iteritems(SPARK_STAGE_COMPLETE_METRIC_VALUES):
+            aggregator.assert_metric(metric, value=value, tags=SPARK_STAGE_COMPLETE_METRIC_TAGS + CUSTOM_TAGS)
+        aggregator.reset()
+
+        dd_run_check(c)
+
+    # The completed jobs and stages are only reported by the first run
+    for metric in SPARK_JOB_SUCCEEDED_METRIC_VALUES:
+        aggregator.assert_metric(metric, count=0, tags=SPARK_JOB_SUCCEEDED_METRIC_TAGS + CUSTOM_TAGS)
+    for metric in SPARK_STAGE_COMPLETE_METRIC_VALUES:
+        aggregator.assert_metric(metric, count=0, tags=SPARK_STAGE_COMPLETE_METRIC_TAGS + CUSTOM_TAGS)
+
+    for metric, value in iteritems(SPARK_JOB_RUNNING_METRIC_VALUES):
+        aggregator.assert_metric(metric, value=value, tags=SPARK_JOB_RUNNING_METRIC_TAGS + CUSTOM_TAGS)
+    for metric, value in iteritems(SPARK_STAGE_RUNNING_METRIC_VALUES):
+        aggregator.assert_metric(metric, value=value, tags=SPARK_STAGE_RUNNING_METRIC_TAGS + CUSTOM_TAGS)
+
+    assert c._reported_completed_jobs == {SPARK_APP_ID: {0}}
+    assert c._reported_completed_stages == {SPARK_APP_ID: {(0, 0)}}
+
+    # Only the applications still running are remembered
+    running_apps = {'app_002': (APP_NAME, SPARK_APP_URL)}
+    with mock.patch('requests.get', return_value=MockResponse('[]')), mock.patch.object(
+        c, '_get_running_apps', return_value=running_apps
+    ):
+        dd_run_check(c)
+
+    assert c._reported_completed_jobs == {'app_002': set()}
+    assert c._reported_completed_stages == {'app_002': set()}
+
+
 @pytest.mark.unit
 @pytest.mark.parametrize(
     "instance,service_check",
@@ -4,7 +4,7 @@
 import datetime as dt  # noqa: F401
 import functools
 import ssl
-from typing import Any, Callable, List, TypeVar, cast  # noqa: F401
+from typing import Any, Callable, Dict, List, Set, Tuple, TypeVar, cast  # noqa: F401
 
 from pyVim import connect
 from pyVmomi import vim, vmodl
@@ -99,6 +99,11 @@ class VSphereAPI(object):
         self.log = log
 
         self._conn = cast(vim.ServiceInstance, None)
+        # Property collector tracking the infrastructure changes, see `sync_infrastructure`
+        self._infrastructure_collector = None  # type: vmodl.query.PropertyCollector
+        self._infrastructure_view = None  # type: vim.view.ContainerView
+        self._infrastructure_version = ''
+        self._infrastructure = {}  # type: Dict[vim.ManagedEntity, Dict[str, Any]]
         self.smart_connect()
 
     def smart_connect(self):
@@ -151,6 +156,9 @@ class VSphereAPI(object):
             connect.Disconnect(self._conn)
 
         self._conn = conn
+        # The property collectors of the previous session are gone
+        self._infrastructure_collector = None
+        self._infrastructure_view = None
         self.log.debug("Connected to %s", version_info.fullName)
 
     @smart_retry
@@ -173,13 +181,9 @@ class VSphereAPI(object):
         """
         return self._conn.content.perfManager.QueryPerfCounterByLevel(collection_level)
 
-    @smart_retry
-    def _get_raw_infrastructure(self):
-        # type: () -> List[vmodl.query.PropertyCollector.ObjectContent]
-        """Traverse the whole vSphere infrastructure and returns the list of raw pyvmomi MOR objects with
-        the required pre-fetched attributes."""
-        content = self._conn.content  # vim.ServiceInstanceContent reference from the connection
-
+    def _get_infrastructure_filter_spec(self, view_ref):
+        # type: (vim.view.ContainerView) -> vmodl.query.PropertyCollector.FilterSpec
+        """Build the filter spec selecting the required attributes of every resource of the container view."""
         property_specs = []
         # Specify which attributes we want to retrieve per object
         for resource in ALL_RESOURCES:
@@ -206,24 +210,33 @@ class VSphereAPI(object):
         traversal_spec.skip = False
         traversal_spec.type = vim.view.ContainerView
 
-        retr_opts = vmodl.query.PropertyCollector.RetrieveOptions()
-        # To limit the number of objects retrieved per call.
-        # If batch_collector_size is 0, collect maximum number of objects.
-        retr_opts.maxObjects = self.config.batch_collector_size
-
         # Specify the root object from where we collect the rest of the objects
         obj_spec = vmodl.query.PropertyCollector.ObjectSpec()
         obj_spec.skip = True
         obj_spec.selectSet = [traversal_spec]
+        obj_spec.obj = view_ref
 
         # Create our filter spec from the above specs
         filter_spec = vmodl.query.PropertyCollector.FilterSpec()
         filter_spec.propSet = property_specs
+        filter_spec.objectSet = [obj_spec]
+        return filter_spec
+
+    @smart_retry
+    def _get_raw_infrastructure(self):
+        # type: () -> List[vmodl.query.PropertyCollector.ObjectContent]
+        """Traverse the whole vSphere infrastructure and returns the list of raw pyvmomi MOR objects with
+        the required pre-fetched attributes."""
+        content = self._conn.content  # vim.ServiceInstanceContent reference from the connection
+
+        retr_opts = vmodl.query.PropertyCollector.RetrieveOptions()
+        # To limit the number of objects retrieved per call.
+        # If batch_collector_size is 0, collect maximum number of objects.
+        retr_opts.maxObjects = self.config.batch_collector_size
 
         view_ref = content.viewManager.CreateContainerView(content.rootFolder, ALL_RESOURCES, True)
         try:
-            obj_spec.obj = view_ref
-            filter_spec.objectSet = [obj_spec]
+            filter_spec = self._get_infrastructure_filter_spec(view_ref)
 
             # Collect the objects and their properties
             res = content.propertyCollector.RetrievePropertiesEx([filter_spec], retr_opts)
@@ -287,7 +300,6 @@ class VSphereAPI(object):
 
             attribute_keys = {x.key: x.name for x in self._fetch_all_attributes()}
             for props in itervalues(infrastructure_data):
-                mor_attributes = []
                 if self.config.collect_property_metrics:
                     all_properties = {}
                     for attribute_name in ALL_PROPERTIES:
@@ -298,17 +310,142 @@ class VSphereAPI(object):
 
                 if 'customValue' not in props:
                     continue
-                for attribute in props.pop('customValue'):
-                    # The attribute key is always unique
-                    attr_key_name = attribute_keys.get(attribute.key)
-                    if attr_key_name is None:
-                        self.log.debug("Unable to resolve attribute key with ID: %s", attribute.key)
+                props['attributes'] = self._format_attributes(props.pop('customValue'), attribute_keys)
+        return cast(InfrastructureData, infrastructure_data)
+
+    def _format_attributes(self, custom_values, attribute_keys):
+        # type: (List[vim.CustomFieldsManager.Value], Dict[int, str]) -> List[str]
+        mor_attributes = []
+        for attribute in custom_values:
+            # The attribute key is always unique
+            attr_key_name = attribute_keys.get(attribute.key)
+            if attr_key_name is None:
+                self.log.debug("Unable to resolve attribute key with ID: %s", attribute.key)
+                continue
+            attr_value = attribute.value
+            mor_attributes.append("{}{}:{}".format(self.config.attr_prefix, attr_key_name, attr_value))
+        return mor_attributes
+
+    @smart_retry
+    def sync_infrastructure(self):
+        # type: () -> InfrastructureData
+        """Create a property collector filter tracking the changes of the whole vSphere infrastructure and return
+        its complete content, in the same format as `get_infrastructure`.
+
+        The filter is kept open afterwards so that `get_infrastructure_updates` only receives the changes."""
+        self.reset_infrastructure_updates()
+        content = self._conn.content
+
+        # A dedicated property collector is used so that its filter doesn't interfere with other API calls
+        collector = content.propertyCollector.CreatePropertyCollector()
+        self._infrastructure_collector = collector
+        self._infrastructure_view = content.viewManager.CreateContainerView(content.rootFolder, ALL_RESOURCES, True)
+        collector.CreateFilter(self._get_infrastructure_filter_spec(self._infrastructure_view), partialUpdates=False)
+
+        # The first update lists every object of the filter
+        self._wait_for_infrastructure_updates()
+        if not self._infrastructure:
+            self.log.warning(
+                "Did not retrieve any properties from the vCenter. Metric collection cannot continue. "
+                "Ensure your user has correct permissions."
+            )
+
+        # Add the root folder entity as it can't be fetched from the property collector.
+        root_folder = content.rootFolder
+        self._infrastructure[root_folder] = {"name": root_folder.name, "parent": None}
+        if self.config.collect_property_metrics:
+            self._infrastructure[root_folder]['properties'] = {}
+
+        return self._infrastructure
+
+    def get_infrastructure_updates(self):
+        # type: () -> Tuple[InfrastructureData, Dict[vim.ManagedEntity, Set[str]], Set[vim.ManagedEntity]]
+        """Apply the changes that happened since the previous call to the infrastructure returned by
+        `sync_infrastructure`.
+
+        :return: the up to date infrastructure, the names of the changed properties of every new or modified mor
+        and the set of the removed mors.
+        """
+        if self._infrastructure_collector is None:
+            raise APIResponseError("The infrastructure is not tracked by a property collector")
+        changed, removed = self._wait_for_infrastructure_updates()
+        return cast(InfrastructureData, self._infrastructure), changed, removed
+
+    def reset_infrastructure_updates(self):
+        # type: () -> None
+        """Destroy the property collector tracking the infrastructure changes, if any."""
+        collector, view_ref = self._infrastructure_collector, self._infrastructure_view
+        self._infrastructure_collector = None
+        self._infrastructure_view = None
+        self._infrastructure_version = ''
+        self._infrastructure = {}
+        try:
+            if collector is not None:
+                collector.DestroyPropertyCollector()
+            if view_ref is not None:
+                view_ref.Destroy()
+        except Exception as e:
+            self.log.debug("Unable to destroy the infrastructure property collector: %s", e)
+
+    def _wait_for_infrastructure_updates(self):
+        # type: () -> Tuple[Dict[vim.ManagedEntity, Set[str]], Set[vim.ManagedEntity]]
+        options = vmodl.query.PropertyCollector.WaitOptions()
+        # Only return the changes that are already available instead of waiting for new ones
+        options.maxWaitSeconds = 0
+        if self.config.batch_collector_size > 0:
+            options.maxObjectUpdates = self.config.batch_collector_size
+
+        infrastructure = self._infrastructure
+        changed = {}  # type: Dict[vim.ManagedEntity, Set[str]]
+        removed = set()  # type: Set[vim.ManagedEntity]
+        attribute_keys = None
+        while True:
+            update_set = self._infrastructure_collector.WaitForUpdatesEx(self._infrastructure_version, options)
+            if update_set is None:
+                # Nothing changed since the last version
+                break
+            self._infrastructure_version = update_set.version
+
+            for filter_update in update_set.filterSet:
+                for object_update in filter_update.objectSet:
+                    mor = object_update.obj
+                    if object_update.kind == 'leave':
+                        if infrastructure.pop(mor, None) is not None:
+                            removed.add(mor)
+                        changed.pop(mor, None)
                         continue
-                    attr_value = attribute.value
-                    mor_attributes.append("{}{}:{}".format(self.config.attr_prefix, attr_key_name, attr_value))
 
-                props['attributes'] = mor_attributes
-        return cast(InfrastructureData, infrastructure_data)
+                    props = infrastructure.get(mor)
+                    if props is None or object_update.kind == 'enter':
+                        if not object_update.changeSet:
+                            continue
+                        props = infrastructure[mor] = {}
+                        if self.config.collect_property_metrics:
+                            props['properties'] = {}
+                        removed.discard(mor)
+
+                    for change in object_update.changeSet:
+                        # Filters are created without partial updates, a change always holds the full value
+                        value = None if change.op in ('remove', 'indirectRemove') else change.val
+                        if change.name == 'customValue':
+                            if attribute_keys is None:
+                                attribute_keys = {x.key: x.name for x in self._fetch_all_attributes()}
+                            props['attributes'] = self._format_attributes(value or [], attribute_keys)
+                        elif self.config.collect_property_metrics and change.name in ALL_PROPERTIES:
+                            if value is None:
+                                props['properties'].pop(change.name, None)
+                            else:
+                                props['properties'][change.name] = value
+                        elif value is None:
+                            props.pop(change.name, None)
+                        else:
+                            props[change.name] = value
+                    changed.setdefault(mor, set()).update(change.name for change in object_update.changeSet)
+
+            if not update_set.truncated:
+                break
+
+        return changed, removed
 
     @smart_retry
     def query_metrics(self, query_specs):
@@ -133,6 +133,13 @@ class InfrastructureCache(VSphereCache):
         # type: (ResourceTags) -> None
         self._tags = mor_tags
 
+    def update_tags(self, mor_tags):
+        # type: (ResourceTags) -> None
+        for mor_type, tags in mor_tags.items():
+            if mor_type not in self._tags:
+                self._tags[mor_type] = {}
+            self._tags[mor_type].update(tags)
+
     def get_mor_props(self, mor, default=None):
         # type: (vim.ManagedEntity, Dict[str, Any]) -> Dict[str, Any]
         mor_type = type(mor)
@@ -149,6 +156,12 @@ class InfrastructureCache(VSphereCache):
             self._mors[mor_type] = {}
         self._mors[mor_type][mor] = mor_data
 
+    def remove_mor(self, mor):
+        # type: (vim.ManagedEntity) -> None
+        mor_type = type(mor)
+        self._mors.get(mor_type, {}).pop(mor, None)
+        self._tags.get(mor_type, {}).pop(mor._moId, None)
+
     def clear_properties(self):
         # type: () -> None
         for _, mors in self._mors.items():
@@ -100,6 +100,7 @@ class VSphereConfig(object):
         self.refresh_infrastructure_cache_interval = instance.get(
             'refresh_infrastructure_cache_interval', DEFAULT_REFRESH_INFRASTRUCTURE_CACHE_INTERVAL
         )
+        self.incremental_infrastructure_cache = is_affirmative(instance.get('incremental_infrastructure_cache', False))
         self.refresh_metrics_metadata_cache_interval = instance.get(
             'refresh_metrics_metadata_cache_interval', DEFAULT_REFRESH_METRICS_METADATA_CACHE_INTERVAL
         )
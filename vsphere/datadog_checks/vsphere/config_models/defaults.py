@@ -64,6 +64,10 @@ def instance_include_datastore_cluster_folder_tag():
     return True
 
 
+def instance_incremental_infrastructure_cache():
+    return False
+
+
 def instance_max_historical_metrics():
     return 256
 
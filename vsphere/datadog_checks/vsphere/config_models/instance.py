@@ -156,6 +156,7 @@ class InstanceConfig(BaseModel):
     host: str
     include_datastore_cluster_folder_tag: Optional[bool] = None
     include_events: Optional[tuple[IncludeEvent, ...]] = None
+    incremental_infrastructure_cache: Optional[bool] = None
     max_historical_metrics: Optional[int] = None
     metric_filters: Optional[MetricFilters] = None
     metric_patterns: Optional[MetricPatterns] = None
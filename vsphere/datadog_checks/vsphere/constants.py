@@ -138,6 +138,9 @@ VM_PROPERTIES = VM_OBJECT_PROPERTIES + VM_SIMPLE_PROPERTIES
 
 ALL_PROPERTIES = VM_PROPERTIES + HOST_PROPERTIES + CLUSTER_PROPERTIES + DATASTORE_PROPERTIES
 
+# Properties used to compute the tags and the hostname of the resources
+TAG_PROPERTIES = ["name", "parent", "customValue", "runtime.powerState", "runtime.host", "guest.hostName"]
+
 
 OBJECT_PROPERTIES_TO_METRIC_NAME = {
     "guest.net": ["guest.net.ipConfig.address", "guest.net"],
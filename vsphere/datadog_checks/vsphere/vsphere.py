@@ -28,6 +28,7 @@ from datadog_checks.vsphere.constants import (
     PROPERTY_COUNT_METRICS,
     PROPERTY_METRICS_BY_RESOURCE_TYPE,
     REALTIME_METRICS_INTERVAL_ID,
+    TAG_PROPERTIES,
     UNLIMITED_HIST_METRICS_PER_QUERY,
 )
 from datadog_checks.vsphere.event import VSphereEvent
@@ -169,10 +170,11 @@ class VSphereCheck(AgentCheck):
         # Apparently only when the server restarts?
         # https://pubs.vmware.com/vsphere-50/index.jsp?topic=%2Fcom.vmware.wssdk.pg.doc_50%2FPG_Ch16_Performance.18.5.html
 
-    def collect_tags(self, infrastructure_data):
-        # type: (InfrastructureData) -> ResourceTags
+    def collect_tags(self, infrastructure_data, mors=None):
+        # type: (InfrastructureData, Optional[Iterable[vim.ManagedEntity]]) -> ResourceTags
         """
         Fetch the all tags, build tags for each monitored resources and store all of that into the tags_cache.
+        If `mors` is set, only the tags of those resources are fetched.
         """
         if not self.api_rest:
             return {}
@@ -180,15 +182,14 @@ class VSphereCheck(AgentCheck):
         # In order to be more efficient in tag collection, the infrastructure data is filtered as much as possible.
         # All filters are applied except the ones based on tags of course.
         resource_filters_without_tags = [f for f in self._config.resource_filters if not isinstance(f, TagFilter)]
-        filtered_infra_data = {
-            mor: props
-            for mor, props in iteritems(infrastructure_data)
+        mors_list = [
+            mor
+            for mor in (infrastructure_data if mors is None else mors)
             if isinstance(mor, tuple(self._config.collected_resource_types))
             and is_resource_collected_by_filters(mor, infrastructure_data, resource_filters_without_tags)
-        }
+        ]
 
         t0 = Timer()
-        mors_list = list(filtered_infra_data.keys())
         try:
             mor_tags = self.api_rest.get_resource_tags_for_mors(mors_list)
         except Exception as e:
@@ -212,7 +213,10 @@ class VSphereCheck(AgentCheck):
         metrics for this mor."""
         self.log.debug("Refreshing the infrastructure cache...")
         t0 = Timer()
-        infrastructure_data = self.api.get_infrastructure()
+        if self._config.incremental_infrastructure_cache:
+            infrastructure_data = self.api.sync_infrastructure()
+        else:
+            infrastructure_data = self.api.get_infrastructure()
         collect_property_metrics = self._config.collect_property_metrics
         self.gauge(
             "datadog.vsphere.refresh_infrastructure_cache.time",
@@ -239,112 +243,183 @@ class VSphereCheck(AgentCheck):
                 # Do nothing for the resource types we do not collect
                 continue
 
-            mor_name = to_string(properties.get("name", "unknown"))
-            mor_type_str = MOR_TYPE_AS_STRING[type(mor)]
-            hostname = None
-            tags = []
-            mor_payload = {}  # type: Dict[str, Any]
-            if self._config.collect_property_metrics:
-                all_properties = properties.get('properties', {})
-                mor_payload['properties'] = all_properties
-
-            if isinstance(mor, vim.VirtualMachine):
-                power_state = properties.get("runtime.powerState")
-                if power_state != vim.VirtualMachinePowerState.poweredOn:
-                    # Skipping because the VM is not powered on
-                    # TODO: Sometimes VM are "poweredOn" but "disconnected" and thus have no metrics
-                    self.log.debug("Skipping VM %s in state %s", mor_name, to_string(power_state))
-                    continue
-
-                # Hosts are not considered as parents of the VMs they run, we use the `runtime.host` property
-                # to get the name of the ESXi host
-                runtime_host = properties.get("runtime.host")
-                runtime_host_props = {}  # type: InfrastructureDataItem
-                if runtime_host:
-                    if runtime_host in infrastructure_data:
-                        runtime_host_props = infrastructure_data.get(runtime_host, {})
-                    else:
-                        self.log.debug("Missing runtime.host details for VM %s", mor_name)
-                runtime_hostname = to_string(runtime_host_props.get("name", "unknown"))
-                tags.append('vsphere_host:{}'.format(runtime_hostname))
-
-                if self._config.use_guest_hostname:
-                    hostname = properties.get("guest.hostName", mor_name)
+            mor_payload = self.build_mor_payload(mor, properties, infrastructure_data)
+            if mor_payload is not None:
+                self.infrastructure_cache.set_mor_props(mor, mor_payload)
+
+    def build_mor_payload(self, mor, properties, infrastructure_data):
+        # type: (vim.ManagedEntity, InfrastructureDataItem, InfrastructureData) -> Optional[Dict[str, Any]]
+        """Compute the tags and the `hostname` of a resource, return None if the resource is not monitored."""
+        mor_name = to_string(properties.get("name", "unknown"))
+        mor_type_str = MOR_TYPE_AS_STRING[type(mor)]
+        hostname = None
+        tags = []
+        mor_payload = {}  # type: Dict[str, Any]
+        if self._config.collect_property_metrics:
+            all_properties = properties.get('properties', {})
+            mor_payload['properties'] = all_properties
+
+        if isinstance(mor, vim.VirtualMachine):
+            power_state = properties.get("runtime.powerState")
+            if power_state != vim.VirtualMachinePowerState.poweredOn:
+                # Skipping because the VM is not powered on
+                # TODO: Sometimes VM are "poweredOn" but "disconnected" and thus have no metrics
+                self.log.debug("Skipping VM %s in state %s", mor_name, to_string(power_state))
+                return None
+
+            # Hosts are not considered as parents of the VMs they run, we use the `runtime.host` property
+            # to get the name of the ESXi host
+            runtime_host = properties.get("runtime.host")
+            runtime_host_props = {}  # type: InfrastructureDataItem
+            if runtime_host:
+                if runtime_host in infrastructure_data:
+                    runtime_host_props = infrastructure_data.get(runtime_host, {})
                 else:
-                    hostname = mor_name
-            elif isinstance(mor, vim.HostSystem):
-                hostname = mor_name
+                    self.log.debug("Missing runtime.host details for VM %s", mor_name)
+            runtime_hostname = to_string(runtime_host_props.get("name", "unknown"))
+            tags.append('vsphere_host:{}'.format(runtime_hostname))
 
+            if self._config.use_guest_hostname:
+                hostname = properties.get("guest.hostName", mor_name)
             else:
-                tags.append('vsphere_{}:{}'.format(mor_type_str, mor_name))
+                hostname = mor_name
+        elif isinstance(mor, vim.HostSystem):
+            hostname = mor_name
+
+        else:
+            tags.append('vsphere_{}:{}'.format(mor_type_str, mor_name))
 
-            parent = properties.get('parent')
-            runtime_host = properties.get('runtime.host')
-            if parent is not None:
-                tags.extend(
-                    get_tags_recursively(parent, infrastructure_data, self._config.include_datastore_cluster_folder_tag)
+        parent = properties.get('parent')
+        runtime_host = properties.get('runtime.host')
+        if parent is not None:
+            tags.extend(
+                get_tags_recursively(parent, infrastructure_data, self._config.include_datastore_cluster_folder_tag)
+            )
+        if runtime_host is not None:
+            tags.extend(
+                get_tags_recursively(
+                    runtime_host,
+                    infrastructure_data,
+                    self._config.include_datastore_cluster_folder_tag,
+                    include_only=['vsphere_cluster'],
                 )
-            if runtime_host is not None:
-                tags.extend(
-                    get_tags_recursively(
-                        runtime_host,
-                        infrastructure_data,
-                        self._config.include_datastore_cluster_folder_tag,
-                        include_only=['vsphere_cluster'],
+            )
+        tags.append('vsphere_type:{}'.format(mor_type_str))
+
+        # Attach tags from fetched attributes.
+        tags.extend(properties.get('attributes', []))
+        resource_tags = self.infrastructure_cache.get_mor_tags(mor) + tags
+        if not is_resource_collected_by_filters(
+            mor,
+            infrastructure_data,
+            self._config.resource_filters,
+            resource_tags,
+        ):
+            # The resource does not match the specified whitelist/blacklist patterns.
+            self.log.debug("Skipping resource not matched by filters. resource=`%s` tags=`%s`", mor_name, resource_tags)
+            return None
+
+        # after retrieving tags, add hostname suffix if specified
+        if isinstance(mor, vim.VirtualMachine):
+            if self._config.vm_hostname_suffix_tag is not None:
+                hostname_suffix = None
+
+                all_tags = resource_tags + self._config.custom_tags
+                sorted_tags = sorted(all_tags)
+                for resource_tag in sorted_tags:
+                    resource_tag_key, _, resource_tag_value = resource_tag.partition(":")
+                    if resource_tag_key == self._config.vm_hostname_suffix_tag:
+                        hostname_suffix = resource_tag_value
+                        break
+
+                if hostname_suffix is not None:
+                    hostname = "{}-{}".format(hostname, hostname_suffix)
+                    self.log.debug(
+                        "Attached hostname suffix key %s, new hostname: %s",
+                        self._config.vm_hostname_suffix_tag,
+                        hostname,
+                    )
+
+                else:
+                    self.log.debug(
+                        "Could not attach hostname suffix key %s for host: %s",
+                        self._config.vm_hostname_suffix_tag,
+                        hostname,
                     )
-                )
-            tags.append('vsphere_type:{}'.format(mor_type_str))
-
-            # Attach tags from fetched attributes.
-            tags.extend(properties.get('attributes', []))
-            resource_tags = self.infrastructure_cache.get_mor_tags(mor) + tags
-            if not is_resource_collected_by_filters(
-                mor,
-                infrastructure_data,
-                self._config.resource_filters,
-                resource_tags,
-            ):
-                # The resource does not match the specified whitelist/blacklist patterns.
-                self.log.debug(
-                    "Skipping resource not matched by filters. resource=`%s` tags=`%s`", mor_name, resource_tags
-                )
-                continue
 
-            # after retrieving tags, add hostname suffix if specified
-            if isinstance(mor, vim.VirtualMachine):
-                if self._config.vm_hostname_suffix_tag is not None:
-                    hostname_suffix = None
-
-                    all_tags = resource_tags + self._config.custom_tags
-                    sorted_tags = sorted(all_tags)
-                    for resource_tag in sorted_tags:
-                        resource_tag_key, _, resource_tag_value = resource_tag.partition(":")
-                        if resource_tag_key == self._config.vm_hostname_suffix_tag:
-                            hostname_suffix = resource_tag_value
-                            break
-
-                    if hostname_suffix is not None:
-                        hostname = "{}-{}".format(hostname, hostname_suffix)
-                        self.log.debug(
-                            "Attached hostname suffix key %s, new hostname: %s",
-                            self._config.vm_hostname_suffix_tag,
-                            hostname,
-                        )
+        mor_payload["tags"] = tags  # type: Dict[str, Any]
 
-                    else:
-                        self.log.debug(
-                            "Could not attach hostname suffix key %s for host: %s",
-                            self._config.vm_hostname_suffix_tag,
-                            hostname,
-                        )
+        if hostname:
+            mor_payload['hostname'] = hostname
 
-            mor_payload["tags"] = tags  # type: Dict[str, Any]
+        return mor_payload
 
-            if hostname:
-                mor_payload['hostname'] = hostname
+    def update_infrastructure_cache(self):
+        # type: () -> bool
+        """Apply the infrastructure changes reported by vCenter since the last check run to the infrastructure_cache.
+        Only the resources whose tag properties changed get their tags and `hostname` computed again.
 
+        :return False if the changes could not be retrieved and the whole infrastructure_cache must be refreshed.
+        """
+        t0 = Timer()
+        try:
+            infrastructure_data, changed, removed = self.api.get_infrastructure_updates()
+        except Exception as e:
+            self.log.warning("Unable to retrieve the infrastructure changes, refreshing the whole cache: %s", e)
+            return False
+        self.gauge(
+            "datadog.vsphere.update_infrastructure_cache.time",
+            t0.total(),
+            tags=self._config.base_tags,
+            raw=True,
+            hostname=self._hostname,
+        )
+        if not changed and not removed:
+            return True
+        self.log.debug("Received changes for %d resources, %d resources were removed.", len(changed), len(removed))
+
+        # Property metrics are only submitted when the whole infrastructure_cache is refreshed, so changes of the
+        # other properties don't impact the cache
+        changed = {mor: names for mor, names in iteritems(changed) if not names.isdisjoint(TAG_PROPERTIES)}
+
+        for mor in removed:
+            self.infrastructure_cache.remove_mor(mor)
+
+        # The tags of a resource are made of the names of its parents and of the ones of the host running it,
+        # so a renamed or moved container impacts all the resources it contains.
+        if any(not isinstance(mor, vim.VirtualMachine) for mor in removed) or any(
+            not isinstance(mor, vim.VirtualMachine) and ('name' in properties or 'parent' in properties)
+            for mor, properties in iteritems(changed)
+        ):
+            mors = list(infrastructure_data)  # type: List[vim.ManagedEntity]
+        else:
+            mors = list(changed)
+        mors = [mor for mor in mors if isinstance(mor, tuple(self._config.collected_resource_types))]
+
+        if self._config.should_collect_tags:
+            new_mors = [mor for mor in changed if self.infrastructure_cache.get_mor_props(mor) is None]
+            self.infrastructure_cache.update_tags(self.collect_tags(infrastructure_data, new_mors))
+
+        updated_mors = set()  # type: Set[vim.ManagedEntity]
+        for mor in mors:
+            mor_payload = self.build_mor_payload(mor, infrastructure_data[mor], infrastructure_data)
+            if mor_payload is None:
+                self.infrastructure_cache.remove_mor(mor)
+                continue
+            mor_payload.pop('properties', None)
+            previous_payload = self.infrastructure_cache.get_mor_props(mor)
+            if (
+                previous_payload is None
+                or previous_payload['tags'] != mor_payload['tags']
+                or previous_payload.get('hostname') != mor_payload.get('hostname')
+            ):
+                updated_mors.add(mor)
             self.infrastructure_cache.set_mor_props(mor, mor_payload)
 
+        if updated_mors:
+            self.submit_external_host_tags(updated_mors)
+        return True
+
     def submit_metrics_callback(self, query_results):
         # type: (List[vim.PerformanceManager.EntityMetricBase]) -> None
         """
@@ -595,14 +670,19 @@ class VSphereCheck(AgentCheck):
         if batch:
             yield batch
 
-    def submit_external_host_tags(self):
-        # type: () -> None
+    def submit_external_host_tags(self, mors=None):
+        # type: (Optional[Set[vim.ManagedEntity]]) -> None
         """Send external host tags to the Datadog backend. This is only useful for a REALTIME instance because
-        only VMs and Hosts appear as 'datadog hosts'."""
+        only VMs and Hosts appear as 'datadog hosts'.
+
+        :param mors: only send the tags of these resources instead of the ones of all the VMs and Hosts.
+        """
         external_host_tags = []
 
         for resource_type in HOST_RESOURCES:
             for mor in self.infrastructure_cache.get_mors(resource_type):
+                if mors is not None and mor not in mors:
+                    continue
                 mor_props = self.infrastructure_cache.get_mor_props(mor)
                 mor_tags = self.infrastructure_cache.get_mor_tags(mor)
                 hostname = mor_props.get('hostname')
@@ -985,8 +1065,12 @@ class VSphereCheck(AgentCheck):
             with self.metrics_metadata_cache.update():
                 self.refresh_metrics_metadata_cache()
 
-        # Refresh the infrastructure cache
-        if self.infrastructure_cache.is_expired():
+        # Refresh the infrastructure cache, or only apply the latest changes to it
+        refresh_infrastructure_cache = self.infrastructure_cache.is_expired()
+        if not refresh_infrastructure_cache and self._config.incremental_infrastructure_cache:
+            refresh_infrastructure_cache = not self.update_infrastructure_cache()
+
+        if refresh_infrastructure_cache:
             with self.infrastructure_cache.update():
                 self.refresh_infrastructure_cache()
 
@@ -1221,3 +1221,29 @@ class MockHttpV7:
                 status_code=200,
             )
         raise Exception("Rest api mock request not matched: method={}, url={}".format('post', url))
+
+
+def build_update_set(version, object_updates, truncated=False):
+    """Build the result of a `WaitForUpdatesEx` call from a list of `(kind, mor, {property_name: value})` tuples,
+    a `None` value meaning that the property was removed."""
+    return vmodl.query.PropertyCollector.UpdateSet(
+        version=version,
+        truncated=truncated,
+        filterSet=[
+            vmodl.query.PropertyCollector.FilterUpdate(
+                objectSet=[
+                    vmodl.query.PropertyCollector.ObjectUpdate(
+                        kind=kind,
+                        obj=mor,
+                        changeSet=[
+                            vmodl.query.PropertyCollector.Change(
+                                name=name, op='assign' if value is not None else 'remove', val=value
+                            )
+                            for name, value in changes.items()
+                        ],
+                    )
+                    for kind, mor, changes in object_updates
+                ]
+            )
+        ],
+    )
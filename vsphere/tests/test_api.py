@@ -8,9 +8,11 @@ import pytest
 from mock import ANY, MagicMock, patch
 from pyVmomi import vim, vmodl
 
-from datadog_checks.vsphere.api import APIConnectionError, VSphereAPI
+from datadog_checks.vsphere.api import APIConnectionError, APIResponseError, VSphereAPI
 from datadog_checks.vsphere.config import VSphereConfig
 
+from .common import build_update_set
+
 
 def test_ssl_verify_false(realtime_instance):
     realtime_instance['ssl_verify'] = False
@@ -255,3 +257,61 @@ def test_get_new_events_with_fallback(realtime_instance):
 
         events = api.get_new_events(start_time=dt.datetime.now())
         assert events == [event1, event3]
+
+
+def test_get_infrastructure_updates(realtime_instance):
+    with patch('datadog_checks.vsphere.api.connect'):
+        config = VSphereConfig(realtime_instance, {}, MagicMock())
+        api = VSphereAPI(config, MagicMock())
+
+        root_folder = api._conn.content.rootFolder
+        root_folder.name = 'root-folder'
+        collector = api._conn.content.propertyCollector.CreatePropertyCollector.return_value
+        vm1 = vim.VirtualMachine(moId='vm1')
+        vm2 = vim.VirtualMachine(moId='vm2')
+        host = vim.HostSystem(moId='host1')
+        collector.WaitForUpdatesEx.side_effect = [
+            build_update_set(
+                '1',
+                [
+                    ('enter', vm1, {'name': 'vm1', 'guest.hostName': 'vm1.local'}),
+                    ('enter', host, {'name': 'host1'}),
+                ],
+                truncated=True,
+            ),
+            build_update_set('2', [('enter', vm2, {'name': 'vm2'})]),
+            None,
+            build_update_set(
+                '3',
+                [
+                    ('modify', vm1, {'runtime.host': host, 'guest.hostName': None}),
+                    ('leave', vm2, {}),
+                ],
+            ),
+        ]
+
+        infrastructure_data = api.sync_infrastructure()
+        assert infrastructure_data == {
+            vm1: {'name': 'vm1', 'guest.hostName': 'vm1.local'},
+            vm2: {'name': 'vm2'},
+            host: {'name': 'host1'},
+            root_folder: {'name': 'root-folder', 'parent': None},
+        }
+        collector.CreateFilter.assert_called_once_with(ANY, partialUpdates=False)
+
+        assert api.get_infrastructure_updates() == (infrastructure_data, {}, set())
+        assert api.get_infrastructure_updates() == (
+            {
+                vm1: {'name': 'vm1', 'runtime.host': host},
+                host: {'name': 'host1'},
+                root_folder: {'name': 'root-folder', 'parent': None},
+            },
+            {vm1: {'runtime.host', 'guest.hostName'}},
+            {vm2},
+        )
+        assert [c[0][0] for c in collector.WaitForUpdatesEx.call_args_list] == ['', '1', '2', '2']
+
+        # A new connection invalidates the property collector
+        api.smart_connect()
+        with pytest.raises(APIResponseError):
+            api.get_infrastructure_updates()
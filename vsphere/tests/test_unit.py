@@ -18,6 +18,7 @@ from .common import (
     HISTORICAL_INSTANCE,
     REALTIME_INSTANCE,
     VSPHERE_VERSION,
+    build_update_set,
 )
 
 pytestmark = [pytest.mark.unit]
@@ -3418,3 +3419,106 @@ def test_make_batch_realtime(
         hostname='vm1',
         tags=['vcenter_server:FAKE'],
     )
+
+
+def test_incremental_infrastructure_cache(aggregator, dd_run_check, realtime_instance, service_instance):
+    realtime_instance['incremental_infrastructure_cache'] = True
+    collector = service_instance.content.propertyCollector.CreatePropertyCollector.return_value
+    host = vim.HostSystem(moId='host1')
+    vm1 = vim.VirtualMachine(moId='vm1')
+    vm2 = vim.VirtualMachine(moId='vm2')
+    powered_on = vim.VirtualMachinePowerState.poweredOn
+    initial_update = build_update_set(
+        '1',
+        [
+            ('enter', host, {'name': 'host1'}),
+            ('enter', vm1, {'name': 'vm1', 'runtime.powerState': powered_on, 'runtime.host': host}),
+            ('enter', vm2, {'name': 'vm2', 'runtime.powerState': powered_on, 'runtime.host': host}),
+        ],
+    )
+    collector.WaitForUpdatesEx = mock.MagicMock(
+        side_effect=[
+            initial_update,
+            build_update_set('2', [('modify', vm2, {'runtime.powerState': vim.VirtualMachinePowerState.poweredOff})]),
+            build_update_set('3', [('modify', host, {'name': 'host2'})]),
+            Exception('The collector version is invalid'),
+            initial_update,
+        ]
+    )
+    check = VSphereCheck('vsphere', {}, [realtime_instance])
+    dd_run_check(check)
+    aggregator.assert_metric(
+        'vsphere.vm.count', value=2, count=2, tags=['vcenter_server:FAKE', 'vsphere_host:host1', 'vsphere_type:vm']
+    )
+    aggregator.assert_metric('datadog.vsphere.refresh_infrastructure_cache.time', count=1)
+    service_instance.content.propertyCollector.RetrievePropertiesEx.assert_not_called()
+
+    # The powered off VM is not monitored anymore
+    aggregator.reset()
+    dd_run_check(check)
+    aggregator.assert_metric(
+        'vsphere.vm.count', value=1, count=1, tags=['vcenter_server:FAKE', 'vsphere_host:host1', 'vsphere_type:vm']
+    )
+    aggregator.assert_metric('datadog.vsphere.update_infrastructure_cache.time', count=1)
+    aggregator.assert_metric('datadog.vsphere.refresh_infrastructure_cache.time', count=0)
+
+    # Renaming the host changes the tags of the VMs it runs
+    aggregator.reset()
+    dd_run_check(check)
+    aggregator.assert_metric(
+        'vsphere.vm.count', value=1, count=1, tags=['vcenter_server:FAKE', 'vsphere_host:host2', 'vsphere_type:vm']
+    )
+    aggregator.assert_metric('vsphere.host.count', value=1, count=1)
+    assert check.infrastructure_cache.get_mor_props(host)['hostname'] == 'host2'
+
+    # The whole infrastructure is fetched again when the changes cannot be retrieved
+    aggregator.reset()
+    dd_run_check(check)
+    aggregator.assert_metric(
+        'vsphere.vm.count', value=2, count=2, tags=['vcenter_server:FAKE', 'vsphere_host:host1', 'vsphere_type:vm']
+    )
+    aggregator.assert_metric('datadog.vsphere.refresh_infrastructure_cache.time', count=1)
+    assert service_instance.content.propertyCollector.CreatePropertyCollector.call_count == 2
+
+
+def test_incremental_infrastructure_cache_external_host_tags(dd_run_check, realtime_instance, service_instance):
+    realtime_instance['incremental_infrastructure_cache'] = True
+    collector = service_instance.content.propertyCollector.CreatePropertyCollector.return_value
+    host = vim.HostSystem(moId='host1')
+    vm1 = vim.VirtualMachine(moId='vm1')
+    vm2 = vim.VirtualMachine(moId='vm2')
+    powered_on = vim.VirtualMachinePowerState.poweredOn
+    collector.WaitForUpdatesEx = mock.MagicMock(
+        side_effect=[
+            build_update_set(
+                '1',
+                [
+                    ('enter', host, {'name': 'host1'}),
+                    ('enter', vm1, {'name': 'vm1', 'runtime.powerState': powered_on, 'runtime.host': host}),
+                    ('enter', vm2, {'name': 'vm2', 'runtime.powerState': powered_on, 'runtime.host': host}),
+                ],
+            ),
+            build_update_set('2', [('modify', vm1, {'guest.toolsRunningStatus': 'guestToolsNotRunning'})]),
+            build_update_set('3', [('modify', vm2, {'name': 'vm3'})]),
+        ]
+    )
+    check = VSphereCheck('vsphere', {}, [realtime_instance])
+    check.set_external_tags = mock.MagicMock()
+    dd_run_check(check)
+    assert sorted(hostname for hostname, _ in check.set_external_tags.mock_calls[0].args[0]) == [
+        'host1',
+        'vm1',
+        'vm2',
+    ]
+
+    # Changes of the properties that are not used by the tags leave the cache untouched
+    check.set_external_tags.reset_mock()
+    vm1_props = check.infrastructure_cache.get_mor_props(vm1)
+    dd_run_check(check)
+    check.set_external_tags.assert_not_called()
+    assert check.infrastructure_cache.get_mor_props(vm1) is vm1_props
+
+    # Only the tags of the renamed VM are submitted again
+    dd_run_check(check)
+    check.set_external_tags.assert_called_once()
+    assert [hostname for hostname, _ in check.set_external_tags.mock_calls[0].args[0]] == ['vm3']